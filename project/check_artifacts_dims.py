@@ -1,34 +1,14 @@
 import os
+import sys
 
-# Use PIL if installed, otherwise basic struct
-try:
-    from PIL import Image
-    def get_dims(filepath):
-        try:
-            with Image.open(filepath) as img:
-                return (img.width, img.height)
-        except:
-            return None
-except ImportError:
-    import struct
-    def get_dims(filepath):
-        try:
-            with open(filepath, 'rb') as f:
-                head = f.read(24)
-                if len(head) < 24: return None
-                if head[:8] == b'\x89\x50\x4E\x47\x0D\x0A\x1A\x0A': # PNG Check
-                    w = struct.unpack('>I', head[16:20])[0]
-                    h = struct.unpack('>I', head[20:24])[0]
-                    return (w, h)
-                return None
-        except:
-            return None
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "tools"))
+from image_meta import IMAGE_EXTS, read_meta
 
 directory = r'C:\Users\Usuario\.gemini\antigravity\brain\3762163f-b80c-4102-9cb1-7e1dc0992c85'
 
 try:
     files = os.listdir(directory)
-    images = [f for f in files if f.lower().endswith(('.png', '.jpg', '.jpeg'))]
+    images = [f for f in files if f.lower().endswith(IMAGE_EXTS)]
 
     print(f"Found {len(images)} images in artifacts dir")
     print("-" * 65)
@@ -36,12 +16,11 @@ try:
     print("-" * 65)
 
     for f in images:
-        path = os.path.join(directory, f)
-        dims = get_dims(path)
-        if dims:
-            print(f"{f:<50} | {dims[0]}x{dims[1]}")
+        meta = read_meta(os.path.join(directory, f))
+        if meta:
+            print(f"{f:<50} | {meta.width}x{meta.height}")
         else:
-            # Maybe it's not a valid PNG/JPG or struct check failed
+            # Not a PNG/JPEG/WebP/ICO or a truncated header
             print(f"{f:<50} | Unknown")
 
 except Exception as e:
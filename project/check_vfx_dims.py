@@ -1,5 +1,8 @@
-from PIL import Image
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "tools"))
+from image_meta import DimsIndex
 
 files = [
     r"c:\git\loopialike\project\assets\vfx\abilities\player\buffs\vfx_player_frost_nova_spritesheet.png",
@@ -9,13 +12,15 @@ files = [
     r"c:\git\loopialike\project\assets\vfx\abilities\player\soul_link\vfx_player_soul_link_spritesheet.png"
 ]
 
+index = DimsIndex()
 with open("vfx_dims.txt", "w") as out:
     for f in files:
-        try:
-            if os.path.exists(f):
-                with Image.open(f) as img:
-                    out.write(f"{os.path.basename(f)}: {img.size}\n")
+        if os.path.exists(f):
+            meta = index.get(f)
+            if meta:
+                out.write(f"{os.path.basename(f)}: {(meta.width, meta.height)}\n")
             else:
-                out.write(f"{os.path.basename(f)}: NOT FOUND\n")
-        except Exception as e:
-            out.write(f"{os.path.basename(f)}: Error {e}\n")
+                out.write(f"{os.path.basename(f)}: Error unknown image format\n")
+        else:
+            out.write(f"{os.path.basename(f)}: NOT FOUND\n")
+index.save()
@@ -1,13 +1,8 @@
 import os
 import sys
 
-# Try importing PIL
-try:
-    from PIL import Image
-    print("PIL imported successfully")
-except ImportError as e:
-    print(f"PIL import failed: {e}")
-    Image = None
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "tools"))
+from image_meta import read_meta
 
 directory = r'C:\Users\Usuario\.gemini\antigravity\brain\3762163f-b80c-4102-9cb1-7e1dc0992c85'
 candidates = [
@@ -24,14 +19,11 @@ for f in candidates:
     print(f"--- Checking {f} ---")
     if os.path.exists(path):
         print(f"File exists. Size: {os.path.getsize(path)} bytes")
-        if Image:
-            try:
-                with Image.open(path) as img:
-                    print(f"Dimensions: {img.width}x{img.height}")
-                    print(f"Format: {img.format}")
-            except Exception as e:
-                print(f"PIL Error: {e}")
+        meta = read_meta(path)
+        if meta:
+            print(f"Dimensions: {meta.width}x{meta.height}")
+            print(f"Format: {meta.format.upper()}")
         else:
-            print("Skipping dimension check (PIL missing)")
+            print("Header not recognised (not PNG/JPEG/WebP/ICO or truncated)")
     else:
         print("File NOT found")
@@ -6,8 +6,14 @@ extends Node
 
 var sprites_index: Dictionary = {}
 
+# Atlas opcional generado por tools/pack_atlases.py: ruta res:// original -> {atlas, region}
+const ATLAS_MAP_PATH = "res://assets/atlases/atlas_map.json"
+var atlas_regions: Dictionary = {}
+var _atlas_textures: Dictionary = {}
+
 func _ready():
 	load_index()
+	load_atlas_map()
 
 func load_index():
 	var path = "res://assets/sprites/sprites_index.json"
@@ -81,3 +87,32 @@ func get_sprite(path_key: String) -> String:
 func has(path_key: String) -> bool:
 	return sprites_index.has(path_key)
 
+func load_atlas_map():
+	if not FileAccess.file_exists(ATLAS_MAP_PATH):
+		return
+	var file = FileAccess.open(ATLAS_MAP_PATH, FileAccess.READ)
+	if not file:
+		return
+	var json = JSON.new()
+	var parse_result = json.parse(file.get_as_text())
+	file.close()
+	if parse_result != OK:
+		push_warning("[SpriteDB] Error parseando atlas_map.json: %s" % json.get_error_message())
+		return
+	atlas_regions = json.get_data().get("regions", {})
+
+# Textura para una ruta: AtlasTexture si está empaquetada en un atlas, si no la textura suelta
+func get_texture(path: String) -> Texture2D:
+	if _atlas_textures.has(path):
+		return _atlas_textures[path]
+	if atlas_regions.has(path) and ResourceLoader.exists(atlas_regions[path]["atlas"]):
+		var entry = atlas_regions[path]
+		var r = entry["region"]
+		var tex = AtlasTexture.new()
+		tex.atlas = load(entry["atlas"])
+		tex.region = Rect2(r[0], r[1], r[2], r[3])
+		_atlas_textures[path] = tex
+		return tex
+	if ResourceLoader.exists(path):
+		return load(path)
+	return null
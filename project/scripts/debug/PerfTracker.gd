@@ -80,7 +80,7 @@ func _init_logs() -> void:
 	_log_system_info()
 
 # Schema version for log format compatibility
-const LOG_SCHEMA_VERSION: int = 2
+const LOG_SCHEMA_VERSION: int = 3  # v3: minute_report.frame_time_sketch + stutter
 
 func _log_system_info() -> void:
 	var info = {
@@ -113,6 +113,8 @@ func _process(delta: float) -> void:
 	counters["physics_time_ms"] = Performance.get_monitor(Performance.TIME_PHYSICS_PROCESS) * 1000.0
 	counters["node_count"] = get_tree().get_node_count()
 	
+	_record_frame_time(frame_time_ms, now)
+	
 	# 2. Check for Spikes
 	if log_spikes and frame_time_ms > frame_time_threshold_ms:
 		if now - _last_spike_time > spike_cooldown_ms:
@@ -456,6 +458,11 @@ func _aggregate_minute_metrics() -> void:
 		}
 	}
 	
+	# Percentiles de frame time (todos los frames, no solo los samples)
+	var ft_sketch = _take_frame_time_sketch()
+	report["frame_time_sketch"] = ft_sketch.sketch
+	report["stutter"] = ft_sketch.stutter
+	
 	# Agregar stats de subsistemas si están disponibles
 	if ProjectilePool and ProjectilePool.instance:
 		report["projectile_pool"] = ProjectilePool.instance.get_stats()
@@ -475,6 +482,91 @@ func _aggregate_minute_metrics() -> void:
 	_append_to_log(report)
 	_minute_samples.clear()
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# FRAME TIME SKETCH (percentiles per minute — decoded by tools/analyze_perf.py)
+# ═══════════════════════════════════════════════════════════════════════════════
+# Every frame goes into a log-bucketed histogram: bucket k holds frame times in
+# (gamma^(k-1), gamma^k], so any percentile read back from it is within
+# SKETCH_RELATIVE_ACCURACY of the true value. Memory is bounded by the bucket
+# count (~350 for 1ms..1s), and sketches from different minutes or runs merge
+# by adding bucket counts.
+
+const SKETCH_RELATIVE_ACCURACY: float = 0.01
+const SKETCH_MIN_MS: float = 0.1
+const STUTTER_BUDGET_MS: float = 1000.0 / 60.0  # Steam Deck target, release_config.json
+const STUTTER_WINDOW_MS: int = 1000
+
+var _sketch_gamma: float = (1.0 + SKETCH_RELATIVE_ACCURACY) / (1.0 - SKETCH_RELATIVE_ACCURACY)
+var _sketch_log_gamma: float = log(_sketch_gamma)
+var _ft_buckets: Dictionary = {}
+var _ft_count: int = 0
+var _ft_sum: float = 0.0
+var _ft_min: float = INF
+var _ft_max: float = 0.0
+
+# Stutter: time spent over budget inside fixed 1s windows; keep the worst window
+var _stutter_window_start_ms: int = 0
+var _stutter_window_over_ms: float = 0.0
+var _stutter_window_frames_over: int = 0
+var _stutter_window_max_ms: float = 0.0
+var _stutter_worst: Dictionary = {}
+
+func _record_frame_time(frame_time_ms: float, now_ms: int) -> void:
+	var ft = maxf(frame_time_ms, SKETCH_MIN_MS)
+	var k = int(ceil(log(ft) / _sketch_log_gamma))
+	_ft_buckets[k] = _ft_buckets.get(k, 0) + 1
+	_ft_count += 1
+	_ft_sum += frame_time_ms
+	_ft_min = minf(_ft_min, frame_time_ms)
+	_ft_max = maxf(_ft_max, frame_time_ms)
+
+	if now_ms - _stutter_window_start_ms >= STUTTER_WINDOW_MS:
+		_close_stutter_window()
+		_stutter_window_start_ms = now_ms
+	if frame_time_ms > STUTTER_BUDGET_MS:
+		_stutter_window_over_ms += frame_time_ms - STUTTER_BUDGET_MS
+		_stutter_window_frames_over += 1
+	_stutter_window_max_ms = maxf(_stutter_window_max_ms, frame_time_ms)
+
+func _close_stutter_window() -> void:
+	if _stutter_window_over_ms > _stutter_worst.get("over_budget_ms", 0.0):
+		var start_ms = _stutter_window_start_ms - (_run_start_ticks_ms if _run_active else 0)
+		_stutter_worst = {
+			"over_budget_ms": snapped(_stutter_window_over_ms, 0.01),
+			"frames_over": _stutter_window_frames_over,
+			"max_frame_ms": snapped(_stutter_window_max_ms, 0.01),
+			"window_start_s": snapped(start_ms / 1000.0, 0.1)
+		}
+	_stutter_window_over_ms = 0.0
+	_stutter_window_frames_over = 0
+	_stutter_window_max_ms = 0.0
+
+func _take_frame_time_sketch() -> Dictionary:
+	"""Snapshot and reset the per-minute sketch and stutter window."""
+	_close_stutter_window()
+	var sketch = {
+		"relative_accuracy": SKETCH_RELATIVE_ACCURACY,
+		"gamma": _sketch_gamma,
+		"min_ms": SKETCH_MIN_MS,
+		"count": _ft_count,
+		"sum_ms": snapped(_ft_sum, 0.01),
+		"min": _ft_min if _ft_count > 0 else 0.0,
+		"max": _ft_max,
+		"buckets": _ft_buckets
+	}
+	var stutter = _stutter_worst.duplicate()
+	if stutter.is_empty():
+		stutter["over_budget_ms"] = 0.0  # clean minute: no frame over budget
+	stutter["budget_ms"] = STUTTER_BUDGET_MS
+	stutter["window_ms"] = STUTTER_WINDOW_MS
+	_ft_buckets = {}
+	_ft_count = 0
+	_ft_sum = 0.0
+	_ft_min = INF
+	_ft_max = 0.0
+	_stutter_worst = {}
+	return {"sketch": sketch, "stutter": stutter}
+
 func _array_avg(arr: Array) -> float:
 	if arr.is_empty():
 		return 0.0
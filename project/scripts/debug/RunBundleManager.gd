@@ -150,7 +150,7 @@ func finalize_bundle(context: Dictionary = {}) -> void:
 	# Generar summary.json
 	_generate_summary(context)
 
-	# Generar event_index.json (índice por tipo de evento para navegación rápida)
+	# Generar event_index.json (placeholder "pending"; tools/event_index.py lo completa offline)
 	# MUST run before integrity so integrity can verify the file exists
 	_generate_event_index()
 
@@ -576,57 +576,18 @@ func _verify_json_run_id(path: String) -> String:
 # ═══════════════════════════════════════════════════════════════════════════════
 
 func _generate_event_index() -> void:
-	"""Generate event_index.json — maps event_type to [{timestamp_ms, line}] for fast JSONL navigation."""
+	"""Write a pending event_index.json placeholder.
+	Re-reading and parsing every JSONL here caused a hitch on the game-over
+	screen. The real byte-offset index (event_type -> offsets) is built after
+	the run by tools/event_index.py, which replaces this placeholder."""
 	var index: Dictionary = {
-		"schema_version": 2,
+		"schema_version": 3,
 		"run_id": _run_id,
 		"generated_at": Time.get_datetime_string_from_system(),
+		"status": "pending",
+		"generator": "tools/event_index.py",
 		"sources": {}
 	}
-
-	# Index each JSONL file in the bundle
-	for tracker_name in ["audit", "balance"]:
-		var path = _bundle_paths.get(tracker_name, "")
-		if path == "" or not FileAccess.file_exists(path):
-			continue
-
-		var source_index: Dictionary = {}  # event_type -> Array of {timestamp_ms, line}
-		var file = FileAccess.open(path, FileAccess.READ)
-		if not file:
-			continue
-
-		var line_num: int = 0
-		while not file.eof_reached():
-			var line = file.get_line().strip_edges()
-			line_num += 1
-			if line.is_empty():
-				continue
-
-			var json = JSON.new()
-			if json.parse(line) != OK:
-				continue
-			var data = json.data
-			if data is Dictionary:
-				var event_type = str(data.get("event", "unknown"))
-				if not source_index.has(event_type):
-					source_index[event_type] = []
-				source_index[event_type].append({
-					"timestamp_ms": data.get("timestamp_ms", 0),
-					"line": line_num
-				})
-
-		file.close()
-
-		# Store summary per event type (count + first/last line)
-		var source_summary: Dictionary = {}
-		for event_type in source_index:
-			var entries = source_index[event_type]
-			source_summary[event_type] = {
-				"count": entries.size(),
-				"lines": entries,
-			}
-		index["sources"][tracker_name] = source_summary
-
 	_write_json(_current_bundle_dir.path_join("event_index.json"), index)
 
 # ═══════════════════════════════════════════════════════════════════════════════
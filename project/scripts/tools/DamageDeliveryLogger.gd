@@ -100,8 +100,10 @@ func get_discrepancies() -> Array:
 		
 	return discrepancies
 
-func save_report(path: String = "damage_delivery_discrepancies.json"):
-	var disc = get_discrepancies()
+func save_report(path: String = "damage_delivery_discrepancies.json", include_all: bool = false):
+	# include_all guarda todos los eventos (no solo discrepancias) para el
+	# análisis offline de tools/damage_delivery.py
+	var disc = _events if include_all else get_discrepancies()
 	if disc.is_empty():
 		print("✅ [DamageDelivery] No discrepancies found!")
 		return
@@ -109,4 +111,4 @@ func save_report(path: String = "damage_delivery_discrepancies.json"):
 	var file = FileAccess.open(path, FileAccess.WRITE)
 	if file:
 		file.store_string(JSON.stringify(disc, "\t"))
-		print("⚠️ [DamageDelivery] Saved %d discrepancies to %s" % [disc.size(), path])
+		print("⚠️ [DamageDelivery] Saved %d %s to %s" % [disc.size(), "events" if include_all else "discrepancies", path])
@@ -158,7 +158,7 @@ static func calculate_final_damage(
 			weapon_id = attacker.get_meta("weapon_id")
 		elif is_instance_valid(player) and player.has_meta("weapon_id"):
 			weapon_id = player.get_meta("weapon_id")
-		var id = logger.log_calculation("calc_event", target, int(result.final_damage), result.is_crit)
+		var id = logger.log_calculation(weapon_id, target, int(result.final_damage), result.is_crit)
 		target.set_meta("last_damage_event_id", id)
 
 	return result
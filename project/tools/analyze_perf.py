@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Frame-time percentiles from perf.jsonl.
+
+PerfTracker (log schema v3+) puts a log-bucketed frame-time sketch and the
+worst 1s stutter window in every minute_report. This tool decodes those
+sketches, merges them per run (and across runs), and reports p50 / p95 /
+p99 / p99.9 against the frame budget from release_config.json.
+
+Sketches are mergeable: bucket k counts frames in (gamma^(k-1), gamma^k], so
+adding bucket counts gives exactly the sketch of the combined frames, and
+every quantile read back is within the sketch's relative accuracy (1%).
+
+Logs written before schema v3 have no sketch; their minutes are listed with
+the sampled avg/max only and are left out of the percentiles.
+
+Usage:
+    python tools/analyze_perf.py <bundle_dir | perf.jsonl> [...]
+    python tools/analyze_perf.py --runs [RUNS_DIR]
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+
+from run_bundle import EventDispatcher, bundle_file_exists, default_runs_dir, find_bundles, read_json
+
+QUANTILES = (0.50, 0.95, 0.99, 0.999)
+DEFAULT_TARGET_FPS = 60
+RELEASE_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "release_config.json")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SKETCH
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class FrameTimeSketch:
+    """Log-bucketed quantile sketch, bucket-compatible with PerfTracker._record_frame_time."""
+
+    def __init__(self, relative_accuracy=0.01, min_ms=0.1):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.min_ms = min_ms
+        self.buckets = {}
+        self.count = 0
+        self.sum_ms = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    @classmethod
+    def from_report(cls, data):
+        """Build a sketch from a minute_report's frame_time_sketch dict."""
+        sketch = cls(data.get("relative_accuracy", 0.01), data.get("min_ms", 0.1))
+        # JSON object keys are strings; Godot may also write whole floats as "12.0"
+        sketch.buckets = {int(float(k)): int(v) for k, v in data.get("buckets", {}).items()}
+        sketch.count = int(data.get("count", sum(sketch.buckets.values())))
+        sketch.sum_ms = float(data.get("sum_ms", 0.0))
+        if sketch.count:
+            sketch.min = float(data.get("min", 0.0))
+            sketch.max = float(data.get("max", 0.0))
+        return sketch
+
+    def add(self, frame_time_ms, n=1):
+        k = math.ceil(math.log(max(frame_time_ms, self.min_ms)) / self.log_gamma)
+        self.buckets[k] = self.buckets.get(k, 0) + n
+        self.count += n
+        self.sum_ms += frame_time_ms * n
+        self.min = min(self.min, frame_time_ms)
+        self.max = max(self.max, frame_time_ms)
+
+    def merge(self, other):
+        if other.count == 0:
+            return self
+        if not math.isclose(other.gamma, self.gamma, rel_tol=1e-9):
+            raise ValueError(f"cannot merge sketches with gamma {self.gamma} and {other.gamma}")
+        for k, n in other.buckets.items():
+            self.buckets[k] = self.buckets.get(k, 0) + n
+        self.count += other.count
+        self.sum_ms += other.sum_ms
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def quantile(self, q):
+        """Frame time at quantile q (0..1), or None for an empty sketch."""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for k in sorted(self.buckets):
+            seen += self.buckets[k]
+            if seen > rank:
+                value = 2 * self.gamma ** k / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def fraction_over(self, threshold_ms):
+        """Share of frames slower than threshold_ms (bucket resolution)."""
+        if self.count == 0:
+            return 0.0
+        k_limit = math.ceil(math.log(max(threshold_ms, self.min_ms)) / self.log_gamma)
+        return sum(n for k, n in self.buckets.items() if k > k_limit) / self.count
+
+    @property
+    def mean(self):
+        return self.sum_ms / self.count if self.count else None
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PERF.JSONL ANALYSIS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def load_frame_budget_ms(path=RELEASE_CONFIG):
+    """Frame budget from release_config.json's Steam Deck target ("60 FPS @ 720p")."""
+    config = read_json(path) or {}
+    platforms = config.get("technical_specs", {}).get("platforms", {})
+    performance = platforms.get("steam_deck", {}).get("performance", "")
+    match = re.search(r"(\d+(?:\.\d+)?)\s*FPS", str(performance), re.IGNORECASE)
+    fps = float(match.group(1)) if match else DEFAULT_TARGET_FPS
+    return 1000.0 / fps
+
+class PerfAnalyzer:
+    """Per-minute and per-run frame-time statistics for one perf log."""
+
+    def __init__(self, run_id=None):
+        self.run_id = run_id
+        self.minutes = []
+        self.run_sketch = None
+        self.legacy_minutes = 0
+        self.spikes = 0
+        self.worst_spike = None
+        self.worst_stutter = None
+
+    def register(self, dispatcher):
+        dispatcher.on('minute_report', self._on_minute_report)
+        dispatcher.on('perf_spike', self._on_perf_spike)
+
+    def _wanted(self, e):
+        # session logs span several runs; bundle logs only hold one
+        return self.run_id is None or e.get('run_id') in (None, self.run_id)
+
+    def _on_minute_report(self, e):
+        if not self._wanted(e):
+            return
+        row = {"t_min": e.get('t_min', len(self.minutes) + 1),
+               "frame_time_ms": e.get('frame_time_ms', {}), "sketch": None, "stutter": None}
+        if 'frame_time_sketch' in e:
+            sketch = FrameTimeSketch.from_report(e['frame_time_sketch'])
+            row["sketch"] = sketch
+            if self.run_sketch is None:
+                self.run_sketch = FrameTimeSketch(sketch.relative_accuracy, sketch.min_ms)
+            self.run_sketch.merge(sketch)
+        else:
+            self.legacy_minutes += 1
+        stutter = e.get('stutter') or {}
+        if stutter.get('over_budget_ms') is not None:
+            row["stutter"] = stutter
+            if stutter['over_budget_ms'] > (self.worst_stutter or {}).get('over_budget_ms', 0):
+                self.worst_stutter = dict(stutter, t_min=row["t_min"])
+        self.minutes.append(row)
+
+    def _on_perf_spike(self, e):
+        if not self._wanted(e):
+            return
+        self.spikes += 1
+        if self.worst_spike is None or e.get('frame_time_ms', 0) > self.worst_spike.get('frame_time_ms', 0):
+            self.worst_spike = e
+
+    def summary(self, budget_ms):
+        """Plain dict of the run-level numbers (comparable across runs)."""
+        sketch = self.run_sketch
+        result = {"minutes": len(self.minutes), "legacy_minutes": self.legacy_minutes,
+                  "frames": sketch.count if sketch else 0, "budget_ms": budget_ms,
+                  "perf_spikes": self.spikes}
+        for q in QUANTILES:
+            result[_quantile_key(q)] = sketch.quantile(q) if sketch else None
+        result["mean_ms"] = sketch.mean if sketch else None
+        result["max_ms"] = sketch.max if sketch else None
+        result["over_budget_pct"] = 100 * sketch.fraction_over(budget_ms) if sketch else None
+        result["worst_stutter_ms"] = self.worst_stutter['over_budget_ms'] if self.worst_stutter else None
+        return result
+
+    def report(self, budget_ms):
+        print(f"\n--- FRAME TIME PER MINUTE (budget {budget_ms:.2f}ms) ---")
+        for row in self.minutes:
+            sketch = row["sketch"]
+            if sketch is None:
+                ft = row["frame_time_ms"]
+                print(f"  t={row['t_min']}min: (no sketch) sampled avg={ft.get('avg', 0):.2f} "
+                      f"max={ft.get('max', 0):.2f}")
+                continue
+            cells = "  ".join(f"{_quantile_key(q)}={_fmt(sketch.quantile(q))}" for q in QUANTILES)
+            stutter = row["stutter"] or {}
+            print(f"  t={row['t_min']}min: frames={sketch.count}  {cells}  max={sketch.max:.2f}  "
+                  f"over_budget={100 * sketch.fraction_over(budget_ms):.1f}%  "
+                  f"worst_1s={stutter.get('over_budget_ms', 0):.1f}ms")
+
+        s = self.summary(budget_ms)
+        print("\n--- RUN FRAME TIME ---")
+        if not s["frames"]:
+            print("  No frame_time_sketch in this log (PerfTracker schema < 3)")
+        else:
+            print(f"  frames={s['frames']}  mean={_fmt(s['mean_ms'])}  max={_fmt(s['max_ms'])}")
+            print("  " + "  ".join(f"{_quantile_key(q)}={_fmt(s[_quantile_key(q)])}" for q in QUANTILES))
+            verdict = "OK" if s["p99"] <= budget_ms else "OVER BUDGET"
+            print(f"  p99 vs {budget_ms:.2f}ms budget: {verdict}  ({s['over_budget_pct']:.2f}% of frames over)")
+        if self.legacy_minutes:
+            print(f"  {self.legacy_minutes} minute(s) without sketch excluded from percentiles")
+        if self.worst_stutter:
+            w = self.worst_stutter
+            print(f"  Worst stutter: {w['over_budget_ms']:.1f}ms over budget in 1s at t={w['t_min']}min "
+                  f"({w.get('frames_over', 0)} slow frames, max {w.get('max_frame_ms', 0):.1f}ms)")
+        print(f"  perf_spike events: {self.spikes}", end="")
+        if self.worst_spike:
+            print(f" (worst {self.worst_spike.get('frame_time_ms', 0):.1f}ms, "
+                  f"cause: {self.worst_spike.get('spike_cause', '?')})")
+        else:
+            print()
+
+def _quantile_key(q):
+    return "p" + f"{q * 100:g}".replace(".", "")
+
+def _fmt(value):
+    return "n/a" if value is None else f"{value:.2f}"
+
+def analyze_perf_log(path, run_id=None):
+    analyzer = PerfAnalyzer(run_id)
+    dispatcher = EventDispatcher()
+    analyzer.register(dispatcher)
+    if bundle_file_exists(path):
+        dispatcher.run_file(path)
+    return analyzer
+
+def resolve_perf_log(target):
+    """Accept a bundle folder or a perf JSONL file; return (path, label)."""
+    if os.path.isdir(target):
+        return os.path.join(target, "perf.jsonl"), os.path.basename(os.path.normpath(target))
+    return target, os.path.basename(target)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def report_runs(analyzers, budget_ms):
+    """One comparable line per run, plus all runs merged."""
+    print(f"\n--- RUNS (budget {budget_ms:.2f}ms) ---")
+    combined = None
+    for label, analyzer in analyzers:
+        s = analyzer.summary(budget_ms)
+        cells = "  ".join(f"{_quantile_key(q)}={_fmt(s[_quantile_key(q)])}" for q in QUANTILES)
+        stutter = "n/a" if s["worst_stutter_ms"] is None else f"{s['worst_stutter_ms']:.1f}ms"
+        print(f"  {label}: frames={s['frames']}  {cells}  worst_1s={stutter}")
+        if analyzer.run_sketch is not None:
+            if combined is None:
+                combined = FrameTimeSketch(analyzer.run_sketch.relative_accuracy, analyzer.run_sketch.min_ms)
+            combined.merge(analyzer.run_sketch)
+    if combined is not None and len(analyzers) > 1:
+        cells = "  ".join(f"{_quantile_key(q)}={_fmt(combined.quantile(q))}" for q in QUANTILES)
+        print(f"  ALL RUNS: frames={combined.count}  {cells}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Frame-time percentiles from PerfTracker logs.")
+    parser.add_argument("targets", nargs="*", help="bundle folders (run_<id>) or perf JSONL files")
+    parser.add_argument("--runs", nargs="?", const=default_runs_dir(), metavar="RUNS_DIR",
+                        help="compare every run_* bundle under RUNS_DIR (default: user://runs)")
+    parser.add_argument("--run-id", help="only use this run's events (for perf_session_*.jsonl logs)")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="frame budget (default: from release_config.json, Steam Deck target)")
+    parser.add_argument("--json", action="store_true", help="print run summaries as JSON")
+    args = parser.parse_args()
+
+    budget_ms = args.budget_ms or load_frame_budget_ms()
+    targets = list(args.targets)
+    if args.runs:
+        targets.extend(path for path, _meta in find_bundles(args.runs))
+    if not targets:
+        parser.error("no perf logs given (pass bundle folders, perf JSONL files or --runs)")
+
+    analyzers = []
+    for target in targets:
+        path, label = resolve_perf_log(target)
+        analyzers.append((label, analyze_perf_log(path, args.run_id)))
+
+    if args.json:
+        print(json.dumps({label: a.summary(budget_ms) for label, a in analyzers}, indent=2))
+        return
+    if len(analyzers) == 1:
+        print(f"PERF ANALYSIS: {analyzers[0][0]}")
+        analyzers[0][1].report(budget_ms)
+    else:
+        report_runs(analyzers, budget_ms)
+
+if __name__ == "__main__":
+    main()
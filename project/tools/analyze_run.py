@@ -1,58 +1,155 @@
 #!/usr/bin/env python3
-"""Analyze run data files for comprehensive report."""
+"""Analyze run data files for comprehensive report.
+
+Each bundle file is read once, as a stream: events are dispatched to the
+per-section analyzers below, which keep only the compact aggregates their
+report needs (counters, per-minute rows, first/last samples).
+"""
+import argparse
 import json
-import sys
 import os
-from collections import Counter, defaultdict
+import statistics
+import sys
+import time
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from run_bundle import (EventDispatcher, JsonlTail, bundle_file_exists, default_runs_dir, find_active_bundle,
+                        find_bundles, iter_jsonl, read_json)
 
 RUN_DIR = r"C:\Users\Usuario\AppData\Roaming\Godot\app_userdata\Loopialike\runs\run_698a09b3-453d"
 
-def load_jsonl(filename):
-    path = os.path.join(RUN_DIR, filename)
-    events = []
-    with open(path, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                try:
-                    events.append(json.loads(line))
-                except json.JSONDecodeError as ex:
-                    events.append({"_parse_error": str(ex), "_raw": line[:200]})
-    return events
-
-def analyze_audit():
-    print("=" * 60)
-    print("AUDIT.JSONL ANALYSIS")
-    print("=" * 60)
-    events = load_jsonl("audit.jsonl")
-    
-    # Event types
-    c = Counter(e.get('event', '_parse_error') for e in events)
-    print(f"\nTotal events: {len(events)}")
-    print("Event types:")
-    for k, v in c.most_common():
-        print(f"  {k}: {v}")
-    
-    # Parse errors
-    errors = [e for e in events if '_parse_error' in e]
-    if errors:
-        print(f"\nPARSE ERRORS: {len(errors)}")
-        for e in errors[:3]:
-            print(f"  {e['_parse_error']}")
-    
-    # Run start
-    for e in events:
-        if e.get('event') == 'run_start':
+def stream_bundle_file(run_dir, filename, *analyzers):
+    """Read one bundle file once, feeding every event to the given analyzers."""
+    dispatcher = EventDispatcher()
+    for analyzer in analyzers:
+        analyzer.register(dispatcher)
+    dispatcher.run_file(os.path.join(run_dir, filename))
+
+def _event_name(e):
+    return e.get('event', '').lower()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# AUDIT.JSONL
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class AuditAnalyzer:
+    def __init__(self):
+        self.types = Counter()
+        self.total = 0
+        self.error_count = 0
+        self.errors = []
+        self.run_start = None
+        self.run_end = None
+        self.snapshot_count = 0
+        self.snapshot_lines = []
+        self.last_enemies = []
+        self.levelup_lines = []
+        self.boss_lines = []
+        self.elite_lines = []
+        self.phase_lines = []
+        self.death_lines = []
+
+    def register(self, dispatcher):
+        dispatcher.on_any(self._on_any)
+        dispatcher.on('run_start', self._on_run_start)
+        dispatcher.on('run_end', self._on_run_end)
+        dispatcher.on('minute_snapshot', self._on_snapshot)
+        dispatcher.on('level_up', self._on_level_up)
+
+    def _on_any(self, e):
+        self.total += 1
+        self.types[e.get('event', '_parse_error')] += 1
+        if '_parse_error' in e:
+            self.error_count += 1
+            if len(self.errors) < 3:
+                self.errors.append(e['_parse_error'])
+
+        name = _event_name(e)
+        t = e.get('timestamp_ms', 0) / 1000
+        if 'boss' in name:
+            self.boss_lines.append(f"  {e.get('event')}: t={t:.0f}s, data={e.get('data', {})}")
+        if 'elite' in name:
+            self.elite_lines.append(f"  {e.get('event')}: t={t:.0f}s")
+        if 'phase' in name:
+            d = e.get('data', {})
+            self.phase_lines.append(f"  {e.get('event')}: t={t:.0f}s, phase={d.get('phase')}, "
+                                    f"current_wave={d.get('current_wave')}")
+        if 'death' in name or 'died' in name:
+            self.death_lines.append(f"  {e.get('event')}: t={t:.0f}s, data={json.dumps(e.get('data', {}), ensure_ascii=False)[:300]}")
+
+    def _on_run_start(self, e):
+        if self.run_start is None:
+            self.run_start = e
+
+    def _on_run_end(self, e):
+        if self.run_end is None:
+            self.run_end = e
+
+    def _on_snapshot(self, snap):
+        self.snapshot_count += 1
+        t = snap.get('t_min', '?')
+        d = snap.get('data', {})
+        ps = d.get('player_stats', {})
+        ws = d.get('weapons', [])
+        eco = d.get('economy', {})
+        perf = d.get('performance', d.get('peerformance', {}))
+
+        weapon_info = []
+        for w in ws:
+            wid = w.get('weapon_id', '?')
+            dps = w.get('dps_last_60s', 0)
+            weapon_info.append(f"{wid}({dps:.0f}dps)")
+
+        spike33 = perf.get('spikes_33ms', 0)
+        spike66 = perf.get('spikes_66ms', 0)
+
+        self.snapshot_lines.append(
+            f"  t={t}min: HP={ps.get('max_health')}, Spd={ps.get('move_speed')}, "
+            f"CritCh={ps.get('crit_chance')}, DmgMult={ps.get('damage_mult')}, "
+            f"Dodge={ps.get('dodge_chance')}, LifeStl={ps.get('life_steal')}, "
+            f"HPReg={ps.get('hp_regen')}, Armor={ps.get('armor')} | "
+            f"Weapons=[{', '.join(weapon_info)}] | "
+            f"Spikes33={spike33},66={spike66} | "
+            f"Fusions={eco.get('fusions', 0)}, Rerolls={eco.get('rerolls', 0)}, "
+            f"Chests={eco.get('chests', {})}")
+        self.last_enemies = d.get('enemies_dangerous', [])
+
+    def _on_level_up(self, lu):
+        d = lu.get('data', {})
+        self.levelup_lines.append(f"  Level {d.get('level')}: t={lu.get('timestamp_ms', 0)/1000:.0f}s, "
+                                  f"offered={d.get('offered_upgrades')}, chosen={d.get('chosen_upgrade')}")
+
+    def report(self):
+        print("=" * 60)
+        print("AUDIT.JSONL ANALYSIS")
+        print("=" * 60)
+
+        # Event types
+        print(f"\nTotal events: {self.total}")
+        print("Event types:")
+        for k, v in self.types.most_common():
+            print(f"  {k}: {v}")
+
+        # Parse errors
+        if self.error_count:
+            print(f"\nPARSE ERRORS: {self.error_count}")
+            for err in self.errors:
+                print(f"  {err}")
+
+        # Run start
+        e = self.run_start
+        if e is not None:
             print(f"\nRUN START:")
             print(f"  character: {e.get('character_id')}")
             print(f"  seed: {e.get('seed')}")
             print(f"  starting_weapons: {e.get('starting_weapons')}")
             print(f"  session: {e.get('session_id')}")
-            break
-    
-    # Run end
-    for e in events:
-        if e.get('event') == 'run_end':
+
+        # Run end
+        e = self.run_end
+        if e is not None:
             d = e.get('data', {})
             print(f"\nRUN END:")
             print(f"  time: {e.get('timestamp_ms', 0)/1000:.1f}s ({e.get('timestamp_ms', 0)/60000:.1f}min)")
@@ -66,292 +163,757 @@ def analyze_audit():
             print(f"  gold_earned: {d.get('gold_earned')}")
             print(f"  xp_total: {d.get('xp_total')}")
             print(f"  healing_done: {d.get('healing_done')}")
-            break
-    
-    # Minute snapshots analysis
-    snaps = [e for e in events if e.get('event') == 'minute_snapshot']
-    print(f"\nMINUTE SNAPSHOTS: {len(snaps)}")
-    
-    if snaps:
-        # Track stat progression
-        print("\n--- STAT PROGRESSION ---")
-        for snap in snaps:
-            t = snap.get('t_min', '?')
-            d = snap.get('data', {})
-            ps = d.get('player_stats', {})
-            ws = d.get('weapons', [])
-            eco = d.get('economy', {})
-            perf = d.get('performance', d.get('peerformance', {}))
-            
-            weapon_info = []
-            for w in ws:
-                wid = w.get('weapon_id', '?')
-                dps = w.get('dps_last_60s', 0)
-                weapon_info.append(f"{wid}({dps:.0f}dps)")
-            
-            spike33 = perf.get('spikes_33ms', 0)
-            spike66 = perf.get('spikes_66ms', 0)
-            
-            print(f"  t={t}min: HP={ps.get('max_health')}, Spd={ps.get('move_speed')}, "
-                  f"CritCh={ps.get('crit_chance')}, DmgMult={ps.get('damage_mult')}, "
-                  f"Dodge={ps.get('dodge_chance')}, LifeStl={ps.get('life_steal')}, "
-                  f"HPReg={ps.get('hp_regen')}, Armor={ps.get('armor')} | "
-                  f"Weapons=[{', '.join(weapon_info)}] | "
-                  f"Spikes33={spike33},66={spike66} | "
-                  f"Fusions={eco.get('fusions', 0)}, Rerolls={eco.get('rerolls', 0)}, "
-                  f"Chests={eco.get('chests', {})}")
-        
-        # Enemies analysis from last few snapshots
-        print("\n--- ENEMY THREATS (last snapshot) ---")
-        last = snaps[-1]
-        enemies = last.get('data', {}).get('enemies_dangerous', [])
-        for en in enemies:
-            atks = en.get('top_attacks', [])
-            atk_str = ', '.join(f"{a['attack_id']}({a['damage']}dmg/{a['hits']}hits)" for a in atks)
-            print(f"  {en.get('enemy_name')}: dmg_to_player={en.get('damage_to_player')}, "
-                  f"hits={en.get('hits_to_player')}, spawns={en.get('spawns')}, "
-                  f"kills_caused={en.get('kills_caused')} | attacks=[{atk_str}]")
-    
-    # Level up events
-    levelups = [e for e in events if e.get('event') == 'level_up']
-    print(f"\nLEVEL UP EVENTS: {len(levelups)}")
-    for lu in levelups:
-        d = lu.get('data', {})
-        print(f"  Level {d.get('level')}: t={lu.get('timestamp_ms', 0)/1000:.0f}s, "
-              f"offered={d.get('offered_upgrades')}, chosen={d.get('chosen_upgrade')}")
-    
-    # Boss/elite events
-    boss_events = [e for e in events if 'boss' in e.get('event', '').lower()]
-    elite_events = [e for e in events if 'elite' in e.get('event', '').lower()]
-    print(f"\nBOSS EVENTS: {len(boss_events)}")
-    for be in boss_events:
-        print(f"  {be.get('event')}: t={be.get('timestamp_ms',0)/1000:.0f}s, data={be.get('data',{})}")
-    print(f"ELITE EVENTS: {len(elite_events)}")
-    for ee in elite_events:
-        print(f"  {ee.get('event')}: t={ee.get('timestamp_ms',0)/1000:.0f}s")
-    
-    # Phase events
-    phase_events = [e for e in events if 'phase' in e.get('event', '').lower()]
-    print(f"\nPHASE EVENTS: {len(phase_events)}")
-    for pe in phase_events:
-        d = pe.get('data', {})
-        print(f"  {pe.get('event')}: t={pe.get('timestamp_ms',0)/1000:.0f}s, phase={d.get('phase')}, "
-              f"current_wave={d.get('current_wave')}")
-    
-    # Death/player events
-    death_events = [e for e in events if 'death' in e.get('event', '').lower() or 'died' in e.get('event', '').lower()]
-    print(f"\nDEATH EVENTS: {len(death_events)}")
-    for de in death_events:
-        print(f"  {de.get('event')}: t={de.get('timestamp_ms',0)/1000:.0f}s, data={json.dumps(de.get('data',{}), ensure_ascii=False)[:300]}")
-    
-    return events, snaps
-
-def analyze_balance():
-    print("\n" + "=" * 60)
-    print("BALANCE.JSONL ANALYSIS")
-    print("=" * 60)
-    events = load_jsonl("balance.jsonl")
-    
-    c = Counter(e.get('event', e.get('type', '_unknown')) for e in events)
-    print(f"\nTotal entries: {len(events)}")
-    print("Entry types:")
-    for k, v in c.most_common():
-        print(f"  {k}: {v}")
-    
-    # Parse errors
-    errors = [e for e in events if '_parse_error' in e]
-    if errors:
-        print(f"\nPARSE ERRORS: {len(errors)}")
-        for e in errors[:5]:
-            print(f"  {e['_parse_error']}")
-            print(f"  Raw: {e.get('_raw', '')[:100]}")
-    
-    # DPS tracking
-    dps_events = [e for e in events if 'dps' in e.get('event', '').lower() or 'weapon' in e.get('event', '').lower()]
-    if dps_events:
-        print(f"\nDPS/Weapon events: {len(dps_events)}")
-        # Show last few
-        for de in dps_events[-3:]:
-            print(f"  {json.dumps(de, ensure_ascii=False)[:200]}")
-    
-    # Difficulty/scaling events
-    diff_events = [e for e in events if 'difficulty' in e.get('event', '').lower() or 'scaling' in e.get('event', '').lower()]
-    if diff_events:
-        print(f"\nDifficulty/Scaling events: {len(diff_events)}")
-    
-    # Sample first and last entries
-    print(f"\n--- FIRST 3 ENTRIES ---")
-    for e in events[:3]:
-        print(f"  {json.dumps(e, ensure_ascii=False)[:300]}")
-    
-    print(f"\n--- LAST 3 ENTRIES ---")
-    for e in events[-3:]:
-        print(f"  {json.dumps(e, ensure_ascii=False)[:300]}")
-    
-    return events
-
-def analyze_upgrade_audit():
-    print("\n" + "=" * 60)
-    print("UPGRADE_AUDIT.JSONL ANALYSIS")
-    print("=" * 60)
-    events = load_jsonl("upgrade_audit.jsonl")
-    
-    c = Counter(e.get('event', e.get('type', '_unknown')) for e in events)
-    print(f"\nTotal entries: {len(events)}")
-    print("Entry types:")
-    for k, v in c.most_common():
-        print(f"  {k}: {v}")
-    
-    # Parse errors
-    errors = [e for e in events if '_parse_error' in e]
-    if errors:
-        print(f"\nPARSE ERRORS: {len(errors)}")
-        for e in errors[:5]:
-            print(f"  {e['_parse_error']}")
-    
-    # Upgrade selections
-    selections = [e for e in events if e.get('event') in ('upgrade_selected', 'upgrade_chosen', 'selection')]
-    applies = [e for e in events if e.get('event') in ('upgrade_applied', 'apply', 'applied')]
-    offers = [e for e in events if e.get('event') in ('upgrade_offered', 'offer', 'offered', 'level_up_options')]
-    
-    print(f"\nOffers: {len(offers)}, Selections: {len(selections)}, Applications: {len(applies)}")
-    
-    # Weapon upgrades
-    weapon_ups = [e for e in events if 'weapon' in json.dumps(e.get('data', e), ensure_ascii=False).lower() 
-                  and e.get('event') not in ('_parse_error',)]
-    
-    # Find unique upgrades taken
-    upgrades_taken = []
-    for e in events:
+
+        # Minute snapshots analysis
+        print(f"\nMINUTE SNAPSHOTS: {self.snapshot_count}")
+
+        if self.snapshot_count:
+            # Track stat progression
+            print("\n--- STAT PROGRESSION ---")
+            for line in self.snapshot_lines:
+                print(line)
+
+            # Enemies analysis from last snapshot
+            print("\n--- ENEMY THREATS (last snapshot) ---")
+            for en in self.last_enemies:
+                atks = en.get('top_attacks', [])
+                atk_str = ', '.join(f"{a['attack_id']}({a['damage']}dmg/{a['hits']}hits)" for a in atks)
+                print(f"  {en.get('enemy_name')}: dmg_to_player={en.get('damage_to_player')}, "
+                      f"hits={en.get('hits_to_player')}, spawns={en.get('spawns')}, "
+                      f"kills_caused={en.get('kills_caused')} | attacks=[{atk_str}]")
+
+        # Level up events
+        print(f"\nLEVEL UP EVENTS: {len(self.levelup_lines)}")
+        for line in self.levelup_lines:
+            print(line)
+
+        # Boss/elite events
+        print(f"\nBOSS EVENTS: {len(self.boss_lines)}")
+        for line in self.boss_lines:
+            print(line)
+        print(f"ELITE EVENTS: {len(self.elite_lines)}")
+        for line in self.elite_lines:
+            print(line)
+
+        # Phase events
+        print(f"\nPHASE EVENTS: {len(self.phase_lines)}")
+        for line in self.phase_lines:
+            print(line)
+
+        # Death/player events
+        print(f"\nDEATH EVENTS: {len(self.death_lines)}")
+        for line in self.death_lines:
+            print(line)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BALANCE.JSONL
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class BalanceAnalyzer:
+    def __init__(self):
+        self.types = Counter()
+        self.total = 0
+        self.error_count = 0
+        self.errors = []
+        self.dps_count = 0
+        self.dps_last = deque(maxlen=3)
+        self.diff_count = 0
+        self.first = []
+        self.last = deque(maxlen=3)
+
+    def register(self, dispatcher):
+        dispatcher.on_any(self._on_any)
+
+    def _on_any(self, e):
+        self.total += 1
+        self.types[e.get('event', e.get('type', '_unknown'))] += 1
+        if '_parse_error' in e:
+            self.error_count += 1
+            if len(self.errors) < 5:
+                self.errors.append(e)
+
+        name = _event_name(e)
+        if 'dps' in name or 'weapon' in name:
+            self.dps_count += 1
+            self.dps_last.append(e)
+        if 'difficulty' in name or 'scaling' in name:
+            self.diff_count += 1
+
+        if len(self.first) < 3:
+            self.first.append(e)
+        self.last.append(e)
+
+    def report(self):
+        print("\n" + "=" * 60)
+        print("BALANCE.JSONL ANALYSIS")
+        print("=" * 60)
+
+        print(f"\nTotal entries: {self.total}")
+        print("Entry types:")
+        for k, v in self.types.most_common():
+            print(f"  {k}: {v}")
+
+        # Parse errors
+        if self.error_count:
+            print(f"\nPARSE ERRORS: {self.error_count}")
+            for e in self.errors:
+                print(f"  {e['_parse_error']}")
+                print(f"  Raw: {e.get('_raw', '')[:100]}")
+
+        # DPS tracking
+        if self.dps_count:
+            print(f"\nDPS/Weapon events: {self.dps_count}")
+            # Show last few
+            for de in self.dps_last:
+                print(f"  {json.dumps(de, ensure_ascii=False)[:200]}")
+
+        # Difficulty/scaling events
+        if self.diff_count:
+            print(f"\nDifficulty/Scaling events: {self.diff_count}")
+
+        # Sample first and last entries
+        print(f"\n--- FIRST 3 ENTRIES ---")
+        for e in self.first:
+            print(f"  {json.dumps(e, ensure_ascii=False)[:300]}")
+
+        print(f"\n--- LAST 3 ENTRIES ---")
+        for e in self.last:
+            print(f"  {json.dumps(e, ensure_ascii=False)[:300]}")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# UPGRADE_AUDIT.JSONL
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class UpgradeAuditAnalyzer:
+    SELECTION_EVENTS = ('upgrade_selected', 'upgrade_chosen', 'selection')
+    APPLY_EVENTS = ('upgrade_applied', 'apply', 'applied')
+    OFFER_EVENTS = ('upgrade_offered', 'offer', 'offered', 'level_up_options')
+
+    def __init__(self):
+        self.types = Counter()
+        self.total = 0
+        self.error_count = 0
+        self.errors = []
+        self.selections = 0
+        self.applies = 0
+        self.offers = 0
+        self.upgrades_taken = Counter()
+        self.first = []
+        self.last = deque(maxlen=3)
+        self.anomalies = []
+
+    def register(self, dispatcher):
+        dispatcher.on_any(self._on_any)
+
+    def _on_any(self, e):
+        self.total += 1
+        self.types[e.get('event', e.get('type', '_unknown'))] += 1
+        if '_parse_error' in e:
+            self.error_count += 1
+            if len(self.errors) < 5:
+                self.errors.append(e['_parse_error'])
+
+        # Upgrade selections
+        event = e.get('event')
+        if event in self.SELECTION_EVENTS:
+            self.selections += 1
+        if event in self.APPLY_EVENTS:
+            self.applies += 1
+        if event in self.OFFER_EVENTS:
+            self.offers += 1
+
+        # Find unique upgrades taken
         data = e.get('data', e)
         chosen = data.get('chosen', data.get('chosen_upgrade', data.get('upgrade_id', None)))
         if chosen:
-            upgrades_taken.append(chosen)
-    
-    if upgrades_taken:
-        print(f"\nUpgrades taken ({len(upgrades_taken)}):")
-        uc = Counter(upgrades_taken)
-        for k, v in uc.most_common():
-            print(f"  {k}: {v}x")
-    
-    # Sample entries
-    print(f"\n--- FIRST 3 ENTRIES ---")
-    for e in events[:3]:
-        print(f"  {json.dumps(e, ensure_ascii=False)[:300]}")
-    
-    print(f"\n--- LAST 3 ENTRIES ---")
-    for e in events[-3:]:
-        print(f"  {json.dumps(e, ensure_ascii=False)[:300]}")
-    
-    # Check for anomalies
-    print("\n--- ANOMALY CHECK ---")
-    # Duplicate upgrades that shouldn't be duplicated
-    # Stats that go negative or unreasonable
-    for e in events:
-        data = e.get('data', e)
+            self.upgrades_taken[chosen] += 1
+
         # Check for negative values
         for key in ('value', 'amount', 'damage', 'hp'):
             val = data.get(key)
             if isinstance(val, (int, float)) and val < 0:
-                print(f"  NEGATIVE VALUE: {key}={val} in {e.get('event', '?')}")
-    
-    return events
+                self.anomalies.append(f"  NEGATIVE VALUE: {key}={val} in {e.get('event', '?')}")
+
+        if len(self.first) < 3:
+            self.first.append(e)
+        self.last.append(e)
 
-def analyze_detailed_snapshots(snaps):
+    def report(self):
+        print("\n" + "=" * 60)
+        print("UPGRADE_AUDIT.JSONL ANALYSIS")
+        print("=" * 60)
+
+        print(f"\nTotal entries: {self.total}")
+        print("Entry types:")
+        for k, v in self.types.most_common():
+            print(f"  {k}: {v}")
+
+        # Parse errors
+        if self.error_count:
+            print(f"\nPARSE ERRORS: {self.error_count}")
+            for err in self.errors:
+                print(f"  {err}")
+
+        print(f"\nOffers: {self.offers}, Selections: {self.selections}, Applications: {self.applies}")
+
+        if self.upgrades_taken:
+            print(f"\nUpgrades taken ({sum(self.upgrades_taken.values())}):")
+            for k, v in self.upgrades_taken.most_common():
+                print(f"  {k}: {v}x")
+
+        # Sample entries
+        print(f"\n--- FIRST 3 ENTRIES ---")
+        for e in self.first:
+            print(f"  {json.dumps(e, ensure_ascii=False)[:300]}")
+
+        print(f"\n--- LAST 3 ENTRIES ---")
+        for e in self.last:
+            print(f"  {json.dumps(e, ensure_ascii=False)[:300]}")
+
+        # Check for anomalies
+        print("\n--- ANOMALY CHECK ---")
+        # Stats that go negative or unreasonable
+        for line in self.anomalies:
+            print(line)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# DETAILED SNAPSHOT ANALYSIS (fed from the same audit.jsonl pass)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+GROWTH_STATS = ['max_health', 'move_speed', 'crit_chance', 'crit_damage', 'damage_mult',
+                'dodge_chance', 'life_steal', 'hp_regen', 'armor', 'damage_reduction', 'attack_speed_mult']
+
+class DetailedSnapshotAnalyzer:
     """Deeper analysis of minute snapshots for balance issues."""
-    print("\n" + "=" * 60)
-    print("DETAILED BALANCE ANALYSIS")
-    print("=" * 60)
-    
-    if not snaps:
-        print("No snapshots available")
-        return
-    
-    # Track stat growth over time
-    print("\n--- STAT GROWTH RATE ---")
-    first = snaps[0].get('data', {}).get('player_stats', {})
-    last = snaps[-1].get('data', {}).get('player_stats', {})
-    t_first = snaps[0].get('t_min', 1)
-    t_last = snaps[-1].get('t_min', 1)
-    duration = t_last - t_first if t_last > t_first else 1
-    
-    for stat in ['max_health', 'move_speed', 'crit_chance', 'crit_damage', 'damage_mult', 
-                 'dodge_chance', 'life_steal', 'hp_regen', 'armor', 'damage_reduction', 'attack_speed_mult']:
-        v_first = first.get(stat, 0)
-        v_last = last.get(stat, 0)
-        if isinstance(v_first, (int, float)) and isinstance(v_last, (int, float)):
-            delta = v_last - v_first
-            rate = delta / duration if duration > 0 else 0
-            flag = ""
-            # Flag potentially OP stats
-            if stat == 'dodge_chance' and v_last > 0.5: flag = " [!HIGH]"
-            if stat == 'life_steal' and v_last > 0.3: flag = " [!HIGH]"
-            if stat == 'damage_mult' and v_last > 3.0: flag = " [!HIGH]"
-            if stat == 'crit_chance' and v_last > 0.6: flag = " [!HIGH]"
-            if stat == 'move_speed' and v_last < 80: flag = " [!LOW - might feel sluggish]"
-            if stat == 'move_speed' and v_last > 400: flag = " [!HIGH - too fast?]"
-            print(f"  {stat}: {v_first} -> {v_last} (delta={delta:+.2f}, rate={rate:+.3f}/min){flag}")
-    
-    # DPS analysis over time
-    print("\n--- DPS PROGRESSION ---")
-    for snap in snaps:
+
+    def __init__(self):
+        self.count = 0
+        self.first_stats = {}
+        self.last_stats = {}
+        self.t_first = 1
+        self.t_last = 1
+        self.dps_rows = []
+        self.threat_rows = deque(maxlen=5)
+        self.perf_rows = []
+        self.spike_33_total = 0
+        self.spike_66_total = 0
+        self.economy_rows = []
+
+    def register(self, dispatcher):
+        dispatcher.on('minute_snapshot', self._on_snapshot)
+
+    def _on_snapshot(self, snap):
+        data = snap.get('data', {})
+        stats = data.get('player_stats', {})
+        if self.count == 0:
+            self.first_stats = stats
+            self.t_first = snap.get('t_min', 1)
+        self.last_stats = stats
+        self.t_last = snap.get('t_min', 1)
+        self.count += 1
+
         t = snap.get('t_min', 0)
-        weapons = snap.get('data', {}).get('weapons', [])
+
+        # DPS over time
+        weapons = data.get('weapons', [])
         total_dps = sum(w.get('dps_last_60s', 0) for w in weapons)
         total_dmg = sum(w.get('damage_total', 0) for w in weapons)
-        weapon_count = len(weapons)
-        print(f"  t={t}min: total_dps={total_dps:.1f}, total_dmg={total_dmg}, weapons={weapon_count}")
-    
-    # Enemy threat analysis
-    print("\n--- ENEMY THREAT EVOLUTION ---")
-    for snap in snaps[-5:]:
-        t = snap.get('t_min', 0)
-        enemies = snap.get('data', {}).get('enemies_dangerous', [])
-        total_dmg_to_player = sum(e.get('damage_to_player', 0) for e in enemies)
-        total_hits = sum(e.get('hits_to_player', 0) for e in enemies)
-        total_player_kills = sum(e.get('kills_caused', 0) for e in enemies)
-        print(f"  t={t}min: total_enemy_dmg={total_dmg_to_player}, total_hits={total_hits}, "
-              f"player_deaths_caused={total_player_kills}")
-    
-    # Performance analysis
-    print("\n--- PERFORMANCE ANALYSIS ---")
-    spike_33_total = 0
-    spike_66_total = 0
-    for snap in snaps:
-        t = snap.get('t_min', 0)
-        perf = snap.get('data', {}).get('performance', snap.get('data', {}).get('peerformance', {}))
+        self.dps_rows.append((t, total_dps, total_dmg, len(weapons)))
+
+        # Enemy threat
+        enemies = data.get('enemies_dangerous', [])
+        self.threat_rows.append((t,
+                                 sum(e.get('damage_to_player', 0) for e in enemies),
+                                 sum(e.get('hits_to_player', 0) for e in enemies),
+                                 sum(e.get('kills_caused', 0) for e in enemies)))
+
+        # Performance
+        perf = data.get('performance', data.get('peerformance', {}))
         s33 = perf.get('spikes_33ms', 0)
         s66 = perf.get('spikes_66ms', 0)
-        spike_33_total += s33
-        spike_66_total += s66
+        self.spike_33_total += s33
+        self.spike_66_total += s66
         if s33 > 0 or s66 > 0:
+            self.perf_rows.append((t, s33, s66))
+
+        # Economy
+        eco = data.get('economy', {})
+        chests = eco.get('chests', {})
+        self.economy_rows.append((t, eco.get('fusions', 0), eco.get('rerolls', 0),
+                                  chests.get('normal', 0), chests.get('elite', 0), chests.get('boss', 0)))
+
+    def report(self):
+        print("\n" + "=" * 60)
+        print("DETAILED BALANCE ANALYSIS")
+        print("=" * 60)
+
+        if not self.count:
+            print("No snapshots available")
+            return
+
+        # Track stat growth over time
+        print("\n--- STAT GROWTH RATE ---")
+        first = self.first_stats
+        last = self.last_stats
+        duration = self.t_last - self.t_first if self.t_last > self.t_first else 1
+
+        for stat in GROWTH_STATS:
+            v_first = first.get(stat, 0)
+            v_last = last.get(stat, 0)
+            if isinstance(v_first, (int, float)) and isinstance(v_last, (int, float)):
+                delta = v_last - v_first
+                rate = delta / duration if duration > 0 else 0
+                flag = ""
+                # Flag potentially OP stats
+                if stat == 'dodge_chance' and v_last > 0.5: flag = " [!HIGH]"
+                if stat == 'life_steal' and v_last > 0.3: flag = " [!HIGH]"
+                if stat == 'damage_mult' and v_last > 3.0: flag = " [!HIGH]"
+                if stat == 'crit_chance' and v_last > 0.6: flag = " [!HIGH]"
+                if stat == 'move_speed' and v_last < 80: flag = " [!LOW - might feel sluggish]"
+                if stat == 'move_speed' and v_last > 400: flag = " [!HIGH - too fast?]"
+                print(f"  {stat}: {v_first} -> {v_last} (delta={delta:+.2f}, rate={rate:+.3f}/min){flag}")
+
+        # DPS analysis over time
+        print("\n--- DPS PROGRESSION ---")
+        for t, total_dps, total_dmg, weapon_count in self.dps_rows:
+            print(f"  t={t}min: total_dps={total_dps:.1f}, total_dmg={total_dmg}, weapons={weapon_count}")
+
+        # Enemy threat analysis
+        print("\n--- ENEMY THREAT EVOLUTION ---")
+        for t, total_dmg_to_player, total_hits, total_player_kills in self.threat_rows:
+            print(f"  t={t}min: total_enemy_dmg={total_dmg_to_player}, total_hits={total_hits}, "
+                  f"player_deaths_caused={total_player_kills}")
+
+        # Performance analysis
+        print("\n--- PERFORMANCE ANALYSIS ---")
+        for t, s33, s66 in self.perf_rows:
             print(f"  t={t}min: spikes_33ms={s33}, spikes_66ms={s66}")
-    
-    if spike_33_total == 0 and spike_66_total == 0:
-        print("  No performance spikes detected - EXCELLENT")
+
+        if self.spike_33_total == 0 and self.spike_66_total == 0:
+            print("  No performance spikes detected - EXCELLENT")
+        else:
+            print(f"  TOTAL: spikes_33ms={self.spike_33_total}, spikes_66ms={self.spike_66_total}")
+
+        # Economy analysis
+        print("\n--- ECONOMY ANALYSIS ---")
+        for t, fusions, rerolls, normal, elite, boss in self.economy_rows:
+            print(f"  t={t}min: fusions={fusions}, rerolls={rerolls}, "
+                  f"chests(N={normal},E={elite},B={boss})")
+
+
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BATCH MODE — every run_* bundle under a runs/ directory
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class RunSummaryAnalyzer:
+    """Per-run aggregates that can be merged across bundles (plain picklable data)."""
+
+    def __init__(self):
+        self.death_cause = None
+        self.killed_by = None
+        self.audit_dps = {}
+        self.balance_dps = {}
+        self.spikes_33ms = 0
+        self.spikes_66ms = 0
+        self.upgrade_picks = Counter()
+        self.character = None
+
+    def register_audit(self, dispatcher):
+        dispatcher.on('run_start', self._on_run_start)
+        dispatcher.on('minute_snapshot', self._on_audit_snapshot)
+        dispatcher.on('player_death', self._on_player_death)
+        dispatcher.on('run_end', self._on_run_end)
+
+    def register_balance(self, dispatcher):
+        dispatcher.on('run_start', self._on_run_start)
+        dispatcher.on('minute_snapshot', self._on_balance_snapshot)
+        dispatcher.on('upgrade_pick', self._on_upgrade_pick)
+        dispatcher.on('run_end', self._on_run_end)
+
+    def _on_run_start(self, e):
+        if self.character is None:
+            self.character = e.get('character_id')
+
+    def _on_audit_snapshot(self, snap):
+        data = snap.get('data', {})
+        t = snap.get('t_min')
+        if isinstance(t, (int, float)):
+            self.audit_dps[int(t)] = sum(w.get('dps_last_60s', 0) for w in data.get('weapons', []))
+        # RunAuditTracker keeps run-cumulative spike counters: the last snapshot holds the total
+        perf = data.get('performance', data.get('peerformance', {}))
+        self.spikes_33ms = max(self.spikes_33ms, perf.get('spikes_33ms', 0))
+        self.spikes_66ms = max(self.spikes_66ms, perf.get('spikes_66ms', 0))
+
+    def _on_balance_snapshot(self, snap):
+        t = snap.get('t_min')
+        if isinstance(t, (int, float)):
+            self.balance_dps[int(round(t))] = snap.get('combat', {}).get('dps_est', 0)
+
+    def _on_player_death(self, e):
+        if self.death_cause is None:
+            self.death_cause = f"{e.get('killer', 'unknown')} / {e.get('killer_attack', 'unknown')}"
+
+    def _on_run_end(self, e):
+        if self.killed_by is None and e.get('killed_by'):
+            self.killed_by = e.get('killed_by')
+
+    def _on_upgrade_pick(self, e):
+        self.upgrade_picks[e.get('picked_id', 'unknown')] += 1
+
+def summarize_bundle(bundle_dir):
+    """Analyze one bundle into a small dict (runs inside a worker process)."""
+    meta = read_json(os.path.join(bundle_dir, 'meta.json')) or {}
+    summary = RunSummaryAnalyzer()
+    for filename, register in (("audit.jsonl", summary.register_audit),
+                               ("balance.jsonl", summary.register_balance)):
+        path = os.path.join(bundle_dir, filename)
+        if bundle_file_exists(path):
+            dispatcher = EventDispatcher()
+            register(dispatcher)
+            dispatcher.run_file(path)
+
+    death_cause = summary.death_cause
+    if death_cause is None:
+        killed_by = summary.killed_by or meta.get('killed_by')
+        death_cause = killed_by if killed_by else meta.get('end_reason', 'unknown')
+
+    return {
+        "run_id": meta.get('run_id', os.path.basename(bundle_dir)),
+        "character": summary.character or meta.get('character_id', 'unknown'),
+        "death_cause": death_cause,
+        "dps_curve": summary.audit_dps or summary.balance_dps,
+        "spikes_33ms": summary.spikes_33ms,
+        "spikes_66ms": summary.spikes_66ms,
+        "upgrade_picks": dict(summary.upgrade_picks),
+    }
+
+def merge_summaries(summaries):
+    """Fold per-run dicts into cross-run aggregates."""
+    merged = {
+        "runs": len(summaries),
+        "death_causes": Counter(),
+        "characters": Counter(),
+        "dps_by_minute": defaultdict(list),
+        "spikes_33ms": 0,
+        "spikes_66ms": 0,
+        "upgrade_picks": Counter(),
+        "upgrade_runs": Counter(),
+    }
+    for s in summaries:
+        merged["death_causes"][s["death_cause"]] += 1
+        merged["characters"][s["character"]] += 1
+        for t, dps in s["dps_curve"].items():
+            merged["dps_by_minute"][t].append(dps)
+        merged["spikes_33ms"] += s["spikes_33ms"]
+        merged["spikes_66ms"] += s["spikes_66ms"]
+        merged["upgrade_picks"].update(s["upgrade_picks"])
+        merged["upgrade_runs"].update(s["upgrade_picks"].keys())
+    return merged
+
+def analyze_batch(runs_dir, workers=None):
+    bundles = find_bundles(runs_dir)
+    print("LOOPIALIKE CROSS-RUN ANALYSIS")
+    print(f"Runs dir: {runs_dir}")
+    print(f"Bundles: {len(bundles)}")
+    if not bundles:
+        return
+
+    paths = [path for path, _meta in bundles]
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        summaries = list(pool.map(summarize_bundle, paths, chunksize=chunksize))
+
+    report_batch(merge_summaries(summaries))
+
+def report_batch(merged):
+    runs = merged["runs"]
+    print("\n" + "=" * 60)
+    print("DEATH CAUSES")
+    print("=" * 60)
+    for cause, n in merged["death_causes"].most_common():
+        print(f"  {cause}: {n} ({n / runs * 100:.0f}%)")
+
+    print("\nCharacters:")
+    for character, n in merged["characters"].most_common():
+        print(f"  {character}: {n}")
+
+    print("\n" + "=" * 60)
+    print("DPS CURVE (total weapon dps per minute, across runs)")
+    print("=" * 60)
+    for t in sorted(merged["dps_by_minute"]):
+        values = merged["dps_by_minute"][t]
+        print(f"  t={t}min: runs={len(values)}, mean={statistics.fmean(values):.1f}, "
+              f"median={statistics.median(values):.1f}, min={min(values):.1f}, max={max(values):.1f}")
+
+    print("\n" + "=" * 60)
+    print("PERFORMANCE SPIKES")
+    print("=" * 60)
+    print(f"  TOTAL: spikes_33ms={merged['spikes_33ms']}, spikes_66ms={merged['spikes_66ms']}")
+    print(f"  Per run: spikes_33ms={merged['spikes_33ms'] / runs:.1f}, spikes_66ms={merged['spikes_66ms'] / runs:.1f}")
+
+    print("\n" + "=" * 60)
+    print("UPGRADE PICKS")
+    print("=" * 60)
+    for upgrade_id, n in merged["upgrade_picks"].most_common():
+        print(f"  {upgrade_id}: {n}x (in {merged['upgrade_runs'][upgrade_id]}/{runs} runs)")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# LIVE FOLLOW — tail the bundle the game is writing right now
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class LiveDashboard:
+    """Running aggregates for --follow, updated one event at a time."""
+
+    def __init__(self):
+        self.t_min = 0
+        self.weapon_dps = {}
+        self.dps_history = deque(maxlen=10)
+        self.balance_dps = None
+        self.active_enemies = None
+        self.player_level = None
+        self.spikes_33ms = 0
+        self.spikes_66ms = 0
+        self.spikes_this_minute = 0
+        self.threat = []
+        self.damage_to_player = 0
+        self.upgrade_picks = 0
+        self.perf_spikes = 0
+        self.worst_frame_ms = 0.0
+        self.worst_spike_cause = ""
+        self.last_fps = None
+        self.death = None
+        self.ended = False
+
+    def register_audit(self, dispatcher):
+        dispatcher.on('minute_snapshot', self._on_audit_snapshot)
+        dispatcher.on('player_death', self._on_player_death)
+        dispatcher.on('run_end', self._on_run_end)
+
+    def register_balance(self, dispatcher):
+        dispatcher.on('minute_snapshot', self._on_balance_snapshot)
+        dispatcher.on('upgrade_pick', self._on_upgrade_pick)
+        dispatcher.on('run_end', self._on_run_end)
+
+    def register_perf(self, dispatcher):
+        dispatcher.on('perf_spike', self._on_perf_spike)
+        dispatcher.on('minute_report', self._on_minute_report)
+
+    def _on_audit_snapshot(self, snap):
+        data = snap.get('data', {})
+        self.t_min = max(self.t_min, snap.get('t_min', 0))
+        self.weapon_dps = {w.get('weapon_id', '?'): w.get('dps_last_60s', 0) for w in data.get('weapons', [])}
+        self.dps_history.append((snap.get('t_min', 0), sum(self.weapon_dps.values())))
+        perf = data.get('performance', data.get('peerformance', {}))
+        self.spikes_33ms = max(self.spikes_33ms, perf.get('spikes_33ms', 0))
+        self.spikes_66ms = max(self.spikes_66ms, perf.get('spikes_66ms', 0))
+        self.spikes_this_minute = perf.get('spikes_this_minute', 0)
+        enemies = data.get('enemies_dangerous', [])
+        self.damage_to_player = sum(e.get('damage_to_player', 0) for e in enemies)
+        self.threat = sorted(enemies, key=lambda e: e.get('damage_to_player', 0), reverse=True)[:3]
+
+    def _on_balance_snapshot(self, snap):
+        self.t_min = max(self.t_min, snap.get('t_min', 0))
+        combat = snap.get('combat', {})
+        self.balance_dps = combat.get('dps_est', self.balance_dps)
+        self.active_enemies = combat.get('active_enemies', self.active_enemies)
+        self.player_level = snap.get('player_level', self.player_level)
+
+    def _on_upgrade_pick(self, e):
+        self.upgrade_picks += 1
+
+    def _on_perf_spike(self, e):
+        self.perf_spikes += 1
+        frame_ms = e.get('frame_time_ms', 0)
+        if frame_ms > self.worst_frame_ms:
+            self.worst_frame_ms = frame_ms
+            self.worst_spike_cause = e.get('spike_cause', '')
+
+    def _on_minute_report(self, e):
+        self.last_fps = e.get('fps', {})
+
+    def _on_player_death(self, e):
+        self.death = f"{e.get('killer', 'unknown')} / {e.get('killer_attack', 'unknown')}"
+
+    def _on_run_end(self, e):
+        self.ended = True
+        if self.death is None and e.get('killed_by'):
+            self.death = e.get('killed_by')
+
+    def render(self, run_name):
+        lines = [f"LIVE RUN: {run_name}   t={self.t_min}min   {time.strftime('%H:%M:%S')}", "=" * 60]
+        dps = sum(self.weapon_dps.values())
+        lines.append(f"DPS (audit): {dps:.1f}   dps_est (balance): {self.balance_dps}   "
+                     f"level: {self.player_level}   enemies: {self.active_enemies}")
+        for weapon_id, weapon_dps in sorted(self.weapon_dps.items(), key=lambda kv: -kv[1]):
+            lines.append(f"  {weapon_id}: {weapon_dps:.1f}")
+        if self.dps_history:
+            lines.append("DPS trend: " + "  ".join(f"{t}m={v:.0f}" for t, v in self.dps_history))
+        lines.append(f"Spikes: 33ms={self.spikes_33ms} 66ms={self.spikes_66ms} "
+                     f"(this minute: {self.spikes_this_minute})   perf_spike events: {self.perf_spikes}")
+        if self.worst_frame_ms:
+            lines.append(f"  worst frame: {self.worst_frame_ms:.1f}ms ({self.worst_spike_cause})")
+        if self.last_fps:
+            lines.append(f"FPS last minute: avg={self.last_fps.get('avg', 0):.1f} min={self.last_fps.get('min', 0):.1f}")
+        lines.append(f"Threat: {self.damage_to_player} damage taken")
+        for enemy in self.threat:
+            lines.append(f"  {enemy.get('enemy_name', enemy.get('enemy_id', '?'))}: "
+                         f"dmg={enemy.get('damage_to_player', 0)} hits={enemy.get('hits_to_player', 0)}")
+        lines.append(f"Upgrades picked: {self.upgrade_picks}")
+        if self.death:
+            lines.append(f"DEATH: {self.death}")
+        if self.ended:
+            lines.append("RUN ENDED")
+        return "\n".join(lines)
+
+def _session_perf_log(runs_dir):
+    """Newest user://perf_logs/perf_session_*.jsonl (perf.jsonl is only copied at run end)."""
+    perf_dir = os.path.join(os.path.dirname(os.path.normpath(runs_dir)), 'perf_logs')
+    try:
+        logs = [e.path for e in os.scandir(perf_dir)
+                if e.name.startswith('perf_session_') and e.name.endswith('.jsonl')]
+    except OSError:
+        return None
+    return max(logs, key=os.path.getmtime) if logs else None
+
+def follow_run(bundle_dir=None, runs_dir=None, interval=2.0):
+    """Poll the bundle's logs and redraw the dashboard until the run ends.
+
+    Every file is read from its last checkpointed byte offset, so each poll
+    only decodes the lines appended since the previous one. An os.stat size
+    check per file is all an idle poll costs.
+    """
+    runs_dir = runs_dir or default_runs_dir()
+    if bundle_dir is None:
+        while True:
+            bundle_dir, _meta = find_active_bundle(runs_dir)
+            if bundle_dir:
+                break
+            print(f"Waiting for an active run under {runs_dir} ...", file=sys.stderr)
+            time.sleep(interval)
     else:
-        print(f"  TOTAL: spikes_33ms={spike_33_total}, spikes_66ms={spike_66_total}")
-    
-    # Economy analysis
-    print("\n--- ECONOMY ANALYSIS ---")
-    for snap in snaps:
-        t = snap.get('t_min', 0)
-        eco = snap.get('data', {}).get('economy', {})
-        chests = eco.get('chests', {})
-        print(f"  t={t}min: fusions={eco.get('fusions', 0)}, rerolls={eco.get('rerolls', 0)}, "
-              f"chests(N={chests.get('normal', 0)},E={chests.get('elite', 0)},B={chests.get('boss', 0)})")
+        runs_dir = os.path.dirname(os.path.normpath(bundle_dir))
+    meta = read_json(os.path.join(bundle_dir, 'meta.json')) or {}
+    run_id = meta.get('run_id')
+    run_name = os.path.basename(os.path.normpath(bundle_dir))
 
-if __name__ == "__main__":
+    dashboard = LiveDashboard()
+    feeds = []
+    for filename, register, only_this_run in (("audit.jsonl", dashboard.register_audit, False),
+                                              ("balance.jsonl", dashboard.register_balance, False)):
+        dispatcher = EventDispatcher()
+        register(dispatcher)
+        feeds.append((JsonlTail(os.path.join(bundle_dir, filename), dispatcher.event_types()),
+                      dispatcher, only_this_run))
+    perf_dispatcher = EventDispatcher()
+    dashboard.register_perf(perf_dispatcher)
+    perf_tail = None
+
+    is_tty = sys.stdout.isatty()
+    try:
+        while True:
+            if perf_tail is None and 'end_timestamp' not in meta:
+                perf_log = _session_perf_log(runs_dir)
+                if perf_log:
+                    perf_tail = JsonlTail(perf_log, perf_dispatcher.event_types())
+                    feeds.append((perf_tail, perf_dispatcher, True))
+            changed = False
+            for tail, dispatcher, only_this_run in feeds:
+                for e in tail.poll():
+                    # the session perf log spans several runs; keep this run's lines only
+                    if only_this_run and run_id and e.get('run_id') != run_id:
+                        continue
+                    dispatcher.dispatch(e)
+                    changed = True
+            if changed:
+                if is_tty:
+                    print("\x1b[2J\x1b[H", end="")
+                print(dashboard.render(run_name), flush=True)
+            meta = read_json(os.path.join(bundle_dir, 'meta.json')) or meta
+            if dashboard.ended or 'end_timestamp' in meta:
+                break
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def analyze_single(run_dir):
+    meta = read_json(os.path.join(run_dir, 'meta.json')) or {}
+    run_name = os.path.basename(os.path.normpath(run_dir))
     print("LOOPIALIKE RUN ANALYSIS")
-    print(f"Run: 698a09b3-453d")
-    print(f"Date: 2026-02-09")
+    print(f"Run: {run_name[4:] if run_name.startswith('run_') else run_name}")
+    print(f"Date: {str(meta.get('start_iso', '?'))[:10]}")
     print()
-    
-    audit_events, snaps = analyze_audit()
-    balance_events = analyze_balance()
-    upgrade_events = analyze_upgrade_audit()
-    analyze_detailed_snapshots(snaps)
-    
+
+    audit = AuditAnalyzer()
+    detailed = DetailedSnapshotAnalyzer()
+    stream_bundle_file(run_dir, "audit.jsonl", audit, detailed)
+    audit.report()
+
+    balance = BalanceAnalyzer()
+    stream_bundle_file(run_dir, "balance.jsonl", balance)
+    balance.report()
+
+    upgrades = UpgradeAuditAnalyzer()
+    stream_bundle_file(run_dir, "upgrade_audit.jsonl", upgrades)
+    upgrades.report()
+
+    detailed.report()
+
     print("\n" + "=" * 60)
     print("ANALYSIS COMPLETE")
     print("=" * 60)
+
+def dump_events(run_dir, events):
+    """Print the matching events of every bundle log as JSON lines."""
+    for filename in ("audit.jsonl", "balance.jsonl", "perf.jsonl", "upgrade_audit.jsonl"):
+        path = os.path.join(run_dir, filename)
+        if not bundle_file_exists(path):
+            continue
+        for e in iter_jsonl(path, events):
+            print(f"{filename}: {json.dumps(e, ensure_ascii=False)}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze Loopialike run bundles.")
+    parser.add_argument("run_dir", nargs="?", default=RUN_DIR,
+                        help="bundle folder (run_<id>) to analyze")
+    parser.add_argument("--batch", nargs="?", const=default_runs_dir(), metavar="RUNS_DIR",
+                        help="analyze every run_* bundle under RUNS_DIR in parallel "
+                             "(default: the game's user://runs)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes for --batch (default: all cores)")
+    parser.add_argument("--event", action="append", metavar="TYPE",
+                        help="only print events of this type (repeatable); non-matching "
+                             "lines are skipped before JSON decoding")
+    parser.add_argument("--follow", nargs="?", const="", metavar="BUNDLE_DIR",
+                        help="live dashboard of a run while the game writes it "
+                             "(default: the active bundle under user://runs)")
+    parser.add_argument("--interval", type=float, default=2.0,
+                        help="seconds between polls in --follow mode (default: 2)")
+    args = parser.parse_args()
+    if args.follow is not None and (args.batch is not None or args.event):
+        parser.error("--follow cannot be combined with --batch or --event")
+    if args.batch is not None and args.event:
+        parser.error("--event prints the events of one bundle; it cannot be combined with --batch")
+
+    if args.follow is not None:
+        follow_run(args.follow or None, interval=args.interval)
+    elif args.event:
+        dump_events(args.run_dir, args.event)
+    elif args.batch is not None:
+        analyze_batch(args.batch, args.workers)
+    else:
+        analyze_single(args.run_dir)
+
+if __name__ == "__main__":
+    main()
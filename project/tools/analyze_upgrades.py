@@ -1,65 +1,89 @@
+"""
+Quick report over an upgrade_audit.jsonl (UpgradeAuditor output).
+
+The file is read once: each event is checked against every section as it
+streams past, and only the lines to print are kept. For queries across all
+archived runs use tools/upgrade_index.py.
+
+Run: python tools/analyze_upgrades.py [upgrade_audit.jsonl]
+"""
 import json
+import sys
+from collections import Counter
 
-events = [json.loads(l) for l in open('upgrade_audit.jsonl', 'r', encoding='utf-8') if l.strip()]
+from run_bundle import iter_jsonl
 
-# Find glass cannon / borde muerte upgrades
-print("=== GLASS CANNON / BORDE DE LA MUERTE ===")
-for e in events:
+path = sys.argv[1] if len(sys.argv) > 1 else 'upgrade_audit.jsonl'
+
+glass_cannon = []
+armor = []
+max_health = []
+verdicts = []
+cats = Counter()
+negatives = []
+
+def _stat_change(e, c):
+    n = e.get('name', '?')
+    i = e.get('id', '?')
+    b = c.get('before', '?')
+    a = c.get('after', '?')
+    d = c.get('delta', '?')
+    s = c.get('status', '?')
+    return f"  {n} [{i}]: {b} -> {a} (delta={d}) status={s}"
+
+for e in iter_jsonl(path):
+    if '_parse_error' in e:
+        continue
+
+    # Glass cannon / borde muerte upgrades
     name = e.get('name', '')
     eid = e.get('id', '')
     if 'borde' in name.lower() or 'muerte' in name.lower() or 'glass' in eid.lower() or 'death' in eid.lower():
-        print(json.dumps(e, indent=2, ensure_ascii=False)[:600])
-        print('---')
+        glass_cannon.append(json.dumps(e, indent=2, ensure_ascii=False)[:600])
 
-# Find armor changes
-print("\n=== ARMOR CHANGES ===")
-for e in events:
-    checks = e.get('checks', [])
-    for c in checks:
+    # Armor / max_health changes and stats that went negative
+    for c in e.get('checks', []):
         if c.get('stat', '') == 'armor':
-            n = e.get('name', '?')
-            i = e.get('id', '?')
-            b = c.get('before', '?')
-            a = c.get('after', '?')
-            d = c.get('delta', '?')
-            s = c.get('status', '?')
-            print(f"  {n} [{i}]: {b} -> {a} (delta={d}) status={s}")
-
-# Find max_health changes
-print("\n=== MAX_HEALTH CHANGES ===")
-for e in events:
-    checks = e.get('checks', [])
-    for c in checks:
+            armor.append(_stat_change(e, c))
         if c.get('stat', '') == 'max_health':
-            n = e.get('name', '?')
-            i = e.get('id', '?')
-            b = c.get('before', '?')
-            a = c.get('after', '?')
-            d = c.get('delta', '?')
-            s = c.get('status', '?')
-            print(f"  {n} [{i}]: {b} -> {a} (delta={d}) status={s}")
-
-# Find any WARN or FAIL verdicts
-print("\n=== VERDICTS: WARN/FAIL ===")
-for e in events:
+            max_health.append(_stat_change(e, c))
+        after = c.get('after')
+        if isinstance(after, (int, float)) and after < 0:
+            negatives.append(f"  {e.get('name', '?')} [{e.get('id')}]: {c.get('stat')}={after}")
+
+    # WARN or FAIL verdicts
     v = e.get('verdict', 'OK')
     if v not in ('OK', None):
-        print(f"  {e.get('name', '?')} [{e.get('id')}]: verdict={v}")
+        verdicts.append(f"  {e.get('name', '?')} [{e.get('id')}]: verdict={v}")
         for c in e.get('checks', []):
             if c.get('status', 'OK') != 'OK':
-                print(f"    check={c.get('check')}: {c.get('detail', '')[:200]}")
+                verdicts.append(f"    check={c.get('check')}: {c.get('detail', '')[:200]}")
+
+    # Upgrade categories
+    if e.get('event') == 'upgrade_audit':
+        cats[e.get('category', 'unknown')] += 1
+
+print("=== GLASS CANNON / BORDE DE LA MUERTE ===")
+for text in glass_cannon:
+    print(text)
+    print('---')
+
+print("\n=== ARMOR CHANGES ===")
+for line in armor:
+    print(line)
+
+print("\n=== MAX_HEALTH CHANGES ===")
+for line in max_health:
+    print(line)
+
+print("\n=== VERDICTS: WARN/FAIL ===")
+for line in verdicts:
+    print(line)
 
-# Count upgrade categories
-from collections import Counter
-cats = Counter(e.get('category', 'unknown') for e in events if e.get('event') == 'upgrade_audit')
 print(f"\n=== UPGRADE CATEGORIES ===")
 for k, v in cats.most_common():
     print(f"  {k}: {v}")
 
-# Stats that went negative
 print("\n=== NEGATIVE STAT VALUES ===")
-for e in events:
-    for c in e.get('checks', []):
-        after = c.get('after')
-        if isinstance(after, (int, float)) and after < 0:
-            print(f"  {e.get('name', '?')} [{e.get('id')}]: {c.get('stat')}={after}")
+for line in negatives:
+    print(line)
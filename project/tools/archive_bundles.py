@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Compress old run bundles in place, keeping them readable by every tool.
+
+Each *.jsonl log of a finalized bundle is replaced by a block-compressed
+copy (<name>.jsonl.gz, or .xz with --codec xz): the log is cut at line
+boundaries into blocks of --block-kb, and every block is written as its own
+gzip member / xz stream. archive.json in the bundle records, per log, the
+original size, mtime and sha256 plus the block list
+[raw_offset, compressed_offset, compressed_length].
+
+run_bundle reads these files transparently (iter_jsonl, open_bundle_file),
+and the byte offsets in event_index.json keep working: a seek only
+decompresses the block it lands in. The index is built before compressing,
+and the original (size, mtime_ns) is kept, so caches keyed on it stay fresh.
+zcat / xzcat still see one plain stream.
+
+Every archive is decompressed and checked against the original sha256
+before the original is removed.
+
+Usage:
+    python tools/archive_bundles.py archive [RUNS_DIR] [--older-than DAYS] [--codec gz|xz] [--level N]
+                                            [--block-kb KB] [--workers N] [--dry-run]
+    python tools/archive_bundles.py restore [RUNS_DIR | BUNDLE_DIR ...]
+    python tools/archive_bundles.py status [RUNS_DIR]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import lzma
+import os
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+from event_index import ensure_event_index
+from run_bundle import (ARCHIVE_CODECS, ARCHIVE_MANIFEST, archive_manifest, default_runs_dir,
+                        find_bundles, iter_bundle_lines)
+
+MANIFEST_VERSION = 1
+DEFAULT_BLOCK_KB = {"gz": 256, "xz": 1024}
+DEFAULT_LEVEL = {"gz": 6, "xz": 6}
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# COMPRESS / RESTORE ONE LOG
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _compressor(codec, level):
+    if codec == "gz":
+        return lambda data: gzip.compress(data, compresslevel=level, mtime=0)
+    return lambda data: lzma.compress(data, preset=level)
+
+def compress_log(path, codec, level, block_size):
+    """Write <path>.<codec>.tmp and return its manifest entry (without renaming anything)."""
+    compress = _compressor(codec, level)
+    archive = f"{path}.{codec}"
+    sha = hashlib.sha256()
+    blocks = []
+    raw_offset = 0
+    with open(path, 'rb') as src, open(archive + ".tmp", 'wb') as dst:
+        pending = b""
+        while True:
+            chunk = src.read(block_size)
+            data = pending + chunk
+            if chunk:
+                cut = data.rfind(b"\n") + 1
+                if cut == 0:  # a line longer than the block: keep reading
+                    pending = data
+                    continue
+                block, pending = data[:cut], data[cut:]
+            else:
+                block, pending = data, b""
+            if block:
+                packed = compress(block)
+                blocks.append([raw_offset, dst.tell(), len(packed)])
+                dst.write(packed)
+                sha.update(block)
+                raw_offset += len(block)
+            if not chunk:
+                break
+        compressed_size = dst.tell()
+    return {"archive": os.path.basename(archive), "codec": codec, "size": raw_offset,
+            "compressed_size": compressed_size, "sha256": sha.hexdigest(), "blocks": blocks}
+
+def check_archive(archive, entry):
+    """True if the archive decompresses to exactly the recorded bytes."""
+    decompress = ARCHIVE_CODECS["." + entry["codec"]]
+    sha = hashlib.sha256()
+    size = 0
+    try:
+        with open(archive, 'rb') as f:
+            for raw_offset, comp_offset, comp_length in entry["blocks"]:
+                f.seek(comp_offset)
+                block = decompress(f.read(comp_length))
+                if raw_offset != size:
+                    return False
+                sha.update(block)
+                size += len(block)
+    except (OSError, EOFError, ValueError, lzma.LZMAError, zlib.error):
+        return False
+    return size == entry["size"] and sha.hexdigest() == entry["sha256"]
+
+def _write_manifest(bundle_dir, manifest):
+    path = os.path.join(bundle_dir, ARCHIVE_MANIFEST)
+    if not manifest["files"]:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BUNDLES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _finished_at(bundle_dir, meta):
+    end = meta.get("end_timestamp")
+    if isinstance(end, (int, float)) and end > 0:
+        return float(end)
+    return os.stat(os.path.join(bundle_dir, "meta.json")).st_mtime
+
+def archive_bundle(args):
+    """Compress every plain *.jsonl of one bundle. Returns (name, raw bytes, compressed bytes, error)."""
+    bundle_dir, codec, level, block_size = args
+    name = os.path.basename(bundle_dir)
+    try:
+        ensure_event_index(bundle_dir)
+        manifest = dict(archive_manifest(bundle_dir)) or {"schema_version": MANIFEST_VERSION, "files": {}}
+        manifest["files"] = dict(manifest.get("files", {}))
+        raw_total = packed_total = 0
+        for log in sorted(n for n in os.listdir(bundle_dir) if n.endswith(".jsonl")):
+            path = os.path.join(bundle_dir, log)
+            st = os.stat(path)
+            entry = compress_log(path, codec, level, block_size)
+            archive = os.path.join(bundle_dir, entry["archive"])
+            if entry["size"] != st.st_size or not check_archive(archive + ".tmp", entry):
+                os.remove(archive + ".tmp")
+                return name, raw_total, packed_total, f"{log}: archive did not verify (file changed while reading?)"
+            entry["mtime_ns"] = st.st_mtime_ns
+            os.replace(archive + ".tmp", archive)
+            manifest["files"][log] = entry
+            _write_manifest(bundle_dir, manifest)
+            os.remove(path)
+            raw_total += entry["size"]
+            packed_total += entry["compressed_size"]
+        return name, raw_total, packed_total, None
+    except OSError as ex:
+        return name, 0, 0, str(ex)
+
+def restore_bundle(bundle_dir):
+    """Decompress every archived log back to its original file and mtime."""
+    manifest = dict(archive_manifest(bundle_dir))
+    files = dict(manifest.get("files", {}))
+    restored = 0
+    for log, entry in sorted(files.items()):
+        path = os.path.join(bundle_dir, log)
+        archive = os.path.join(bundle_dir, entry["archive"])
+        if not os.path.exists(path):
+            with open(path + ".tmp", 'wb') as f:
+                for line in iter_bundle_lines(path):
+                    f.write(line)
+            if os.path.getsize(path + ".tmp") != entry["size"]:
+                os.remove(path + ".tmp")
+                raise OSError(f"{archive}: restored size does not match archive.json")
+            os.utime(path + ".tmp", ns=(entry["mtime_ns"], entry["mtime_ns"]))
+            os.replace(path + ".tmp", path)
+            restored += 1
+        del files[log]
+        manifest["files"] = files
+        _write_manifest(bundle_dir, manifest)
+        os.remove(archive)
+    return restored
+
+def bundle_usage(bundle_dir):
+    """(raw bytes, bytes on disk) of a bundle's logs."""
+    raw = disk = 0
+    entries = archive_manifest(bundle_dir).get("files", {})
+    for entry in entries.values():
+        raw += entry["size"]
+        disk += entry["compressed_size"]
+    for name in os.listdir(bundle_dir):
+        if name.endswith(".jsonl") and name not in entries:
+            size = os.path.getsize(os.path.join(bundle_dir, name))
+            raw += size
+            disk += size
+    return raw, disk
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _mb(n):
+    return f"{n / (1024 * 1024):.1f} MB"
+
+def cmd_archive(args):
+    codec = args.codec
+    level = args.level if args.level is not None else DEFAULT_LEVEL[codec]
+    block_size = (args.block_kb or DEFAULT_BLOCK_KB[codec]) * 1024
+    cutoff = time.time() - args.older_than * 86400
+    todo, skipped = [], 0
+    for bundle_dir, meta in find_bundles(args.runs_dir):
+        finalized = meta.get("end_timestamp") is not None
+        has_plain = any(n.endswith(".jsonl") for n in os.listdir(bundle_dir))
+        if not finalized or not has_plain or _finished_at(bundle_dir, meta) > cutoff:
+            skipped += 1
+            continue
+        todo.append(bundle_dir)
+    print(f"{len(todo)} bundle(s) to archive ({skipped} skipped: active, recent or already archived)")
+    if args.dry_run or not todo:
+        return 0
+
+    t0 = time.perf_counter()
+    raw_total = packed_total = failed = 0
+    jobs = [(bundle_dir, codec, level, block_size) for bundle_dir in todo]
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for name, raw, packed, error in pool.map(archive_bundle, jobs, chunksize=max(1, len(jobs) // 64)):
+            raw_total += raw
+            packed_total += packed
+            if error:
+                failed += 1
+                print(f"  {name}: {error}", file=sys.stderr)
+    elapsed = time.perf_counter() - t0
+    ratio = raw_total / packed_total if packed_total else 0.0
+    print(f"Archived {len(todo) - failed} bundle(s): {_mb(raw_total)} -> {_mb(packed_total)} "
+          f"({ratio:.1f}x) in {elapsed:.1f}s")
+    return 1 if failed else 0
+
+def cmd_restore(args):
+    targets = args.targets or [default_runs_dir()]
+    bundle_dirs = []
+    for target in targets:
+        if os.path.exists(os.path.join(target, "meta.json")):
+            bundle_dirs.append(target)
+        else:
+            bundle_dirs.extend(path for path, _meta in find_bundles(target))
+    restored = 0
+    for bundle_dir in bundle_dirs:
+        if archive_manifest(bundle_dir):
+            restored += restore_bundle(bundle_dir)
+    print(f"Restored {restored} log(s) in {len(bundle_dirs)} bundle(s)")
+    return 0
+
+def cmd_status(args):
+    raw_total = disk_total = archived = 0
+    bundles = find_bundles(args.runs_dir)
+    for bundle_dir, _meta in bundles:
+        raw, disk = bundle_usage(bundle_dir)
+        raw_total += raw
+        disk_total += disk
+        archived += bool(archive_manifest(bundle_dir))
+    ratio = raw_total / disk_total if disk_total else 0.0
+    print(f"{len(bundles)} bundle(s), {archived} archived")
+    print(f"  logs: {_mb(raw_total)} uncompressed, {_mb(disk_total)} on disk ({ratio:.1f}x)")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Block-compress old run bundles (transparently readable).")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("archive", help="compress the logs of finalized bundles")
+    p.add_argument("runs_dir", nargs="?", default=default_runs_dir())
+    p.add_argument("--older-than", type=float, default=7.0, metavar="DAYS",
+                   help="only bundles that ended at least this many days ago (default 7, 0 = all)")
+    p.add_argument("--codec", choices=("gz", "xz"), default="gz", help="gz (fast reads, default) or xz (smaller)")
+    p.add_argument("--level", type=int, default=None, help="compression level (default 6)")
+    p.add_argument("--block-kb", type=int, default=None,
+                   help="uncompressed block size in KiB (default 256 for gz, 1024 for xz)")
+    p.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    p.add_argument("--dry-run", action="store_true", help="only list what would be archived")
+    p.set_defaults(func=cmd_archive)
+
+    p = sub.add_parser("restore", help="decompress archived logs back to plain JSONL")
+    p.add_argument("targets", nargs="*", help="runs dir or bundle folders (default: user://runs)")
+    p.set_defaults(func=cmd_restore)
+
+    p = sub.add_parser("status", help="show compressed vs uncompressed log sizes")
+    p.add_argument("runs_dir", nargs="?", default=default_runs_dir())
+    p.set_defaults(func=cmd_status)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+if __name__ == "__main__":
+    main()
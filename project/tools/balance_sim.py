@@ -0,0 +1,818 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo balance simulator driven by the game's own data tables.
+
+Weapons, weapon level trees, upgrades, enemies, the XP curve, the difficulty
+curve and stat limits are read straight from the .gd sources (gd_const.py),
+so a balance edit is picked up without re-running the game. Thousands of
+runs are simulated at once as NumPy arrays: every step spawns enemies, spends
+the build's damage on them, applies contact damage, grants XP and resolves
+level-ups by drawing options the way LevelUpPanel does and picking one with a
+policy.
+
+The per-minute output uses the fields of BalanceTelemetry's minute_snapshot
+(progression.level, combat.dps_est, combat.kills_total, hp_max) so it can be
+put next to real bundles with --compare. Like the real dps_est, the simulated
+one is damage actually dealt, so it is capped by what spawned; build_dps is
+what the build would deal against a full screen (the spawn cap), uncapped.
+
+What is modelled / what is not:
+    - weapon stats, level trees, global stats (damage, attack speed,
+      projectiles, pierce, area, crit, chain), burn DoT, life steal
+    - max_health, regen, armor, dodge, damage_taken_mult, kill_heal, revives
+    - enemy spawn rate / cap, tier mix and difficulty scaling by minute
+    - upgrade options: tier weights by time and luck, max_stacks, uniques,
+      required/excluded weapon tags, the 30% cursed roll, weapon level-up
+      chance; one new weapon and one weapon level-up slot per panel
+    - NOT: elites, bosses, chests, fusions, rerolls, movement, knockback,
+      slows, conditional bonuses; stats outside MODELLED_STATS are ignored
+      (--explain lists them)
+Geometry (how many enemies a projectile reaches) is reduced to the density
+knobs in MODEL; tune them with --set against --compare.
+
+Usage:
+    python tools/balance_sim.py [--runs 100000] [--minutes 30] [--character frost_mage]
+                                [--policy greedy|dps|random] [--compare RUNS_DIR] [--json OUT]
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from gd_const import load_consts, parse_enums, project_root
+from run_bundle import bundle_file_exists, default_runs_dir, find_bundles, iter_jsonl
+
+# Tunable model constants (override with --set KEY=VALUE)
+MODEL = {
+    "accuracy": 0.8,            # share of shots that connect
+    "line_density": 0.02,       # extra enemies a piercing shot crosses per enemy alive
+    "area_density": 0.03,       # enemies inside an AOE of area 1.0, per enemy alive
+    "chain_density": 0.05,      # chain jumps that find a target, per enemy alive
+    "orbit_density": 0.02,      # share of time an orb touches an enemy, per enemy alive
+    "orbit_hit_interval": 0.5,  # OrbitalManager._hit_cooldown
+    "contact_fraction": 0.002,  # share of alive enemies within attack range of the player
+    "iframe_s": 0.4,            # BasePlayer._apply_dynamic_iframes base window...
+    "iframe_density_s": 0.02,   # ...plus this per enemy in range, up to +0.10s
+    "revive_hp": 0.5,           # HP fraction restored by a revive
+    "survival_weight": 0.5,     # greedy policy: weight of log(EHP) against log(DPS)
+    "regen_horizon_s": 10.0,    # greedy policy: seconds of regen counted as EHP
+    "global_share": 3.0 / 7.0,  # LevelUpPanel asks 3 global + 4 player upgrades
+    "cursed_chance": 0.3,       # UpgradeDatabase.get_random_player_upgrades
+    "draw_attempts": 6,
+}
+
+MODELLED_STATS = [
+    "max_health", "health_regen", "armor", "dodge_chance", "damage_taken_mult", "life_steal",
+    "kill_heal", "revives", "damage_mult", "damage_flat", "attack_speed_mult", "cooldown_mult",
+    "area_mult", "extra_projectiles", "extra_pierce", "chain_count", "crit_chance", "crit_damage",
+    "xp_mult", "luck",
+]
+S = {name: i for i, name in enumerate(MODELLED_STATS)}
+DOT_EFFECTS = ("burn", "poison", "bleed")
+# columns of GameData.w_table
+(W_DAMAGE, W_RATE, W_COUNT, W_AREA, W_CAP, W_CRIT, W_DOT, W_SPEED, W_CHAIN, W_ORBIT,
+ W_DENSITY, W_AREA_POW, W_COLUMNS) = range(13)
+QUANTILES = (10, 50, 90)
+BATCH_RUNS = 10000
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# GAME DATA
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class GameData:
+    """Arrays built from the .gd data tables, shared by every batch."""
+
+    def __init__(self, root=None):
+        root = root or project_root()
+
+        def consts(rel, **kwargs):
+            return load_consts(os.path.join(root, rel), **kwargs)
+
+        weapon_path = os.path.join(root, "scripts/data/WeaponDatabase.gd")
+        wdb = load_consts(weapon_path)
+        with open(weapon_path, 'r', encoding='utf-8') as f:
+            enums = parse_enums(f.read())
+        udb = consts("scripts/data/UpgradeDatabase.gd")
+        wud = consts("scripts/data/WeaponUpgradeDatabase.gd")
+        edb = consts("scripts/data/EnemyDatabase.gd")
+        self.characters = consts("scripts/data/CharacterDatabase.gd")["CHARACTERS"]
+        pstats = consts("scripts/core/PlayerStats.gd")
+        self.difficulty = consts("scripts/core/DifficultyManager.gd")
+        self.xp = consts("scripts/core/ExperienceManager.gd")
+        self.spawn = consts("scripts/core/EnemyManager.gd", exports=True)
+        self.base_options = consts("scripts/ui/LevelUpPanel.gd").get("BASE_OPTIONS", 4)
+        self.unmodelled = Counter()
+
+        self.base_stats = np.array([float(pstats["BASE_STATS"].get(s, 0.0)) for s in MODELLED_STATS])
+        limits = pstats.get("STAT_LIMITS", {})
+        self.stat_min = np.array([float(limits.get(s, {}).get("min", -np.inf)) for s in MODELLED_STATS])
+        self.stat_max = np.array([float(limits.get(s, {}).get("max", np.inf)) for s in MODELLED_STATS])
+
+        self._load_weapons(wdb, enums)
+        self._load_upgrades(udb, wud)
+        self._load_enemies(edb)
+        self._load_xp_curve()
+
+    # --- weapons -------------------------------------------------------------
+
+    def _load_weapons(self, wdb, enums):
+        kind_names = {v: k.split(".", 1)[1] for k, v in enums.items() if k.startswith("ProjectileType.")}
+        self.max_weapon_level = int(wdb.get("MAX_WEAPON_LEVEL", 8))
+        self.max_slots = int(wdb.get("MAX_WEAPON_SLOTS", 6))
+        self.weapon_ids = list(wdb["WEAPONS"])
+        tags = sorted({t for w in wdb["WEAPONS"].values() for t in w.get("tags", [])})
+        self.tag_bits = {t: 1 << i for i, t in enumerate(tags)}
+        W, L = len(self.weapon_ids), self.max_weapon_level + 1
+        # (weapon, level, W_*) with an extra all-zero weapon row for empty slots (-1)
+        self.w_table = np.zeros((W + 1, L, W_COLUMNS), dtype=np.float32)
+        self.w_tags = np.zeros(W, dtype=np.uint64)
+        reach = {"SINGLE": ("line_density", 0), "MULTI": ("line_density", 0), "BEAM": ("line_density", 1),
+                 "AOE": ("area_density", 2), "CHAIN": ("chain_density", 0), "ORBIT": ("orbit_density", 1)}
+
+        for wi, wid in enumerate(self.weapon_ids):
+            w = wdb["WEAPONS"][wid]
+            kind = kind_names.get(w.get("projectile_type"), "SINGLE")
+            kind = kind if kind in reach else "SINGLE"
+            self.w_tags[wi] = sum(self.tag_bits[t] for t in w.get("tags", []))
+            effect = w.get("effect", "none")
+            cooldown = float(w.get("cooldown", 1.0))
+            orbit = kind == "ORBIT" or cooldown <= 0
+            tree = wdb["WEAPON_SPECIFIC_UPGRADES"].get(wid, wdb["GENERIC_LEVEL_UPGRADES"])
+            dmg, rate, count, pierce, area = 1.0, 1.0, float(w.get("projectile_count", 1)), float(w.get("pierce", 0)), float(w.get("area", 1.0))
+            effect_mult, effect_add, crit = 1.0, 0.0, 0.0
+            value = float(w.get("effect_value", 0) or 0)
+            row = self.w_table[wi]
+            row[:, W_SPEED] = 0.0 if orbit else 1.0
+            row[:, W_ORBIT] = kind == "ORBIT"
+            row[:, W_CHAIN] = effect == "chain"
+            row[:, W_DENSITY] = MODEL[reach[kind][0]]
+            row[:, W_AREA_POW] = reach[kind][1]
+            for level in range(1, L):
+                up = tree.get(level, wdb["GENERIC_LEVEL_UPGRADES"].get(level, {})) if level > 1 else {}
+                all_mult = float(up.get("all_mult", 1.0))
+                dmg *= float(up.get("damage_mult", 1.0)) * all_mult
+                if orbit:
+                    dmg *= float(up.get("no_cooldown_damage_mult", 1.0))
+                    rate *= float(up.get("projectile_speed_mult", 1.0))
+                if effect in ("none", ""):
+                    dmg *= float(up.get("no_effect_damage_mult", 1.0))
+                rate *= float(up.get("attack_speed_mult", 1.0))
+                count += float(up.get("projectile_count_add", 0))
+                pierce += float(up.get("pierce_add", 0))
+                area *= float(up.get("area_mult", 1.0)) * all_mult
+                if pierce >= 999:
+                    area *= float(up.get("max_pierce_area_mult", 1.0))
+                effect_mult *= float(up.get("effect_mult", 1.0)) * all_mult
+                effect_add += float(up.get("effect_value_add", 0))
+                crit += float(up.get("crit_chance_add", 0.0))
+
+                row[level, W_DAMAGE] = float(w.get("damage", 0)) * dmg
+                row[level, W_RATE] = rate / (MODEL["orbit_hit_interval"] if orbit else cooldown)
+                row[level, W_COUNT] = count
+                row[level, W_AREA] = area
+                row[level, W_CAP] = value + effect_add if effect == "chain" else pierce
+                row[level, W_CRIT] = crit + (value * effect_mult if effect == "crit_chance" else 0.0)
+                if effect in DOT_EFFECTS:
+                    row[level, W_DOT] = value * effect_mult * float(w.get("effect_duration", 0.0))
+
+    # --- upgrades ------------------------------------------------------------
+
+    def _load_upgrades(self, udb, wud):
+        rows = [(0, u) for u in wud["GLOBAL_UPGRADES"].values()]
+        for table in ("DEFENSIVE_UPGRADES", "UTILITY_UPGRADES", "OFFENSIVE_UPGRADES", "CURSED_UPGRADES", "UNIQUE_UPGRADES"):
+            rows += [(1, dict(u, _table=table)) for u in udb.get(table, {}).values()]
+        U = len(rows)
+        self.upgrade_ids = [u.get("id", "?") for _src, u in rows]
+        self.u_source = np.array([src for src, _u in rows], dtype=np.int8)
+        self.u_tier = np.array([int(u.get("tier", 1)) for _src, u in rows], dtype=np.int8)
+        self.u_max = np.array([int(u.get("max_stacks", 1)) for _src, u in rows], dtype=np.int16)
+        self.u_cursed = np.array([u.get("_table") == "CURSED_UPGRADES" for _src, u in rows])
+        self.u_unique = np.array([bool(u.get("is_unique")) for _src, u in rows])
+        self.u_req = np.array([sum(self.tag_bits.get(t, 1 << 63) for t in u.get("required_tags", []))
+                               for _src, u in rows], dtype=np.uint64)
+        self.u_excl = np.array([sum(self.tag_bits.get(t, 0) for t in u.get("excluded_tags", []))
+                                for _src, u in rows], dtype=np.uint64)
+        # one extra neutral row, used for options that are not upgrades
+        self.u_add = np.zeros((U + 1, len(MODELLED_STATS)))
+        self.u_mul = np.ones((U + 1, len(MODELLED_STATS)))
+        self.u_set = np.full((U + 1, len(MODELLED_STATS)), np.nan)
+        for ui, (_src, u) in enumerate(rows):
+            for eff in u.get("effects", []):
+                stat, op, value = eff.get("stat"), eff.get("operation", "add"), eff.get("value", 0)
+                if stat not in S or not isinstance(value, (int, float)):
+                    self.unmodelled[stat] += 1
+                    continue
+                if op == "add":
+                    self.u_add[ui, S[stat]] += value
+                elif op == "multiply":
+                    self.u_mul[ui, S[stat]] *= value
+                elif op == "set":
+                    self.u_set[ui, S[stat]] = value
+                else:
+                    self.unmodelled[f"{stat} ({op})"] += 1
+
+        # (source, tier) -> slice of `u_order`, for vectorised draws inside a tier
+        self.u_order = np.lexsort((np.arange(U), self.u_tier, self.u_source))
+        self.u_start = np.zeros((2, 6), dtype=np.int64)
+        self.u_count = np.zeros((2, 6), dtype=np.int64)
+        for src in (0, 1):
+            for tier in range(1, 6):
+                members = np.nonzero((self.u_source[self.u_order] == src) & (self.u_tier[self.u_order] == tier))[0]
+                if len(members):
+                    self.u_start[src, tier], self.u_count[src, tier] = members[0], len(members)
+
+    # --- enemies / XP ----------------------------------------------------------
+
+    def _load_enemies(self, edb):
+        scaling = edb["TIER_SCALING"]
+        self.spawn_minute = {int(k): float(v) for k, v in edb["TIER_SPAWN_TIMES"].items()}
+        self.exp_base = float(edb.get("EXPONENTIAL_SCALING_BASE", 1.6))
+        self.tier_hp, self.tier_dmg, self.tier_xp, self.tier_cd = {}, {}, {}, {}
+        for tier in (1, 2, 3, 4):
+            enemies = list(edb.get(f"TIER_{tier}_ENEMIES", {}).values())
+            sc = scaling[tier]
+            for e in enemies:
+                # EnemyDatabase._prepare_enemy_data
+                if "damage_profile" in e:
+                    e["base_damage"] = int(edb["DAMAGE_PROFILES"].get(e["damage_profile"], 5) * sc["damage"])
+            mods = [e.get("modifiers", {}) for e in enemies]
+            self.tier_hp[tier] = np.mean([e["base_hp"] * sc["hp"] * m.get("hp", 1.0) for e, m in zip(enemies, mods)])
+            self.tier_dmg[tier] = np.mean([e["base_damage"] * sc["damage"] * m.get("damage", 1.0) for e, m in zip(enemies, mods)])
+            self.tier_xp[tier] = np.mean([e["base_xp"] * sc["xp"] for e in enemies])
+            self.tier_cd[tier] = np.mean([e.get("attack_cooldown", 1.5) for e in enemies])
+
+    def _load_xp_curve(self):
+        base = self.xp.get("XP_CURVE_BASE", 12.0)
+        growth = self.xp.get("XP_CURVE_GROWTH", 1.22)
+        linear = self.xp.get("XP_CURVE_LINEAR", 4.0)
+        levels = np.arange(1, 202)
+        # ExperienceManager.get_exp_for_level(L) == curve[L - 2], curve built from level = L - 1
+        need = np.floor(base * growth ** (levels - 2) + linear * (levels - 1) + 0.5)
+        self.exp_for_level = np.maximum(need, 8.0)
+        self.exp_for_level[:2] = 0.0  # index = level; level 1 needs nothing
+
+    # --- per-minute scalars ----------------------------------------------------
+
+    def difficulty_at(self, t):
+        """(hp_mult, damage_mult, count_mult, attack_speed_mult), DifficultyManager at minute t."""
+        d = self.difficulty
+        p1_end, p2_end, trans = d["PHASE_1_END"], d["PHASE_2_END"], d["PHASE_TRANSITION"]
+        p1_hp = (1 + d["P1_RATE_HP"]) ** p1_end
+        p1_dmg = (1 + d["P1_RATE_DAMAGE"]) ** p1_end
+        p1_spawn = (1 + d["P1_RATE_SPAWN"]) ** p1_end
+        p2_hp = p1_hp * (1 + d["P2_RATE_HP"]) ** (p2_end - p1_end)
+        p2_dmg = p1_dmg * (1 + d["P2_RATE_DAMAGE"]) ** (p2_end - p1_end)
+        p2_spawn = p1_spawn * (1 + d["P2_RATE_SPAWN"]) ** (p2_end - p1_end)
+        attack = (1 + d["P1_RATE_ATTACK_SPEED"]) ** t
+        if t < p1_end:
+            hp = (1 + d["P1_RATE_HP"]) ** t
+            dmg = (1 + d["P1_RATE_DAMAGE"]) ** t
+            count = (1 + d["P1_RATE_SPAWN"]) ** t
+        elif t < p2_end:
+            blend = _smoothstep(t, p1_end, p1_end + trans)
+            hp = _lerp((1 + d["P1_RATE_HP"]) ** t, p1_hp * (1 + d["P2_RATE_HP"]) ** (t - p1_end), blend)
+            dmg = _lerp((1 + d["P1_RATE_DAMAGE"]) ** t, p1_dmg * (1 + d["P2_RATE_DAMAGE"]) ** (t - p1_end), blend)
+            count = p1_spawn * (1 + d["P2_RATE_SPAWN"]) ** (t - p1_end)
+        else:
+            blend = _smoothstep(t, p2_end, p2_end + trans)
+            t3 = t - p2_end
+            hp = _lerp(p1_hp * (1 + d["P2_RATE_HP"]) ** (t - p1_end),
+                       p2_hp * (1 + d["P3_LOG_RATE_HP"] * math.log(1 + t3 / d["P3_LOG_SCALE_HP"])), blend)
+            dmg = _lerp(p1_dmg * (1 + d["P2_RATE_DAMAGE"]) ** (t - p1_end),
+                        p2_dmg * (1 + d["P3_LOG_RATE_DAMAGE"] * math.log(1 + t3 / d["P3_LOG_SCALE_DAMAGE"])), blend)
+            count = p2_spawn * (1 + d["P3_SPAWN_RATE"]) ** t3
+            attack = d["ATTACK_SPEED_CAP"]
+        return (min(hp, d["HP_SOFT_CAP"]), min(dmg, d["DAMAGE_SOFT_CAP"]),
+                min(count, d["SPAWN_CAP"]), min(attack, d["ATTACK_SPEED_CAP"]))
+
+    def enemy_at(self, t):
+        """Average (hp, damage, xp, attack_cooldown) of an enemy spawned at minute t."""
+        # EnemyManager._select_weighted_tier (time fallback of the zone-based tier)
+        weights = {1: 1.0, 2: 0.6, 3: 0.35, 4: 0.15}
+        if t > 20:
+            bonus = (t - 20) / 20.0
+            weights[2] = min(1.0, weights[2] + bonus * 0.5)
+            weights[3] = min(0.8, weights[3] + bonus * 0.4)
+            weights[4] = min(0.6, weights[4] + bonus * 0.3)
+        tiers = [tier for tier, start in self.spawn_minute.items() if t >= start and tier in self.tier_hp]
+        total = sum(weights[tier] for tier in tiers)
+        hp_mult, dmg_mult, _count, _attack = self.difficulty_at(t)
+        exp_scale = self.exp_base ** ((t - 20.0) / 5.0) if t > 20 else 1.0
+        mix = {tier: weights[tier] / total for tier in tiers}
+        hp = sum(p * self.tier_hp[tier] for tier, p in mix.items()) * exp_scale * hp_mult
+        dmg = sum(p * self.tier_dmg[tier] for tier, p in mix.items()) * exp_scale * dmg_mult
+        xp = sum(p * self.tier_xp[tier] for tier, p in mix.items()) * exp_scale
+        cd = sum(p * self.tier_cd[tier] for tier, p in mix.items())
+        return hp, dmg, xp, cd
+
+    def spawn_at(self, t):
+        """(spawns per second, max alive) from EnemyManager at minute t."""
+        rate = self.spawn["base_spawn_rate"] * (1.0 + t * self.spawn["spawn_rate_increase_per_minute"])
+        rate *= self.difficulty_at(t)[2]
+        minute = int(t)
+        cap = self.spawn["max_enemies"] + minute * self.spawn["max_enemies_increase_per_minute"]
+        if minute > 20:
+            cap += ((minute - 20) // 5) * 10
+        return rate, cap
+
+
+def _smoothstep(t, edge0, edge1):
+    if t <= edge0:
+        return 0.0
+    if t >= edge1:
+        return 1.0
+    x = (t - edge0) / (edge1 - edge0)
+    return x * x * (3.0 - 2.0 * x)
+
+def _lerp(a, b, w):
+    return a + (b - a) * w
+
+def global_tier_weights(t, luck):
+    """WeaponUpgradeDatabase._calculate_tier_weights, vectorised over luck."""
+    return _tier_weights(t, luck, [(3, [.80, .18, .02, 0, 0]), (8, [.50, .35, .13, .02, 0]),
+                                   (15, [.25, .35, .30, .09, .01]), (25, [.10, .25, .35, .25, .05])],
+                         [.05, .15, .30, .35, .15], 0.1, 0.3, (0.4, 0.4, 0.2))
+
+def player_tier_weights(t, luck):
+    """UpgradeDatabase._calculate_tier_weights, vectorised over luck."""
+    return _tier_weights(t, luck, [(3, [.75, .22, .03, 0, 0]), (8, [.45, .35, .17, .03, 0]),
+                                   (15, [.20, .35, .30, .13, .02]), (25, [.08, .22, .35, .27, .08])],
+                         [.03, .12, .30, .35, .20], 0.15, 0.4, (0.35, 0.40, 0.25))
+
+def _tier_weights(t, luck, bands, last, luck_rate, luck_cap, shares):
+    base = next((w for limit, w in bands if t < limit), last)
+    w = np.tile(np.array(base, dtype=float), (len(luck), 1))
+    factor = np.clip(luck * luck_rate, 0.0, luck_cap) * (luck > 0)
+    shift = (w[:, 0] + w[:, 1]) * factor
+    w[:, 0] *= 1.0 - factor
+    w[:, 1] *= 1.0 - factor * 0.5
+    for i, share in enumerate(shares):
+        w[:, 2 + i] += shift * share
+    return w
+
+def weapon_upgrade_chance(t, luck):
+    """LevelUpPanel._calculate_weapon_upgrade_chance."""
+    chance = 0.40 + min(t / 5.0 * 0.05, 0.15) + (0.10 if t >= 10.0 else 0.0) + np.minimum(luck * 0.10, 0.20)
+    return np.minimum(chance, 0.75)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SIMULATION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class Batch:
+    """State of `n` simulated runs of one character."""
+
+    def __init__(self, data, character, n, rng):
+        self.data, self.n, self.rng = data, n, rng
+        char = data.characters[character]
+        base = data.base_stats.copy()
+        for stat, value in char.get("stats", {}).items():
+            if stat in S:
+                base[S[stat]] = value
+        self.base = base
+        U = len(data.upgrade_ids)
+        self.add = np.zeros((n, len(MODELLED_STATS)))
+        self.mul = np.ones((n, len(MODELLED_STATS)))
+        self.setv = np.full((n, len(MODELLED_STATS)), np.nan)
+        self.owned = np.zeros((n, U), dtype=np.int16)
+        self.slot_w = np.full((n, data.max_slots), -1, dtype=np.int16)
+        self.slot_l = np.zeros((n, data.max_slots), dtype=np.int8)
+        self.slot_w[:, 0] = data.weapon_ids.index(char.get("starting_weapon", data.weapon_ids[0]))
+        self.slot_l[:, 0] = 1
+        self.stats = self.effective(self.add, self.mul, self.setv)
+        self.cache = self.dps_cache(self.stats, self.slot_w, self.slot_l)
+        self.hp = self.stats[:, S["max_health"]].copy()
+        self.revives_used = np.zeros(n)
+        self.alive = np.ones(n, dtype=bool)
+        self.level = np.ones(n, dtype=np.int32)
+        self.xp = np.zeros(n)
+        self.enemies = np.zeros(n)
+        self.enemy_hp = np.zeros(n)
+        self.kills = np.zeros(n)
+        self.picks = np.zeros(U + len(data.weapon_ids) + 1, dtype=np.int64)
+
+    def effective(self, add, mul, setv):
+        stats = (self.base + add) * mul
+        stats = np.where(np.isnan(setv), stats, setv)
+        return np.clip(stats, self.data.stat_min, self.data.stat_max)
+
+    def dps_cache(self, stats, slot_w, slot_l):
+        """Per-slot (damage per target per second, target cap, reach per enemy, is-orbit)."""
+        # empty slots are -1, which indexes the all-zero row at the end of the table
+        w = self.data.w_table[slot_w, slot_l]
+        stats = stats.astype(np.float32)  # the table is float32; halves the memory traffic
+        col = lambda name: stats[:, S[name]][:, None]
+        crit_p = np.clip(col("crit_chance") + w[..., W_CRIT], 0.0, 1.0)
+        hit = (w[..., W_DAMAGE] * col("damage_mult") + col("damage_flat")) * (1 + crit_p * (col("crit_damage") - 1))
+        hit += w[..., W_DOT] * col("damage_mult")
+        speed = 1.0 + w[..., W_SPEED] * (col("attack_speed_mult") / col("cooldown_mult") - 1.0)
+        count = w[..., W_COUNT] + col("extra_projectiles")
+        per_target = hit * w[..., W_RATE] * speed * count * MODEL["accuracy"]
+        cap = w[..., W_CAP] + np.where(w[..., W_CHAIN] > 0, col("chain_count"), col("extra_pierce"))
+        area = w[..., W_AREA] * col("area_mult")
+        density = w[..., W_DENSITY] * np.where(w[..., W_AREA_POW] >= 1, area, 1.0) \
+            * np.where(w[..., W_AREA_POW] >= 2, area, 1.0)
+        return per_target, cap, density, w[..., W_ORBIT] > 0
+
+    @staticmethod
+    def dps(cache, enemies):
+        per_target, cap, density, orbit = cache
+        reach = enemies[:, None] * density
+        targets = np.where(orbit, np.minimum(1.0, reach), 1.0 + np.minimum(cap, reach))
+        return (per_target * targets).sum(axis=1)
+
+    def step(self, t, dt, record):
+        d = self.data
+        hp_e, dmg_e, xp_e, cd_e = d.enemy_at(t)
+        rate, cap = d.spawn_at(t)
+        attack_mult = d.difficulty_at(t)[3]
+        live = self.alive
+        spawned = np.minimum(rate * dt, np.maximum(cap - self.enemies, 0.0)) * live
+        self.enemies += spawned
+        self.enemy_hp += spawned * hp_e
+
+        dealt = np.minimum(self.dps(self.cache, self.enemies) * dt, self.enemy_hp) * live
+        mean_hp = np.divide(self.enemy_hp, self.enemies, out=np.full(self.n, hp_e), where=self.enemies > 1e-9)
+        kills = np.minimum(dealt / mean_hp, self.enemies)
+        self.enemies -= kills
+        self.enemy_hp = np.maximum(self.enemy_hp - dealt, 0.0)
+        self.kills += kills
+
+        st = self.stats
+        # attacks arrive as a Poisson stream; i-frames after each hit make it a
+        # dead-time counter, so the hit rate saturates at 1 / iframe
+        near = self.enemies * MODEL["contact_fraction"]
+        iframe = MODEL["iframe_s"] + np.minimum(near * MODEL["iframe_density_s"], 0.10)
+        attacks = near * attack_mult / cd_e
+        hits = self.rng.poisson(attacks / (1.0 + attacks * iframe) * dt * live)
+        per_hit = np.maximum(1.0, dmg_e - st[:, S["armor"]]) * st[:, S["damage_taken_mult"]] \
+            * (1.0 - np.minimum(st[:, S["dodge_chance"]], 0.6))
+        heal = st[:, S["health_regen"]] * dt + st[:, S["life_steal"]] * dealt + st[:, S["kill_heal"]] * kills
+        max_hp = st[:, S["max_health"]]
+        self.hp = np.minimum(self.hp + (heal - hits * per_hit) * live, max_hp)
+
+        down = live & (self.hp <= 0)
+        if down.any():
+            revive = down & (self.revives_used < st[:, S["revives"]])
+            self.hp[revive] = max_hp[revive] * MODEL["revive_hp"]
+            self.revives_used[revive] += 1
+            dead = down & ~revive
+            self.alive[dead] = False
+            record["death_t"][dead] = t
+
+        self.xp += kills * xp_e * st[:, S["xp_mult"]] * live
+        record["dealt"] += dealt
+        while True:
+            up = np.nonzero(self.alive & (self.xp >= d.exp_for_level[np.minimum(self.level + 1, len(d.exp_for_level) - 1)]))[0]
+            if not len(up):
+                break
+            self.xp[up] -= d.exp_for_level[np.minimum(self.level[up] + 1, len(d.exp_for_level) - 1)]
+            self.level[up] += 1
+            self.level_up(up, t, dmg_e)
+
+    # --- level-up --------------------------------------------------------------
+
+    def level_up(self, idx, t, enemy_damage):
+        d, rng = self.data, self.rng
+        n, K = len(idx), d.base_options
+        U, W = len(d.upgrade_ids), len(d.weapon_ids)
+        opts = np.full((n, K), -1, dtype=np.int64)
+        luck = self.stats[idx, S["luck"]]
+        slot_w, slot_l = self.slot_w[idx], self.slot_l[idx]
+        rows = np.arange(n)
+        filled = np.zeros(n, dtype=np.int64)
+
+        # 1. a new weapon while a slot is free
+        owned_w = np.zeros((n, W), dtype=bool)
+        has = slot_w >= 0
+        owned_w[np.repeat(rows, slot_w.shape[1])[has.ravel()], slot_w[has]] = True
+        free = (~has).any(axis=1) & (~owned_w).any(axis=1)
+        pick = np.argmax(rng.random((n, W)) * ~owned_w, axis=1)
+        opts[free, 0] = U + pick[free]
+        filled += free
+
+        # 2. a weapon level-up, with LevelUpPanel's time/luck chance
+        upgradable = has & (slot_l < d.max_weapon_level)
+        offer = upgradable.any(axis=1) & (rng.random(n) < weapon_upgrade_chance(t, luck))
+        slot = np.argmax(rng.random(upgradable.shape) * upgradable, axis=1)
+        opts[rows[offer], filled[offer]] = U + W + slot[offer]
+        filled += offer
+
+        # 3. upgrades fill the remaining options
+        tags_any = np.bitwise_or.reduce(np.where(has, d.w_tags[np.where(has, slot_w, 0)], 0), axis=1)
+        tags_all = np.bitwise_and.reduce(np.where(has, d.w_tags[np.where(has, slot_w, 0)], ~np.uint64(0)), axis=1)
+        cursed_ok = rng.random(n) < MODEL["cursed_chance"]
+        gw, pw = global_tier_weights(t, luck), player_tier_weights(t, luck)
+        for c in range(K):
+            for _attempt in range(int(MODEL["draw_attempts"])):
+                need = np.nonzero((opts[:, c] < 0) & (filled <= c))[0]
+                if not len(need):
+                    break
+                src = (rng.random(len(need)) >= MODEL["global_share"]).astype(np.intp)
+                weights = np.where(src[:, None] == 0, gw[need], pw[need]) * (d.u_count[src, 1:] > 0)
+                cum = np.cumsum(weights, axis=1)
+                tier = 1 + np.argmax(cum > rng.random(len(need))[:, None] * cum[:, -1:], axis=1)
+                u = d.u_order[d.u_start[src, tier] + (rng.random(len(need)) * d.u_count[src, tier]).astype(np.int64)]
+                ok = (self.owned[idx[need], u] < d.u_max[u]) \
+                    & ((d.u_req[u] & tags_any[need]) == d.u_req[u]) & ((d.u_excl[u] & tags_all[need]) == 0) \
+                    & (~d.u_cursed[u] | cursed_ok[need]) & ~(opts[need] == u[:, None]).any(axis=1)
+                opts[need[ok], c] = u[ok]
+
+        choice = self.choose(idx, opts, enemy_damage)
+        picked = opts[rows, choice]
+        valid = picked >= 0
+        self.apply(idx[valid], picked[valid])
+
+    def candidate_state(self, idx, codes):
+        """(add, mul, setv, slot_w, slot_l) after applying option `codes` to runs `idx`."""
+        d = self.data
+        U, W = len(d.upgrade_ids), len(d.weapon_ids)
+        # non-upgrade codes map to the neutral row U of the effect tables
+        u = np.where((codes >= 0) & (codes < U), codes, U)
+        add, mul = self.add[idx] + d.u_add[u], self.mul[idx] * d.u_mul[u]
+        setv = np.where(np.isnan(d.u_set[u]), self.setv[idx], d.u_set[u])
+        slot_w, slot_l = self.slot_w[idx], self.slot_l[idx]
+        rows = np.arange(len(idx))
+        is_new = (codes >= U) & (codes < U + W)
+        free_slot = np.argmax(slot_w < 0, axis=1)
+        slot_w[rows[is_new], free_slot[is_new]] = codes[is_new] - U
+        slot_l[rows[is_new], free_slot[is_new]] = 1
+        is_lvl = codes >= U + W
+        slot_l[rows[is_lvl], codes[is_lvl] - U - W] += 1
+        return add, mul, setv, slot_w, slot_l
+
+    def choose(self, idx, opts, enemy_damage):
+        n, K = opts.shape
+        valid = opts >= 0
+        if self.policy == "random":
+            return np.argmax(self.rng.random((n, K)) * valid, axis=1)
+        flat_idx = np.repeat(idx, K)
+        add, mul, setv, slot_w, slot_l = self.candidate_state(flat_idx, opts.ravel())
+        stats = self.effective(add, mul, setv)
+        ref = np.maximum(self.enemies[flat_idx], 1.0)
+        score = np.log(np.maximum(self.dps(self.dps_cache(stats, slot_w, slot_l), ref), 1e-6))
+        if self.policy == "greedy":
+            per_hit = np.maximum(1.0, enemy_damage - stats[:, S["armor"]]) * stats[:, S["damage_taken_mult"]] \
+                * (1.0 - np.minimum(stats[:, S["dodge_chance"]], 0.6))
+            ehp = (stats[:, S["max_health"]] * (1 + stats[:, S["revives"]] * MODEL["revive_hp"])
+                   + stats[:, S["health_regen"]] * MODEL["regen_horizon_s"]) * enemy_damage / per_hit
+            score += MODEL["survival_weight"] * np.log(np.maximum(ehp, 1e-6))
+        score = np.where(valid.ravel(), score, -np.inf).reshape(n, K)
+        # ties (e.g. two options with no modelled effect) are broken at random
+        score += self.rng.random((n, K)) * 1e-9
+        return np.argmax(score, axis=1)
+
+    def apply(self, idx, codes):
+        if not len(idx):
+            return
+        d = self.data
+        U = len(d.upgrade_ids)
+        old_max = self.stats[idx, S["max_health"]]
+        self.add[idx], self.mul[idx], self.setv[idx], self.slot_w[idx], self.slot_l[idx] = \
+            self.candidate_state(idx, codes)
+        is_up = codes < U
+        np.add.at(self.owned, (idx[is_up], codes[is_up]), 1)
+        np.add.at(self.picks, np.minimum(codes, U + len(d.weapon_ids)), 1)
+        self.stats[idx] = self.effective(self.add[idx], self.mul[idx], self.setv[idx])
+        new_cache = self.dps_cache(self.stats[idx], self.slot_w[idx], self.slot_l[idx])
+        for full, part in zip(self.cache, new_cache):
+            full[idx] = part
+        new_max = self.stats[idx, S["max_health"]]
+        self.hp[idx] = np.minimum(self.hp[idx] + np.maximum(new_max - old_max, 0.0), new_max)
+
+
+def simulate_batch(args):
+    """Simulate one batch; returns per-minute arrays and pick counts."""
+    root, character, n, minutes, dt, policy, seed, overrides = args
+    MODEL.update(overrides)
+    data = _data(root)
+    rng = np.random.default_rng(seed)
+    batch = Batch(data, character, n, rng)
+    batch.policy = policy
+    fields = ("player_level", "dps_est", "build_dps", "kills_total", "hp_current", "hp_max", "alive")
+    out = {f: np.zeros((minutes, n), dtype=np.float32) for f in fields}
+    record = {"dealt": np.zeros(n), "death_t": np.full(n, np.nan)}
+    steps_per_min = max(1, int(round(60.0 / dt)))
+    dt = 60.0 / steps_per_min
+    for minute in range(minutes):
+        for k in range(steps_per_min):
+            batch.step(minute + k / steps_per_min, dt, record)
+        out["player_level"][minute] = batch.level
+        out["dps_est"][minute] = record["dealt"] / 60.0
+        out["build_dps"][minute] = batch.dps(batch.cache, np.full(n, float(data.spawn_at(minute)[1])))
+        out["kills_total"][minute] = batch.kills
+        out["hp_current"][minute] = np.maximum(batch.hp, 0.0)
+        out["hp_max"][minute] = batch.stats[:, S["max_health"]]
+        out["alive"][minute] = batch.alive
+        record["dealt"][:] = 0.0
+        if not batch.alive.any():
+            for f in fields:
+                out[f][minute + 1:] = out[f][minute] if f != "alive" else 0
+            break
+    out["death_t"] = record["death_t"]
+    out["picks"] = batch.picks
+    return out
+
+_DATA = {}
+
+def _data(root):
+    if root not in _DATA:
+        _DATA[root] = GameData(root)
+    return _DATA[root]
+
+
+def simulate(character, runs, minutes, dt=2.0, policy="greedy", seed=0, workers=None, overrides=None, root=None):
+    """Run `runs` simulations in batches across processes and concatenate the results."""
+    root = root or project_root()
+    sizes = [min(BATCH_RUNS, runs - start) for start in range(0, runs, BATCH_RUNS)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(root, character, size, minutes, dt, policy, s, overrides or {}) for size, s in zip(sizes, seeds)]
+    if workers == 1 or len(jobs) == 1:
+        results = [simulate_batch(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(simulate_batch, jobs))
+    merged = {}
+    for key in results[0]:
+        if key == "picks":
+            merged[key] = sum(r[key] for r in results)
+        else:
+            merged[key] = np.concatenate([r[key] for r in results], axis=-1)
+    return merged
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# REPORTING / REAL DATA
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def summarize(result, minutes):
+    """Per-minute quantiles in minute_snapshot terms (alive runs only)."""
+    rows = []
+    for m in range(minutes):
+        alive = result["alive"][m] > 0
+        row = {"t_min": m + 1, "runs": int(alive.sum()), "alive_pct": 100.0 * alive.mean()}
+        for field in ("player_level", "dps_est", "build_dps", "kills_total", "hp_max", "hp_current"):
+            values = result[field][m][alive]
+            row[field] = ({f"p{q}": float(v) for q, v in zip(QUANTILES, np.percentile(values, QUANTILES))}
+                          if len(values) else None)
+        rows.append(row)
+    return rows
+
+def load_real_curves(runs_dir, character, minutes):
+    """The same per-minute quantiles from balance.jsonl of recorded bundles."""
+    per_minute = {m: {"player_level": [], "dps_est": [], "kills_total": [], "hp_max": [], "hp_current": []}
+                  for m in range(1, minutes + 1)}
+    survived = []
+    for path, _meta in find_bundles(runs_dir):
+        log = os.path.join(path, "balance.jsonl")
+        if not bundle_file_exists(log):
+            print(f"  skipping {os.path.basename(path)}: no balance.jsonl", file=sys.stderr)
+            continue
+        char_id, snaps, end = None, [], None
+        for e in iter_jsonl(log, ("run_start", "minute_snapshot", "run_end")):
+            kind = e.get("event")
+            if kind == "run_start":
+                char_id = e.get("character_id")
+            elif kind == "minute_snapshot":
+                snaps.append(e)
+            elif kind == "run_end":
+                end = e
+        if character and char_id and char_id != character:
+            continue
+        for e in snaps:
+            m = int(round(e.get("t_min", 0)))
+            if m not in per_minute:
+                continue
+            combat, prog = e.get("combat", {}), e.get("progression", {})
+            for field, value in (("player_level", prog.get("level", e.get("player_level"))),
+                                 ("dps_est", combat.get("dps_est")), ("kills_total", combat.get("kills_total")),
+                                 ("hp_max", e.get("hp_max")), ("hp_current", e.get("hp_current"))):
+                if isinstance(value, (int, float)):
+                    per_minute[m][field].append(value)
+        if end is not None:
+            seconds = end.get("time_survived") or end.get("duration_s") or end.get("timestamp_ms", 0) / 1000.0
+            survived.append((float(seconds) / 60.0, end.get("end_reason", "death") == "death"))
+    rows = {}
+    for m, fields in per_minute.items():
+        # runs that ended another way (quit, victory) before minute m are censored
+        known = [minutes_alive >= m for minutes_alive, died in survived if died or minutes_alive >= m]
+        row = {"runs": len(fields["player_level"]), "alive_pct": 100.0 * np.mean(known) if known else None}
+        for field, values in fields.items():
+            row[field] = float(np.median(values)) if values else None
+        rows[m] = row
+    return rows, len(survived)
+
+def _fmt(value, width=7, digits=1):
+    return f"{value:>{width}.{digits}f}" if isinstance(value, (int, float)) else " " * (width - 1) + "-"
+
+def print_report(rows, real=None):
+    header = (f"  {'min':>3}  {'alive%':>6}  {'level p10/p50/p90':>17}  {'dps_est':>7}  "
+              f"{'build_dps p10/p50/p90':>23}  {'hp_max':>6}  {'kills':>7}")
+    if real is not None:
+        header += f"  │ {'real lvl':>8}  {'real dps':>8}  {'alive%':>6}"
+    print(header)
+    for row in rows:
+        lvl, dps = row["player_level"], row["build_dps"]
+        line = f"  {row['t_min']:>3}  {row['alive_pct']:>6.1f}  "
+        line += (f"{lvl['p10']:>5.0f}/{lvl['p50']:>5.0f}/{lvl['p90']:>5.0f}" if lvl else f"{'-':>17}") + "  "
+        line += _fmt(row["dps_est"]["p50"] if row["dps_est"] else None, 7, 0) + "  "
+        line += (f"{dps['p10']:>7.0f}/{dps['p50']:>7.0f}/{dps['p90']:>7.0f}" if dps else f"{'-':>23}") + "  "
+        line += _fmt(row["hp_max"]["p50"] if row["hp_max"] else None, 6, 0) + "  "
+        line += _fmt(row["kills_total"]["p50"] if row["kills_total"] else None, 7, 0)
+        if real is not None:
+            r = real.get(row["t_min"], {})
+            line += f"  │ {_fmt(r.get('player_level'), 8, 0)}  {_fmt(r.get('dps_est'), 8, 0)}  {_fmt(r.get('alive_pct'), 6)}"
+        print(line)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _parse_override(text):
+    key, _, value = text.partition("=")
+    if key not in MODEL:
+        raise argparse.ArgumentTypeError(f"unknown model constant {key!r} (known: {', '.join(MODEL)})")
+    try:
+        return key, float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{key} needs a number, got {value!r}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo balance simulation from the .gd data tables.")
+    parser.add_argument("--runs", type=int, default=10000, help="simulated runs (default 10000)")
+    parser.add_argument("--minutes", type=int, default=30, help="minutes per run (default 30)")
+    parser.add_argument("--character", default="frost_mage", help="CharacterDatabase id (default frost_mage)")
+    parser.add_argument("--policy", choices=("greedy", "dps", "random"), default="greedy",
+                        help="level-up choice: best DPS+EHP gain, best DPS gain, or uniform")
+    parser.add_argument("--dt", type=float, default=2.0, help="simulation step in seconds (default 2)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--set", type=_parse_override, action="append", default=[], metavar="KEY=VALUE",
+                        help="override a MODEL constant, e.g. --set contact_fraction=0.05")
+    parser.add_argument("--compare", nargs="?", const=default_runs_dir(), metavar="RUNS_DIR",
+                        help="put recorded bundles (balance.jsonl) next to the simulation")
+    parser.add_argument("--json", metavar="OUT", help="write per-minute quantiles and pick rates as JSON")
+    parser.add_argument("--explain", action="store_true", help="list upgrade stats the model ignores")
+    args = parser.parse_args()
+
+    overrides = dict(args.set)
+    MODEL.update(overrides)
+    data = _data(project_root())
+    if args.character not in data.characters:
+        sys.exit(f"Unknown character {args.character!r}; known: {', '.join(data.characters)}")
+
+    t0 = time.perf_counter()
+    result = simulate(args.character, args.runs, args.minutes, args.dt, args.policy, args.seed,
+                      args.workers, overrides)
+    elapsed = time.perf_counter() - t0
+    rows = summarize(result, args.minutes)
+    print(f"Simulated {args.runs} runs of {args.character} ({args.policy}, dt={args.dt:g}s, "
+          f"{args.minutes} min) in {elapsed:.1f}s")
+
+    real = None
+    if args.compare:
+        real, count = load_real_curves(args.compare, args.character, args.minutes)
+        print(f"Compared with {count} recorded run(s) from {args.compare}")
+    print_report(rows, real)
+
+    picks = result["picks"]
+    U = len(data.upgrade_ids)
+    total = max(1, int(picks.sum()))
+    names = data.upgrade_ids + [f"weapon:{w}" for w in data.weapon_ids] + ["weapon level-up"]
+    print("\nMost picked options:")
+    for i in np.argsort(picks)[::-1][:12]:
+        if picks[i]:
+            print(f"  {names[i]:<28} {100.0 * picks[i] / total:5.1f}%")
+    deaths = result["death_t"][~np.isnan(result["death_t"])]
+    if len(deaths):
+        print(f"\nDeaths: {len(deaths)} ({100.0 * len(deaths) / args.runs:.1f}%), "
+              f"median at minute {np.median(deaths):.1f}")
+    if args.explain:
+        print("\nUpgrade stats not modelled (effect count):")
+        for stat, count in data.unmodelled.most_common():
+            print(f"  {stat}: {count}")
+
+    if args.json:
+        payload = {
+            "character": args.character, "runs": args.runs, "minutes": args.minutes, "policy": args.policy,
+            "dt": args.dt, "seed": args.seed, "model": MODEL, "elapsed_s": round(elapsed, 2),
+            "per_minute": rows,
+            "pick_share": {names[i]: picks[i] / total for i in np.nonzero(picks)[0]},
+            "real": real,
+        }
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+if __name__ == "__main__":
+    main()
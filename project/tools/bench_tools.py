@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Benchmark the run-bundle analysis tools on a synthetic corpus.
+
+Generates (or reuses) a corpus with synth_bundles.py, then runs every
+analysis entry point on it as its own process and reports wall time,
+events/sec and peak RSS. Events are the lines of the logs each tool reads,
+taken from corpus.json; tools that take one bundle get the largest one.
+
+Tools with a cache are measured twice: cold (cache removed or bypassed with
+the tool's own flag) and warm (cache filled by a previous run). event_index
+runs first, so later tools find fresh indexes like they would in user://runs.
+
+Peak RSS is ru_maxrss of a small wrapper process's children: the tool and
+every worker process it waited for (the largest of them, not the sum).
+Not available on Windows.
+
+The corpus is kept in the temp folder keyed by its parameters, so repeated
+benchmarks skip generation; --corpus picks the folder.
+
+Usage:
+    python tools/bench_tools.py [--events 1000000] [--seed 1] [--corpus DIR] [--repeat 3]
+                                [--only analyze_perf,verify_bundles] [--workers N]
+                                [--json bench.json] [--compare baseline.json]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from synth_bundles import DEFAULT_RATES, GENERATOR_VERSION, LOGS, generate_corpus, read_corpus
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRATCH = ".bench"
+
+# Runs argv[1:] and prints {"rc", "wall_s", "peak_rss_kb"}; a fresh process per
+# measurement so RUSAGE_CHILDREN only covers this tool and its workers
+MEASURE = r"""
+import json, subprocess, sys, time
+try:
+    import resource
+except ImportError:
+    resource = None
+t0 = time.perf_counter()
+proc = subprocess.run(sys.argv[1:], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+wall = time.perf_counter() - t0
+rss = None
+if resource is not None:
+    rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    if sys.platform == "darwin":
+        rss //= 1024
+print(json.dumps({"rc": proc.returncode, "wall_s": wall, "peak_rss_kb": rss,
+                  "stderr": proc.stderr.decode("utf-8", "replace")[-2000:]}))
+"""
+
+# (name, argv after the script, logs read, scope, cold variant, warm variant)
+#   {runs} corpus dir, {bundle} largest bundle, {scratch} per-corpus scratch dir
+#   cold/warm: extra args and "rm:<file>" scratch files to delete first; cold None = no cache
+ENTRY_POINTS = [
+    ("event_index", ["event_index.py", "--runs", "{runs}"], LOGS, "corpus", ["--force"], []),
+    ("analyze_run", ["analyze_run.py", "{bundle}"], ("audit", "balance", "upgrade_audit"), "bundle", None, None),
+    ("analyze_run_batch", ["analyze_run.py", "--batch", "{runs}"], ("audit", "balance"), "corpus", None, None),
+    ("analyze_upgrades", ["analyze_upgrades.py", "{bundle}/upgrade_audit.jsonl"], ("upgrade_audit",), "bundle",
+     None, None),
+    ("analyze_perf", ["analyze_perf.py", "--runs", "{runs}"], ("perf",), "corpus", None, None),
+    ("spike_attribution", ["spike_attribution.py", "--runs", "{runs}"], ("perf",), "corpus", None, None),
+    ("perf_gate", ["perf_gate.py", "baseline", "--out", "{scratch}/perf_baseline.json", "--runs", "{runs}"],
+     ("perf",), "corpus", None, None),
+    ("upgrade_index", ["upgrade_index.py", "--runs", "{runs}", "--index", "{scratch}/upgrade_index.sqlite",
+                       "--count"], ("upgrade_audit",), "corpus", ["rm:upgrade_index.sqlite"], []),
+    ("run_warehouse", ["run_warehouse.py", "ingest", "{runs}", "--db", "{scratch}/warehouse.sqlite"],
+     LOGS, "corpus", ["rm:warehouse.sqlite"], []),
+    ("verify_bundles", ["verify_bundles.py", "{runs}"], LOGS, "corpus", ["--no-cache"], []),
+    ("snapshot_columns", ["snapshot_columns.py", "{runs}"], ("audit",), "corpus", ["--rebuild"], []),
+]
+WORKER_TOOLS = {"event_index", "upgrade_index", "run_warehouse", "verify_bundles", "snapshot_columns"}
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CORPUS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def default_corpus_dir(events, seed):
+    return os.path.join(tempfile.gettempdir(), f"bench_corpus_{events}_{seed}")
+
+def ensure_corpus(out_dir, events, seed, workers=None):
+    """corpus.json of out_dir, generating the corpus if it is missing or was made with other parameters."""
+    corpus = read_corpus(out_dir)
+    if (corpus and corpus.get("version") == GENERATOR_VERSION and corpus.get("events_requested") == events
+            and corpus.get("seed") == seed and corpus.get("rates") == DEFAULT_RATES):
+        print(f"Reusing corpus {out_dir} ({corpus['runs']} bundles, {corpus['events']} events)")
+        return corpus
+    print(f"Generating {events} events into {out_dir} ...")
+    t0 = time.perf_counter()
+    shutil.rmtree(os.path.join(out_dir, SCRATCH), ignore_errors=True)
+    if os.path.exists(os.path.join(out_dir, ".verify_cache.json")):
+        os.remove(os.path.join(out_dir, ".verify_cache.json"))
+    corpus = generate_corpus(out_dir, events, seed=seed, workers=workers, force=True)
+    print(f"  {corpus['runs']} bundles in {time.perf_counter() - t0:.1f}s")
+    return corpus
+
+def largest_bundle(corpus, logs):
+    return max(corpus["bundles"].items(), key=lambda kv: (sum(kv[1].get(log, 0) for log in logs), kv[0]))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MEASURE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def measure(argv):
+    """Run one tool process. Returns the MEASURE dict."""
+    out = subprocess.run([sys.executable, "-c", MEASURE, sys.executable] + argv, cwd=TOOLS_DIR,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out)
+
+def _expand(argv, runs_dir, bundle_dir, scratch):
+    return [a.format(runs=runs_dir, bundle=bundle_dir, scratch=scratch) for a in argv]
+
+def _prepare(variant, scratch):
+    """Apply the rm: entries of a variant and return its extra args."""
+    args = []
+    for item in variant or []:
+        if item.startswith("rm:"):
+            path = os.path.join(scratch, item[3:])
+            if os.path.exists(path):
+                os.remove(path)
+        else:
+            args.append(item)
+    return args
+
+def bench_entry(entry, runs_dir, corpus, scratch, repeat, workers):
+    """Yield result rows (one per mode) for one entry point."""
+    name, argv, logs, scope, cold, warm = entry
+    if scope == "bundle":
+        bundle, counts = largest_bundle(corpus, logs)
+        events = sum(counts.get(log, 0) for log in logs)
+    else:
+        bundle = ""
+        events = sum(c.get(log, 0) for c in corpus["bundles"].values() for log in logs)
+    base = [os.path.join(TOOLS_DIR, argv[0])] + _expand(argv[1:], runs_dir, os.path.join(runs_dir, bundle), scratch)
+    if workers is not None and name in WORKER_TOOLS:
+        base += ["--workers", str(workers)]
+
+    modes = [("cold", cold), ("warm", warm)] if cold is not None else [("-", None)]
+    for mode, variant in modes:
+        if mode == "warm":
+            measure(base)   # fill the cache
+        runs = []
+        for _ in range(repeat):
+            result = measure(base + _prepare(variant, scratch))
+            if result["rc"] != 0:
+                yield {"name": name, "mode": mode, "events": events, "error": result["stderr"].strip()[-400:]}
+                break
+            runs.append(result)
+        else:
+            best = min(r["wall_s"] for r in runs)
+            rss = [r["peak_rss_kb"] for r in runs if r["peak_rss_kb"] is not None]
+            yield {"name": name, "mode": mode, "events": events, "wall_s": round(best, 4),
+                   "events_per_s": round(events / best, 1) if best > 0 else None,
+                   "peak_rss_mb": round(max(rss) / 1024.0, 1) if rss else None,
+                   "runs": [round(r["wall_s"], 4) for r in runs]}
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# REPORT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _fmt(value, spec, missing="n/a"):
+    return format(value, spec) if value is not None else missing
+
+def print_results(rows, baseline=None):
+    base = {(r["name"], r["mode"]): r for r in (baseline or {}).get("results", [])}
+    header = f"  {'tool':<20} {'mode':<5} {'events':>10} {'best s':>9} {'events/s':>12} {'peak RSS MB':>12}"
+    if base:
+        header += f" {'vs base':>8} {'RSS vs':>7}"
+    print(header)
+    for r in rows:
+        if "error" in r:
+            print(f"  {r['name']:<20} {r['mode']:<5} {r['events']:>10}  FAILED: {r['error'].splitlines()[-1] if r['error'] else '?'}")
+            continue
+        line = (f"  {r['name']:<20} {r['mode']:<5} {r['events']:>10} {r['wall_s']:>9.3f} "
+                f"{_fmt(r['events_per_s'], ',.0f'):>12} {_fmt(r['peak_rss_mb'], '.1f'):>12}")
+        old = base.get((r["name"], r["mode"]))
+        if old and old.get("wall_s"):
+            line += f" {old['wall_s'] / r['wall_s']:>7.2f}x"
+            if old.get("peak_rss_mb") and r["peak_rss_mb"]:
+                line += f" {r['peak_rss_mb'] / old['peak_rss_mb']:>6.2f}x"
+        print(line)
+    if base:
+        print("  (vs base: speedup over the baseline wall time; RSS vs: peak RSS relative to the baseline)")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the analysis tools on synthetic run bundles.")
+    parser.add_argument("--events", type=int, default=1000000, help="corpus size in events (default 1000000)")
+    parser.add_argument("--seed", type=int, default=1, help="corpus seed (default 1)")
+    parser.add_argument("--corpus", metavar="DIR", help="corpus folder (default: <tmp>/bench_corpus_<events>_<seed>)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per tool and mode, best is kept (default 3)")
+    parser.add_argument("--only", metavar="NAMES", help="comma-separated tools to run: "
+                        + ", ".join(e[0] for e in ENTRY_POINTS))
+    parser.add_argument("--workers", type=int, default=None, help="--workers passed to the tools that take it")
+    parser.add_argument("--json", metavar="PATH", help="write the results as JSON")
+    parser.add_argument("--compare", metavar="PATH", help="earlier --json output to compare against")
+    args = parser.parse_args()
+
+    entries = ENTRY_POINTS
+    if args.only:
+        wanted = {n.strip() for n in args.only.split(",") if n.strip()}
+        unknown = wanted - {e[0] for e in ENTRY_POINTS}
+        if unknown:
+            parser.error(f"unknown tool(s): {', '.join(sorted(unknown))}")
+        entries = [e for e in ENTRY_POINTS if e[0] in wanted]
+    baseline = None
+    if args.compare:
+        try:
+            with open(args.compare, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as ex:
+            sys.exit(f"Cannot read {args.compare}: {ex}")
+
+    runs_dir = os.path.abspath(args.corpus or default_corpus_dir(args.events, args.seed))
+    try:
+        corpus = ensure_corpus(runs_dir, args.events, args.seed, args.workers)
+    except FileExistsError as ex:
+        sys.exit(f"{ex}; pick another --corpus")
+    scratch = os.path.join(runs_dir, SCRATCH)
+    os.makedirs(scratch, exist_ok=True)
+
+    print(f"\n=== BENCHMARK: {corpus['events']} events in {corpus['runs']} bundles, best of {args.repeat} ===")
+    rows = []
+    for entry in entries:
+        for row in bench_entry(entry, runs_dir, corpus, scratch, max(1, args.repeat), args.workers):
+            rows.append(row)
+            status = "FAILED" if "error" in row else f"{row['wall_s']:.3f}s"
+            print(f"  {row['name']} ({row['mode']}): {status}")
+    print("\n=== SUMMARY ===")
+    print_results(rows, baseline)
+
+    if args.json:
+        payload = {"generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": sys.version.split()[0],
+                   "platform": sys.platform, "cpu_count": os.cpu_count(), "workers": args.workers,
+                   "corpus": {k: corpus[k] for k in ("events", "runs", "seed", "version")},
+                   "repeat": args.repeat, "results": rows}
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=2)
+        print(f"\nWrote {args.json}")
+    if any("error" in r for r in rows):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
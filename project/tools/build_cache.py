@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Content-addressed build cache for generated assets.
+
+A generator describes each output with a key: the sha256 of everything that
+determines its bytes (parameters, the source of the code that draws it, the
+output format and library versions). _build_manifest.json in the output
+folder records, per file, the key that produced it plus the file's sha256
+and size; it holds nothing checkout-specific, so it is tracked next to the
+assets and reads the same in every clone. The mtime each file had when its
+hash was last checked lives in .build_stat_cache.json beside it (ignored by
+git): on the next build an output is fresh, and skipped without being
+rendered or touched, when its key is unchanged and the file on disk is still
+the one that was written -- by stat when the local cache knows it, by hash
+after a clone, copy or touch. Rebuilt outputs whose bytes come out identical
+are not rewritten either, and the manifest itself is only rewritten when an
+entry changes, so Godot sees no change and git shows no diff.
+
+Usage (from a generator):
+    cache = BuildCache(output_dir)
+    key = cache_key(params={...}, code=[frame_func], fmt={"format": "png"})
+    if not cache.is_fresh(rel_path, key):
+        cache.write(rel_path, key, png_bytes, info={...})
+    cache.save()
+
+    owner = find_owner(path, exclude=output_dir)  # (folder, entry) if another manifest records path
+
+    python tools/build_cache.py [OUTPUT_DIR]      # show what produced each file
+"""
+
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import sys
+
+MANIFEST_FILE = "_build_manifest.json"
+MANIFEST_VERSION = 2
+STAT_CACHE_FILE = ".build_stat_cache.json"
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# KEYS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def source_of(obj):
+    """Source text of a function / class / module, or of a file path"""
+    if isinstance(obj, str):
+        with open(obj, 'r', encoding='utf-8') as f:
+            return f.read()
+    return inspect.getsource(obj)
+
+def cache_key(params=None, code=(), fmt=None):
+    """sha256 over canonical JSON of the parameters, the code's source and the output format"""
+    payload = {
+        "params": params or {},
+        "code": [hashlib.sha256(source_of(c).encode('utf-8')).hexdigest() for c in code],
+        "format": fmt or {},
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+def file_sha256(path):
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MANIFEST
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class BuildCache:
+    """_build_manifest.json of one output folder; paths are relative to it (with / separators)"""
+
+    def __init__(self, output_dir, force=False):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, MANIFEST_FILE)
+        self.stat_path = os.path.join(output_dir, STAT_CACHE_FILE)
+        self.force = force
+        self.files = self._load(self.path, MANIFEST_VERSION, "files")
+        self.mtimes = self._load(self.stat_path, MANIFEST_VERSION, "mtime_ns")
+        self.dirty = False
+        self.stats_dirty = False
+
+    @staticmethod
+    def _load(path, version, field):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == version:
+                return data.get(field, {})
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    @staticmethod
+    def _rel(rel_path):
+        return rel_path.replace(os.sep, "/")
+
+    def is_fresh(self, rel_path, key):
+        """True if rel_path was built from key and has not been modified since"""
+        rel = self._rel(rel_path)
+        entry = self.files.get(rel)
+        if self.force or not entry or entry.get("key") != key:
+            return False
+        path = os.path.join(self.output_dir, rel_path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        if st.st_size != entry.get("size"):
+            return False
+        if st.st_mtime_ns == self.mtimes.get(rel):
+            return True
+        # new checkout, copy or touch: compare content, then remember the stat locally
+        if file_sha256(path) != entry.get("sha256"):
+            return False
+        self.mtimes[rel] = st.st_mtime_ns
+        self.stats_dirty = True
+        return True
+
+    def write(self, rel_path, key, data, info=None):
+        """Store data at rel_path unless the file already holds exactly these bytes; True if written"""
+        rel = self._rel(rel_path)
+        path = os.path.join(self.output_dir, rel_path)
+        sha = hashlib.sha256(data).hexdigest()
+        try:
+            unchanged = os.path.getsize(path) == len(data) and file_sha256(path) == sha
+        except OSError:
+            unchanged = False
+        if not unchanged:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path + ".tmp", 'wb') as f:
+                f.write(data)
+            os.replace(path + ".tmp", path)
+        entry = dict(info or {}, key=key, sha256=sha, size=len(data))
+        if self.files.get(rel) != entry:
+            self.files[rel] = entry
+            self.dirty = True
+        self.mtimes[rel] = os.stat(path).st_mtime_ns
+        self.stats_dirty = True
+        return not unchanged
+
+    def forget(self, rel_path):
+        """Drop the record of an output that is no longer produced"""
+        rel = self._rel(rel_path)
+        if self.files.pop(rel, None) is not None:
+            self.dirty = True
+        if self.mtimes.pop(rel, None) is not None:
+            self.stats_dirty = True
+
+    def save(self):
+        if self.dirty:
+            self._dump(self.path, {"version": MANIFEST_VERSION, "files": self.files})
+            self.dirty = False
+        if self.stats_dirty:
+            self._dump(self.stat_path, {"version": MANIFEST_VERSION, "mtime_ns": self.mtimes})
+            self.stats_dirty = False
+
+    def _dump(self, path, data):
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(path + ".tmp", 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+            f.write("\n")
+        os.replace(path + ".tmp", path)
+
+def find_owner(path, exclude=None, manifests=None):
+    """(folder, entry) of the nearest _build_manifest.json above path that records it, or None.
+    exclude skips the caller's own output folder; manifests memoizes {folder: BuildCache} across calls."""
+    path = os.path.abspath(path)
+    skip = os.path.abspath(exclude) if exclude else None
+    manifests = {} if manifests is None else manifests
+    folder = os.path.dirname(path)
+    while True:
+        if folder != skip:
+            if folder not in manifests:
+                manifests[folder] = BuildCache(folder)
+            entry = manifests[folder].files.get(os.path.relpath(path, folder).replace(os.sep, "/"))
+            if entry:
+                return folder, entry
+        parent = os.path.dirname(folder)
+        if parent == folder:
+            return None
+        folder = parent
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the build manifest of a generated asset folder.")
+    parser.add_argument("output_dir", nargs="?",
+                        default=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                             "assets", "vfx", "abilities", "player"))
+    args = parser.parse_args()
+
+    cache = BuildCache(args.output_dir)
+    if not cache.files:
+        sys.exit(f"No {MANIFEST_FILE} in {args.output_dir}")
+    for rel_path, entry in sorted(cache.files.items()):
+        path = os.path.join(args.output_dir, rel_path)
+        state = "fresh" if cache.is_fresh(rel_path, entry["key"]) else "stale"
+        producer = entry.get("generator", "?")
+        print(f"  {state:<5}  {rel_path:<56} key {entry['key'][:12]}  {producer}")
+        if not os.path.exists(path):
+            print("         (missing)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Offline analysis of DamageDeliveryLogger reports.
+
+The logger follows each hit through the damage pipeline: calculation
+(DamageCalculator) -> application (HealthComponent) -> feedback
+(FloatingText), keyed by event id. get_discrepancies() only works in game on
+the in-memory list; this tool reads a saved report instead
+(save_report(path, true) writes every event) and streams it: the JSON array
+is decoded one element at a time and the three stages are hash-joined on
+the event id.
+
+Two record shapes are accepted, in any mix:
+    merged   {"id", "frame", "weapon_id", "is_crit", "calculated", "applied",
+              "feedback_shown"}   (what the logger writes today)
+    staged   {"stage": "calculation" | "application" | "feedback",
+              "event_id", "frame", ...}   (one record per pipeline step)
+
+An event is finalized once the stream is --window frames past its first
+record, so memory is bounded by the number of events in flight rather than
+by the size of the report. Ids reused after the window (the logger restarts
+its numbering on start_logging()) count as new events.
+
+Per weapon_id and crit flag the report counts:
+    dropped      calculated, never applied
+    mismatched   applied != calculated
+    duplicated   a stage seen more than once for the same id
+    no_feedback  applied > 0 but no damage number shown
+    orphan       application/feedback without a calculation
+
+Usage:
+    python tools/damage_delivery.py damage_delivery_discrepancies.json [--window 120]
+                                    [--examples 10] [--json out.json] [--strict]
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter, defaultdict, deque
+
+from run_bundle import iter_json_array
+
+STAGE_NAMES = {
+    "calculation": 0, "calc": 0, "calculated": 0,
+    "application": 1, "apply": 1, "applied": 1,
+    "feedback": 2,
+}
+ISSUES = ("dropped", "mismatched", "duplicated", "no_feedback", "orphan")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RECORDS -> STAGES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def record_stages(record):
+    """Yield (stage, event_id, frame, record) for the pipeline steps a record holds."""
+    if not isinstance(record, dict):
+        return
+    stage = record.get("stage", record.get("event"))
+    event_id = record.get("event_id", record.get("id"))
+    if event_id is None:
+        return
+    event_id = int(event_id)
+    frame = record.get("frame")
+    frame = int(frame) if isinstance(frame, (int, float)) else None
+    if stage in STAGE_NAMES:
+        yield STAGE_NAMES[stage], event_id, frame, record
+        return
+    if "calculated" in record:
+        yield 0, event_id, frame, record
+    if record.get("applied", -1) not in (-1, None):
+        yield 1, event_id, frame, record
+    if record.get("feedback_shown"):
+        yield 2, event_id, frame, record
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# HASH JOIN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class DeliveryJoin:
+    """Join the stages of each event by id, finalizing events that left the frame window."""
+
+    def __init__(self, window=120, examples=10):
+        self.window = window
+        self.examples = examples
+        self.inflight = {}          # event_id -> entry
+        self.order = deque()        # (first frame, event_id, entry) in arrival order
+        self.max_frame = 0
+        self.peak_inflight = 0
+        self.records = 0
+        self.totals = defaultdict(Counter)   # (weapon_id, is_crit) -> counters
+        self.samples = []
+
+    def feed(self, record):
+        self.records += 1
+        for stage, event_id, frame, rec in record_stages(record):
+            if frame is not None and frame > self.max_frame:
+                self.max_frame = frame
+            entry = self.inflight.get(event_id)
+            if entry is None:
+                entry = {"id": event_id, "frame": frame if frame is not None else self.max_frame,
+                         "seen": [0, 0, 0], "weapon_id": None, "is_crit": None,
+                         "calculated": None, "applied": None}
+                self.inflight[event_id] = entry
+                self.order.append((entry["frame"], event_id, entry))
+            entry["seen"][stage] += 1
+            if stage == 0:
+                entry["calculated"] = rec.get("calculated", rec.get("amount"))
+                entry["weapon_id"] = rec.get("weapon_id", entry["weapon_id"])
+                entry["is_crit"] = bool(rec.get("is_crit", False))
+            elif stage == 1:
+                entry["applied"] = rec.get("applied", rec.get("amount"))
+            elif entry["is_crit"] is None and "is_crit" in rec:
+                entry["is_crit"] = bool(rec["is_crit"])
+        if len(self.inflight) > self.peak_inflight:
+            self.peak_inflight = len(self.inflight)
+        self._evict(self.max_frame - self.window)
+
+    def _evict(self, before_frame):
+        order = self.order
+        while order and order[0][0] < before_frame:
+            _frame, event_id, entry = order.popleft()
+            if self.inflight.get(event_id) is entry:
+                del self.inflight[event_id]
+            self._finalize(entry)
+
+    def finish(self):
+        """Finalize everything still in flight (end of the report)."""
+        self._evict(float("inf"))
+        return self
+
+    def _finalize(self, entry):
+        calc_n, app_n, fb_n = entry["seen"]
+        calculated = entry["calculated"] if isinstance(entry["calculated"], (int, float)) else 0
+        applied = entry["applied"] if isinstance(entry["applied"], (int, float)) else 0
+        issues = []
+        if calc_n == 0:
+            issues.append("orphan")
+        if calc_n > 1 or app_n > 1 or fb_n > 1:
+            issues.append("duplicated")
+        if calc_n and not app_n:
+            issues.append("dropped")
+        elif calc_n and applied != calculated:
+            issues.append("mismatched")
+        if app_n and applied > 0 and not fb_n:
+            issues.append("no_feedback")
+
+        c = self.totals[(entry["weapon_id"] or "unknown", bool(entry["is_crit"]))]
+        c["events"] += 1
+        c["damage_calculated"] += calculated
+        c["damage_applied"] += applied
+        for issue in issues:
+            c[issue] += 1
+        if "dropped" in issues:
+            c["damage_dropped"] += calculated
+        if "mismatched" in issues:
+            c["damage_delta"] += applied - calculated
+        if not issues:
+            c["ok"] += 1
+        elif len(self.samples) < self.examples:
+            self.samples.append({"id": entry["id"], "frame": entry["frame"], "weapon_id": entry["weapon_id"],
+                                 "is_crit": entry["is_crit"], "calculated": entry["calculated"],
+                                 "applied": entry["applied"], "stages_seen": entry["seen"], "issues": issues})
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# REPORT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def print_report(join, path):
+    print(f"=== DAMAGE DELIVERY: {path} ===")
+    print(f"  records: {join.records}  events: {sum(c['events'] for c in join.totals.values())}  "
+          f"peak in flight: {join.peak_inflight} (window {join.window} frames)")
+    print(f"\n  {'weapon_id':<24} {'crit':<5} {'events':>7} {'ok':>7} {'dropped':>8} {'mismatch':>8} "
+          f"{'dup':>5} {'no_fb':>6} {'orphan':>6} {'dmg lost':>9} {'dmg delta':>9}")
+    grand = Counter()
+    for (weapon_id, crit), c in sorted(join.totals.items(), key=lambda kv: (-kv[1]["events"], kv[0])):
+        grand.update(c)
+        print(f"  {weapon_id:<24} {'yes' if crit else 'no':<5} {c['events']:>7} {c['ok']:>7} {c['dropped']:>8} "
+              f"{c['mismatched']:>8} {c['duplicated']:>5} {c['no_feedback']:>6} {c['orphan']:>6} "
+              f"{c['damage_dropped']:>9} {c['damage_delta']:>+9}")
+    print(f"  {'TOTAL':<24} {'':<5} {grand['events']:>7} {grand['ok']:>7} {grand['dropped']:>8} "
+          f"{grand['mismatched']:>8} {grand['duplicated']:>5} {grand['no_feedback']:>6} {grand['orphan']:>6} "
+          f"{grand['damage_dropped']:>9} {grand['damage_delta']:>+9}")
+    if grand["damage_calculated"]:
+        lost = grand["damage_calculated"] - grand["damage_applied"]
+        print(f"\n  damage calculated {grand['damage_calculated']}, applied {grand['damage_applied']}"
+              f" ({100.0 * lost / grand['damage_calculated']:.2f}% not delivered)")
+    if join.samples:
+        print("\n=== EXAMPLES ===")
+        for s in join.samples:
+            print(f"  id={s['id']} frame={s['frame']} {s['weapon_id']} crit={s['is_crit']} "
+                  f"calc={s['calculated']} applied={s['applied']} stages={s['stages_seen']} -> {', '.join(s['issues'])}")
+    return grand
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def main():
+    parser = argparse.ArgumentParser(description="Join and check a DamageDeliveryLogger report.")
+    parser.add_argument("report", nargs="?", default="damage_delivery_discrepancies.json",
+                        help="JSON written by DamageDeliveryLogger.save_report()")
+    parser.add_argument("--window", type=int, default=120,
+                        help="frames an event may stay open before it is finalized (default 120)")
+    parser.add_argument("--examples", type=int, default=10, help="problem events to print (default 10)")
+    parser.add_argument("--json", metavar="PATH", help="write the per-weapon counters as JSON")
+    parser.add_argument("--strict", action="store_true", help="exit with status 1 if any problem was found")
+    args = parser.parse_args()
+
+    join = DeliveryJoin(args.window, args.examples)
+    try:
+        for record in iter_json_array(args.report):
+            join.feed(record)
+    except OSError as ex:
+        sys.exit(f"Cannot read {args.report}: {ex}")
+    except ValueError as ex:
+        print(f"Report is truncated or malformed after {join.records} records: {ex}", file=sys.stderr)
+    join.finish()
+    grand = print_report(join, args.report)
+
+    if args.json:
+        payload = {
+            "report": args.report, "records": join.records, "window": args.window,
+            "peak_inflight": join.peak_inflight,
+            "per_weapon": [dict(weapon_id=w, is_crit=crit, **c) for (w, crit), c in sorted(join.totals.items())],
+            "totals": dict(grand), "examples": join.samples,
+        }
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+    if args.strict and any(grand[issue] for issue in ISSUES):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Byte-offset event index for run bundles.
+
+Builds event_index.json next to the bundle's JSONL logs, mapping every
+event type to the byte offset and length of each of its lines, so readers
+can seek straight to run_end, minute_snapshot or player_death records
+instead of scanning the whole file.
+
+RunBundleManager only writes a "pending" placeholder at run end; this tool
+fills it in after the run (or in bulk over a runs/ directory).
+
+Usage:
+    python tools/event_index.py <bundle_dir> [<bundle_dir> ...]
+    python tools/event_index.py --runs <runs_dir> [--force]
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from run_bundle import (bundle_file_exists, bundle_file_signature, default_runs_dir, find_bundles,
+                        iter_bundle_lines, open_bundle_file, read_json)
+
+INDEX_FILE = "event_index.json"
+INDEX_SCHEMA_VERSION = 3
+
+# tracker name (as in RunBundleManager._bundle_paths) -> file in the bundle
+SOURCES = {
+    "audit": "audit.jsonl",
+    "balance": "balance.jsonl",
+    "perf": "perf.jsonl",
+    "upgrade_audit": "upgrade_audit.jsonl",
+}
+
+_EVENT_RE = re.compile(rb'"event"\s*:\s*"((?:[^"\\]|\\.)*)"')
+_TIMESTAMP_RE = re.compile(rb'"timestamp_ms"\s*:\s*(-?\d+(?:\.\d+)?)')
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BUILD
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _classify_line(line):
+    """Return (event_type, timestamp_ms) for one raw JSONL line.
+
+    Godot writes the top-level "event" key once per line, so a single regex
+    hit is trusted as-is. Lines with nested "event" keys (perf_spike keeps
+    recent_events) or without a match fall back to a real JSON decode.
+    """
+    events = _EVENT_RE.findall(line)
+    stamps = _TIMESTAMP_RE.findall(line)
+    if len(events) == 1 and len(stamps) <= 1:
+        ts = stamps[0] if stamps else b"0"
+        return events[0].decode('utf-8', 'replace'), (float(ts) if b"." in ts else int(ts))
+    try:
+        data = json.loads(line)
+    except ValueError:
+        return "_parse_error", 0
+    if not isinstance(data, dict):
+        return "_invalid", 0
+    return str(data.get("event", "unknown")), data.get("timestamp_ms", 0)
+
+def index_jsonl(path):
+    """Scan one JSONL file in binary mode and group line offsets by event type.
+
+    Offsets are those of the uncompressed log, also for archived bundles.
+    """
+    events = {}
+    offset = 0
+    line_num = 0
+    for raw in iter_bundle_lines(path):
+        line_num += 1
+        length = len(raw)
+        line = raw.strip()
+        if line:
+            event_type, ts = _classify_line(line)
+            entry = events.get(event_type)
+            if entry is None:
+                entry = events[event_type] = {
+                    "count": 0, "offsets": [], "lengths": [], "lines": [], "timestamps_ms": []
+                }
+            entry["count"] += 1
+            entry["offsets"].append(offset)
+            entry["lengths"].append(length)
+            entry["lines"].append(line_num)
+            entry["timestamps_ms"].append(ts)
+        offset += length
+    return events
+
+def build_event_index(bundle_dir):
+    """(Re)build event_index.json for a bundle and return it."""
+    meta = read_json(os.path.join(bundle_dir, "meta.json")) or {}
+    index = {
+        "schema_version": INDEX_SCHEMA_VERSION,
+        "run_id": meta.get("run_id", ""),
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "generator": "tools/event_index.py",
+        "status": "ready",
+        "sources": {},
+    }
+    for source, filename in SOURCES.items():
+        path = os.path.join(bundle_dir, filename)
+        if not bundle_file_exists(path):
+            continue
+        size, mtime_ns = bundle_file_signature(path)
+        index["sources"][source] = {
+            "file": filename,
+            "size": size,
+            "mtime_ns": mtime_ns,
+            "events": index_jsonl(path),
+        }
+
+    tmp_path = os.path.join(bundle_dir, INDEX_FILE + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, separators=(',', ':'))
+    os.replace(tmp_path, os.path.join(bundle_dir, INDEX_FILE))
+    return index
+
+def is_index_fresh(bundle_dir, index):
+    """True if the index is a byte-offset index matching the files on disk."""
+    if not isinstance(index, dict) or index.get("schema_version", 0) < INDEX_SCHEMA_VERSION:
+        return False
+    if index.get("status") != "ready":
+        return False
+    sources = index.get("sources", {})
+    for source, filename in SOURCES.items():
+        path = os.path.join(bundle_dir, filename)
+        entry = sources.get(source)
+        if not bundle_file_exists(path):
+            if entry is not None:
+                return False
+            continue
+        if entry is None or (entry.get("size"), entry.get("mtime_ns")) != bundle_file_signature(path):
+            return False
+    return True
+
+def ensure_event_index(bundle_dir, force=False):
+    """Load the bundle's index, rebuilding it if missing, pending or stale."""
+    index = None if force else read_json(os.path.join(bundle_dir, INDEX_FILE))
+    if not is_index_fresh(bundle_dir, index):
+        index = build_event_index(bundle_dir)
+    return index
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SEEKABLE READER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class BundleReader:
+    """Random access to a bundle's events through its byte-offset index.
+
+        reader = BundleReader(bundle_dir)
+        run_end = reader.last("audit", "run_end")
+        for snap in reader.events("audit", "minute_snapshot"):
+            ...
+    """
+
+    def __init__(self, bundle_dir, index=None):
+        self.bundle_dir = bundle_dir
+        self.index = index if index is not None else ensure_event_index(bundle_dir)
+
+    def _entry(self, source, event_type):
+        return self.index.get("sources", {}).get(source, {}).get("events", {}).get(event_type)
+
+    def count(self, source, event_type):
+        entry = self._entry(source, event_type)
+        return entry["count"] if entry else 0
+
+    def event_types(self, source):
+        return sorted(self.index.get("sources", {}).get(source, {}).get("events", {}))
+
+    def events(self, source, event_type, start=0, stop=None):
+        """Yield decoded events of one type (optionally a slice of them) in file order."""
+        entry = self._entry(source, event_type)
+        if not entry:
+            return
+        path = os.path.join(self.bundle_dir, SOURCES[source])
+        positions = list(zip(entry["offsets"], entry["lengths"]))[start:stop]
+        with open_bundle_file(path) as f:
+            for offset, length in positions:
+                f.seek(offset)
+                yield json.loads(f.read(length))
+
+    def first(self, source, event_type):
+        return next(self.events(source, event_type, 0, 1), None)
+
+    def last(self, source, event_type):
+        return next(self.events(source, event_type, -1, None), None)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _index_bundle(args):
+    bundle_dir, force = args
+    index = ensure_event_index(bundle_dir, force=force)
+    return bundle_dir, sum(
+        entry["count"] for source in index["sources"].values() for entry in source["events"].values()
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Build byte-offset event indexes for run bundles.")
+    parser.add_argument("bundles", nargs="*", help="bundle folders (run_<id>) to index")
+    parser.add_argument("--runs", nargs="?", const=default_runs_dir(), metavar="RUNS_DIR",
+                        help="index every run_* bundle under RUNS_DIR (default: user://runs)")
+    parser.add_argument("--force", action="store_true", help="rebuild even if the index is fresh")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    bundle_dirs = list(args.bundles)
+    if args.runs:
+        bundle_dirs.extend(path for path, _meta in find_bundles(args.runs))
+    if not bundle_dirs:
+        parser.error("no bundles given (pass bundle folders or --runs)")
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for bundle_dir, events in pool.map(_index_bundle, [(b, args.force) for b in bundle_dirs]):
+            print(f"  {os.path.basename(os.path.normpath(bundle_dir))}: {events} events indexed")
+
+if __name__ == "__main__":
+    main()
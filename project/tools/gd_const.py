@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Read top-level `const` tables out of GDScript files.
+
+The game keeps its balance data (weapons, upgrades, enemies, spawn phases,
+stat limits...) as literal `const` dictionaries in .gd files. This module
+parses those literals into plain Python values so tools can use the same
+numbers the game does, without a Godot install:
+
+    dicts / arrays        -> dict / list
+    numbers, strings      -> int / float / str ("&"/"^" prefixes dropped)
+    true / false / null   -> True / False / None
+    Enum.MEMBER           -> int when the enum is declared in the file,
+                             otherwise the dotted name as a string
+    OTHER_CONST           -> the value of that const when it is in the file
+    Color(...), Vector2() -> Call(name, args)
+    + - * / and unary -   -> evaluated when both sides are numbers
+
+Only declarations starting at column 0 are read; consts local to functions
+are ignored. `@export var` defaults can be read as well (exports=True), for
+the tuning knobs that live on nodes rather than in const tables, and so can
+plain top-level `var` tables (variables=True), such as VFXManager's configs.
+
+Usage:
+    python tools/gd_const.py scripts/data/WeaponDatabase.gd [CONST_NAME]
+"""
+
+import json
+import os
+import re
+import sys
+from collections import namedtuple
+
+Call = namedtuple("Call", "name args")
+
+CONST_RE = re.compile(r'^const\s+([A-Za-z_]\w*)\s*(?::\s*[A-Za-z_][\w\[\], ]*)?\s*:?=', re.M)
+EXPORT_RE = re.compile(r'^@export\w*(?:\([^)\n]*\))?\s+var\s+([A-Za-z_]\w*)\s*(?::\s*[A-Za-z_][\w\[\], ]*)?\s*:?=', re.M)
+VAR_RE = re.compile(r'^var\s+([A-Za-z_]\w*)\s*(?::\s*[A-Za-z_][\w\[\], ]*)?\s*:?=', re.M)
+ENUM_RE = re.compile(r'^enum\s+([A-Za-z_]\w*)\s*\{([^}]*)\}', re.M)
+TOKEN_RE = re.compile(r'''
+    (?P<ws>[ \t\r\n\\]+)
+  | (?P<comment>\#[^\n]*)
+  | (?P<string>[&^]?(?:"""(?:\\.|[^\\])*?"""|"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*'))
+  | (?P<number>0x[0-9A-Fa-f_]+|0b[01_]+|(?:\d[\d_]*\.?[\d_]*|\.\d[\d_]*)(?:[eE][+-]?\d+)?)
+  | (?P<name>[A-Za-z_]\w*)
+  | (?P<op>[{}\[\](),:=.+\-*/%])
+''', re.X)
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", '"': '"', "'": "'", "\\": "\\"}
+
+
+class GDParseError(ValueError):
+    pass
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TOKENIZER / PARSER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _unquote(text):
+    text = text.lstrip("&^")
+    body = text[3:-3] if text.startswith('"""') else text[1:-1]
+    return re.sub(r'\\(u[0-9A-Fa-f]{4}|.)',
+                  lambda m: chr(int(m.group(1)[1:], 16)) if m.group(1)[0] == "u" and len(m.group(1)) == 5
+                  else _ESCAPES.get(m.group(1), m.group(1)), body)
+
+def _number(text):
+    text = text.replace("_", "")
+    if text.startswith(("0x", "0X")):
+        return int(text, 16)
+    if text.startswith(("0b", "0B")):
+        return int(text, 2)
+    if "." in text or "e" in text or "E" in text:
+        return float(text)
+    return int(text)
+
+
+class _Parser:
+    """Recursive-descent parser over the expression that starts at `pos`."""
+
+    def __init__(self, source, pos, names):
+        self.source = source
+        self.pos = pos
+        self.names = names
+        self.token = None
+        self._advance()
+
+    def _advance(self):
+        while True:
+            m = TOKEN_RE.match(self.source, self.pos)
+            if m is None:
+                # the lookahead past the end of an expression may hit anything
+                # (annotations, `->`...); it is only an error if it gets parsed
+                char = self.source[self.pos:self.pos + 1]
+                self.token = ("eof", None) if not char else ("other", char)
+                return
+            self.pos = m.end()
+            kind = m.lastgroup
+            if kind not in ("ws", "comment"):
+                self.token = (kind, m.group())
+                return
+
+    def _expect(self, op):
+        if self.token != ("op", op):
+            raise GDParseError(f"expected {op!r}, got {self.token[1]!r} at offset {self.pos}")
+        self._advance()
+
+    def expression(self):
+        value = self._term()
+        while self.token in (("op", "+"), ("op", "-")):
+            op = self.token[1]
+            self._advance()
+            value = _binary(op, value, self._term())
+        return value
+
+    def _term(self):
+        value = self._unary()
+        while self.token in (("op", "*"), ("op", "/"), ("op", "%")):
+            op = self.token[1]
+            self._advance()
+            value = _binary(op, value, self._unary())
+        return value
+
+    def _unary(self):
+        if self.token == ("op", "-"):
+            self._advance()
+            return _binary("*", -1, self._unary())
+        if self.token == ("op", "+"):
+            self._advance()
+            return self._unary()
+        return self._atom()
+
+    def _atom(self):
+        kind, text = self.token
+        if kind == "number":
+            self._advance()
+            return _number(text)
+        if kind == "string":
+            self._advance()
+            return _unquote(text)
+        if kind == "op" and text == "{":
+            return self._dict()
+        if kind == "op" and text == "[":
+            return self._list()
+        if kind == "op" and text == "(":
+            self._advance()
+            value = self.expression()
+            self._expect(")")
+            return value
+        if kind == "name":
+            return self._name()
+        raise GDParseError(f"unexpected {text!r} at offset {self.pos}")
+
+    def _name(self):
+        parts = [self.token[1]]
+        self._advance()
+        while self.token == ("op", "."):
+            self._advance()
+            if self.token[0] != "name":
+                raise GDParseError(f"expected a name after '.' at offset {self.pos}")
+            parts.append(self.token[1])
+            self._advance()
+        dotted = ".".join(parts)
+        if self.token == ("op", "("):
+            self._advance()
+            args = []
+            while self.token != ("op", ")"):
+                args.append(self.expression())
+                if self.token == ("op", ","):
+                    self._advance()
+            self._advance()
+            return Call(dotted, args)
+        if dotted in ("true", "false"):
+            return dotted == "true"
+        if dotted == "null":
+            return None
+        if dotted in self.names:
+            return self.names[dotted]
+        return dotted
+
+    def _dict(self):
+        self._advance()
+        result = {}
+        while self.token != ("op", "}"):
+            # Lua-style `{key = value}` uses bare names as string keys
+            if self.token[0] == "name":
+                save_pos, save_token = self.pos, self.token
+                bare = self.token[1]
+                self._advance()
+                if self.token == ("op", "="):
+                    self._advance()
+                    result[bare] = self.expression()
+                    if self.token == ("op", ","):
+                        self._advance()
+                    continue
+                self.pos, self.token = save_pos, save_token
+            key = self.expression()
+            self._expect(":")
+            result[_hashable(key)] = self.expression()
+            if self.token == ("op", ","):
+                self._advance()
+            elif self.token != ("op", "}"):
+                raise GDParseError(f"expected ',' or '}}' at offset {self.pos}, got {self.token[1]!r}")
+        self._advance()
+        return result
+
+    def _list(self):
+        self._advance()
+        result = []
+        while self.token != ("op", "]"):
+            result.append(self.expression())
+            if self.token == ("op", ","):
+                self._advance()
+            elif self.token != ("op", "]"):
+                raise GDParseError(f"expected ',' or ']' at offset {self.pos}, got {self.token[1]!r}")
+        self._advance()
+        return result
+
+
+def _hashable(key):
+    if isinstance(key, list):
+        return tuple(key)
+    if isinstance(key, Call):
+        return Call(key.name, tuple(key.args))
+    return key
+
+def _binary(op, a, b):
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)) and not isinstance(a, bool):
+        if op == "+":
+            return a + b
+        if op == "-":
+            return a - b
+        if op == "*":
+            return a * b
+        if op == "/":
+            if isinstance(a, int) and isinstance(b, int):
+                return int(a / b) if b else 0
+            return a / b if b else float("inf")
+        if op == "%":
+            return a % b if b else 0
+    if op == "+" and isinstance(a, str) and isinstance(b, str):
+        return a + b
+    return Call(op, [a, b])
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PUBLIC API
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def parse_enums(source):
+    """{"Enum.MEMBER": int} for every top-level `enum Name { ... }` block."""
+    names = {}
+    for m in ENUM_RE.finditer(source):
+        body = re.sub(r'#[^\n]*', '', m.group(2))
+        value = 0
+        for item in body.split(","):
+            item = item.strip()
+            if not item:
+                continue
+            if "=" in item:
+                item, raw = (s.strip() for s in item.split("=", 1))
+                value = _number(raw)
+            names[f"{m.group(1)}.{item}"] = value
+            names.setdefault(item, value)
+            value += 1
+    return names
+
+def parse_consts(source, only=None, exports=False, variables=False):
+    """{NAME: value} for the top-level consts of a GDScript source.
+
+    With exports=True the defaults of `@export var` declarations are
+    included too, with variables=True those of plain top-level `var`s.
+    Consts that fail to parse are skipped unless they were asked for in
+    `only`, in which case the GDParseError propagates.
+    """
+    names = parse_enums(source)
+    wanted = set(only) if only else None
+    consts = {}
+    matches = list(CONST_RE.finditer(source))
+    if exports:
+        matches += list(EXPORT_RE.finditer(source))
+    if variables:
+        matches += list(VAR_RE.finditer(source))
+    matches.sort(key=lambda m: m.start())
+    for m in matches:
+        name = m.group(1)
+        try:
+            parser = _Parser(source, m.end(), names)
+            value = parser.expression()
+        except GDParseError as ex:
+            if wanted and name in wanted:
+                raise GDParseError(f"{name}: {ex}") from None
+            continue
+        names[name] = value
+        if wanted is None or name in wanted:
+            consts[name] = value
+    return consts
+
+def load_consts(path, only=None, exports=False, variables=False):
+    """parse_consts() of a .gd file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return parse_consts(f.read(), only, exports, variables)
+
+def project_root():
+    """The Godot project folder (the one holding project.godot)."""
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _to_json(value):
+    if isinstance(value, Call):
+        return {"_call": value.name, "args": [_to_json(a) for a in value.args]}
+    if isinstance(value, dict):
+        return {str(k): _to_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(v) for v in value]
+    return value
+
+def main():
+    if len(sys.argv) < 2:
+        sys.exit("usage: gd_const.py FILE.gd [CONST_NAME ...]")
+    consts = load_consts(sys.argv[1], sys.argv[2:] or None)
+    if len(sys.argv) == 3:
+        consts = consts.get(sys.argv[2])
+    json.dump(_to_json(consts), sys.stdout, indent=2, ensure_ascii=False)
+    print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Image dimensions from file headers, with a persistent index
+
+read_meta() parses only the first bytes of a file, never the pixels:
+    PNG    IHDR (alpha from the color type, or a tRNS chunk before IDAT)
+    JPEG   the first SOFn marker
+    WebP   VP8 / VP8L / VP8X chunk headers
+    ICO    the largest directory entry (PNG-compressed entries read from their IHDR)
+
+DimsIndex keeps .assets_dims_cache.json at the project root, keyed by path
+relative to the project:
+    {"version": 1, "files": {"assets/ui/x.png": {"format": "png", "width": 64, "height": 64,
+                                                  "alpha": true, "size": 1234, "mtime_ns": ...}}}
+scan() walks the indexed folders and re-reads, on a thread pool, only the
+files whose size or mtime changed since the last run; get() answers from the
+index after a single stat. Paths outside the project are read directly. The
+index holds this checkout's sizes and mtimes, so it is a local cache that git
+ignores; the tracked assets_dims.json is check_user_assets_json.py's report.
+
+Usage:
+    index = DimsIndex()
+    index.scan()
+    meta = index.get("assets/ui/backgrounds/main_menu_bg_new.png")   # ImageMeta or None
+
+    python tools/image_meta.py [PATH ...] [--dirs assets docs] [--workers N] [--rescan] [--json]
+"""
+
+import argparse
+import json
+import os
+import struct
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from gd_const import project_root
+
+ImageMeta = namedtuple("ImageMeta", "format width height alpha")
+
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".webp", ".ico")
+INDEX_FILE = ".assets_dims_cache.json"
+INDEX_VERSION = 1
+DEFAULT_DIRS = ("assets", "docs")
+SKIP_DIRS = {".godot", ".git", ".import"}
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# SOF0-SOF15 minus DHT (C4), JPG (C8) and DAC (CC)
+JPEG_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+JPEG_STANDALONE = {0x01} | set(range(0xD0, 0xD9))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# HEADER PARSERS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _png(f, head):
+    if head[12:16] != b"IHDR":
+        return None
+    width, height, _depth, color_type = struct.unpack(">IIBB", head[16:26])
+    alpha = color_type in (4, 6)
+    if color_type in (0, 2, 3):  # alpha only through a tRNS chunk, which precedes IDAT
+        f.seek(33)
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8 or chunk[4:] == b"IDAT":
+                break
+            if chunk[4:] == b"tRNS":
+                alpha = True
+                break
+            f.seek(struct.unpack(">I", chunk[:4])[0] + 4, 1)
+    return ImageMeta("png", width, height, alpha)
+
+def _jpeg(f):
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        while byte and byte != b"\xff":  # tolerate garbage between segments
+            byte = f.read(1)
+        while byte == b"\xff":  # fill bytes
+            byte = f.read(1)
+        if not byte:
+            return None
+        marker = byte[0]
+        if marker in JPEG_STANDALONE:
+            continue
+        if marker == 0xD9 or marker == 0xDA:  # EOI / SOS before any frame header
+            return None
+        seg = f.read(2)
+        if len(seg) < 2:
+            return None
+        length = struct.unpack(">H", seg)[0]
+        if marker in JPEG_SOF:
+            frame = f.read(5)
+            if len(frame) < 5:
+                return None
+            _precision, height, width = struct.unpack(">BHH", frame)
+            return ImageMeta("jpeg", width, height, False)
+        f.seek(length - 2, 1)
+
+def _webp(head):
+    chunk = head[12:16]
+    if chunk == b"VP8 " and head[23:26] == b"\x9d\x01\x2a":
+        width, height = struct.unpack("<HH", head[26:30])
+        return ImageMeta("webp", width & 0x3FFF, height & 0x3FFF, False)
+    if chunk == b"VP8L" and head[20] == 0x2F:
+        bits = struct.unpack("<I", head[21:25])[0]
+        return ImageMeta("webp", (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1, bool(bits >> 28 & 1))
+    if chunk == b"VP8X":
+        width = int.from_bytes(head[24:27], "little") + 1
+        height = int.from_bytes(head[27:30], "little") + 1
+        return ImageMeta("webp", width, height, bool(head[20] & 0x10))
+    return None
+
+def _ico(f, head):
+    count = struct.unpack("<H", head[4:6])[0]
+    f.seek(6)
+    entries = f.read(16 * count)
+    best = None
+    for i in range(len(entries) // 16):
+        w, h = entries[i * 16] or 256, entries[i * 16 + 1] or 256
+        offset = struct.unpack("<I", entries[i * 16 + 12:i * 16 + 16])[0]
+        if w == 256 or h == 256:  # 0 means "256 or more": PNG entries say exactly
+            f.seek(offset)
+            sub = f.read(26)
+            if sub[:8] == PNG_SIGNATURE and sub[12:16] == b"IHDR":
+                w, h = struct.unpack(">II", sub[16:24])
+        if best is None or w * h > best[0] * best[1]:
+            best = (w, h)
+    return ImageMeta("ico", best[0], best[1], True) if best else None
+
+def read_meta(path):
+    """ImageMeta(format, width, height, alpha) from the file header, or None if unreadable / unknown"""
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(33)
+            if head[:8] == PNG_SIGNATURE:
+                return _png(f, head)
+            if head[:2] == b"\xff\xd8":
+                return _jpeg(f)
+            if head[:4] == b"RIFF" and head[8:12] == b"WEBP" and len(head) >= 30:
+                return _webp(head)
+            if head[:4] == b"\x00\x00\x01\x00" and len(head) >= 6:
+                return _ico(f, head)
+    except (OSError, struct.error):
+        pass
+    return None
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# INDEX
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class DimsIndex:
+    """Header metadata of every image under the indexed folders, cached in INDEX_FILE"""
+
+    def __init__(self, path=None, root=None):
+        self.root = os.path.abspath(root or project_root())
+        self.path = path or os.path.join(self.root, INDEX_FILE)
+        self.files = {}
+        self.dirty = False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get("version") == INDEX_VERSION:
+                self.files = index.get("files", {})
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def _key(self, path):
+        """Project-relative key with / separators, or None for paths outside the project"""
+        full = os.path.abspath(os.path.join(self.root, path))
+        rel = os.path.relpath(full, self.root)
+        if rel.startswith(os.pardir):
+            return None
+        return rel.replace(os.sep, "/")
+
+    @staticmethod
+    def _entry(meta, st):
+        fields = meta._asdict() if meta else {"format": None, "width": None, "height": None, "alpha": None}
+        return dict(fields, size=st.st_size, mtime_ns=st.st_mtime_ns)
+
+    @staticmethod
+    def _meta(entry):
+        return ImageMeta(entry["format"], entry["width"], entry["height"], entry["alpha"]) if entry["format"] else None
+
+    def _walk(self, top):
+        """(key, path, stat) of every image below top"""
+        stack = [top]
+        while stack:
+            try:
+                it = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS:
+                            stack.append(entry.path)
+                    elif entry.name.lower().endswith(IMAGE_EXTS):
+                        yield self._key(entry.path), entry.path, entry.stat()
+
+    def scan(self, dirs=DEFAULT_DIRS, workers=None, force=False):
+        """Bring the index up to date for dirs; returns (images, re-read, removed)"""
+        seen, stale = set(), []
+        for d in dirs:
+            for key, path, st in self._walk(os.path.join(self.root, d)):
+                seen.add(key)
+                entry = self.files.get(key)
+                if force or not entry or (entry.get("size"), entry.get("mtime_ns")) != (st.st_size, st.st_mtime_ns):
+                    stale.append((key, path, st))
+        if stale:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                metas = pool.map(read_meta, [path for _key, path, _st in stale])
+                for (key, _path, st), meta in zip(stale, metas):
+                    self.files[key] = self._entry(meta, st)
+            self.dirty = True
+        prefixes = tuple(os.path.relpath(os.path.join(self.root, d), self.root).replace(os.sep, "/") + "/"
+                         for d in dirs)
+        removed = [key for key in self.files if key.startswith(prefixes) and key not in seen]
+        for key in removed:
+            del self.files[key]
+        self.dirty |= bool(removed)
+        return len(seen), len(stale), len(removed)
+
+    def get(self, path):
+        """ImageMeta of path (absolute or project-relative), re-read only if the file changed"""
+        key = self._key(path)
+        full = os.path.join(self.root, path)
+        try:
+            st = os.stat(full)
+        except OSError:
+            return None
+        if key is None:
+            return read_meta(full)
+        entry = self.files.get(key)
+        if entry and (entry.get("size"), entry.get("mtime_ns")) == (st.st_size, st.st_mtime_ns):
+            return self._meta(entry)
+        meta = read_meta(full)
+        self.files[key] = self._entry(meta, st)
+        self.dirty = True
+        return meta
+
+    def save(self):
+        if not self.dirty:
+            return
+        with open(self.path + ".tmp", 'w', encoding='utf-8') as f:
+            json.dump({"version": INDEX_VERSION, "files": dict(sorted(self.files.items()))}, f, indent=1)
+            f.write("\n")
+        os.replace(self.path + ".tmp", self.path)
+        self.dirty = False
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def main():
+    parser = argparse.ArgumentParser(description="Read image dimensions from headers and keep the local index current.")
+    parser.add_argument("paths", nargs="*", help="images or folders to print (default: a summary of the index)")
+    parser.add_argument("--dirs", nargs="+", default=list(DEFAULT_DIRS), help="project folders to index (default: assets docs)")
+    parser.add_argument("--workers", type=int, default=None, help="header reader threads (default: Python's)")
+    parser.add_argument("--rescan", action="store_true", help="re-read every header, ignoring size / mtime")
+    parser.add_argument("--json", action="store_true", help="print {path: [width, height]} as JSON")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    index = DimsIndex()
+    images, reread, removed = index.scan(args.dirs, args.workers, args.rescan)
+    index.save()
+    elapsed = time.perf_counter() - t0
+
+    results = {}
+    for path in args.paths:
+        if os.path.isdir(path):
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+                for name in sorted(filenames):
+                    if name.lower().endswith(IMAGE_EXTS):
+                        results[os.path.join(dirpath, name)] = index.get(os.path.abspath(os.path.join(dirpath, name)))
+        else:
+            results[path] = index.get(os.path.abspath(path))
+    index.save()
+
+    if args.json:
+        print(json.dumps({p: [m.width, m.height] if m else None for p, m in results.items()}, indent=2))
+        return
+    for path, meta in results.items():
+        dims = f"{meta.width}x{meta.height}" if meta else "unknown" if os.path.exists(path) else "missing"
+        print(f"  {dims:>11}  {meta.format if meta else '-':<5} {path}")
+    if not args.paths:
+        formats = {}
+        for entry in index.files.values():
+            formats[entry["format"] or "unreadable"] = formats.get(entry["format"] or "unreadable", 0) + 1
+        print(f"{images} image(s) in {', '.join(args.dirs)}: "
+              f"{', '.join(f'{n} {fmt}' for fmt, n in sorted(formats.items(), key=lambda kv: -kv[1]))}")
+    print(f"{reread} header(s) read, {removed} removed, index up to date in {elapsed * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Lossless PNG recompression for assets/
+
+Every PNG is decoded to RGBA and re-encoded in the smallest representation
+that decodes to exactly the same pixels:
+  - RGBA -> RGB when fully opaque, LA / L when grey
+  - palette (P, with a tRNS alpha table) when there are at most 256 distinct
+    colors, written at 1/2/4/8 bits per pixel
+  - zlib level 9 with per-row adaptive filter selection (Pillow optimize=True)
+and without ancillary chunks (text, XMP, EXIF, iCCP, sRGB, gAMA, cHRM, pHYs),
+which Godot ignores on import. Every candidate is decoded again and compared
+pixel for pixel with the original before it replaces the file; a file is
+only rewritten if it gets smaller. Animated and 16-bit PNGs are left alone.
+
+Results are cached by content hash in <root>/.png_optimize_cache.json (the
+sha256 of every file that is known to be optimal, plus the size / mtime it
+was seen with), so reruns only read and recompress new or changed files.
+
+Usage:
+    python tools/optimize_pngs.py [ROOT ...] [--workers N] [--dry-run] [--min-saving BYTES] [--force]
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets")
+CACHE_FILE = ".png_optimize_cache.json"
+CACHE_VERSION = 1
+SKIP_DIRS = {".godot", ".import", ".git"}
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CANDIDATES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _encode(image, **params):
+    out = io.BytesIO()
+    image.save(out, "PNG", optimize=True, icc_profile=None, **params)
+    return out.getvalue()
+
+def _decode_rgba(data):
+    with Image.open(io.BytesIO(data)) as im:
+        return np.asarray(im.convert("RGBA"))
+
+def _palette_image(rgba):
+    """Exact palette version of an image with <= 256 colors (transparent entries first), else None"""
+    packed = rgba.view(np.uint32).reshape(rgba.shape[:2])
+    colors, index = np.unique(packed, return_inverse=True)
+    if len(colors) > 256:
+        return None
+    entries = colors.view(np.uint8).reshape(-1, 4)
+    order = np.argsort(entries[:, 3] == 255, kind="stable")  # tRNS can then stop at the last translucent entry
+    remap = np.empty_like(order)
+    remap[order] = np.arange(len(order))
+    entries = entries[order]
+    image = Image.fromarray(remap[index.reshape(rgba.shape[:2])].astype(np.uint8), "P")
+    image.putpalette(entries[:, :3].tobytes(), "RGB")
+    alphas = entries[:, 3]
+    translucent = int(np.count_nonzero(alphas < 255))
+    params = {"transparency": alphas[:translucent].tobytes()} if translucent else {}
+    return image, params
+
+def candidates(rgba):
+    """(label, image, save params) for every lossless representation worth trying"""
+    opaque = bool((rgba[..., 3] == 255).all())
+    grey = bool((rgba[..., 0] == rgba[..., 1]).all() and (rgba[..., 1] == rgba[..., 2]).all())
+    if grey:
+        yield ("L", Image.fromarray(rgba[..., 0], "L"), {}) if opaque else \
+              ("LA", Image.fromarray(np.ascontiguousarray(rgba[..., [0, 3]]), "LA"), {})
+    yield ("RGB", Image.fromarray(np.ascontiguousarray(rgba[..., :3]), "RGB"), {}) if opaque else \
+          ("RGBA", Image.fromarray(rgba, "RGBA"), {})
+    palette = _palette_image(rgba)
+    if palette is not None:
+        yield ("P", palette[0], palette[1])
+
+def optimize_file(path):
+    """Smallest verified lossless re-encoding of one PNG. Returns (best bytes or None, original sha256, label, note)."""
+    with open(path, 'rb') as f:
+        original = f.read()
+    sha = hashlib.sha256(original).hexdigest()
+    try:
+        with Image.open(io.BytesIO(original)) as im:
+            if getattr(im, "is_animated", False):
+                return None, sha, None, "animated"
+            if im.mode in ("I", "I;16", "I;16B", "F") or im.info.get("bits", 8) > 8:
+                return None, sha, None, f"{im.mode} (16-bit) kept"
+            rgba = np.ascontiguousarray(np.asarray(im.convert("RGBA")))
+    except (OSError, ValueError) as ex:
+        return None, sha, None, f"unreadable: {ex}"
+    best, best_label = None, None
+    for label, image, params in candidates(rgba):
+        data = _encode(image, **params)
+        if len(data) < len(original) and (best is None or len(data) < len(best)):
+            if np.array_equal(_decode_rgba(data), rgba):
+                best, best_label = data, label
+    return best, sha, best_label, None
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CACHE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def load_cache(root):
+    try:
+        with open(os.path.join(root, CACHE_FILE), 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get("version") == CACHE_VERSION:
+            return cache
+    except (OSError, ValueError):
+        pass
+    return {"version": CACHE_VERSION, "optimal": [], "files": {}}
+
+def save_cache(root, cache):
+    path = os.path.join(root, CACHE_FILE)
+    cache["optimal"] = sorted(set(cache["optimal"]))
+    with open(path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(cache, f, separators=(',', ':'))
+    os.replace(path + ".tmp", path)
+
+def file_sha256(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def find_pngs(root):
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+        for name in sorted(filenames):
+            if name.lower().endswith(".png"):
+                yield os.path.join(dirpath, name)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PASS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def process(job):
+    """Worker entry point: job = (path, dry run, min saving) -> (path, bytes before, after, note, stat)"""
+    path, dry_run, min_saving = job
+    before = os.path.getsize(path)
+    best, sha, _label, note = optimize_file(path)
+    after = before
+    if best is not None and before - len(best) >= min_saving:
+        after = len(best)
+        if not dry_run:
+            sha = hashlib.sha256(best).hexdigest()
+            with open(path + ".tmp", 'wb') as f:
+                f.write(best)
+            os.replace(path + ".tmp", path)
+    st = os.stat(path)
+    return path, before, after, note, [st.st_size, st.st_mtime_ns, sha]
+
+def _mb(n):
+    return f"{n / (1024 * 1024):.1f} MB" if n >= 1024 * 1024 else f"{n / 1024:.1f} KB"
+
+def optimize_root(root, workers=None, dry_run=False, min_saving=64, force=False):
+    """Recompress the PNGs under root that are not known to be optimal.
+    Returns ({directory: [files, smaller, bytes before, bytes after]}, cached count, notes)."""
+    cache = load_cache(root) if not force else {"version": CACHE_VERSION, "optimal": [], "files": {}}
+    optimal = set(cache["optimal"])
+    files = {}
+    todo, skipped = [], 0
+    for path in find_pngs(root):
+        rel = os.path.relpath(path, root).replace(os.sep, "/")
+        st = os.stat(path)
+        seen = cache["files"].get(rel)
+        if not (seen and seen[:2] == [st.st_size, st.st_mtime_ns] and seen[2] in optimal):
+            seen = None
+            if optimal:  # touched or copied, but maybe content we already optimized
+                sha = file_sha256(path)
+                seen = [st.st_size, st.st_mtime_ns, sha] if sha in optimal else None
+        if seen:
+            files[rel] = seen
+            skipped += 1
+        else:
+            todo.append(path)
+
+    per_dir = defaultdict(lambda: [0, 0, 0, 0])
+    notes = []
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            jobs = [(path, dry_run, min_saving) for path in todo]
+            for path, before, after, note, stat in pool.map(process, jobs, chunksize=4):
+                rel = os.path.relpath(path, root).replace(os.sep, "/")
+                entry = per_dir[os.path.dirname(rel) or "."]
+                entry[0] += 1
+                entry[1] += after < before
+                entry[2] += before
+                entry[3] += after
+                if note:
+                    notes.append(f"{rel}: {note}")
+                files[rel] = stat
+    if not dry_run:
+        save_cache(root, {"version": CACHE_VERSION, "optimal": [e[2] for e in files.values()], "files": files})
+    return per_dir, skipped, notes
+
+def print_report(root, per_dir, skipped, notes, dry_run):
+    total = [0, 0, 0, 0]
+    rows = sorted(per_dir.items(), key=lambda kv: kv[1][3] - kv[1][2])
+    print(f"\n{root}")
+    print(f"  {'directory':<56} {'files':>6} {'smaller':>8} {'before':>11} {'after':>11} {'saved':>11}")
+    for directory, (files, changed, before, after) in rows:
+        for k, v in enumerate((files, changed, before, after)):
+            total[k] += v
+        if changed:
+            saved = before - after
+            print(f"  {directory:<56} {files:>6} {changed:>8} {_mb(before):>11} {_mb(after):>11} "
+                  f"{_mb(saved):>11} ({saved / before:.0%})")
+    files, changed, before, after = total
+    saved = before - after
+    verb = "would save" if dry_run else "saved"
+    print(f"  {files} PNG(s) checked, {skipped} cached as optimal, {changed} smaller: "
+          f"{_mb(before)} -> {_mb(after)}, {verb} {_mb(saved)}" + (f" ({saved / before:.1%})" if before else ""))
+    for note in notes:
+        print(f"  - {note}")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def main():
+    parser = argparse.ArgumentParser(description="Losslessly recompress every PNG under the asset folders.")
+    parser.add_argument("roots", nargs="*", default=[ASSETS_DIR], help="folders to optimize (default: assets/)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--dry-run", action="store_true", help="report the savings without rewriting anything")
+    parser.add_argument("--min-saving", type=int, default=64, metavar="BYTES",
+                        help="only rewrite a file that shrinks by at least this much (default 64)")
+    parser.add_argument("--force", action="store_true", help="ignore the content-hash cache")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    for root in args.roots:
+        if not os.path.isdir(root):
+            sys.exit(f"Not a folder: {root}")
+        per_dir, skipped, notes = optimize_root(root, args.workers, args.dry_run, args.min_saving, args.force)
+        print_report(root, per_dir, skipped, notes, args.dry_run)
+    print(f"\nDone in {time.perf_counter() - t0:.1f}s")
+
+if __name__ == "__main__":
+    main()
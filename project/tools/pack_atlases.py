@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Texture atlas packer for small VFX sheets, icons, pickups and UI textures
+
+Packs each group of related textures into power-of-two atlases with
+MaxRects (best short side fit), leaving --padding transparent pixels between
+regions and extruding every texture's border --extrude pixels outwards so
+filtering and mipmaps never sample a neighbour. Textures larger than the
+group's size limit (backgrounds, logos, store art) are left out.
+
+Groups (GROUPS below):
+    icons    assets/icons
+    pickups  assets/sprites/pickups
+    ui       assets/ui
+    vfx      spritesheets configured in VFXManager.gd (vfx_configs.py) up to 512 px
+
+Output in assets/atlases/: <group>_<page>.png and atlas_map.json,
+    {"version": 1,
+     "atlases": {"res://assets/atlases/icons_0.png": {"group": "icons", "file": "icons_0.png", "size": [w, h]}},
+     "regions": {"res://assets/icons/fire_wand.png": {"atlas": "res://assets/atlases/icons_0.png",
+                                                      "region": [x, y, w, h]}}}
+keyed by the original res:// path, so SpriteDB.get_texture() and VFX configs
+can swap a path for an AtlasTexture (atlas + region; spritesheet frames are
+then sub-regions of that region).
+
+Each group is keyed by its inputs' content hashes, the packer settings and
+this file's source (build_cache.py); only groups whose key changed are
+repacked, in parallel, and atlases whose bytes come out identical are not
+rewritten.
+
+Usage:
+    python tools/pack_atlases.py [--only GROUP,...] [--padding 2] [--extrude 1] [--max-size 2048]
+                                 [--workers N] [--force] [--list]
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from build_cache import BuildCache, cache_key
+from vfx_configs import load_sheet_configs
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASSETS_DIR = os.path.join(PROJECT_DIR, "assets")
+ATLAS_DIR = os.path.join(ASSETS_DIR, "atlases")
+MAP_FILE = "atlas_map.json"
+MAP_VERSION = 1
+
+# group -> (source, max input side in px)
+GROUPS = {
+    "icons": ("assets/icons", 256),
+    "pickups": ("assets/sprites/pickups", 256),
+    "ui": ("assets/ui", 256),
+    "vfx": ("vfx_manager", 512),
+}
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# INPUTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def res_path(path):
+    return "res://" + os.path.relpath(path, PROJECT_DIR).replace(os.sep, "/")
+
+def vfx_manager_sheets():
+    """Spritesheet files referenced by VFXManager.gd configs"""
+    return sorted({sheet.path for sheet in load_sheet_configs() if os.path.exists(sheet.path)})
+
+def group_inputs(group):
+    """[(path, width, height)] of the textures that go into a group's atlases"""
+    source, max_side = GROUPS[group]
+    if source == "vfx_manager":
+        paths = vfx_manager_sheets()
+    else:
+        paths = []
+        for dirpath, dirnames, filenames in os.walk(os.path.join(PROJECT_DIR, *source.split("/"))):
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+            paths.extend(os.path.join(dirpath, n) for n in sorted(filenames) if n.lower().endswith(".png"))
+    inputs = []
+    for path in paths:
+        with Image.open(path) as im:
+            w, h = im.size
+        if w <= max_side and h <= max_side:
+            inputs.append((path, w, h))
+    return inputs
+
+def file_sha256(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAXRECTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class MaxRects:
+    """MaxRects bin (best short side fit); free rectangles are (x, y, w, h)"""
+
+    def __init__(self, width, height):
+        self.width, self.height = width, height
+        self.free = [(0, 0, width, height)]
+
+    def insert(self, w, h):
+        """Place a w x h rectangle; returns (x, y) or None if it does not fit"""
+        best, best_fit = None, None
+        for fx, fy, fw, fh in self.free:
+            if w <= fw and h <= fh:
+                fit = (min(fw - w, fh - h), max(fw - w, fh - h))
+                if best_fit is None or fit < best_fit:
+                    best, best_fit = (fx, fy), fit
+        if best is None:
+            return None
+        self._split(best[0], best[1], w, h)
+        return best
+
+    def _split(self, x, y, w, h):
+        result = []
+        for fx, fy, fw, fh in self.free:
+            if x >= fx + fw or x + w <= fx or y >= fy + fh or y + h <= fy:
+                result.append((fx, fy, fw, fh))
+                continue
+            if x > fx:
+                result.append((fx, fy, x - fx, fh))
+            if x + w < fx + fw:
+                result.append((x + w, fy, fx + fw - x - w, fh))
+            if y > fy:
+                result.append((fx, fy, fw, y - fy))
+            if y + h < fy + fh:
+                result.append((fx, y + h, fw, fy + fh - y - h))
+        # prune rectangles contained in another one
+        result.sort(key=lambda r: r[2] * r[3], reverse=True)
+        pruned = []
+        for r in result:
+            if not any(r[0] >= p[0] and r[1] >= p[1] and r[0] + r[2] <= p[0] + p[2] and r[1] + r[3] <= p[1] + p[3]
+                       for p in pruned):
+                pruned.append(r)
+        self.free = pruned
+
+def _pot(n):
+    return 1 << max(0, (int(n) - 1).bit_length())
+
+def _page_sizes(area, max_w, max_h, min_side):
+    """Power-of-two (w, h) candidates, smallest area first, never below the needed area"""
+    sizes = []
+    w = _pot(min_side)
+    while w <= max_w:
+        h = _pot(min_side)
+        while h <= max_h:
+            if w * h >= area and w >= h // 2 and h >= w // 2:
+                sizes.append((w, h))
+            h *= 2
+        w *= 2
+    return sorted(sizes, key=lambda s: (s[0] * s[1], s[0] < s[1])) or [(max_w, max_h)]
+
+def pack(sizes, max_w, max_h, spacing):
+    """Pack (w, h) items (each grown by spacing) into as few power-of-two pages as possible.
+    Returns [(page_w, page_h, {item index: (x, y)})]; items larger than a page raise ValueError."""
+    order = sorted(range(len(sizes)), key=lambda k: (max(sizes[k]), sizes[k][0] * sizes[k][1]), reverse=True)
+    for k in order:
+        if sizes[k][0] + spacing > max_w or sizes[k][1] + spacing > max_h:
+            raise ValueError(f"item {sizes[k][0]}x{sizes[k][1]} does not fit a {max_w}x{max_h} atlas")
+    pages = []
+    remaining = order
+    while remaining:
+        area = sum((sizes[k][0] + spacing) * (sizes[k][1] + spacing) for k in remaining)
+        widest = max(max(sizes[k][0], sizes[k][1]) + spacing for k in remaining)
+        for page_w, page_h in _page_sizes(area, max_w, max_h, widest):
+            bin_ = MaxRects(page_w, page_h)
+            placed, left = {}, []
+            for k in remaining:
+                pos = bin_.insert(sizes[k][0] + spacing, sizes[k][1] + spacing)
+                if pos is None:
+                    left.append(k)
+                else:
+                    placed[k] = pos
+            if not left or (page_w, page_h) == (max_w, max_h):
+                break
+        if not placed:
+            raise ValueError("packing made no progress")
+        # shrink the last page to the used power-of-two extent
+        used_w = max(placed[k][0] + sizes[k][0] + spacing for k in placed)
+        used_h = max(placed[k][1] + sizes[k][1] + spacing for k in placed)
+        pages.append((min(page_w, _pot(used_w)), min(page_h, _pot(used_h)), placed))
+        remaining = left
+    return pages
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BUILD
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def pack_group(job):
+    """Worker entry point: job = (group, [(path, w, h)], padding, extrude, max size)
+    -> (group, [(page file name, png bytes, (w, h))], {res path: [page file name, x, y, w, h]})"""
+    group, inputs, padding, extrude, max_size = job
+    border = padding + extrude
+    pages = pack([(w, h) for _path, w, h in inputs], max_size, max_size, 2 * border)
+    out, regions = [], {}
+    for page_idx, (page_w, page_h, placed) in enumerate(pages):
+        name = f"{group}_{page_idx}.png"
+        canvas = np.zeros((page_h, page_w, 4), dtype=np.uint8)
+        for k, (x, y) in placed.items():
+            path, w, h = inputs[k]
+            with Image.open(path) as im:
+                pixels = np.asarray(im.convert("RGBA"))
+            if extrude:
+                pixels = np.pad(pixels, ((extrude, extrude), (extrude, extrude), (0, 0)), mode="edge")
+            canvas[y + padding:y + padding + h + 2 * extrude, x + padding:x + padding + w + 2 * extrude] = pixels
+            regions[res_path(path)] = [name, x + border, y + border, w, h]
+        png = io.BytesIO()
+        Image.fromarray(canvas, "RGBA").save(png, "PNG", optimize=True)
+        out.append((name, png.getvalue(), (page_w, page_h)))
+    return group, out, regions
+
+def load_map(atlas_dir):
+    try:
+        with open(os.path.join(atlas_dir, MAP_FILE), 'r', encoding='utf-8') as f:
+            mapping = json.load(f)
+        if mapping.get("version") == MAP_VERSION:
+            return mapping
+    except (OSError, ValueError):
+        pass
+    return {"version": MAP_VERSION, "atlases": {}, "regions": {}}
+
+def build(groups, atlas_dir=ATLAS_DIR, padding=2, extrude=1, max_size=2048, workers=None, force=False):
+    """Repack the groups whose inputs or settings changed and rewrite atlas_map.json.
+    Returns {group: (number of inputs, pages, packed now?)}"""
+    cache = BuildCache(atlas_dir, force=force)
+    mapping = load_map(atlas_dir)
+    atlas_res = res_path(atlas_dir)
+    jobs, keys, status = [], {}, {}
+    border = padding + extrude
+    for group in groups:
+        inputs = [(p, w, h) for p, w, h in group_inputs(group)
+                  if w + 2 * border <= max_size and h + 2 * border <= max_size]
+        settings = {"group": group, "padding": padding, "extrude": extrude, "max_size": max_size}
+        params = dict(settings, inputs=[[res_path(p), file_sha256(p)] for p, _w, _h in inputs])
+        keys[group] = cache_key(params, [__file__], {"format": "png"})
+        pages = [info["file"] for info in mapping["atlases"].values() if info.get("group") == group]
+        fresh = bool(pages) and all(cache.is_fresh(name, keys[group]) for name in pages)
+        if fresh or not inputs:
+            status[group] = (len(inputs), len(pages), False)
+            if not inputs:
+                _drop_group(mapping, group, atlas_dir, cache)
+        else:
+            jobs.append((group, inputs, padding, extrude, max_size))
+
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for group, pages, regions in pool.map(pack_group, jobs):
+                _drop_group(mapping, group, atlas_dir, cache, keep={name for name, _png, _size in pages})
+                for name, png, size in pages:
+                    cache.write(name, keys[group], png, {"generator": "pack_atlases.py", "group": group})
+                    mapping["atlases"][f"{atlas_res}/{name}"] = {"group": group, "file": name, "size": list(size)}
+                for res, (name, x, y, w, h) in regions.items():
+                    mapping["regions"][res] = {"atlas": f"{atlas_res}/{name}", "region": [x, y, w, h]}
+                status[group] = (len(regions), len(pages), True)
+
+    mapping["regions"] = dict(sorted(mapping["regions"].items()))
+    mapping["atlases"] = dict(sorted(mapping["atlases"].items()))
+    text = json.dumps(mapping, indent=1) + "\n"
+    map_path = os.path.join(atlas_dir, MAP_FILE)
+    try:
+        with open(map_path, 'r', encoding='utf-8') as f:
+            unchanged = f.read() == text
+    except OSError:
+        unchanged = False
+    if not unchanged:
+        os.makedirs(atlas_dir, exist_ok=True)
+        with open(map_path + ".tmp", 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(map_path + ".tmp", map_path)
+    cache.save()
+    return status
+
+def _drop_group(mapping, group, atlas_dir, cache, keep=()):
+    """Forget a group's atlases and regions, deleting pages that are no longer produced"""
+    dropped = {atlas for atlas, info in mapping["atlases"].items() if info.get("group") == group}
+    for atlas in dropped:
+        name = mapping["atlases"].pop(atlas)["file"]
+        if name not in keep:
+            cache.forget(name)
+            if os.path.exists(os.path.join(atlas_dir, name)):
+                os.remove(os.path.join(atlas_dir, name))
+    mapping["regions"] = {res: r for res, r in mapping["regions"].items() if r["atlas"] not in dropped}
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack small textures into power-of-two atlases.")
+    parser.add_argument("--only", metavar="GROUPS", help=f"comma-separated groups ({', '.join(GROUPS)})")
+    parser.add_argument("--out", default=ATLAS_DIR, help="atlas folder (default: assets/atlases)")
+    parser.add_argument("--padding", type=int, default=2, help="transparent pixels around every region (default 2)")
+    parser.add_argument("--extrude", type=int, default=1, help="edge pixels repeated around every region (default 1)")
+    parser.add_argument("--max-size", type=int, default=2048, help="largest atlas side, a power of two (default 2048)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--force", action="store_true", help="repack every group")
+    parser.add_argument("--list", action="store_true", help="list each group's inputs and exit")
+    args = parser.parse_args()
+
+    groups = list(GROUPS)
+    if args.only:
+        groups = [g.strip() for g in args.only.split(",") if g.strip()]
+        unknown = [g for g in groups if g not in GROUPS]
+        if unknown:
+            sys.exit(f"Unknown group(s): {', '.join(unknown)} (known: {', '.join(GROUPS)})")
+    if args.max_size & (args.max_size - 1):
+        sys.exit("--max-size must be a power of two")
+    if args.list:
+        for group in groups:
+            inputs = group_inputs(group)
+            print(f"{group}: {len(inputs)} texture(s), {sum(w * h for _p, w, h in inputs) / 1e6:.2f} Mpx")
+            for path, w, h in inputs:
+                print(f"  {w:>4}x{h:<4} {res_path(path)}")
+        return
+
+    t0 = time.perf_counter()
+    try:
+        status = build(groups, args.out, args.padding, args.extrude, args.max_size, args.workers, args.force)
+    except ValueError as ex:
+        sys.exit(f"Cannot pack: {ex}")
+    for group in groups:
+        count, pages, packed = status[group]
+        state = "packed" if packed else "up to date"
+        print(f"  {group:<8} {count:>4} texture(s) -> {pages} atlas page(s)  {state}")
+    print(f"\nAtlas map: {os.path.join(args.out, MAP_FILE)} ({time.perf_counter() - t0:.1f}s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Performance regression gate: candidate build vs a stored baseline.
+
+A baseline is built from the perf.jsonl of N saved run bundles (typically
+the autopilot runs of the last good build) and stored as JSON: for every
+metric it keeps the per-minute values of every run. Minutes of one run are
+not independent observations and load grows with run time, so the check
+reduces each run to one value per metric -- the median minute (spikes: the
+mean per minute) over the minutes every compared run reached -- and tests
+candidate runs against baseline runs with a one-sided Mann-Whitney U test
+(no normality assumption; frame times are heavy-tailed). A metric
+regresses when the candidate is significantly worse (p < alpha) AND its
+median moved past the metric's budget.
+
+Exit codes: 0 pass, 1 regression past budget, 2 not enough data / bad input.
+
+Usage:
+    python tools/perf_gate.py baseline --out perf_baseline.json --runs [RUNS_DIR] --last 8
+    python tools/perf_gate.py baseline --out perf_baseline.json --autopilot-report autopilot_report.json
+    python tools/perf_gate.py check --baseline perf_baseline.json <bundle_dir> [...]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from statistics import NormalDist
+
+from analyze_perf import FrameTimeSketch
+from run_bundle import bundle_file_exists, default_runs_dir, find_bundles, iter_jsonl, read_json
+
+BASELINE_VERSION = 2
+
+# metric -> (budget: allowed relative worsening of the median, minimum absolute change, unit).
+# Every metric is "higher is worse".
+METRICS = {
+    "frame_p50_ms":     (0.05, 0.25, "ms"),
+    "frame_p95_ms":     (0.05, 0.50, "ms"),
+    "frame_p99_ms":     (0.10, 1.00, "ms"),
+    "frame_mean_ms":    (0.05, 0.25, "ms"),
+    "stutter_ms":       (0.20, 5.00, "ms"),
+    "memory_max_mb":    (0.10, 5.00, "MB"),
+    "memory_growth_mb": (0.25, 1.00, "MB"),
+    "node_count_avg":   (0.10, 50.0, "nodes"),
+    "spikes_per_min":   (0.25, 1.00, "spikes"),
+}
+
+DEFAULT_ALPHA = 0.01
+MIN_RUNS = 5            # per side; 5 vs 5 is the smallest design that can reach p < 0.01
+EXACT_TEST_MAX_N = 30   # more runs in total use the normal approximation
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# METRIC EXTRACTION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def bundle_metrics(bundle_dir):
+    """Per-minute metric samples for one bundle's perf.jsonl: {metric: [value or None per minute]}."""
+    samples = {name: [] for name in METRICS}
+    path = os.path.join(bundle_dir, "perf.jsonl")
+    if not bundle_file_exists(path):
+        return samples
+    spikes = 0
+    for e in iter_jsonl(path, ("minute_report", "perf_spike")):
+        if e.get('event') == 'perf_spike':
+            spikes += 1
+            continue
+        minute = dict.fromkeys(METRICS)
+        # perf_spike lines logged since the previous minute_report
+        minute["spikes_per_min"] = spikes
+        spikes = 0
+        sketch_data = e.get('frame_time_sketch')
+        if sketch_data and sketch_data.get('count'):
+            sketch = FrameTimeSketch.from_report(sketch_data)
+            minute["frame_p50_ms"] = sketch.quantile(0.50)
+            minute["frame_p95_ms"] = sketch.quantile(0.95)
+            minute["frame_p99_ms"] = sketch.quantile(0.99)
+            minute["frame_mean_ms"] = sketch.mean
+        elif isinstance(e.get('frame_time_ms', {}).get('avg'), (int, float)):
+            minute["frame_mean_ms"] = e['frame_time_ms']['avg']
+        stutter = e.get('stutter')
+        if isinstance(stutter, dict):
+            # older PerfTracker logs omit over_budget_ms for a minute with no slow frame
+            over = stutter.get('over_budget_ms', 0.0)
+            if isinstance(over, (int, float)):
+                minute["stutter_ms"] = over
+        memory = e.get('memory_mb', {})
+        for metric, value in (("memory_max_mb", memory.get('max')),
+                              ("memory_growth_mb", memory.get('growth')),
+                              ("node_count_avg", e.get('node_count', {}).get('avg'))):
+            if isinstance(value, (int, float)):
+                minute[metric] = value
+        for name, value in minute.items():
+            samples[name].append(value)
+    return samples
+
+def collect_metrics(bundle_dirs):
+    """Per-run minute series of several bundles: {metric: [[minute values of run 1], ...]}."""
+    runs = {name: [] for name in METRICS}
+    for bundle_dir in bundle_dirs:
+        for name, values in bundle_metrics(bundle_dir).items():
+            runs[name].append(values)
+    return runs
+
+def run_lengths(runs):
+    """Minutes logged by each run of a collect_metrics() result."""
+    return [len(series) for series in next(iter(runs.values()), [])]
+
+def reduce_runs(runs, horizon):
+    """One value per run and metric over the run's first `horizon` minutes.
+
+    The median minute for every metric except spikes_per_min, which is a
+    rate (the median minute of a rare event is almost always 0). A run with
+    no value for a metric inside the horizon is left out of that metric.
+    """
+    reduced = {}
+    for name, series_list in runs.items():
+        values = []
+        for series in series_list:
+            window = [v for v in series[:horizon] if v is not None]
+            if window:
+                values.append(statistics.fmean(window) if name == "spikes_per_min"
+                              else statistics.median(window))
+        reduced[name] = values
+    return reduced
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SIGNIFICANCE TEST
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _exact_rank_sum_p(doubled_ranks, n1, observed):
+    """P(rank sum of n1 items drawn from doubled_ranks >= observed), all subsets equally likely.
+
+    Ranks are doubled so tied (averaged) ranks stay integers; the subset-sum
+    counts are built with the usual 0/1 knapsack recurrence.
+    """
+    counts = [dict() for _ in range(n1 + 1)]
+    counts[0][0] = 1
+    for rank in doubled_ranks:
+        for k in range(n1, 0, -1):
+            row = counts[k]
+            for total, ways in counts[k - 1].items():
+                row[total + rank] = row.get(total + rank, 0) + ways
+    dist = counts[n1]
+    return sum(ways for total, ways in dist.items() if total >= observed) / sum(dist.values())
+
+def mann_whitney_greater(candidate, baseline):
+    """One-sided Mann-Whitney U: p-value for "candidate tends to be larger".
+
+    Exact permutation distribution (conditional on ties) up to
+    EXACT_TEST_MAX_N values; past that the normal approximation with tie and
+    continuity correction.
+    """
+    n1, n2 = len(candidate), len(baseline)
+    pooled = sorted([(v, 0) for v in candidate] + [(v, 1) for v in baseline])
+    doubled_ranks = []
+    rank_sum = 0.0
+    tie_term = 0.0
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        avg_rank = (i + j) / 2 + 1
+        ties = j - i + 1
+        tie_term += ties ** 3 - ties
+        doubled_ranks.extend([i + j + 2] * ties)
+        rank_sum += avg_rank * sum(1 for _, group in pooled[i:j + 1] if group == 0)
+        i = j + 1
+    n = n1 + n2
+    if n <= EXACT_TEST_MAX_N:
+        return _exact_rank_sum_p(doubled_ranks, n1, round(2 * rank_sum))
+    u = rank_sum - n1 * (n1 + 1) / 2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0 if u <= n1 * n2 / 2 else 0.0
+    z = (u - n1 * n2 / 2 - 0.5) / variance ** 0.5
+    return 1 - NormalDist().cdf(z)
+
+def compare(baseline_samples, candidate_samples, budgets, alpha):
+    """One row per metric from per-run values: medians, change, p-value and verdict."""
+    rows = []
+    for name, (budget, min_delta, unit) in METRICS.items():
+        base = baseline_samples.get(name, [])
+        cand = candidate_samples.get(name, [])
+        budget = budgets.get(name, budget)
+        row = {"metric": name, "unit": unit, "budget_pct": 100 * budget,
+               "n_baseline": len(base), "n_candidate": len(cand)}
+        if len(base) < MIN_RUNS or len(cand) < MIN_RUNS:
+            row["verdict"] = "SKIP"
+            rows.append(row)
+            continue
+        base_median = statistics.median(base)
+        cand_median = statistics.median(cand)
+        delta = cand_median - base_median
+        change = delta / abs(base_median) if base_median else (0.0 if delta == 0 else float("inf"))
+        p_value = mann_whitney_greater(cand, base)
+        significant = p_value < alpha
+        over_budget = change > budget and delta > min_delta
+        row.update(baseline_median=base_median, candidate_median=cand_median,
+                   change_pct=100 * change, p_value=p_value)
+        if significant and over_budget:
+            row["verdict"] = "REGRESSION"
+        elif significant and delta > 0:
+            row["verdict"] = "WORSE (within budget)"
+        elif mann_whitney_greater(base, cand) < alpha:
+            row["verdict"] = "IMPROVED"
+        else:
+            row["verdict"] = "OK"
+        rows.append(row)
+    return rows
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def select_bundles(args):
+    """Bundle folders from positional args and/or --runs / --last / --autopilot-report."""
+    bundle_dirs = list(args.bundles)
+    runs_dir = args.runs
+    last = args.last
+    if getattr(args, "autopilot_report", None):
+        report = read_json(args.autopilot_report)
+        if not isinstance(report, dict):
+            print(f"Cannot read autopilot report: {args.autopilot_report}", file=sys.stderr)
+            sys.exit(2)
+        if report.get("total_errors", 0) > 0:
+            print(f"Autopilot report has {report['total_errors']} errors; refusing to use its runs",
+                  file=sys.stderr)
+            sys.exit(2)
+        # the report does not carry run ids: its runs are the newest bundles
+        last = last or report.get("runs_completed")
+        runs_dir = runs_dir or default_runs_dir()
+    if runs_dir:
+        found = [path for path, meta in find_bundles(runs_dir) if 'end_timestamp' in meta]
+        found.sort(key=lambda path: os.path.getmtime(os.path.join(path, 'meta.json')))
+        bundle_dirs.extend(found[-last:] if last else found)
+    return bundle_dirs
+
+def cmd_baseline(args):
+    bundle_dirs = select_bundles(args)
+    if not bundle_dirs:
+        print("No bundles selected for the baseline", file=sys.stderr)
+        return 2
+    samples = collect_metrics(bundle_dirs)
+    reduced = reduce_runs(samples, max(run_lengths(samples), default=0))
+    baseline = {
+        "version": BASELINE_VERSION,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "runs": [os.path.basename(os.path.normpath(b)) for b in bundle_dirs],
+        "samples": samples,
+    }
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2)
+    print(f"Baseline written to {args.out} from {len(bundle_dirs)} run(s)")
+    for name, values in reduced.items():
+        median = f"{statistics.median(values):.2f}" if values else "n/a"
+        print(f"  {name}: runs={len(values)} median of runs={median}")
+    return 0
+
+def cmd_check(args):
+    baseline = read_json(args.baseline)
+    if not isinstance(baseline, dict) or baseline.get("version") != BASELINE_VERSION:
+        print(f"Unreadable or incompatible baseline: {args.baseline}", file=sys.stderr)
+        return 2
+    bundle_dirs = select_bundles(args)
+    if not bundle_dirs:
+        print("No candidate bundles selected", file=sys.stderr)
+        return 2
+
+    budgets = {}
+    for item in args.budget or []:
+        name, _, pct = item.partition("=")
+        try:
+            budget = float(pct) / 100
+        except ValueError:
+            budget = None
+        if name not in METRICS or budget is None:
+            print(f"Bad --budget {item!r} (expected METRIC=PCT, metrics: {', '.join(METRICS)})", file=sys.stderr)
+            return 2
+        budgets[name] = budget
+
+    candidate = collect_metrics(bundle_dirs)
+    # only the minutes every run reached: load grows with run time
+    lengths = [n for n in run_lengths(baseline["samples"]) + run_lengths(candidate) if n > 0]
+    horizon = min(lengths, default=0)
+    rows = compare(reduce_runs(baseline["samples"], horizon), reduce_runs(candidate, horizon),
+                   budgets, args.alpha)
+    print(f"PERF GATE: {len(bundle_dirs)} candidate run(s) vs baseline of "
+          f"{len(baseline.get('runs', []))} run(s) ({baseline.get('created_at', '?')}), "
+          f"first {horizon} minute(s) of each run, alpha={args.alpha}")
+    for row in rows:
+        if row["verdict"] == "SKIP":
+            print(f"  {row['metric']:<18} SKIP (runs={row['n_baseline']}/{row['n_candidate']}, need {MIN_RUNS})")
+            continue
+        print(f"  {row['metric']:<18} {row['baseline_median']:>9.2f} -> {row['candidate_median']:>9.2f} "
+              f"{row['unit']:<6} {row['change_pct']:+7.1f}% (budget {row['budget_pct']:.0f}%)  "
+              f"p={row['p_value']:.4f}  {row['verdict']}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, indent=2)
+
+    regressions = [row["metric"] for row in rows if row["verdict"] == "REGRESSION"]
+    if regressions:
+        print(f"❌ PERF_GATE_FAIL — regressions: {', '.join(regressions)}")
+        return 1
+    if all(row["verdict"] == "SKIP" for row in rows):
+        print("⚠️ PERF_GATE_SKIP — not enough runs for any metric")
+        return 2
+    print("✅ PERF_GATE_PASS")
+    return 0
+
+def _add_selection_args(parser):
+    parser.add_argument("bundles", nargs="*", help="bundle folders (run_<id>)")
+    parser.add_argument("--runs", nargs="?", const=default_runs_dir(), metavar="RUNS_DIR",
+                        help="take finished run_* bundles under RUNS_DIR (default: user://runs)")
+    parser.add_argument("--last", type=int, default=None, help="only the N most recent bundles of --runs")
+    parser.add_argument("--autopilot-report", metavar="PATH",
+                        help="autopilot_report.json: use its runs_completed newest bundles, "
+                             "and refuse a report with errors")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare a build's perf logs against a stored baseline.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_base = sub.add_parser("baseline", help="store a baseline from saved bundles")
+    _add_selection_args(p_base)
+    p_base.add_argument("--out", default="perf_baseline.json", help="baseline file to write")
+
+    p_check = sub.add_parser("check", help="compare candidate bundles against a baseline")
+    _add_selection_args(p_check)
+    p_check.add_argument("--baseline", default="perf_baseline.json", help="baseline file to read")
+    p_check.add_argument("--alpha", type=float, default=DEFAULT_ALPHA, help="significance level (default 0.01)")
+    p_check.add_argument("--budget", action="append", metavar="METRIC=PCT",
+                         help="override a metric's allowed median worsening in percent (repeatable)")
+    p_check.add_argument("--json", metavar="PATH", help="also write the comparison rows as JSON")
+
+    args = parser.parse_args()
+    handler = cmd_baseline if args.command == "baseline" else cmd_check
+    sys.exit(handler(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,433 @@
+"""
+Run bundle helpers shared by the analysis tools.
+
+Reads the JSONL logs that RunBundleManager collects in user://runs/run_<id>/
+(audit.jsonl, balance.jsonl, perf.jsonl, upgrade_audit.jsonl) as a stream:
+every line is decoded once and handed to the handlers registered for its
+event type, so memory stays flat no matter how long the run was. Logs that
+tools/archive_bundles.py compressed are read the same way.
+"""
+
+import bisect
+import gzip
+import io
+import json
+import lzma
+import os
+import zlib
+from collections import defaultdict
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# JSON DECODER (orjson / ujson when installed, stdlib otherwise)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+try:
+    import orjson
+    json_loads = orjson.loads
+    JSON_DECODER = "orjson"
+except ImportError:
+    try:
+        import ujson
+        json_loads = ujson.loads
+        JSON_DECODER = "ujson"
+    except ImportError:
+        json_loads = json.loads
+        JSON_DECODER = "json"
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# JSONL STREAMING
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def event_prefilter(events):
+    """Byte patterns matching an "event" key with one of the given values.
+
+    Godot's JSON.stringify writes "event":"x"; Python's json.dumps writes
+    "event": "x". Both spellings are accepted.
+    """
+    patterns = []
+    for name in events:
+        value = json.dumps(name).encode('utf-8')
+        patterns.append(b'"event":' + value)
+        patterns.append(b'"event": ' + value)
+    return tuple(patterns)
+
+def decode_jsonl_lines(lines, events=None):
+    """Decode raw JSONL byte lines into dicts (see iter_jsonl for the rules)."""
+    wanted = frozenset(events) if events else None
+    patterns = event_prefilter(wanted) if wanted else ()
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if patterns and not any(p in line for p in patterns):
+            continue
+        try:
+            event = json_loads(line)
+        except ValueError as ex:
+            yield {"_parse_error": str(ex), "_raw": line.decode('utf-8', 'replace')[:200]}
+            continue
+        if wanted and (not isinstance(event, dict) or event.get('event') not in wanted):
+            continue
+        yield event
+
+def iter_jsonl(path, events=None):
+    """Yield one dict per non-empty line of a JSONL file.
+
+    Broken lines are yielded as {"_parse_error": ..., "_raw": ...} so callers
+    can report them without aborting the whole file.
+
+    events: optional collection of event types to keep. Lines that do not
+    contain a matching "event" key are rejected with a byte search before
+    any JSON decoding; lines that pass are checked again after decoding
+    (nested events such as perf_spike.recent_events must not leak through).
+    Broken lines are only reported when they pass the byte check.
+
+    Logs compressed by tools/archive_bundles.py are read transparently.
+    """
+    yield from decode_jsonl_lines(iter_bundle_lines(path), events)
+
+def iter_json_array(path, chunk_size=1 << 16):
+    """Yield the elements of a JSON array document one at a time.
+
+    For reports the game writes with JSON.stringify(array) in one go: the file
+    is read in chunks and decoded with raw_decode, so only the element being
+    decoded is held in memory, whatever the document size. A file that is not
+    an array (JSONL, concatenated documents) yields its top-level values.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buf, pos, eof = '', 0, False
+        in_array = None
+        want = chunk_size
+
+        def refill():
+            nonlocal buf, pos, eof
+            chunk = f.read(want)
+            buf, pos, eof = buf[pos:] + chunk, 0, not chunk
+
+        while True:
+            while True:
+                while pos < len(buf) and buf[pos] in ' \t\r\n,\ufeff':
+                    pos += 1
+                if pos < len(buf) or eof:
+                    break
+                refill()
+            if pos >= len(buf):
+                return
+            if in_array is None:
+                in_array = buf[pos] == '['
+                if in_array:
+                    pos += 1
+                    continue
+            if in_array and buf[pos] == ']':
+                return
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                want *= 2  # an element larger than the buffer: grow instead of re-decoding per chunk
+                refill()
+                continue
+            if end == len(buf) and not eof:
+                refill()  # a number at the very end may continue in the next chunk
+                continue
+            want = chunk_size
+            pos = end
+            yield value
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ARCHIVED (BLOCK-COMPRESSED) LOGS
+# ═══════════════════════════════════════════════════════════════════════════════
+#
+# tools/archive_bundles.py replaces <name>.jsonl with <name>.jsonl.gz (or .xz):
+# a series of independent gzip members / xz streams, each holding whole lines.
+# archive.json in the bundle lists, per log, the original size and mtime and
+# the blocks as [raw_offset, compressed_offset, compressed_length], so a byte
+# offset into the original file (event_index.json, upgrade_index) maps to one
+# block. Plain gzip/xz tools still read the files as one stream.
+
+ARCHIVE_MANIFEST = "archive.json"
+ARCHIVE_CODECS = {
+    ".gz": lambda data: zlib.decompress(data, 31),
+    ".xz": lzma.decompress,
+}
+_manifest_cache = {}
+
+def archive_manifest(bundle_dir):
+    """archive.json of a bundle ({} when nothing in it is archived)."""
+    path = os.path.join(bundle_dir, ARCHIVE_MANIFEST)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return {}
+    cached = _manifest_cache.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, read_json(path) or {})
+        _manifest_cache[path] = cached
+    return cached[1]
+
+def archived_log(path):
+    """(archive path, manifest entry) for a log stored compressed, else (None, None).
+
+    The entry is None for a .gz/.xz without an archive.json record (compressed
+    by hand): sequential reads still work, seeking is slow.
+    """
+    bundle_dir, name = os.path.split(path)
+    entry = archive_manifest(bundle_dir).get("files", {}).get(name)
+    if entry:
+        archive = os.path.join(bundle_dir, entry["archive"])
+        if os.path.exists(archive):
+            return archive, entry
+    for ext in ARCHIVE_CODECS:
+        if os.path.exists(path + ext):
+            return path + ext, None
+    return None, None
+
+def bundle_file_exists(path):
+    """True if the log exists, plain or archived."""
+    return os.path.exists(path) or archived_log(path)[0] is not None
+
+def bundle_file_signature(path):
+    """(size, mtime_ns) of a log as the game wrote it, plain or archived.
+
+    Archiving keeps this signature, so caches keyed on it (event_index,
+    run_warehouse, snapshot_columns...) stay valid.
+    """
+    try:
+        st = os.stat(path)
+        return st.st_size, st.st_mtime_ns
+    except FileNotFoundError:
+        archive, entry = archived_log(path)
+        if entry is not None:
+            return entry["size"], entry["mtime_ns"]
+        if archive is None:
+            raise
+        st = os.stat(archive)
+        return -st.st_size, st.st_mtime_ns
+
+def iter_bundle_lines(path):
+    """Yield the raw lines (bytes, with newline) of a log, plain or archived."""
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            yield from f
+        return
+    archive, entry = archived_log(path)
+    if archive is None:
+        raise FileNotFoundError(path)
+    ext = os.path.splitext(archive)[1]
+    if entry is None:
+        opener = gzip.open if ext == ".gz" else lzma.open
+        with opener(archive, 'rb') as f:
+            yield from f
+        return
+    decompress = ARCHIVE_CODECS[ext]
+    with open(archive, 'rb') as f:
+        for _raw_offset, comp_offset, comp_length in entry["blocks"]:
+            f.seek(comp_offset)
+            yield from decompress(f.read(comp_length)).splitlines(keepends=True)
+
+def open_bundle_file(path):
+    """Binary, seekable file object over a log, plain or archived.
+
+    Offsets are those of the original file, so event_index.json offsets work
+    unchanged; an archived log only decompresses the blocks that are read.
+    """
+    if os.path.exists(path):
+        return open(path, 'rb')
+    archive, entry = archived_log(path)
+    if archive is None:
+        raise FileNotFoundError(path)
+    if entry is None:
+        return gzip.open(archive, 'rb') if archive.endswith(".gz") else lzma.open(archive, 'rb')
+    return io.BufferedReader(BlockFile(archive, entry), buffer_size=1 << 16)
+
+
+class BlockFile(io.RawIOBase):
+    """Raw reader over a block-compressed log, in uncompressed coordinates."""
+
+    def __init__(self, archive, entry):
+        super().__init__()
+        self._f = open(archive, 'rb')
+        self._blocks = entry["blocks"]
+        self._starts = [block[0] for block in self._blocks]
+        self._size = entry["size"]
+        self._decompress = ARCHIVE_CODECS[os.path.splitext(archive)[1]]
+        self._pos = 0
+        self._cached = (-1, b"")
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += self._size
+        self._pos = max(0, offset)
+        return self._pos
+
+    def _block(self, i):
+        if self._cached[0] != i:
+            _raw_offset, comp_offset, comp_length = self._blocks[i]
+            self._f.seek(comp_offset)
+            self._cached = (i, self._decompress(self._f.read(comp_length)))
+        return self._cached[1]
+
+    def readinto(self, buffer):
+        if self._pos >= self._size or not self._blocks:
+            return 0
+        i = bisect.bisect_right(self._starts, self._pos) - 1
+        data = self._block(i)
+        start = self._pos - self._starts[i]
+        n = min(len(buffer), len(data) - start)
+        buffer[:n] = data[start:start + n]
+        self._pos += n
+        return n
+
+    def close(self):
+        if not self.closed:
+            self._f.close()
+        super().close()
+
+
+class JsonlTail:
+    """Follow a JSONL file that another process is still appending to.
+
+    offset is the checkpoint: the byte position just after the last complete
+    line handed out. A partially written last line is left on disk until its
+    newline arrives, and a file that shrinks (rewritten) is read again from 0.
+    """
+
+    def __init__(self, path, events=None, offset=0):
+        self.path = path
+        self.events = events
+        self.offset = offset
+
+    def poll(self):
+        """Return the events of every line completed since the last poll."""
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return []
+        if size < self.offset:
+            self.offset = 0
+        if size == self.offset:
+            return []
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            chunk = f.read(size - self.offset)
+        end = chunk.rfind(b'\n')
+        if end < 0:
+            return []
+        self.offset += end + 1
+        return list(decode_jsonl_lines(chunk[:end + 1].split(b'\n'), self.events))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# EVENT DISPATCH
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class EventDispatcher:
+    """Route events to handlers registered per event type.
+
+    on(event_type, fn)  -> fn(event) for events whose "event" key matches
+    on_any(fn)          -> fn(event) for every event, including parse errors
+    """
+
+    def __init__(self):
+        self._handlers = defaultdict(list)
+        self._any_handlers = []
+
+    def on(self, event_type, handler):
+        self._handlers[event_type].append(handler)
+        return handler
+
+    def on_any(self, handler):
+        self._any_handlers.append(handler)
+        return handler
+
+    def dispatch(self, event):
+        for handler in self._any_handlers:
+            handler(event)
+        for handler in self._handlers.get(event.get('event'), ()):
+            handler(event)
+
+    def event_types(self):
+        """Event types this dispatcher can use, or None if it wants every line."""
+        if self._any_handlers:
+            return None
+        return frozenset(self._handlers)
+
+    def run(self, events):
+        """Feed an event iterable through the handlers. Returns the event count."""
+        count = 0
+        for event in events:
+            self.dispatch(event)
+            count += 1
+        return count
+
+    def run_file(self, path):
+        """Stream a JSONL file through the handlers, skipping lines no handler wants."""
+        return self.run(iter_jsonl(path, self.event_types()))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BUNDLE DISCOVERY
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def default_runs_dir():
+    """user://runs for Loopialike on this machine (Godot app_userdata layout)."""
+    if os.name == 'nt':
+        base = os.environ.get('APPDATA', os.path.expanduser('~'))
+        return os.path.join(base, 'Godot', 'app_userdata', 'Loopialike', 'runs')
+    base = os.environ.get('XDG_DATA_HOME', os.path.expanduser('~/.local/share'))
+    return os.path.join(base, 'godot', 'app_userdata', 'Loopialike', 'runs')
+
+def read_json(path):
+    """Load a JSON document, or None if it is missing or unreadable."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def find_active_bundle(runs_dir):
+    """Bundle the game is writing right now, like RunBundleManager.get_current_bundle_dir().
+
+    finalize_bundle() stamps end_timestamp into meta.json, so the active run is
+    the most recently started bundle whose meta has no end_timestamp yet.
+    Returns (bundle_dir, meta) or (None, None).
+    """
+    active = [(path, meta) for path, meta in find_bundles(runs_dir) if 'end_timestamp' not in meta]
+    if not active:
+        return None, None
+    return max(active, key=lambda item: (item[1].get('start_timestamp', 0), item[0]))
+
+def find_bundles(runs_dir):
+    """List (bundle_dir, meta) for every run_* folder with a readable meta.json.
+
+    Mirrors RunBundleManager.list_bundles(): folders without a parseable
+    meta.json are skipped. Sorted by folder name (run ids are time-ordered).
+    """
+    result = []
+    try:
+        entries = sorted(os.scandir(runs_dir), key=lambda entry: entry.name)
+    except OSError:
+        return result
+    for entry in entries:
+        if not entry.is_dir() or not entry.name.startswith('run_'):
+            continue
+        meta = read_json(os.path.join(entry.path, 'meta.json'))
+        if isinstance(meta, dict):
+            result.append((entry.path, meta))
+    return result
@@ -0,0 +1,578 @@
+#!/usr/bin/env python3
+"""
+SQLite warehouse of every run bundle, for cross-run questions.
+
+Loads audit.jsonl, balance.jsonl, perf.jsonl and upgrade_audit.jsonl of each
+run_* bundle into typed tables:
+
+    run              one row per bundle (meta + run_end + player_death)
+    minute_snapshot  one row per run minute, audit and balance snapshots merged
+    weapon_sample    per-weapon DPS / damage of every audit minute_snapshot
+    level_up         audit level_timeline (fallback: balance player_level steps)
+    spike            perf_spike with its counters
+    perf_minute      minute_report frame time / fps / memory
+    upgrade_pick     balance upgrade_pick
+    upgrade_check    one row per UpgradeAuditor check
+
+Ingest is incremental: a bundle is re-read only when the size / mtime of its
+meta.json or logs changed (ingest_state table). Bundles are parsed in a
+process pool; rows are written with executemany, one transaction per batch.
+
+Usage:
+    python tools/run_warehouse.py ingest [RUNS_DIR] [--db PATH] [--workers N]
+    python tools/run_warehouse.py query dps-at-minute --minute 10
+    python tools/run_warehouse.py query spikes-by-enemies --bucket 50
+    python tools/run_warehouse.py sql "SELECT character_id, COUNT(*) FROM run GROUP BY 1"
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from run_bundle import bundle_file_exists, bundle_file_signature, default_runs_dir, find_bundles, iter_jsonl
+
+DB_FILE = "warehouse.sqlite"
+SCHEMA_VERSION = 1
+BUNDLE_FILES = ("meta.json", "audit.jsonl", "balance.jsonl", "perf.jsonl", "upgrade_audit.jsonl")
+BATCH_BUNDLES = 200
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingest_state (
+    bundle      TEXT PRIMARY KEY,
+    run_id      TEXT NOT NULL,
+    signature   TEXT NOT NULL,
+    ingested_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS run (
+    run_id          TEXT PRIMARY KEY,
+    bundle          TEXT NOT NULL,
+    character_id    TEXT,
+    seed            INTEGER,
+    game_version    TEXT,
+    start_iso       TEXT,
+    start_timestamp REAL,
+    end_timestamp   REAL,
+    duration_s      REAL,
+    time_survived   REAL,
+    end_reason      TEXT,
+    killed_by       TEXT,
+    killer          TEXT,
+    killer_attack   TEXT,
+    final_level     INTEGER,
+    kills           INTEGER,
+    damage_dealt    REAL,
+    damage_taken    REAL,
+    gold            INTEGER,
+    spikes_33ms     INTEGER,
+    spikes_66ms     INTEGER
+);
+CREATE TABLE IF NOT EXISTS minute_snapshot (
+    run_id             TEXT NOT NULL,
+    minute             INTEGER NOT NULL,
+    player_level       INTEGER,
+    dps_total          REAL,
+    damage_total       REAL,
+    weapon_count       INTEGER,
+    dps_est            REAL,
+    kills_total        INTEGER,
+    kills_last_60s     INTEGER,
+    active_enemies     INTEGER,
+    damage_to_player   REAL,
+    hits_to_player     INTEGER,
+    spikes_33ms        INTEGER,
+    spikes_66ms        INTEGER,
+    spikes_this_minute INTEGER,
+    gold_total         INTEGER,
+    xp_per_min         REAL,
+    PRIMARY KEY (run_id, minute)
+);
+CREATE TABLE IF NOT EXISTS weapon_sample (
+    run_id       TEXT NOT NULL,
+    minute       INTEGER NOT NULL,
+    weapon_id    TEXT NOT NULL,
+    dps_last_60s REAL,
+    damage_total REAL,
+    hits_total   INTEGER,
+    crit_rate    REAL,
+    kills        INTEGER
+);
+CREATE TABLE IF NOT EXISTS level_up (
+    run_id TEXT NOT NULL,
+    t_min  REAL,
+    level  INTEGER
+);
+CREATE TABLE IF NOT EXISTS spike (
+    run_id              TEXT NOT NULL,
+    t_min               REAL,
+    player_level        INTEGER,
+    frame_time_ms       REAL,
+    enemies_alive       INTEGER,
+    projectiles_alive   INTEGER,
+    draw_calls          INTEGER,
+    nodes_created_delta INTEGER,
+    physics_time_ms     REAL,
+    node_count          INTEGER,
+    memory_mb           REAL,
+    spike_cause         TEXT
+);
+CREATE TABLE IF NOT EXISTS perf_minute (
+    run_id        TEXT NOT NULL,
+    t_min         REAL,
+    samples       INTEGER,
+    fps_avg       REAL,
+    fps_min       REAL,
+    frame_ms_avg  REAL,
+    frame_ms_max  REAL,
+    enemies_avg   REAL,
+    projectiles_avg REAL,
+    draw_calls_avg REAL,
+    memory_max_mb REAL,
+    memory_growth_mb REAL
+);
+CREATE TABLE IF NOT EXISTS upgrade_pick (
+    run_id       TEXT NOT NULL,
+    t_min        REAL,
+    player_level INTEGER,
+    source       TEXT,
+    picked_id    TEXT,
+    picked_type  TEXT
+);
+CREATE TABLE IF NOT EXISTS upgrade_check (
+    run_id     TEXT NOT NULL,
+    event      TEXT,
+    pickup_num INTEGER,
+    upgrade_id TEXT,
+    name       TEXT,
+    category   TEXT,
+    verdict    TEXT,
+    check_name TEXT,
+    stat       TEXT,
+    status     TEXT,
+    before     REAL,
+    after      REAL,
+    delta      REAL
+);
+CREATE INDEX IF NOT EXISTS idx_run_character ON run (character_id);
+CREATE INDEX IF NOT EXISTS idx_minute_minute ON minute_snapshot (minute);
+CREATE INDEX IF NOT EXISTS idx_weapon_run ON weapon_sample (run_id, minute);
+CREATE INDEX IF NOT EXISTS idx_weapon_weapon ON weapon_sample (weapon_id, minute);
+CREATE INDEX IF NOT EXISTS idx_level_run ON level_up (run_id);
+CREATE INDEX IF NOT EXISTS idx_spike_run ON spike (run_id);
+CREATE INDEX IF NOT EXISTS idx_spike_enemies ON spike (enemies_alive);
+CREATE INDEX IF NOT EXISTS idx_perf_run ON perf_minute (run_id);
+CREATE INDEX IF NOT EXISTS idx_pick_run ON upgrade_pick (run_id);
+CREATE INDEX IF NOT EXISTS idx_pick_id ON upgrade_pick (picked_id);
+CREATE INDEX IF NOT EXISTS idx_check_run ON upgrade_check (run_id);
+CREATE INDEX IF NOT EXISTS idx_check_stat ON upgrade_check (stat, status);
+"""
+
+# per-run tables (cleared before a bundle is re-ingested), with their column counts
+RUN_TABLES = {
+    "run": 21, "minute_snapshot": 17, "weapon_sample": 8, "level_up": 3,
+    "spike": 12, "perf_minute": 12, "upgrade_pick": 6, "upgrade_check": 13,
+}
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# EXTRACT (runs in worker processes)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _num(value):
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+def _minute(t_min):
+    return int(round(t_min)) if isinstance(t_min, (int, float)) else None
+
+def bundle_signature(bundle_dir):
+    """Size and mtime of meta.json and every log: changes when the bundle does."""
+    sig = []
+    for name in BUNDLE_FILES:
+        try:
+            sig.append([name, *bundle_file_signature(os.path.join(bundle_dir, name))])
+        except OSError:
+            sig.append([name, None, None])
+    return json.dumps(sig, separators=(',', ':'))
+
+def extract_bundle(bundle_dir):
+    """Parse one bundle into {table: [row tuples]}."""
+    with open(os.path.join(bundle_dir, "meta.json"), 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    run_id = str(meta.get("run_id") or os.path.basename(os.path.normpath(bundle_dir))[4:])
+    run = {"character_id": meta.get("character_id"), "seed": _num(meta.get("seed")),
+           "game_version": meta.get("game_version"), "start_iso": meta.get("start_iso"),
+           "start_timestamp": _num(meta.get("start_timestamp")), "end_timestamp": _num(meta.get("end_timestamp"))}
+    minutes = {}
+    tables = {name: [] for name in RUN_TABLES}
+    level_timeline = None
+    balance_levels = []
+
+    def minute_row(minute):
+        row = minutes.get(minute)
+        if row is None:
+            row = minutes[minute] = {}
+        return row
+
+    def path(name):
+        return os.path.join(bundle_dir, name)
+
+    if bundle_file_exists(path("audit.jsonl")):
+        for e in iter_jsonl(path("audit.jsonl"), ("run_start", "minute_snapshot", "player_death", "run_end")):
+            kind = e.get("event")
+            if kind == "run_start":
+                for key in ("character_id", "seed", "game_version"):
+                    run[key] = run.get(key) or e.get(key)
+            elif kind == "minute_snapshot":
+                minute = _minute(e.get("t_min"))
+                if minute is None:
+                    continue
+                data = e.get("data", {})
+                weapons = [w for w in data.get("weapons", []) if isinstance(w, dict)]
+                enemies = data.get("enemies_dangerous", [])
+                perf = data.get("performance", data.get("peerformance", {}))
+                minute_row(minute).update(
+                    dps_total=sum(_num(w.get("dps_last_60s")) or 0 for w in weapons),
+                    damage_total=sum(_num(w.get("damage_total")) or 0 for w in weapons),
+                    weapon_count=len(weapons),
+                    damage_to_player=sum(_num(x.get("damage_to_player")) or 0 for x in enemies),
+                    hits_to_player=sum(_num(x.get("hits_to_player")) or 0 for x in enemies),
+                    spikes_33ms=_num(perf.get("spikes_33ms")), spikes_66ms=_num(perf.get("spikes_66ms")),
+                    spikes_this_minute=_num(perf.get("spikes_this_minute")))
+                for w in weapons:
+                    tables["weapon_sample"].append((
+                        run_id, minute, str(w.get("weapon_id", "?")), _num(w.get("dps_last_60s")),
+                        _num(w.get("damage_total")), _num(w.get("hits_total")), _num(w.get("crit_rate")),
+                        _num(w.get("kills"))))
+                run["spikes_33ms"] = max(run.get("spikes_33ms") or 0, _num(perf.get("spikes_33ms")) or 0)
+                run["spikes_66ms"] = max(run.get("spikes_66ms") or 0, _num(perf.get("spikes_66ms")) or 0)
+            elif kind == "player_death":
+                run["killer"] = e.get("killer")
+                run["killer_attack"] = e.get("killer_attack")
+            elif kind == "run_end":
+                for key in ("duration_s", "time_survived"):
+                    run[key] = _num(e.get(key))
+                run["end_reason"] = e.get("end_reason")
+                run["killed_by"] = e.get("killed_by")
+                summary = e.get("summary") or {}
+                if isinstance(summary.get("level_timeline"), list):
+                    level_timeline = summary["level_timeline"]
+
+    if bundle_file_exists(path("balance.jsonl")):
+        events = ("run_start", "minute_snapshot", "upgrade_pick", "run_end")
+        for e in iter_jsonl(path("balance.jsonl"), events):
+            kind = e.get("event")
+            if isinstance(e.get("player_level"), (int, float)):
+                balance_levels.append((e.get("t_min"), int(e["player_level"])))
+            if kind == "run_start":
+                run["character_id"] = run.get("character_id") or e.get("character_id")
+            elif kind == "minute_snapshot":
+                minute = _minute(e.get("t_min"))
+                if minute is None:
+                    continue
+                combat = e.get("combat", {})
+                progression = e.get("progression", {})
+                minute_row(minute).update(
+                    player_level=_num(progression.get("level", e.get("player_level"))),
+                    dps_est=_num(combat.get("dps_est")), kills_total=_num(combat.get("kills_total")),
+                    kills_last_60s=_num(combat.get("kills_last_60s")),
+                    active_enemies=_num(combat.get("active_enemies")),
+                    gold_total=_num(e.get("economy", {}).get("gold_total")),
+                    xp_per_min=_num(progression.get("xp_per_min")))
+            elif kind == "upgrade_pick":
+                tables["upgrade_pick"].append((
+                    run_id, _num(e.get("t_min")), _num(e.get("player_level")), e.get("source"),
+                    e.get("picked_id"), e.get("picked_type")))
+            elif kind == "run_end":
+                final = e.get("final_stats", {})
+                run["end_reason"] = run.get("end_reason") or e.get("end_reason")
+                run["killed_by"] = run.get("killed_by") or e.get("killed_by")
+                run["final_level"] = _num(final.get("level"))
+                run["kills"] = _num(final.get("kills"))
+                run["damage_dealt"] = _num(final.get("damage_dealt"))
+                run["damage_taken"] = _num(final.get("damage_taken"))
+                run["gold"] = _num(final.get("gold"))
+
+    if bundle_file_exists(path("perf.jsonl")):
+        for e in iter_jsonl(path("perf.jsonl"), ("perf_spike", "minute_report")):
+            if '_parse_error' in e:
+                continue  # a broken line that mentions the event names
+            if e.get("event") == "perf_spike":
+                c = e.get("counters", {})
+                tables["spike"].append((
+                    run_id, _num(e.get("t_min")), _num(e.get("player_level")), _num(e.get("frame_time_ms")),
+                    _num(c.get("enemies_alive")), _num(c.get("projectiles_alive")), _num(c.get("draw_calls")),
+                    _num(c.get("nodes_created_delta")), _num(c.get("physics_time_ms")), _num(c.get("node_count")),
+                    _num(e.get("memory_mb", c.get("memory_static_mb"))), e.get("spike_cause")))
+            else:
+                fps, ft, mem = e.get("fps", {}), e.get("frame_time_ms", {}), e.get("memory_mb", {})
+                tables["perf_minute"].append((
+                    run_id, _num(e.get("t_min")), _num(e.get("samples")), _num(fps.get("avg")), _num(fps.get("min")),
+                    _num(ft.get("avg")), _num(ft.get("max")), _num(e.get("enemies", {}).get("avg")),
+                    _num(e.get("projectiles", {}).get("avg")), _num(e.get("draw_calls", {}).get("avg")),
+                    _num(mem.get("max")), _num(mem.get("growth"))))
+
+    if bundle_file_exists(path("upgrade_audit.jsonl")):
+        events = ("upgrade_audit", "weapon_audit", "global_weapon_upgrade_audit")
+        for e in iter_jsonl(path("upgrade_audit.jsonl"), events):
+            if '_parse_error' in e:
+                continue
+            for c in [c for c in e.get("checks", []) if isinstance(c, dict)] or [{}]:
+                tables["upgrade_check"].append((
+                    run_id, e.get("event"), _num(e.get("pickup_num")), str(e.get("id", "")), e.get("name"),
+                    e.get("category"), e.get("verdict"), c.get("check"), c.get("stat"), c.get("status"),
+                    _num(c.get("before")), _num(c.get("after")), _num(c.get("delta"))))
+
+    # level_up: authoritative audit timeline, else every player_level step seen in balance.jsonl
+    if level_timeline is not None:
+        for entry in level_timeline:
+            if isinstance(entry, dict):
+                tables["level_up"].append((run_id, _num(entry.get("t_min")), _num(entry.get("level"))))
+    else:
+        last_level = None
+        for t_min, level in balance_levels:
+            if last_level is not None and level > last_level:
+                tables["level_up"].append((run_id, _num(t_min), level))
+            last_level = level if last_level is None else max(last_level, level)
+
+    for minute in sorted(minutes):
+        m = minutes[minute]
+        tables["minute_snapshot"].append((
+            run_id, minute, m.get("player_level"), m.get("dps_total"), m.get("damage_total"),
+            m.get("weapon_count"), m.get("dps_est"), m.get("kills_total"), m.get("kills_last_60s"),
+            m.get("active_enemies"), m.get("damage_to_player"), m.get("hits_to_player"),
+            m.get("spikes_33ms"), m.get("spikes_66ms"), m.get("spikes_this_minute"),
+            m.get("gold_total"), m.get("xp_per_min")))
+
+    tables["run"].append((
+        run_id, os.path.basename(os.path.normpath(bundle_dir)), run.get("character_id"), run.get("seed"),
+        run.get("game_version"), run.get("start_iso"), run.get("start_timestamp"), run.get("end_timestamp"),
+        run.get("duration_s"), run.get("time_survived"), run.get("end_reason"), run.get("killed_by"),
+        run.get("killer"), run.get("killer_attack"), run.get("final_level"), run.get("kills"),
+        run.get("damage_dealt"), run.get("damage_taken"), run.get("gold"),
+        run.get("spikes_33ms"), run.get("spikes_66ms")))
+    return run_id, tables
+
+def _extract(args):
+    bundle_dir, signature = args
+    try:
+        run_id, tables = extract_bundle(bundle_dir)
+    except (OSError, ValueError) as ex:
+        return bundle_dir, signature, None, f"{type(ex).__name__}: {ex}"
+    return bundle_dir, signature, (run_id, tables), None
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# LOAD
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _median_aggregate():
+    class Median:
+        def __init__(self):
+            self.values = []
+
+        def step(self, value):
+            if value is not None:
+                self.values.append(value)
+
+        def finalize(self):
+            return statistics.median(self.values) if self.values else None
+    return Median
+
+def connect(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.create_aggregate("median", 1, _median_aggregate())
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version not in (0, SCHEMA_VERSION):
+        sys.exit(f"{db_path} has schema v{version}, expected v{SCHEMA_VERSION}; delete it to rebuild")
+    conn.executescript(SCHEMA)
+    conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+    return conn
+
+def _delete_run(conn, bundle, run_id):
+    for table in RUN_TABLES:
+        conn.execute(f"DELETE FROM {table} WHERE run_id = ?", (run_id,))
+    conn.execute("DELETE FROM ingest_state WHERE bundle = ?", (bundle,))
+
+def ingest(runs_dir, db_path, workers=None):
+    """Bring the warehouse up to date with runs_dir. Returns (ingested, skipped, removed, failed)."""
+    conn = connect(db_path)
+    state = {bundle: (run_id, sig) for bundle, run_id, sig in
+             conn.execute("SELECT bundle, run_id, signature FROM ingest_state")}
+    bundles = {os.path.basename(path): path for path, _meta in find_bundles(runs_dir)}
+
+    todo = []
+    for name, path in bundles.items():
+        signature = bundle_signature(path)
+        if state.get(name, (None, None))[1] != signature:
+            todo.append((path, signature))
+
+    removed = [name for name in state if name not in bundles]
+    with conn:
+        for name in removed:
+            _delete_run(conn, name, state[name][0])
+
+    failed = []
+    now = time.strftime("%Y-%m-%dT%H:%M:%S")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(_extract, todo, chunksize=max(1, min(32, len(todo) // 64 or 1)))
+        batch = []
+        for result in results:
+            batch.append(result)
+            if len(batch) >= BATCH_BUNDLES:
+                failed += _write_batch(conn, batch, state, now)
+                batch = []
+        if batch:
+            failed += _write_batch(conn, batch, state, now)
+    conn.execute("PRAGMA optimize")
+    conn.close()
+    return len(todo) - len(failed), len(bundles) - len(todo), len(removed), failed
+
+def _write_batch(conn, batch, state, now):
+    """Replace the rows of a batch of bundles in one transaction."""
+    failed = []
+    rows = {table: [] for table in RUN_TABLES}
+    with conn:
+        for bundle_dir, signature, extracted, error in batch:
+            name = os.path.basename(os.path.normpath(bundle_dir))
+            if error:
+                failed.append((name, error))
+                continue
+            run_id, tables = extracted
+            if name in state:
+                _delete_run(conn, name, state[name][0])
+            # a re-created bundle may reuse a run_id under another folder name
+            _delete_run(conn, name, run_id)
+            for table, table_rows in tables.items():
+                rows[table].extend(table_rows)
+            conn.execute("INSERT INTO ingest_state VALUES (?, ?, ?, ?)", (name, run_id, signature, now))
+        for table, table_rows in rows.items():
+            if table_rows:
+                placeholders = ", ".join("?" * RUN_TABLES[table])
+                verb = "INSERT OR REPLACE" if table in ("run", "minute_snapshot") else "INSERT"
+                conn.executemany(f"{verb} INTO {table} VALUES ({placeholders})", table_rows)
+    return failed
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CANNED QUERIES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+QUERIES = {
+    "dps-at-minute": (
+        "Median / average DPS at a given minute per character",
+        """SELECT r.character_id, COUNT(*) AS runs, median(m.dps_total) AS median_dps,
+                  AVG(m.dps_total) AS avg_dps, median(m.dps_est) AS median_dps_est
+           FROM minute_snapshot m JOIN run r USING (run_id)
+           WHERE m.minute = :minute
+           GROUP BY r.character_id ORDER BY median_dps DESC"""),
+    "spikes-by-enemies": (
+        "perf_spike count and frame time per enemies_alive bucket",
+        """SELECT (enemies_alive / :bucket) * :bucket AS enemies_from, COUNT(*) AS spikes,
+                  AVG(frame_time_ms) AS avg_ms, MAX(frame_time_ms) AS max_ms,
+                  COUNT(DISTINCT run_id) AS runs
+           FROM spike WHERE enemies_alive IS NOT NULL
+           GROUP BY enemies_from ORDER BY enemies_from"""),
+    "weapon-dps": (
+        "Median DPS per weapon at a given minute",
+        """SELECT weapon_id, COUNT(*) AS samples, median(dps_last_60s) AS median_dps,
+                  MAX(dps_last_60s) AS max_dps
+           FROM weapon_sample WHERE minute = :minute
+           GROUP BY weapon_id ORDER BY median_dps DESC"""),
+    "level-curve": (
+        "Median minute at which each level is reached",
+        """SELECT level, COUNT(DISTINCT run_id) AS runs, median(t_min) AS median_t_min
+           FROM level_up GROUP BY level ORDER BY level"""),
+    "deaths": (
+        "Most common killers",
+        """SELECT COALESCE(killer, killed_by) AS killer, killer_attack, COUNT(*) AS runs,
+                  median(time_survived) AS median_survived
+           FROM run WHERE end_reason = 'death'
+           GROUP BY 1, 2 ORDER BY runs DESC"""),
+    "upgrade-picks": (
+        "Most picked upgrades and the share of runs picking them",
+        """SELECT picked_id, COUNT(*) AS picks, COUNT(DISTINCT run_id) AS runs,
+                  ROUND(100.0 * COUNT(DISTINCT run_id) / (SELECT COUNT(*) FROM run), 1) AS pct_runs
+           FROM upgrade_pick GROUP BY picked_id ORDER BY picks DESC"""),
+    "failing-checks": (
+        "UpgradeAuditor checks that are not OK, per stat",
+        """SELECT stat, status, COUNT(*) AS checks, COUNT(DISTINCT upgrade_id) AS upgrades,
+                  COUNT(DISTINCT run_id) AS runs
+           FROM upgrade_check WHERE status IS NOT NULL AND status != 'OK'
+           GROUP BY stat, status ORDER BY checks DESC"""),
+}
+
+def print_rows(cursor):
+    columns = [d[0] for d in cursor.description]
+    rows = cursor.fetchall()
+    formatted = [[f"{v:.2f}" if isinstance(v, float) else ("" if v is None else str(v)) for v in row]
+                 for row in rows]
+    widths = [max([len(c)] + [len(r[i]) for r in formatted]) for i, c in enumerate(columns)]
+    print("  " + "  ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    for row in formatted:
+        print("  " + "  ".join(v.ljust(w) for v, w in zip(row, widths)))
+    return len(rows)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite warehouse of Loopialike run bundles.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_ingest = sub.add_parser("ingest", help="load new or changed bundles")
+    p_ingest.add_argument("runs_dir", nargs="?", default=default_runs_dir(),
+                          help="folder holding run_* bundles (default: the game's user://runs)")
+    p_ingest.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+
+    p_query = sub.add_parser("query", help="run a canned query")
+    p_query.add_argument("name", choices=sorted(QUERIES), help="; ".join(f"{k}: {v[0]}" for k, v in QUERIES.items()))
+    p_query.add_argument("--minute", type=int, default=10, help="minute for per-minute queries (default 10)")
+    p_query.add_argument("--bucket", type=int, default=50, help="enemy count bucket size (default 50)")
+
+    p_sql = sub.add_parser("sql", help="run an ad-hoc SQL statement (median() is available)")
+    p_sql.add_argument("statement")
+
+    for p in (p_query, p_sql):
+        p.add_argument("--runs", default=default_runs_dir(), metavar="RUNS_DIR",
+                       help="runs folder holding the default database")
+    for p in (p_ingest, p_query, p_sql):
+        p.add_argument("--db", help=f"database file (default: <RUNS_DIR>/{DB_FILE})")
+    args = parser.parse_args()
+
+    runs_dir = args.runs_dir if args.command == "ingest" else args.runs
+    db_path = args.db or os.path.join(runs_dir, DB_FILE)
+
+    if args.command == "ingest":
+        t0 = time.perf_counter()
+        ingested, skipped, removed, failed = ingest(runs_dir, db_path, args.workers)
+        print(f"Ingested {ingested} bundle(s), {skipped} unchanged, {removed} removed "
+              f"in {time.perf_counter() - t0:.2f}s -> {db_path}")
+        for name, error in failed:
+            print(f"  ✗ {name}: {error}")
+        sys.exit(1 if failed else 0)
+
+    if not os.path.exists(db_path):
+        sys.exit(f"No warehouse at {db_path}; run 'ingest' first")
+    conn = connect(db_path)
+    t0 = time.perf_counter()
+    try:
+        if args.command == "query":
+            title, sql = QUERIES[args.name]
+            print(f"{title}" + (f" (minute {args.minute})" if ":minute" in sql else ""))
+            count = print_rows(conn.execute(sql, {"minute": args.minute, "bucket": max(1, args.bucket)}))
+        else:
+            count = print_rows(conn.execute(args.statement))
+    except sqlite3.Error as ex:
+        sys.exit(f"SQL error: {ex}")
+    print(f"{count} row(s) in {1000 * (time.perf_counter() - t0):.1f}ms", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
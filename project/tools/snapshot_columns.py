@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Columnar cache of audit.jsonl minute snapshots + vectorized cross-run analysis.
+
+Every minute_snapshot of a bundle is flattened once into NumPy columns
+(player_stats, weapons[].dps_last_60s, economy, performance, enemy threat)
+and cached in <bundle>/.cache/snapshot_columns.npz, keyed by the size and
+mtime of audit.jsonl. Later runs of the tool only load the arrays, so stat
+growth, outlier flags and cross-run comparisons over hundreds of runs are
+plain array operations.
+
+Requires numpy.
+
+Usage:
+    python tools/snapshot_columns.py [RUNS_DIR] [--minute 10] [--rebuild]
+"""
+
+import argparse
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from analyze_run import GROWTH_STATS
+from event_index import INDEX_FILE, BundleReader, is_index_fresh
+from run_bundle import bundle_file_exists, bundle_file_signature, default_runs_dir, find_bundles, iter_jsonl, read_json
+
+CACHE_DIR = ".cache"
+CACHE_FILE = "snapshot_columns.npz"
+CACHE_VERSION = 1
+
+# stat -> (comparison, threshold, label); same limits as analyze_run's detailed report
+STAT_FLAGS = {
+    'dodge_chance': [('>', 0.5, "HIGH")],
+    'life_steal': [('>', 0.3, "HIGH")],
+    'damage_mult': [('>', 3.0, "HIGH")],
+    'crit_chance': [('>', 0.6, "HIGH")],
+    'move_speed': [('<', 80, "LOW - might feel sluggish"), ('>', 400, "HIGH - too fast?")],
+}
+
+ROBUST_Z_LIMIT = 3.5
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# FLATTEN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _number(value):
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else np.nan
+
+def _total(values):
+    """Sum of the numeric values; null or non-numeric entries count as missing, not as an error."""
+    return float(sum(v for v in map(_number, values) if not np.isnan(v)))
+
+def _iter_snapshots(bundle_dir):
+    """minute_snapshot events of audit.jsonl, seeking through a fresh index when there is one."""
+    index = read_json(os.path.join(bundle_dir, INDEX_FILE))
+    if is_index_fresh(bundle_dir, index):
+        yield from BundleReader(bundle_dir, index).events("audit", "minute_snapshot")
+        return
+    for e in iter_jsonl(os.path.join(bundle_dir, "audit.jsonl"), ('minute_snapshot',)):
+        if '_parse_error' not in e:
+            yield e
+
+def flatten_snapshots(snapshots):
+    """Turn minute_snapshot dicts into {column_name: float64 array}, one row per minute."""
+    rows = []
+    for snap in snapshots:
+        data = snap.get('data', {})
+        row = {"t_min": _number(snap.get('t_min'))}
+
+        for stat, value in data.get('player_stats', {}).items():
+            row["stat." + stat] = _number(value)
+
+        weapons = [w for w in data.get('weapons', []) if isinstance(w, dict)]
+        for w in weapons:
+            row["dps." + str(w.get('weapon_id', '?'))] = _number(w.get('dps_last_60s', 0))
+        row["total_dps"] = _total(w.get('dps_last_60s', 0) for w in weapons)
+        row["total_damage"] = _total(w.get('damage_total', 0) for w in weapons)
+        row["weapon_count"] = float(len(weapons))
+
+        eco = data.get('economy', {})
+        chests = eco.get('chests', {})
+        row["eco.fusions"] = _number(eco.get('fusions', 0))
+        row["eco.rerolls"] = _number(eco.get('rerolls', 0))
+        for chest_type in ('normal', 'elite', 'boss'):
+            row["eco.chests_" + chest_type] = _number(chests.get(chest_type, 0))
+
+        perf = data.get('performance', data.get('peerformance', {}))
+        for key in ('spikes_33ms', 'spikes_66ms', 'spikes_this_minute'):
+            row["perf." + key] = _number(perf.get(key, 0))
+
+        enemies = [e for e in data.get('enemies_dangerous', []) if isinstance(e, dict)]
+        row["threat.damage_to_player"] = _total(e.get('damage_to_player', 0) for e in enemies)
+        row["threat.hits_to_player"] = _total(e.get('hits_to_player', 0) for e in enemies)
+        rows.append(row)
+
+    names = sorted({name for row in rows for name in row})
+    columns = {name: np.full(len(rows), np.nan) for name in names}
+    for i, row in enumerate(rows):
+        for name, value in row.items():
+            columns[name][i] = value
+    return columns
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CACHE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _source_key(bundle_dir):
+    size, mtime_ns = bundle_file_signature(os.path.join(bundle_dir, "audit.jsonl"))
+    return np.array([CACHE_VERSION, size, mtime_ns], dtype=np.int64)
+
+def load_cached_columns(bundle_dir):
+    """Cached columns for the bundle, or None when missing or stale."""
+    path = os.path.join(bundle_dir, CACHE_DIR, CACHE_FILE)
+    try:
+        with np.load(path) as cached:
+            if not np.array_equal(cached["__source_key"], _source_key(bundle_dir)):
+                return None
+            return {name: cached[name] for name in cached.files if name != "__source_key"}
+    except (OSError, KeyError, ValueError):
+        return None
+
+def build_columns(bundle_dir):
+    """Flatten audit.jsonl snapshots and write the cache. Returns the columns."""
+    key = _source_key(bundle_dir)
+    columns = flatten_snapshots(_iter_snapshots(bundle_dir))
+    cache_dir = os.path.join(bundle_dir, CACHE_DIR)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = os.path.join(cache_dir, CACHE_FILE + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, __source_key=key, **columns)
+    os.replace(tmp_path, os.path.join(cache_dir, CACHE_FILE))
+    return columns
+
+def load_columns(bundle_dir, rebuild=False):
+    columns = None if rebuild else load_cached_columns(bundle_dir)
+    return columns if columns is not None else build_columns(bundle_dir)
+
+def load_many(bundle_dirs, rebuild=False, workers=None):
+    """Columns for many bundles; cache misses are rebuilt in a process pool."""
+    result = {}
+    missing = []
+    for bundle_dir in bundle_dirs:
+        if not bundle_file_exists(os.path.join(bundle_dir, "audit.jsonl")):
+            continue
+        columns = None if rebuild else load_cached_columns(bundle_dir)
+        if columns is None:
+            missing.append(bundle_dir)
+        else:
+            result[bundle_dir] = columns
+    if missing:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for bundle_dir, columns in zip(missing, pool.map(build_columns, missing)):
+                result[bundle_dir] = columns
+    return result
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# VECTORIZED ANALYSIS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def stack_final_stats(runs, stats=GROWTH_STATS):
+    """(first, last, duration) matrices of shape runs x stats (NaN where absent)."""
+    first = np.full((len(runs), len(stats)), np.nan)
+    last = np.full((len(runs), len(stats)), np.nan)
+    duration = np.ones(len(runs))
+    for i, columns in enumerate(runs):
+        t = columns.get("t_min")
+        if t is None or not len(t):
+            continue
+        span = t[-1] - t[0]
+        duration[i] = span if span > 0 else 1
+        for j, stat in enumerate(stats):
+            values = columns.get("stat." + stat)
+            if values is not None:
+                first[i, j] = values[0]
+                last[i, j] = values[-1]
+    return first, last, duration
+
+def growth_rates(first, last, duration):
+    """Per-minute growth of every stat for every run (runs x stats)."""
+    return (last - first) / duration[:, None]
+
+def threshold_flags(last, stats=GROWTH_STATS):
+    """Boolean mask (runs x stats) + labels for the fixed balance limits."""
+    mask = np.zeros(last.shape, dtype=bool)
+    labels = np.full(last.shape, "", dtype=object)
+    for j, stat in enumerate(stats):
+        for op, limit, label in STAT_FLAGS.get(stat, ()):
+            hit = last[:, j] > limit if op == '>' else last[:, j] < limit
+            mask[:, j] |= hit
+            labels[hit, j] = label
+    return mask, labels
+
+def robust_z(matrix):
+    """Column-wise robust z-score (median / MAD), NaN-safe."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN columns stay NaN
+        median = np.nanmedian(matrix, axis=0)
+        mad = np.nanmedian(np.abs(matrix - median), axis=0)
+    mad = np.where(mad > 0, mad, np.nan)
+    return 0.6745 * (matrix - median) / mad
+
+def dps_by_minute(runs):
+    """runs x minutes matrix of total_dps, NaN-padded, plus the minute labels."""
+    minutes = sorted({int(t) for columns in runs for t in columns.get("t_min", ()) if not np.isnan(t)})
+    position = {t: i for i, t in enumerate(minutes)}
+    matrix = np.full((len(runs), len(minutes)), np.nan)
+    for i, columns in enumerate(runs):
+        t = columns.get("t_min")
+        dps = columns.get("total_dps")
+        if t is None or dps is None:
+            continue
+        valid = ~np.isnan(t)
+        cols = np.array([position[int(x)] for x in t[valid]], dtype=int)
+        matrix[i, cols] = dps[valid]
+    return matrix, minutes
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# REPORT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def report(bundle_columns, minute=None):
+    names = [os.path.basename(os.path.normpath(b)) for b in bundle_columns]
+    runs = list(bundle_columns.values())
+    print("LOOPIALIKE SNAPSHOT COLUMNS")
+    print(f"Runs with snapshots: {len(runs)}")
+    if not runs:
+        return
+
+    first, last, duration = stack_final_stats(runs)
+    rates = growth_rates(first, last, duration)
+
+    print("\n--- STAT GROWTH RATE (per min, across runs) ---")
+    with np.errstate(all='ignore'):
+        for j, stat in enumerate(GROWTH_STATS):
+            col = rates[:, j]
+            if np.all(np.isnan(col)):
+                continue
+            p10, p50, p90 = np.nanpercentile(col, [10, 50, 90])
+            final = np.nanmedian(last[:, j])
+            print(f"  {stat}: median_rate={p50:+.3f}/min (p10={p10:+.3f}, p90={p90:+.3f}), "
+                  f"median_final={final:.3f}")
+
+    print("\n--- OUTLIERS ---")
+    mask, labels = threshold_flags(last)
+    with np.errstate(all='ignore'):
+        z = robust_z(last)
+    outliers = mask | (np.abs(z) > ROBUST_Z_LIMIT)
+    found = False
+    for i, j in zip(*np.nonzero(outliers)):
+        found = True
+        reason = f"[!{labels[i, j]}]" if mask[i, j] else f"z={z[i, j]:+.1f}"
+        print(f"  {names[i]}: {GROWTH_STATS[j]}={last[i, j]:.3f} {reason}")
+    if not found:
+        print("  None")
+
+    print("\n--- TOTAL DPS BY MINUTE (across runs) ---")
+    matrix, minutes = dps_by_minute(runs)
+    if minutes:
+        with np.errstate(all='ignore'):
+            counts = np.sum(~np.isnan(matrix), axis=0)
+            p10, p50, p90 = np.nanpercentile(matrix, [10, 50, 90], axis=0)
+        for k, t in enumerate(minutes):
+            if minute is not None and t != minute:
+                continue
+            print(f"  t={t}min: runs={counts[k]}, median={p50[k]:.1f}, p10={p10[k]:.1f}, p90={p90[k]:.1f}")
+
+        if minute is not None and minute in minutes:
+            k = minutes.index(minute)
+            with np.errstate(all='ignore'):
+                z_dps = robust_z(matrix[:, k:k + 1])[:, 0]
+            for i in np.nonzero(np.abs(z_dps) > ROBUST_Z_LIMIT)[0]:
+                print(f"    outlier {names[i]}: total_dps={matrix[i, k]:.1f} (z={z_dps[i]:+.1f})")
+
+def main():
+    parser = argparse.ArgumentParser(description="Columnar minute_snapshot cache and cross-run stats.")
+    parser.add_argument("runs_dir", nargs="?", default=default_runs_dir(), help="runs/ directory")
+    parser.add_argument("--minute", type=int, default=None, help="only show (and z-score) this minute's DPS")
+    parser.add_argument("--rebuild", action="store_true", help="ignore cached columns")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes for cache misses")
+    args = parser.parse_args()
+
+    bundle_dirs = [path for path, _meta in find_bundles(args.runs_dir)]
+    report(load_many(bundle_dirs, rebuild=args.rebuild, workers=args.workers), minute=args.minute)
+
+if __name__ == "__main__":
+    main()
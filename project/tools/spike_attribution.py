@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Frame-time cost per enemy / projectile / draw call, fitted across bundles.
+
+PerfTracker._infer_spike_cause() labels each spike with hand-written rules.
+This tool instead regresses frame time on the counters PerfTracker logs and
+reports what one more unit of each costs in milliseconds, with 95%
+confidence intervals (heteroskedasticity-robust, HC1):
+
+  spike model   every perf_spike: frame_time_ms ~ counters at the slow frame
+                (enemies_alive, projectiles_alive, draw_calls,
+                nodes_created_delta, physics_time_ms, node_count)
+  minute model  every minute_report, weighted by its sample count:
+                mean frame time ~ average enemies / projectiles /
+                draw_calls / node_count over the minute
+
+Spikes are only logged above PerfTracker's 22ms threshold, so the spike
+model describes what drives slow frames further up; the minute model sees
+every frame and is the better estimate of steady-state cost. A counter the
+others explain almost entirely (VIF above 1000, e.g. a node count that only
+follows enemies and projectiles) has no cost of its own to estimate: it is
+listed as aliased, with the combination it follows, and left out of the fit.
+
+Requires numpy.
+
+Usage:
+    python tools/spike_attribution.py --runs [RUNS_DIR]
+    python tools/spike_attribution.py <bundle_dir | perf.jsonl> [...]
+"""
+
+import argparse
+import math
+import os
+from statistics import NormalDist
+
+import numpy as np
+
+from run_bundle import bundle_file_exists, default_runs_dir, find_bundles, iter_jsonl
+
+SPIKE_FEATURES = ("enemies_alive", "projectiles_alive", "draw_calls",
+                  "nodes_created_delta", "physics_time_ms", "node_count")
+MINUTE_FEATURES = ("enemies", "projectiles", "draw_calls", "node_count")
+
+# "cost of +N units" column, so per-unit costs of 0.00x ms stay readable
+UNIT_SCALE = {"enemies_alive": 100, "projectiles_alive": 100, "draw_calls": 100,
+              "nodes_created_delta": 100, "physics_time_ms": 1, "node_count": 1000,
+              "enemies": 100, "projectiles": 100}
+
+# fewer observations than this per coefficient give meaningless intervals
+MIN_ROWS_PER_COEF = 5
+# a counter the others explain this well (1 - R² < 1 / VIF) only adds rounding noise to the fit
+ALIASED_VIF = 1000
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# DATA
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _number(value):
+    return float(value) if isinstance(value, (int, float)) else math.nan
+
+def collect_rows(perf_logs):
+    """Read perf_spike and minute_report events into two numeric matrices.
+
+    Returns (spike_y, spike_X, minute_y, minute_X, minute_w) as numpy arrays;
+    rows with a missing counter are dropped.
+    """
+    spike_rows, minute_rows = [], []
+    for path in perf_logs:
+        if not bundle_file_exists(path):
+            continue
+        for e in iter_jsonl(path, ("perf_spike", "minute_report")):
+            if e.get('event') == 'perf_spike':
+                counters = e.get('counters', {})
+                spike_rows.append([_number(e.get('frame_time_ms'))] +
+                                  [_number(counters.get(name)) for name in SPIKE_FEATURES])
+            else:
+                sketch = e.get('frame_time_sketch') or {}
+                if sketch.get('count'):
+                    frame_ms, weight = sketch.get('sum_ms', 0) / sketch['count'], sketch['count']
+                else:
+                    frame_ms, weight = _number(e.get('frame_time_ms', {}).get('avg')), e.get('samples', 0)
+                minute_rows.append([frame_ms, _number(weight)] +
+                                   [_number(e.get(name, {}).get('avg')) for name in MINUTE_FEATURES])
+
+    spikes = np.array(spike_rows, dtype=float).reshape(-1, 1 + len(SPIKE_FEATURES))
+    spikes = spikes[np.isfinite(spikes).all(axis=1)]
+    minutes = np.array(minute_rows, dtype=float).reshape(-1, 2 + len(MINUTE_FEATURES))
+    minutes = minutes[np.isfinite(minutes).all(axis=1) & (minutes[:, 1] > 0)]
+    return spikes[:, 0], spikes[:, 1:], minutes[:, 0], minutes[:, 2:], minutes[:, 1]
+
+def perf_logs_for(targets):
+    """Bundle folders -> their perf.jsonl; files are taken as-is."""
+    return [os.path.join(t, "perf.jsonl") if os.path.isdir(t) else t for t in targets]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# REGRESSION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def t_critical(dof, confidence=0.95):
+    """Two-sided Student t critical value (Cornish-Fisher expansion of the normal one)."""
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    if dof <= 0:
+        return math.inf
+    return (z + (z ** 3 + z) / (4 * dof) + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * dof ** 2)
+            + (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / (384 * dof ** 3))
+
+def aliased_columns(A):
+    """Columns of A (intercept first) that the columns kept before them explain almost entirely: VIF
+    above ALIASED_VIF, which includes exact rank deficiency. Returns the kept column indices and
+    {j: (indices of the columns kept before it, its coefficients over them)}."""
+    keep, aliased = [], {}
+    for j in range(A.shape[1]):
+        target = A[:, j]
+        if not keep:
+            keep.append(j)
+            continue
+        coefs = np.linalg.lstsq(A[:, keep], target, rcond=None)[0]
+        ss_tot = float(((target - target.mean()) ** 2).sum())
+        ss_res = float(((target - A[:, keep] @ coefs) ** 2).sum())
+        if ss_tot == 0 or ss_res < ss_tot / ALIASED_VIF:
+            aliased[j] = (list(keep), coefs)
+        else:
+            keep.append(j)
+    return keep, aliased
+
+def fit_ols(y, X, weights=None, confidence=0.95):
+    """(Weighted) least squares with an intercept and HC1 robust standard errors.
+
+    Returns a dict with coef / se / ci_low / ci_high arrays (intercept first),
+    r2, n and the variance inflation factor of each feature. Features that
+    are (almost) linear combinations of the intercept and earlier features
+    cannot be separated from them: they are left out of the fit (NaN
+    coefficients) and listed in "aliased" as {feature index: (column
+    indices into coef, coefficients)}.
+    """
+    n, k = X.shape
+    A = np.column_stack([np.ones(n), X])
+    keep, aliased = aliased_columns(A)
+    w = np.ones(n) if weights is None else weights / weights.mean()
+    sw = np.sqrt(w)
+    Aw, yw = A[:, keep] * sw[:, None], y * sw
+    fitted, *_ = np.linalg.lstsq(Aw, yw, rcond=None)
+    resid = yw - Aw @ fitted
+
+    dof = n - len(keep)
+    bread = np.linalg.pinv(Aw.T @ Aw)
+    meat = (Aw * (resid ** 2)[:, None]).T @ Aw
+    cov = bread @ meat @ bread * (n / dof if dof > 0 else math.inf)
+    coef, se = np.full(k + 1, math.nan), np.full(k + 1, math.nan)
+    coef[keep] = fitted
+    se[keep] = np.sqrt(np.clip(np.diag(cov), 0, None))
+    half = t_critical(dof, confidence) * se
+
+    centered = yw - np.average(y, weights=w) * sw
+    ss_tot = float(centered @ centered)
+    r2 = 1 - float(resid @ resid) / ss_tot if ss_tot > 0 else math.nan
+    vif = np.full(k, math.nan)
+    features = [j - 1 for j in keep if j > 0]
+    vif[features] = variance_inflation(X[:, features])
+    return {"coef": coef, "se": se, "ci_low": coef - half, "ci_high": coef + half,
+            "r2": r2, "n": n, "vif": vif, "aliased": {j - 1: fit for j, fit in aliased.items() if j > 0}}
+
+def variance_inflation(X):
+    """VIF per column: how much collinearity with the other counters widens its interval."""
+    n, k = X.shape
+    vif = np.full(k, math.nan)
+    if n <= k + 1:
+        return vif
+    for j in range(k):
+        others = np.column_stack([np.ones(n), np.delete(X, j, axis=1)])
+        target = X[:, j]
+        fitted = others @ np.linalg.lstsq(others, target, rcond=None)[0]
+        ss_tot = float(((target - target.mean()) ** 2).sum())
+        if ss_tot > 0:
+            r2 = 1 - float(((target - fitted) ** 2).sum()) / ss_tot
+            vif[j] = 1 / max(1 - r2, 1e-12)
+    return vif
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# REPORT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _interval(low, high, digits):
+    return f"[{low:.{digits}f}, {high:.{digits}f}]"
+
+def _vif(value):
+    return ">999" if value > 999 else f"{value:.1f}"
+
+def _combination(names, columns, coefs):
+    """'a * x + b * y + c' over design columns (0 = intercept)"""
+    terms = [f"{c:.4g} * {names[col - 1]}" for col, c in zip(columns, coefs) if col > 0 and abs(c) > 1e-9]
+    terms += [f"{c:.4g}" for col, c in zip(columns, coefs) if col == 0 and abs(c) > 1e-9]
+    return " + ".join(terms).replace("+ -", "- ") or "0"
+
+def report_model(title, names, fit, X):
+    print(f"\n--- {title} (n={fit['n']}, R²={fit['r2']:.3f}) ---")
+    print(f"  {'counter':<22}{'ms/unit':>10}{'95% CI':>24}{'ms per +N':>16}{'at median':>12}{'VIF':>7}")
+    print(f"  {'(intercept)':<22}{fit['coef'][0]:>10.3f}{_interval(fit['ci_low'][0], fit['ci_high'][0], 3):>24}")
+    medians = np.median(X, axis=0)
+    ranked = []
+    for j, name in enumerate(names):
+        if j in fit['aliased']:
+            print(f"  {name:<22}{'aliased':>10}  ≈ {_combination(names, *fit['aliased'][j])}")
+            continue
+        c, lo, hi = fit['coef'][j + 1], fit['ci_low'][j + 1], fit['ci_high'][j + 1]
+        scale = UNIT_SCALE.get(name, 1)
+        flag = "" if lo > 0 or hi < 0 else "  (CI spans 0)"
+        per_n = f"+{scale}: {c * scale:.2f}"
+        print(f"  {name:<22}{c:>10.4f}{_interval(lo, hi, 4):>24}"
+              f"{per_n:>16}{c * medians[j]:>12.2f}{_vif(fit['vif'][j]):>7}{flag}")
+        if lo > 0:
+            ranked.append((c * medians[j], name))
+    if ranked:
+        print("  Optimize first (significant cost at median load): "
+              + ", ".join(f"{name} ({ms:.2f}ms)" for ms, name in sorted(ranked, reverse=True)))
+    if fit['aliased']:
+        print(f"  [!] {', '.join(names[j] for j in fit['aliased'])}: (almost) exact linear function(s) of the "
+              f"other counters, left out of the fit; the costs above include theirs")
+    if np.nanmax(fit['vif'], initial=0) > 10:
+        print("  [!] VIF > 10: counters move together, individual costs are poorly separated")
+
+def main():
+    parser = argparse.ArgumentParser(description="Attribute frame time to PerfTracker counters.")
+    parser.add_argument("targets", nargs="*", help="bundle folders (run_<id>) or perf JSONL files")
+    parser.add_argument("--runs", nargs="?", const=default_runs_dir(), metavar="RUNS_DIR",
+                        help="use every run_* bundle under RUNS_DIR (default: user://runs)")
+    parser.add_argument("--confidence", type=float, default=0.95, help="interval level (default 0.95)")
+    args = parser.parse_args()
+
+    targets = list(args.targets)
+    if args.runs:
+        targets.extend(path for path, _meta in find_bundles(args.runs))
+    if not targets:
+        parser.error("no perf logs given (pass bundle folders, perf JSONL files or --runs)")
+    perf_logs = perf_logs_for(targets)
+
+    spike_y, spike_X, minute_y, minute_X, minute_w = collect_rows(perf_logs)
+    print(f"SPIKE ATTRIBUTION: {len(perf_logs)} perf log(s), "
+          f"{len(spike_y)} perf_spike, {len(minute_y)} minute_report")
+
+    if len(spike_y) >= MIN_ROWS_PER_COEF * (len(SPIKE_FEATURES) + 1):
+        fit = fit_ols(spike_y, spike_X, confidence=args.confidence)
+        report_model("SPIKE MODEL: frame_time_ms at perf_spike", SPIKE_FEATURES, fit, spike_X)
+    else:
+        print(f"\n  Not enough perf_spike events for the spike model "
+              f"(need {MIN_ROWS_PER_COEF * (len(SPIKE_FEATURES) + 1)})")
+
+    if len(minute_y) >= MIN_ROWS_PER_COEF * (len(MINUTE_FEATURES) + 1):
+        fit = fit_ols(minute_y, minute_X, weights=minute_w, confidence=args.confidence)
+        report_model("MINUTE MODEL: mean frame time per minute_report", MINUTE_FEATURES, fit, minute_X)
+    else:
+        print(f"\n  Not enough minute_report events for the minute model "
+              f"(need {MIN_ROWS_PER_COEF * (len(MINUTE_FEATURES) + 1)})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1005 @@
+#!/usr/bin/env python3
+"""
+Synthetic run bundles for testing and benchmarking the analysis tools.
+
+Writes run_<id>/ folders shaped like the ones RunBundleManager leaves in
+user://runs (meta.json, summary.json, integrity.json, a pending
+event_index.json, the two markdown reports) with the four logs in the
+schemas of the trackers that write them:
+
+    audit.jsonl          RunAuditTracker   run_start, minute_snapshot, player_death, run_end
+    balance.jsonl        BalanceTelemetry  run_start, minute_snapshot, upgrade_pick, weapon_level_up,
+                                           chest_opened, elite_spawned, boss_spawned, run_end
+    perf.jsonl           PerfTracker       session_start, minute_report, perf_spike
+    upgrade_audit.jsonl  UpgradeAuditor    upgrade_audit, weapon_audit, global_weapon_upgrade_audit
+
+Weapon, upgrade, enemy and character ids come from the game's data tables
+(through gd_const), so reports keyed by id group the way real ones do. Key
+order, compact separators and the common fields each tracker appends follow
+the GDScript emitters.
+
+Size and mix:
+    --events N   total events in the corpus (10k .. 10M)
+    --runs R     number of bundles; by default as many runs of --minutes
+                 length as it takes to reach N at the --mix rates
+    --mix        events per gameplay minute of the non-periodic types, e.g.
+                 perf_spike=6,chest_opened=1 (see DEFAULT_RATES); with --runs
+                 the rates are scaled to hit --events, keeping their ratios
+Every bundle seeds its own RNG from --seed and its index, so the output is
+the same for any --workers. corpus.json in OUT_DIR records the parameters
+and the event count of every log (tools/bench_tools.py reads it).
+
+Usage:
+    python tools/synth_bundles.py OUT_DIR [--events 100000] [--runs N] [--seed 1]
+                                  [--mix perf_spike=6,upgrade_audit=3] [--minutes 5-30] [--workers N] [--force]
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from gd_const import load_consts, project_root
+
+GENERATOR_VERSION = 1
+CORPUS_FILE = "corpus.json"
+LOGS = ("audit", "balance", "perf", "upgrade_audit")
+
+# Non-periodic events: log they go to and default rate per gameplay minute
+# (roughly what a 20-minute debug run produces)
+SPORADIC_LOG = {
+    "upgrade_pick": "balance", "weapon_level_up": "balance", "chest_opened": "balance",
+    "elite_spawned": "balance", "boss_spawned": "balance",
+    "perf_spike": "perf",
+    "upgrade_audit": "upgrade_audit", "weapon_audit": "upgrade_audit",
+    "global_weapon_upgrade_audit": "upgrade_audit",
+}
+DEFAULT_RATES = {
+    "upgrade_pick": 2.0, "weapon_level_up": 0.9, "chest_opened": 0.4, "elite_spawned": 0.2,
+    "boss_spawned": 0.1, "perf_spike": 1.5, "upgrade_audit": 1.4, "weapon_audit": 0.8,
+    "global_weapon_upgrade_audit": 0.3,
+}
+
+BASE_EPOCH = 1767225600  # 2026-01-01, keeps start timestamps reproducible
+GAME_VERSION = "0.1.0"
+GODOT_VERSION = "4.3-stable (official)"
+STAT_SNAPSHOT = ("max_health", "hp_regen", "life_steal", "armor", "damage_reduction", "dodge_chance",
+                 "attack_speed_mult", "damage_mult", "crit_chance", "crit_damage", "move_speed")
+SPIKE_CAUSES = ("unknown", "wave_spawn", "enemy_burst", "high_instantiation", "massive_instantiation",
+                "physics_overload", "boss_spawn", "wave_start")
+PERF_LOG_EVENTS = ("enemy_spawn", "vfx_spawn", "vfx_return", "wave_start", "wave_end", "chunk_load", "chunk_unload")
+SKETCH_RELATIVE_ACCURACY = 0.01
+SKETCH_GAMMA = (1.0 + SKETCH_RELATIVE_ACCURACY) / (1.0 - SKETCH_RELATIVE_ACCURACY)
+STUTTER_BUDGET_MS = 1000.0 / 60.0
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# GAME DATA
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class Catalog:
+    """Ids and names from the .gd data tables."""
+
+    def __init__(self, root=None):
+        root = root or project_root()
+
+        def consts(rel):
+            return load_consts(os.path.join(root, rel))
+
+        wdb = consts("scripts/data/WeaponDatabase.gd")
+        udb = consts("scripts/data/UpgradeDatabase.gd")
+        wud = consts("scripts/data/WeaponUpgradeDatabase.gd")
+        edb = consts("scripts/data/EnemyDatabase.gd")
+        self.characters = consts("scripts/data/CharacterDatabase.gd")["CHARACTERS"]
+        self.base_stats = consts("scripts/core/PlayerStats.gd")["BASE_STATS"]
+
+        self.weapons = {wid: w.get("name", wid) for wid, w in wdb["WEAPONS"].items()}
+        self.max_weapon_level = int(wdb.get("MAX_WEAPON_LEVEL", 8))
+        self.fusions = [f for f in wdb.get("FUSIONS", {}).values() if len(f.get("components", [])) == 2]
+        self.weapon_names = dict(self.weapons, **{f["id"]: f.get("name", f["id"]) for f in self.fusions})
+        self.player_upgrades = [dict(u, category=u.get("category", table.split("_")[0].lower()))
+                                for table in ("DEFENSIVE_UPGRADES", "UTILITY_UPGRADES", "OFFENSIVE_UPGRADES",
+                                              "CURSED_UPGRADES", "UNIQUE_UPGRADES")
+                                for u in udb.get(table, {}).values()]
+        self.global_upgrades = list(wud["GLOBAL_UPGRADES"].values())
+        self.enemies_by_tier = {}
+        for tier in (1, 2, 3, 4):
+            self.enemies_by_tier[tier] = [(eid, e.get("name", eid), e.get("special_abilities", []))
+                                          for eid, e in edb.get(f"TIER_{tier}_ENEMIES", {}).items()]
+        self.tier_minutes = {int(k): float(v) for k, v in edb.get("TIER_SPAWN_TIMES", {}).items()}
+        self.bosses = [(bid, b.get("name", bid), b.get("phases", 1)) for bid, b in edb.get("BOSSES", {}).items()]
+        self.elite_abilities = list(edb.get("ELITE_CONFIG", {}).get("extra_abilities", []))
+        self.snapshot_stats = [s for s in STAT_SNAPSHOT if s in self.base_stats]
+
+    def enemies_at(self, t_min):
+        tiers = [t for t, start in sorted(self.tier_minutes.items()) if start <= t_min] or [1]
+        return [e for t in tiers for e in self.enemies_by_tier.get(t, [])]
+
+_catalog = None
+
+def catalog():
+    global _catalog
+    if _catalog is None:
+        _catalog = Catalog()
+    return _catalog
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CORPUS PLAN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def periodic_events(minutes, death):
+    """Events every run writes regardless of the mix, per log."""
+    return {
+        "audit": minutes + 1 + 2 + (1 if death else 0),   # run_start, minute ticks + final tick, run_end, death
+        "balance": minutes + 2,                            # run_start, minute snapshots, run_end
+        "perf": minutes + 1,                               # session_start, minute reports
+        "upgrade_audit": 0,
+    }
+
+def _split(total, weights):
+    """Integer split of total proportional to weights (cumulative rounding: sums exactly)."""
+    keys = sorted(weights)
+    weight_sum = sum(weights.values())
+    result, done, acc = {}, 0, 0.0
+    for key in keys:
+        acc += weights[key]
+        n = round(total * acc / weight_sum) - done if weight_sum else 0
+        result[key] = n
+        done += n
+    return result
+
+def plan_corpus(events, runs=None, seed=1, rates=None, minutes=(5, 30)):
+    """Per-bundle jobs: minutes, death, start timestamp and the count of each non-periodic event."""
+    rng = random.Random(seed)
+    rates = {k: v for k, v in (rates or DEFAULT_RATES).items() if v > 0}
+    per_minute = sum(rates.values())
+    plan, expected = [], 0.0
+    while (len(plan) < runs) if runs else (expected < events or not plan):
+        m = rng.randint(*minutes)
+        death = rng.random() < 0.9
+        plan.append((m, death))
+        expected += sum(periodic_events(m, death).values()) + per_minute * m
+
+    fixed = sum(sum(periodic_events(m, d).values()) for m, d in plan)
+    sporadic = max(0, events - fixed) if rates else 0
+    total_minutes = sum(m for m, _d in plan)
+    jobs, done, acc, start = [], 0, 0, BASE_EPOCH
+    for index, (m, death) in enumerate(plan):
+        acc += m
+        n = round(sporadic * acc / total_minutes) - done
+        done += n
+        weights = {k: w * rng.uniform(0.5, 1.5) for k, w in rates.items()}
+        jobs.append({"index": index, "seed": seed, "minutes": m, "death": death,
+                     "start_timestamp": start, "counts": _split(n, weights)})
+        start += m * 60 + rng.randint(30, 3600)
+    return jobs
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ONE RUN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _dumps(data):
+    # Godot's JSON.stringify: insertion order, no spaces, raw UTF-8
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+
+def _gen_id(rng, unix_time):
+    return "%08x-%04x" % (int(unix_time), rng.getrandbits(16))
+
+
+class SyntheticRun:
+    """Game state for one run, advanced in time order while its events are written."""
+
+    def __init__(self, job):
+        self.cat = catalog()
+        self.rng = rng = random.Random(f"{job['seed']}:{job['index']}")
+        self.minutes = job["minutes"]
+        self.death = job["death"]
+        self.start_ts = job["start_timestamp"]
+        self.session_id = _gen_id(rng, self.start_ts - rng.randint(5, 600))
+        self.run_id = _gen_id(rng, self.start_ts)
+        self.seed = rng.getrandbits(31)
+        self.balance_run_id = job["index"] + 1
+        self.start_ticks = rng.randint(8000, 400000)
+        self.character_id = rng.choice(sorted(self.cat.characters))
+        start_weapon = self.cat.characters[self.character_id].get("starting_weapon") or next(iter(self.cat.weapons))
+        self.starting_weapons = [start_weapon]
+        self.skill = rng.uniform(0.6, 1.4)
+        self.lines = {log: [] for log in LOGS}
+        self.counts = {log: 0 for log in LOGS}
+
+        self.t = 0.0
+        self.level = 1
+        self.weapons = {start_weapon: 1}
+        self.fused = {}
+        self.weapon_stats = {}
+        self.enemy_stats = {}
+        self.upgrades = []
+        self.picks = []
+        self.level_timeline = []
+        self.stats = {s: self.cat.base_stats[s] for s in self.cat.snapshot_stats}
+        self.totals = dict(kills=0, elites=0, bosses=0, damage=0, taken=0, healing=0, gold=0, xp=0, dodges=0)
+        self.prev = dict(self.totals, level=1)
+        self.chests = {"normal": 0, "elite": 0, "boss": 0}
+        self.chests_last_60s = 0
+        self.rerolls = 0
+        self.rerolls_last_60s = 0
+        self.fusions = 0
+        self.spikes_33 = self.spikes_66 = self.spikes_minute = 0
+        self.spike_frames = []  # (t, frame ms) of this minute's perf_spikes, folded into its sketch
+        self.pickup_num = 0
+        self.audit_counts = {"ok": 0, "warn": 0, "fail": 0, "dead_stat": 0}
+        self.frame = 0
+
+    # --- helpers -------------------------------------------------------------
+
+    def _emit(self, log, event):
+        self.lines[log].append(_dumps(event))
+        self.counts[log] += 1
+
+    @property
+    def t_min(self):
+        return self.t / 60.0
+
+    @property
+    def ticks(self):
+        return self.start_ticks + int(self.t * 1000)
+
+    def _phase(self):
+        return min(5, 1 + int(self.t_min // 5))
+
+    def _difficulty(self):
+        m = self.t_min
+        return {"enemy_hp_mult": round(1.0 + 0.09 * m, 2), "enemy_dmg_mult": round(1.0 + 0.05 * m, 2),
+                "spawn_mult": round(1.0 + 0.07 * m, 2), "elite_mult": round(1.0 + 0.03 * m, 2),
+                "speed_mult": round(1.0 + 0.01 * m, 2)}
+
+    def _score(self):
+        return self.totals["kills"] * 10 + self.totals["elites"] * 100 + self.totals["bosses"] * 1000 + int(self.t)
+
+    def _balance(self, event):
+        event.update({"schema_version": 1, "session_id": self.session_id, "run_id": self.run_id,
+                      "timestamp_ms": int(self.t * 1000), "t_min": round(self.t_min, 2), "seed": self.seed,
+                      "difficulty_phase": self._phase(), "player_level": self.level,
+                      "score_current": self._score()})
+        self._emit("balance", event)
+
+    def _audit(self, event):
+        event.update({"timestamp_ms": int(self.t * 1000), "run_id": self.run_id, "session_id": self.session_id})
+        self._emit("audit", event)
+
+    def _perf(self, event):
+        event.update({"run_id": self.run_id, "session_id": self.session_id})
+        if "timestamp" in event:
+            event["timestamp_abs_ms"] = event["timestamp"]
+            event["timestamp_ms"] = event["timestamp"] - self.start_ticks
+        self._emit("perf", event)
+
+    def _upgrade_audit(self, event):
+        event["run_id"] = self.run_id
+        self._emit("upgrade_audit", event)
+
+    def _weapon_row(self, wid):
+        row = self.weapon_stats.get(wid)
+        if row is None:
+            row = self.weapon_stats[wid] = {"damage_total": 0, "hits_total": 0, "crits_total": 0, "kills": 0,
+                                            "status_procs": {}, "last_60s": 0}
+        return row
+
+    def _weapon_dicts(self):
+        result = []
+        for wid, row in self.weapon_stats.items():
+            d = {"weapon_id": wid, "weapon_name": self.cat.weapon_names.get(wid, wid),
+                 "damage_total": row["damage_total"], "hits_total": row["hits_total"],
+                 "crits_total": row["crits_total"],
+                 "crit_rate": round(row["crits_total"] / row["hits_total"], 4) if row["hits_total"] else 0.0,
+                 "kills": row["kills"], "status_procs": dict(row["status_procs"]),
+                 "dps_last_60s": round(row["last_60s"] / 60.0, 2)}
+            if wid in self.fused:
+                d["status"] = "fused"
+                d["fused_into"] = self.fused[wid]
+                continue
+            result.append(d)
+        result.sort(key=lambda d: -d["damage_total"])
+        return result[:10]
+
+    def _enemy_dicts(self):
+        result = []
+        for eid, row in self.enemy_stats.items():
+            attacks = sorted(({"attack_id": a, "damage": v[0], "hits": v[1]} for a, v in row["attacks"].items()),
+                             key=lambda a: -a["damage"])[:5]
+            result.append({"enemy_id": eid, "enemy_name": row["name"], "damage_to_player": row["damage"],
+                           "hits_to_player": row["hits"], "kills_caused": row["kills_caused"],
+                           "spawns": row["spawns"], "top_attacks": attacks})
+        result.sort(key=lambda d: -d["damage_to_player"])
+        return result[:10]
+
+    def _top_scopes(self, n):
+        rng = self.rng
+        calls = rng.randint(3000, 9000)
+        avg = rng.uniform(0.05, 0.6) * (1 + self.t_min / 20)
+        return [{"name": "EnemyAI", "total_ms": round(avg * calls, 3), "avg_ms": round(avg, 4),
+                 "max_ms": round(avg * rng.uniform(3, 12), 3), "min_ms": round(avg * 0.2, 4), "calls": calls}][:n]
+
+    def _counters(self):
+        rng = self.rng
+        enemies = int(20 + self.t_min * 14 * rng.uniform(0.7, 1.3))
+        projectiles = int(10 + len(self.weapons) * 25 * rng.uniform(0.5, 1.5))
+        pickups, particles = rng.randint(0, 120), rng.randint(0, 400)
+        # correlated like the game's counters, never exact functions of each other:
+        # batching varies draw calls, pooled / orphan nodes vary the node counts
+        objects_nodes = 1500 + enemies * 6 + projectiles * 3 + pickups * 2 + rng.randint(0, 300)
+        return {"enemies_alive": enemies, "enemies_spawned_total": int(self.totals["kills"] * 1.1) + enemies,
+                "projectiles_alive": projectiles, "projectiles_spawned_total": projectiles * int(1 + self.t),
+                "pickups_alive": pickups, "particles_alive": particles,
+                "draw_calls": max(1, int(150 + enemies * 0.8 + projectiles * 0.5 + particles * 0.05
+                                         + rng.gauss(0, 20))),
+                "objects_nodes": objects_nodes,
+                "nodes_created_delta": rng.choice((0, 0, 1, 3, 12, 40, 80, 160)),
+                "memory_static_mb": round(180.0 + self.t_min * 1.6 + rng.uniform(0, 4), 3),
+                "physics_time_ms": round(rng.uniform(0.5, 4.0) * (1 + self.t_min / 15), 3),
+                "node_count": objects_nodes - rng.randint(60, 400)}
+
+    # --- periodic ------------------------------------------------------------
+
+    def begin(self):
+        self.t = 0.0
+        start_iso = time.strftime("%Y-%m-%d_%H-%M-%S", time.gmtime(self.start_ts))
+        self.start_iso = start_iso
+        perf_session = {"event": "session_start", "schema_version": 3, "os": "Windows",
+                        "cpu": "AMD Ryzen 7 5800X 8-Core Processor", "gpu": "NVIDIA GeForce RTX 3070",
+                        "godot_version": GODOT_VERSION, "timestamp": float(self.start_ts - 120),
+                        "run_id": self.run_id}
+        self._emit("perf", perf_session)
+        self._audit({"event": "run_start", "schema_version": 1, "session_id": self.session_id,
+                     "run_id": self.run_id, "seed": self.seed, "character_id": self.character_id,
+                     "starting_weapons": self.starting_weapons, "game_version": GAME_VERSION})
+        self._balance({"event": "run_start", "run_id": self.run_id, "balance_run_id": self.balance_run_id,
+                       "character_id": self.character_id, "starting_weapons": self.starting_weapons,
+                       "game_version": GAME_VERSION, "seed": self.seed})
+
+    def advance(self, t):
+        """Accumulate combat between self.t and t."""
+        dt = t - self.t
+        if dt <= 0:
+            return
+        rng = self.rng
+        m = self.t_min
+        owned = [w for w in self.weapons if w not in self.fused]
+        dps = self.skill * (12 + 4 * m) * (1 + 0.35 * len(owned)) * self.stats.get("damage_mult", 1.0)
+        for wid in owned:
+            dealt = int(dps * dt / len(owned) * rng.uniform(0.6, 1.4) * (1 + 0.15 * self.weapons[wid]))
+            hits = max(1, dealt // max(1, 8 + 3 * self.weapons[wid]))
+            row = self._weapon_row(wid)
+            row["damage_total"] += dealt
+            row["last_60s"] += dealt
+            row["hits_total"] += hits
+            row["crits_total"] += int(hits * self.stats.get("crit_chance", 0.05))
+            self.totals["damage"] += dealt
+        kills = int(dt * (0.8 + 0.25 * m) * self.skill * rng.uniform(0.7, 1.3))
+        self.totals["kills"] += kills
+        for wid in owned:
+            self._weapon_row(wid)["kills"] += kills // max(1, len(owned))
+        self.totals["xp"] += kills * (1 + int(m // 5))
+        self.totals["gold"] += int(kills * 0.3)
+        self.totals["healing"] += int(dt * 0.2)
+        self.totals["dodges"] += int(dt * 0.05 * rng.random())
+        pool = self.cat.enemies_at(m)
+        for _ in range(max(1, int(dt / 10))):
+            eid, name, abilities = rng.choice(pool)
+            row = self.enemy_stats.get(eid)
+            if row is None:
+                row = self.enemy_stats[eid] = {"name": name, "damage": 0, "hits": 0, "kills_caused": 0,
+                                               "spawns": 0, "attacks": {}}
+            row["spawns"] += rng.randint(5, 40)
+            if rng.random() < 0.6:
+                dmg = int(rng.uniform(3, 12) * (1 + m / 6))
+                attack = rng.choice(["contact"] + list(abilities))
+                row["damage"] += dmg
+                row["hits"] += 1
+                hit = row["attacks"].setdefault(attack, [0, 0])
+                hit[0] += dmg
+                hit[1] += 1
+                self.totals["taken"] += dmg
+        while self.level_timeline_due():
+            pass
+        self.t = t
+
+    def level_timeline_due(self):
+        needed = 5 * self.level * self.level
+        if self.totals["xp"] < needed:
+            return False
+        self.level += 1
+        self.level_timeline.append({"t_min": round(self.t_min, 2), "level": self.level})
+        return True
+
+    def minute_tick(self, minute):
+        rng = self.rng
+        self.spikes_minute = min(self.spikes_minute, 10)
+        self._audit({"event": "minute_snapshot", "t_min": minute, "data": {
+            "weapons": self._weapon_dicts(),
+            "enemies_dangerous": self._enemy_dicts(),
+            "performance": {"top_scopes": self._top_scopes(5), "spikes_33ms": self.spikes_33,
+                            "spikes_66ms": self.spikes_66, "spikes_this_minute": self.spikes_minute},
+            "player_stats": {k: round(v, 4) if isinstance(v, float) else v for k, v in self.stats.items()},
+            "difficulty": self._difficulty(),
+            "economy": {"chests": dict(self.chests), "fusions": self.fusions, "rerolls": self.rerolls},
+        }})
+        if minute > self.minutes:
+            return  # end_run's final tick only goes to the audit log
+
+        totals, prev = self.totals, self.prev
+        delta = {k: max(0, totals[k] - prev[k]) for k in totals}
+        levels = max(0, self.level - prev["level"])
+        event = {
+            "event": "minute_snapshot",
+            "progression": {"xp_earned_total": totals["xp"], "xp_gained_last_60s": delta["xp"],
+                            "xp_per_min": float(delta["xp"]), "level": self.level,
+                            "levels_gained_last_60s": levels, "levels_per_min": float(levels)},
+            "combat": {"dps_est": delta["damage"] / 60.0, "damage_dealt_total": totals["damage"],
+                       "damage_done_last_60s": delta["damage"], "damage_taken_total": totals["taken"],
+                       "damage_taken_last_60s": delta["taken"], "healing_total": totals["healing"],
+                       "healing_done_last_60s": delta["healing"], "kills_total": totals["kills"],
+                       "kills_last_60s": delta["kills"], "elites_killed_total": totals["elites"],
+                       "elites_killed_last_60s": delta["elites"], "bosses_killed_total": totals["bosses"],
+                       "bosses_killed_last_60s": delta["bosses"], "dodges_total": totals["dodges"],
+                       "active_enemies": int(20 + minute * 14 * rng.uniform(0.7, 1.3))},
+            "economy": {"gold_total": totals["gold"], "gold_gained_last_60s": delta["gold"],
+                        "rerolls_used_last_60s": self.rerolls_last_60s, "rerolls_total": self.rerolls,
+                        "chests_opened_last_60s": self.chests_last_60s, "fusions_obtained_total": self.fusions},
+            "difficulty": self._difficulty(),
+            "build": {"weapons": [{"id": w, "lvl": lvl} for w, lvl in self.weapons.items() if w not in self.fused],
+                      "top_upgrades": self._top_upgrades(),
+                      "stats": {k: round(v, 4) if isinstance(v, float) else v for k, v in self.stats.items()}},
+        }
+        hp_max = int(self.stats.get("max_health", 100))
+        event["hp_current"] = max(1, int(hp_max * rng.uniform(0.2, 1.0)))
+        event["hp_max"] = hp_max
+        self._balance(event)
+        self.prev = dict(totals, level=self.level)
+        self.rerolls_last_60s = self.chests_last_60s = 0
+        self._perf(self._minute_report(minute))
+        self.spikes_minute = 0
+        self.spike_frames = []
+        for row in self.weapon_stats.values():
+            row["last_60s"] = 0
+
+    def _top_upgrades(self):
+        counts = {}
+        for uid in self.upgrades:
+            counts[uid] = counts.get(uid, 0) + 1
+        ranked = sorted(counts.items(), key=lambda kv: -kv[1])[:10]
+        return [{"id": uid, "stacks": n} for uid, n in ranked]
+
+    def _minute_report(self, minute):
+        rng = self.rng
+        load = 1.0 + minute / 25.0
+        base_ms = rng.uniform(14.5, 16.2) * load
+        # PerfTracker records every frame, so this minute's perf_spike frames are in its sketch
+        # and take their share of the minute
+        spikes = self.spike_frames
+        frames = int(max(1000.0, 60 * 1000 - sum(ft for _t, ft in spikes)) / base_ms)
+        sample = sorted(max(0.1, rng.lognormvariate(math.log(base_ms), 0.12)) for _ in range(48))
+        buckets = {}
+        for ft in sample:
+            k = int(math.ceil(math.log(ft) / math.log(SKETCH_GAMMA)))
+            buckets[str(k)] = buckets.get(str(k), 0) + 1
+        scale = frames / len(sample)
+        buckets = {k: max(1, int(round(n * scale))) for k, n in buckets.items()}
+        regular = sum(buckets.values())
+        for _t, ft in spikes:
+            k = str(int(math.ceil(math.log(ft) / math.log(SKETCH_GAMMA))))
+            buckets[k] = buckets.get(k, 0) + 1
+        count = regular + len(spikes)
+        frame_max = max([sample[-1]] + [ft for _t, ft in spikes])
+        fps = [1000.0 / ft for ft in sample]
+        enemies = [int(20 + minute * 14 * rng.uniform(0.6, 1.3)) for _ in range(4)]
+        projectiles = [int(10 + len(self.weapons) * 25 * rng.uniform(0.4, 1.5)) for _ in range(4)]
+        draw_calls = [max(1, int(150 + e * 0.8 + p * 0.5 + rng.gauss(0, 20))) for e, p in zip(enemies, projectiles)]
+        memory = sorted(round(180.0 + (minute - 1 + i / 4) * 1.6, 3) for i in range(4))
+        nodes = [1400 + e * 6 + p * 3 + rng.randint(0, 300) for e, p in zip(enemies, projectiles)]
+        over = [ft for ft in sample if ft > STUTTER_BUDGET_MS]
+        base_over = sum(ft - STUTTER_BUDGET_MS for ft in over) * 0.4
+        base_frames = len(over) // 4 + 1 if over else 0
+        worst = None  # (over ms, frames over, max frame ms, window start s) of the worst 1 s window
+        if over:
+            worst = (base_over, base_frames, max(over), (minute - 1) * 60 + rng.uniform(0, 60))
+        windows = {}
+        for t, ft in spikes:
+            w = windows.setdefault(int(t), [base_over, base_frames, max(over, default=0.0)])
+            w[0] += ft - STUTTER_BUDGET_MS
+            w[1] += 1
+            w[2] = max(w[2], ft)
+        for start, (over_ms, frames_over, max_ms) in windows.items():
+            if worst is None or over_ms > worst[0]:
+                worst = (over_ms, frames_over, max_ms, start)
+        stutter = {"over_budget_ms": 0.0, "budget_ms": STUTTER_BUDGET_MS, "window_ms": 1000}
+        if worst:
+            stutter.update(over_budget_ms=round(worst[0], 2), frames_over=worst[1],
+                           max_frame_ms=round(worst[2], 2), window_start_s=round(worst[3], 1))
+
+        def agg(values, digits=None):
+            avg = sum(values) / len(values)
+            return {"min": min(values), "max": max(values), "avg": round(avg, digits) if digits else avg}
+
+        memory_agg = agg(memory, 3)
+        memory_agg["growth"] = round(memory[-1] - memory[0], 3)
+        return {
+            "event": "minute_report", "schema_version": 3,
+            "timestamp": float(self.start_ts + minute * 60), "t_min": round(minute + rng.uniform(0, 0.02), 2),
+            "player_level": self.level, "samples": 360,
+            "fps": {"min": int(min(fps)), "max": int(max(fps)), "avg": round(sum(fps) / len(fps), 3)},
+            "frame_time_ms": {"min": round(sample[0], 3), "max": round(sample[-1], 3),
+                              "avg": round(sum(sample) / len(sample), 3)},
+            "projectiles": agg(projectiles), "enemies": agg(enemies), "draw_calls": agg(draw_calls),
+            "memory_mb": memory_agg, "node_count": agg(nodes),
+            "frame_time_sketch": {"relative_accuracy": SKETCH_RELATIVE_ACCURACY, "gamma": SKETCH_GAMMA,
+                                  "min_ms": 0.1, "count": count,
+                                  "sum_ms": round(base_ms * regular + sum(ft for _t, ft in spikes), 2),
+                                  "min": round(sample[0], 3), "max": round(frame_max, 3), "buckets": buckets},
+            "stutter": stutter,
+            "projectile_pool": {"active": projectiles[-1], "pooled": rng.randint(50, 400),
+                                "degradation_level": 0 if minute < 15 else rng.randint(0, 2)},
+        }
+
+    def end(self):
+        rng = self.rng
+        self.t = self.minutes * 60.0 + rng.uniform(1, 59)
+        killer = rng.choice(self.cat.enemies_at(self.t_min))
+        end_reason = "death" if self.death else "quit"
+        killed_by = killer[0] if self.death else "unknown"
+        self.minute_tick(self.minutes + 1)
+        if self.death:
+            killer_attack = rng.choice(["contact"] + list(killer[2]))
+            window = [{"t": round(self.t - i * 0.4, 2), "amount": rng.randint(5, 40), "source": killer[0]}
+                      for i in range(rng.randint(3, 12))]
+            self._audit({"event": "player_death", "run_id": self.run_id, "killer": killer[0],
+                         "killer_attack": killer_attack, "killer_damage_type": "physical",
+                         "killer_source_kind": "melee" if killer_attack == "contact" else "ability",
+                         "killing_blow_damage": window[0]["amount"], "killing_blow_element": "physical",
+                         "window_duration_s": 5.0, "total_damage_in_window": sum(w["amount"] for w in window),
+                         "hits_in_window": len(window), "active_status_effects": [],
+                         "player_position": "Vector2(%.1f, %.1f)" % (rng.uniform(-2000, 2000), rng.uniform(-2000, 2000)),
+                         "enemy_density": rng.randint(20, 300), "last_damage_window": window})
+        summary = {
+            "duration_minutes": self.minutes + 1, "final_level": self.level, "phase_reached": self._phase(),
+            "score_final": self._score(),
+            "damage": {"dealt_total": self.totals["damage"], "taken_total": self.totals["taken"]},
+            "weapons": {"top_10": self._weapon_dicts(), "total_equipped": len(self.weapon_stats)},
+            "enemies": {"top_10_dangerous": self._enemy_dicts()},
+            "economy": {"chests_opened": dict(self.chests), "fusions_obtained": self.fusions,
+                        "rerolls_used": self.rerolls, "gold_spent": 0},
+            "upgrades": {"picks_count": len(self.picks), "timeline": self.picks},
+            "level_timeline": self.level_timeline,
+            "performance": {"spikes_33ms_total": self.spikes_33, "spikes_66ms_total": self.spikes_66,
+                            "top_scopes_run": self._top_scopes(10), "spike_samples": []},
+            "elite_ability_combos": {}, "score_snapshots": [], "player_stats_history": [], "difficulty_history": [],
+        }
+        self._audit({"event": "run_end", "run_id": self.run_id, "time_survived": round(self.t, 3),
+                     "end_reason": end_reason, "killed_by": killed_by, "duration_s": round(self.t + 4.2, 3),
+                     "summary": summary})
+        weapons = [{"id": w, "lvl": lvl} for w, lvl in self.weapons.items() if w not in self.fused]
+        self._balance({
+            "event": "run_end", "time_survived": round(self.t, 3), "duration_s": round(self.t + 4.2, 3),
+            "score_final": self._score(), "end_reason": end_reason, "killed_by": killed_by,
+            "final_stats": {"level": self.level, "kills": self.totals["kills"], "elites_killed": self.totals["elites"],
+                            "bosses_killed": self.totals["bosses"], "gold": self.totals["gold"],
+                            "damage_dealt": self.totals["damage"], "damage_taken": self.totals["taken"],
+                            "healing_done": self.totals["healing"], "xp_earned_total": self.totals["xp"]},
+            "build_final": {"weapons": weapons, "upgrades": self._top_upgrades(), "player_stats": dict(self.stats)},
+            "economy": {"rerolls_used": self.rerolls, "chests_opened": sum(self.chests.values()),
+                        "fusions_obtained": self.fusions},
+            "difficulty_final": self._difficulty(),
+        })
+        return end_reason, killed_by, weapons
+
+    # --- non-periodic --------------------------------------------------------
+
+    def upgrade_pick(self):
+        rng = self.rng
+        options = rng.sample(self.cat.player_upgrades, k=min(4, len(self.cat.player_upgrades)))
+        rerolls = 1 if rng.random() < 0.1 else 0
+        self.rerolls += rerolls
+        self.rerolls_last_60s += rerolls
+        picked = rng.choice(options)
+        self.upgrades.append(picked["id"])
+        self._apply_effects(picked)
+        source = rng.choices(("levelup", "chest_elite", "chest_boss"), (90, 8, 2))[0]
+        self.picks.append({"t_min": round(self.t_min, 2), "id": picked["id"], "source": source})
+        self._balance({"event": "upgrade_pick", "source": source, "options_shown": [o["id"] for o in options],
+                       "picked_id": picked["id"], "picked_type": "upgrade", "reroll_count_this_pick": rerolls,
+                       "rerolls_total": self.rerolls})
+
+    def _apply_effects(self, upgrade):
+        for effect in upgrade.get("effects", []):
+            stat = effect.get("stat")
+            value = effect.get("value", 0)
+            if stat not in self.stats or not isinstance(value, (int, float)):
+                continue
+            if effect.get("operation") == "multiply":
+                self.stats[stat] *= value
+            else:
+                self.stats[stat] += value
+
+    def weapon_level_up(self):
+        rng = self.rng
+        owned = [w for w, lvl in self.weapons.items() if w not in self.fused and lvl < self.cat.max_weapon_level]
+        if not owned or (len(self.weapons) < 6 and rng.random() < 0.25):
+            fresh = [w for w in self.cat.weapons if w not in self.weapons]
+            if fresh:
+                wid = rng.choice(fresh)
+                self.weapons[wid] = 1
+                owned = [wid]
+        wid = rng.choice(owned) if owned else rng.choice(list(self.weapons))
+        before = self.weapons[wid]
+        self.weapons[wid] = min(self.cat.max_weapon_level, before + 1)
+        self._balance({"event": "weapon_level_up", "weapon_id": wid, "level_before": before,
+                       "level_after": self.weapons[wid]})
+
+    def chest_opened(self):
+        rng = self.rng
+        chest_type = rng.choices(("normal", "elite", "boss"), (80, 15, 5))[0]
+        self.chests[chest_type] += 1
+        self.chests_last_60s += 1
+        fusion = chest_type != "normal" and rng.random() < 0.2
+        loot = [u["id"] for u in rng.sample(self.cat.player_upgrades, k=rng.randint(1, 3))]
+        if fusion and self.cat.fusions:
+            fusion_def = rng.choice(self.cat.fusions)
+            for component in fusion_def["components"]:
+                if component in self.weapons:
+                    self.fused[component] = fusion_def["id"]
+            self.weapons[fusion_def["id"]] = 1
+            self.fusions += 1
+            loot = [fusion_def["id"]]
+        self._balance({"event": "chest_opened", "chest_type": chest_type, "loot_ids": loot,
+                       "fusion_obtained": fusion})
+
+    def elite_spawned(self):
+        rng = self.rng
+        eid, _name, _abilities = rng.choice(self.cat.enemies_at(self.t_min))
+        tier = next((t for t, enemies in self.cat.enemies_by_tier.items() if any(e[0] == eid for e in enemies)), 1)
+        abilities = rng.sample(self.cat.elite_abilities, k=min(len(self.cat.elite_abilities), rng.randint(1, 3)))
+        if rng.random() < 0.7:
+            self.totals["elites"] += 1
+        self._balance({"event": "elite_spawned", "enemy_id": eid, "tier": tier, "abilities": abilities})
+
+    def boss_spawned(self):
+        rng = self.rng
+        boss_id, _name, phases = rng.choice(self.cat.bosses)
+        if rng.random() < 0.5:
+            self.totals["bosses"] += 1
+        self._balance({"event": "boss_spawned", "boss_id": boss_id, "phase": rng.randint(1, max(1, phases))})
+
+    def perf_spike(self):
+        rng = self.rng
+        frame_time = 22.0 + rng.expovariate(1 / 14.0)
+        if frame_time >= 66.0:
+            self.spikes_66 += 1
+        elif frame_time >= 33.0:
+            self.spikes_33 += 1
+        self.spikes_minute += 1
+        self.spike_frames.append((self.t, frame_time))
+        counters = self._counters()
+        self.frame = max(self.frame, int(self.t * 60))
+        recent = []
+        for i in range(rng.randint(0, 20)):
+            name = rng.choice(PERF_LOG_EVENTS)
+            data = {"total": counters["enemies_alive"]} if name == "enemy_spawn" else (
+                {"type": "normal", "count": rng.randint(5, 40)} if name == "wave_start" else {})
+            recent.append({"event": name, "timestamp": self.ticks - 20 * (20 - i), "frame": self.frame - (20 - i),
+                           "data": data, "context": {"enemies": counters["enemies_alive"],
+                                                     "projectiles": counters["projectiles_alive"],
+                                                     "fps": rng.randint(40, 60)}})
+        self._perf({
+            "event": "perf_spike", "schema_version": 3, "timestamp": self.ticks,
+            "t_min": round(self.t_min, 2), "player_level": self.level, "frame_time_ms": frame_time,
+            "instant_fps": 1000.0 / frame_time, "fps_smoothed": rng.randint(45, 60), "scene_name": "Game",
+            "spike_cause": rng.choice(SPIKE_CAUSES), "counters": counters,
+            "memory_mb": counters["memory_static_mb"], "recent_events": recent,
+            "group_counts": {"enemies": counters["enemies_alive"], "projectiles": counters["projectiles_alive"],
+                             "pickups": counters["pickups_alive"]},
+            "projectile_pool": {"active": counters["projectiles_alive"], "pooled": rng.randint(50, 400),
+                                "degradation_level": 0},
+        })
+
+    def _verdict(self, statuses):
+        if "FAIL" in statuses:
+            verdict = "FAIL"
+        elif "DEAD_STAT" in statuses:
+            verdict = "DEAD_STAT"
+        elif "WARN" in statuses:
+            verdict = "WARN"
+        else:
+            verdict = "OK"
+        self.audit_counts[verdict.lower()] += 1
+        return verdict
+
+    def _stat_check(self, kind, stat, before, value, op):
+        rng = self.rng
+        expected = before * value if op == "multiply" else before + value
+        roll = rng.random()
+        after = expected if roll < 0.9 else (before if roll < 0.96 else expected * rng.uniform(0.5, 0.9))
+        delta = after - before
+        if abs(after - expected) < 1e-6:
+            status, detail = "OK", "Cambio correcto"
+        elif after == before:
+            status, detail = "FAIL", "Stat no cambió"
+        else:
+            status, detail = "WARN", "Cambio distinto al esperado"
+        return {"check": kind, "stat": stat, "before": round(before, 3), "after": round(after, 3),
+                "expected": round(expected, 3), "delta": round(delta, 3), "operation": op,
+                "declared_value": value, "status": status, "detail": detail}
+
+    def upgrade_audit(self):
+        rng = self.rng
+        upgrade = rng.choice(self.cat.player_upgrades)
+        self.pickup_num += 1
+        checks = []
+        for effect in upgrade.get("effects", []):
+            stat = effect.get("stat", "")
+            value = effect.get("value", 0.0)
+            if not stat or not isinstance(value, (int, float)):
+                continue
+            if rng.random() < 0.03:
+                before = float(self.cat.base_stats.get(stat, 0.0))
+                checks.append({"check": "dead_stat", "stat": stat, "before": round(before, 3),
+                               "after": round(before + value, 3), "status": "DEAD_STAT",
+                               "detail": "Stat se almacena (%.2f→%.2f) pero NO tiene consumidor en gameplay"
+                                         % (before, before + value)})
+                continue
+            before = float(self.stats.get(stat, self.cat.base_stats.get(stat, 0.0)))
+            checks.append(self._stat_check("stat_change", stat, before, value, effect.get("operation", "add")))
+        event = {"event": "upgrade_audit", "pickup_num": self.pickup_num, "timestamp": self.ticks,
+                 "type": "player_upgrade", "id": upgrade["id"], "name": upgrade.get("name", upgrade["id"]),
+                 "tier": upgrade.get("tier", 0), "category": upgrade.get("category", "unknown"),
+                 "effects_declared": len(upgrade.get("effects", [])), "checks": checks,
+                 "verdict": self._verdict({c["status"] for c in checks})}
+        self._upgrade_audit(event)
+
+    def weapon_audit(self):
+        rng = self.rng
+        action = rng.choices(("new_weapon", "level_up", "fusion"), (30, 65, 5))[0]
+        self.pickup_num += 1
+        if action == "fusion" and self.cat.fusions:
+            fusion = rng.choice(self.cat.fusions)
+            wid, name = fusion["id"], fusion.get("name", fusion["id"])
+            a, b = fusion["components"]
+            removed = rng.random() < 0.95
+            checks = [{"check": "fusion_created", "stat": wid, "status": "OK", "detail": "Fusión registrada"},
+                      {"check": "sources_removed", "stat": f"{a} + {b}", "status": "OK" if removed else "WARN",
+                       "detail": "Originales removidas" if removed else "Originales aún presentes"}]
+        else:
+            action = "level_up" if action == "fusion" else action
+            wid = rng.choice(list(self.weapons) if action == "level_up" else list(self.cat.weapons))
+            name = self.cat.weapon_names.get(wid, wid)
+            if action == "new_weapon":
+                found = rng.random() < 0.98
+                checks = [{"check": "weapon_registered", "stat": wid, "status": "OK" if found else "FAIL",
+                           "detail": "Arma registrada en AttackManager" if found else "Arma NO encontrada en AttackManager"}]
+            else:
+                level = self.weapons.get(wid, 1)
+                checks = [{"check": "weapon_level", "stat": wid, "status": "OK" if level > 1 else "WARN",
+                           "detail": "Nivel actual: %d" % level}]
+        self._upgrade_audit({"event": "weapon_audit", "pickup_num": self.pickup_num, "timestamp": self.ticks,
+                             "type": action, "id": wid, "name": name, "checks": checks,
+                             "verdict": self._verdict({c["status"] for c in checks})})
+
+    def global_weapon_upgrade_audit(self):
+        rng = self.rng
+        upgrade = rng.choice(self.cat.global_upgrades)
+        self.pickup_num += 1
+        checks = []
+        for effect in upgrade.get("effects", []):
+            stat = effect.get("stat", "")
+            value = effect.get("value", 0.0)
+            if not stat or not isinstance(value, (int, float)):
+                continue
+            before = 1.0 if effect.get("operation") == "multiply" else 0.0
+            checks.append(self._stat_check("gws_stat_change", stat, before, value, effect.get("operation", "add")))
+        self._upgrade_audit({"event": "global_weapon_upgrade_audit", "pickup_num": self.pickup_num,
+                             "timestamp": self.ticks, "type": "global_weapon_upgrade", "id": upgrade["id"],
+                             "name": upgrade.get("name", upgrade["id"]),
+                             "effects_declared": len(upgrade.get("effects", [])), "checks": checks,
+                             "verdict": self._verdict({c["status"] for c in checks})})
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BUNDLE FILES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _write_json(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent="\t", ensure_ascii=False)
+
+def _write_lines(path, lines):
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        for start in range(0, len(lines), 4096):
+            f.write("\n".join(lines[start:start + 4096]))
+            f.write("\n")
+
+def write_bundle(args):
+    """Generate one bundle. args = (out_dir, job) -> (bundle name, {log: events})."""
+    out_dir, job = args
+    run = SyntheticRun(job)
+    rng = run.rng
+    horizon = run.minutes * 60.0
+    timeline = [(minute * 60.0, 0, "minute") for minute in range(1, run.minutes + 1)]
+    for kind, n in job["counts"].items():
+        timeline += [(rng.uniform(0.5, horizon), 1, kind) for _ in range(n)]
+    timeline.sort()
+
+    run.begin()
+    minute = 0
+    for t, _order, kind in timeline:
+        run.advance(t)
+        if kind == "minute":
+            minute += 1
+            run.minute_tick(minute)
+        else:
+            getattr(run, kind)()
+    end_reason, killed_by, weapons = run.end()
+
+    name = f"run_{run.run_id}"
+    bundle_dir = os.path.join(out_dir, name)
+    os.makedirs(bundle_dir, exist_ok=True)
+    for log in LOGS:
+        _write_lines(os.path.join(bundle_dir, f"{log}.jsonl"), run.lines[log])
+        run.lines[log] = None
+
+    end_ts = run.start_ts + int(run.t) + 5
+    end_iso = time.strftime("%Y-%m-%d_%H-%M-%S", time.gmtime(end_ts))
+    duration_s = round(run.t + 4.2, 3)
+    meta = {
+        "schema_version": 2, "run_id": run.run_id, "session_id": run.session_id, "seed": run.seed,
+        "character_id": run.character_id, "starting_weapons": run.starting_weapons, "game_version": GAME_VERSION,
+        "start_timestamp": float(run.start_ts), "start_iso": run.start_iso, "os": "Windows",
+        "godot_version": GODOT_VERSION,
+        "files": {"audit_log": "audit.jsonl", "balance_log": "balance.jsonl", "perf_log": "perf.jsonl",
+                  "audit_report": "audit_report.md", "summary": "summary.json", "event_index": "event_index.json"},
+        "end_timestamp": float(end_ts), "end_iso": end_iso, "end_reason": end_reason, "duration_s": duration_s,
+        "killed_by": killed_by,
+    }
+    _write_json(os.path.join(bundle_dir, "meta.json"), meta)
+    totals = run.totals
+    summary = {
+        "schema_version": 2, "run_id": run.run_id, "end_reason": end_reason, "killed_by": killed_by,
+        "duration_s": duration_s, "time_survived": round(run.t, 3),
+        "duration_note": "duration_s=wall-clock (includes pauses), time_survived=gameplay only (excludes pauses/menus)",
+        "end_timestamp": float(end_ts), "end_iso": end_iso,
+        "stats": {"level": run.level, "kills": totals["kills"], "elites_killed": totals["elites"],
+                  "bosses_killed": totals["bosses"], "gold": totals["gold"], "damage_dealt": totals["damage"],
+                  "damage_taken": totals["taken"], "healing_done": totals["healing"], "xp_total": totals["xp"],
+                  "rerolls_total": run.rerolls},
+        "build": {"weapons": weapons, "upgrades": run._top_upgrades(), "player_stats": dict(run.stats)},
+        "difficulty_final": run._difficulty(),
+        "death_context": {"killer": killed_by, "killer_attack": "contact", "killer_damage_type": "physical",
+                          "killer_source_kind": "melee", "window_duration_s": 5.0, "hits_in_window": 0,
+                          "total_damage_in_window": 0},
+        "bundle_files": {"meta": "meta.json", "audit_log": "audit.jsonl", "balance_log": "balance.jsonl",
+                         "perf_log": "perf.jsonl", "audit_report": "audit_report.md",
+                         "upgrade_audit_log": "upgrade_audit.jsonl", "upgrade_audit_report": "upgrade_audit_report.md",
+                         "integrity": "integrity.json", "event_index": "event_index.json"},
+        "file_sizes": {},
+        "upgrade_audit": {"total_pickups": run.pickup_num, "counts": dict(run.audit_counts),
+                          "top_upgrades_picked": [{"id": u["id"], "count": u["stacks"]} for u in run._top_upgrades()]},
+    }
+    _write_json(os.path.join(bundle_dir, "summary.json"), summary)
+    with open(os.path.join(bundle_dir, "audit_report.md"), 'w', encoding='utf-8') as f:
+        f.write(f"# Run Audit Report\n\n- Run: {run.run_id}\n- Character: {run.character_id}\n"
+                f"- Duration: {run.t / 60.0:.1f} min\n- Final level: {run.level}\n")
+    with open(os.path.join(bundle_dir, "upgrade_audit_report.md"), 'w', encoding='utf-8') as f:
+        f.write(f"# Upgrade Audit Report\n\n- Run: {run.run_id}\n- Pickups audited: {run.pickup_num}\n")
+    _write_json(os.path.join(bundle_dir, "event_index.json"), {
+        "schema_version": 3, "run_id": run.run_id, "generated_at": end_iso.replace("_", "T"), "status": "pending",
+        "generator": "tools/event_index.py", "sources": {}})
+    artifacts = {}
+    for fname in ("meta.json", "summary.json", "audit.jsonl", "balance.jsonl", "perf.jsonl", "audit_report.md",
+                  "upgrade_audit.jsonl", "upgrade_audit_report.md", "event_index.json"):
+        path = os.path.join(bundle_dir, fname)
+        status = "ok" if fname.endswith((".json", ".jsonl")) else "present"
+        if fname == "upgrade_audit.jsonl" and not run.counts["upgrade_audit"]:
+            status = "empty"
+        artifacts[fname] = {"exists": True, "size_bytes": os.path.getsize(path), "status": status}
+    _write_json(os.path.join(bundle_dir, "integrity.json"), {
+        "schema_version": 2, "run_id": run.run_id, "session_id": run.session_id,
+        "generated_at": end_iso.replace("_", "T"), "artifacts": artifacts, "warnings": [], "is_consistent": True})
+    return name, dict(run.counts)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CORPUS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def parse_mix(text):
+    """'perf_spike=6,upgrade_audit=3' -> DEFAULT_RATES with those rates replaced."""
+    rates = dict(DEFAULT_RATES)
+    for item in filter(None, (s.strip() for s in (text or "").split(","))):
+        key, sep, value = item.partition("=")
+        if not sep or key not in SPORADIC_LOG:
+            raise ValueError(f"bad --mix item {item!r} (known: {', '.join(sorted(SPORADIC_LOG))})")
+        rates[key] = float(value)
+    return rates
+
+def read_corpus(out_dir):
+    """corpus.json of a generated corpus, or None."""
+    try:
+        with open(os.path.join(out_dir, CORPUS_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def generate_corpus(out_dir, events, runs=None, seed=1, rates=None, minutes=(5, 30), workers=None, force=False):
+    """Write a corpus into out_dir and return its corpus.json contents."""
+    rates = rates or dict(DEFAULT_RATES)
+    existing = [e.name for e in os.scandir(out_dir) if e.is_dir() and e.name.startswith("run_")] \
+        if os.path.isdir(out_dir) else []
+    if existing:
+        if read_corpus(out_dir) is None or not force:
+            raise FileExistsError(f"{out_dir} already holds run_* bundles"
+                                  + ("" if read_corpus(out_dir) is None else " (use --force to regenerate)"))
+        for name in existing:
+            shutil.rmtree(os.path.join(out_dir, name))
+    os.makedirs(out_dir, exist_ok=True)
+
+    jobs = plan_corpus(events, runs, seed, rates, minutes)
+    bundles = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for name, counts in pool.map(write_bundle, [(out_dir, job) for job in jobs],
+                                     chunksize=max(1, len(jobs) // 256)):
+            bundles[name] = counts
+    corpus = {"generator": "tools/synth_bundles.py", "version": GENERATOR_VERSION, "seed": seed,
+              "events_requested": events, "events": sum(sum(c.values()) for c in bundles.values()),
+              "runs": len(bundles), "minutes": list(minutes), "rates": rates, "bundles": bundles}
+    with open(os.path.join(out_dir, CORPUS_FILE), 'w', encoding='utf-8') as f:
+        json.dump(corpus, f, separators=(',', ':'))
+    return corpus
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _minutes(text):
+    lo, _sep, hi = text.partition("-")
+    lo, hi = int(lo), int(hi or lo)
+    if not 1 <= lo <= hi:
+        raise argparse.ArgumentTypeError("expected MIN-MAX minutes, e.g. 5-30")
+    return lo, hi
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic run bundles with the game's log schemas.")
+    parser.add_argument("out_dir", help="folder to write run_* bundles into (created if missing)")
+    parser.add_argument("--events", type=int, default=100000, help="total events in the corpus (default 100000)")
+    parser.add_argument("--runs", type=int, default=None, help="number of bundles (default: from --events and --mix)")
+    parser.add_argument("--seed", type=int, default=1, help="corpus seed (default 1)")
+    parser.add_argument("--mix", default="", metavar="EVENT=RATE,...",
+                        help="events per gameplay minute for non-periodic types, e.g. perf_spike=6,chest_opened=1")
+    parser.add_argument("--minutes", type=_minutes, default=(5, 30), metavar="MIN-MAX",
+                        help="gameplay minutes per run (default 5-30)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--force", action="store_true", help="replace a previously generated corpus in OUT_DIR")
+    args = parser.parse_args()
+    try:
+        rates = parse_mix(args.mix)
+    except ValueError as ex:
+        parser.error(str(ex))
+
+    t0 = time.perf_counter()
+    try:
+        corpus = generate_corpus(args.out_dir, args.events, args.runs, args.seed, rates, args.minutes,
+                                 args.workers, args.force)
+    except FileExistsError as ex:
+        sys.exit(str(ex))
+    per_log = {log: sum(c.get(log, 0) for c in corpus["bundles"].values()) for log in LOGS}
+    print(f"Wrote {corpus['runs']} bundle(s), {corpus['events']} events to {args.out_dir} "
+          f"in {time.perf_counter() - t0:.1f}s")
+    print("  " + "  ".join(f"{log}={n}" for log, n in per_log.items()))
+
+if __name__ == "__main__":
+    main()
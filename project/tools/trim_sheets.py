@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Trim VFX spritesheets: shared bounding box, empty and duplicate frames
+
+Every sheet configured in VFXManager.gd (vfx_configs.py) is sliced into its
+hframes x vframes grid and analysed with whole-sheet numpy operations:
+  - empty frames: no pixel with alpha above --alpha-threshold
+  - duplicate frames: byte-identical to an earlier frame
+  - bounding box: the union of every frame's visible pixels (+ --margin)
+The unique, non-empty frames cropped to that shared box make the trimmed
+sheet (as many columns as the original, fewer rows when frames were
+dropped).
+
+With --write every sheet that gets smaller is written to --out (same
+relative path as under assets/vfx/abilities) next to trim_map.json, keyed
+by the original res:// path:
+    {"sheet": "res://...trimmed.png", "hframes": 4, "vframes": 1,
+     "frame_size": [w, h], "offset": [dx, dy],
+     "frame_map": [0, 1, 1, 2, -1, ...], "source_frame_size": [128, 128]}
+Frame i of the original animation is frame frame_map[i] of the trimmed sheet
+(-1: draw nothing). Drawn centered with Sprite2D.offset = offset, the result
+lands on exactly the same screen pixels as the original frame.
+
+VRAM is reported as uncompressed RGBA8 (width x height x 4).
+
+Usage:
+    python tools/trim_sheets.py [--only ID,...] [--margin 1] [--alpha-threshold 0] [--workers N]
+                                [--write] [--out DIR] [--json REPORT.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from gd_const import project_root
+from vfx_configs import load_sheet_configs
+
+VFX_ROOT = os.path.join(project_root(), "assets", "vfx", "abilities")
+DEFAULT_OUT = os.path.join(project_root(), "assets", "vfx", "trimmed")
+TRIM_MAP = "trim_map.json"
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ANALYSIS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def slice_frames(pixels, hframes, vframes):
+    """(h, w, 4) sheet -> (hframes * vframes, fh, fw, 4) view, row-major like Sprite2D.frame"""
+    fh, fw = pixels.shape[0] // vframes, pixels.shape[1] // hframes
+    grid = pixels[:fh * vframes, :fw * hframes].reshape(vframes, fh, hframes, fw, 4)
+    return grid.transpose(0, 2, 1, 3, 4).reshape(vframes * hframes, fh, fw, 4)
+
+def analyse(frames, alpha_threshold=0, margin=1):
+    """frame_map (unique frame index or -1 per frame), unique frame indices and shared box (x0, y0, x1, y1)"""
+    n, fh, fw = frames.shape[:3]
+    visible = frames[..., 3] > alpha_threshold
+    empty = ~visible.reshape(n, -1).any(axis=1)
+
+    flat = np.ascontiguousarray(frames).reshape(n, -1)
+    rows = flat.view(np.dtype((np.void, flat.shape[1])))[:, 0]
+    _, first, inverse = np.unique(rows, return_index=True, return_inverse=True)
+    canonical = first[inverse.ravel()]  # earliest frame with identical bytes
+
+    unique = [i for i in range(n) if not empty[i] and canonical[i] == i]
+    slot = {frame: k for k, frame in enumerate(unique)}
+    frame_map = [-1 if empty[i] else slot[int(canonical[i])] for i in range(n)]
+
+    union = visible.any(axis=0)
+    if not union.any():
+        return frame_map, unique, (0, 0, 0, 0)
+    ys, xs = np.nonzero(union.any(axis=1))[0], np.nonzero(union.any(axis=0))[0]
+    box = (max(0, int(xs[0]) - margin), max(0, int(ys[0]) - margin),
+           min(fw, int(xs[-1]) + 1 + margin), min(fh, int(ys[-1]) + 1 + margin))
+    return frame_map, unique, box
+
+def trim_sheet(job):
+    """Worker entry point: job = (sheet config, alpha threshold, margin, output path or None) -> report dict"""
+    sheet, alpha_threshold, margin, out_path = job
+    t0 = time.perf_counter()
+    with Image.open(sheet.path) as im:
+        pixels = np.asarray(im.convert("RGBA"))
+    height, width = pixels.shape[:2]
+    frames = slice_frames(pixels, sheet.hframes, sheet.vframes)
+    n, fh, fw = frames.shape[:3]
+    frame_map, unique, (x0, y0, x1, y1) = analyse(frames, alpha_threshold, margin)
+    tw, th = x1 - x0, y1 - y0
+    cols = max(1, min(sheet.hframes, len(unique)))
+    rows = -(-len(unique) // cols) if unique else 0
+    report = {
+        "id": sheet.id, "category": sheet.category, "res_path": sheet.res_path,
+        "frames": n, "empty": frame_map.count(-1), "duplicates": n - frame_map.count(-1) - len(unique),
+        "source_frame_size": [fw, fh], "frame_size": [tw, th], "sheet_size": [width, height],
+        "trimmed_size": [cols * tw, rows * th], "vram": width * height * 4, "trimmed_vram": cols * tw * rows * th * 4,
+        "entry": {
+            "hframes": cols, "vframes": rows, "frame_size": [tw, th],
+            # Sprite2D is centered: shift the cropped frame back to where its box sat in the full frame
+            "offset": [(x0 + tw / 2.0) - fw / 2.0, (y0 + th / 2.0) - fh / 2.0],
+            "frame_map": frame_map, "source_frame_size": [fw, fh],
+        },
+    }
+    report["written"] = bool(out_path and unique and report["trimmed_vram"] < report["vram"])
+    if report["written"]:
+        out = np.zeros((rows * th, cols * tw, 4), dtype=np.uint8)
+        for k, frame in enumerate(unique):
+            r, c = divmod(k, cols)
+            out[r * th:(r + 1) * th, c * tw:(c + 1) * tw] = frames[frame, y0:y1, x0:x1]
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+        Image.fromarray(out, "RGBA").save(out_path, "PNG", optimize=True)
+    report["seconds"] = time.perf_counter() - t0
+    return report
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _kb(n):
+    return f"{n / 1024:,.0f} KB"
+
+def main():
+    parser = argparse.ArgumentParser(description="Trim VFX spritesheets and drop empty / duplicate frames.")
+    parser.add_argument("--only", metavar="IDS", help="comma-separated VFX ids (as in VFXManager.gd)")
+    parser.add_argument("--margin", type=int, default=1, help="transparent pixels kept around the shared box (default 1)")
+    parser.add_argument("--alpha-threshold", type=int, default=0,
+                        help="alpha at or below this counts as empty (default 0 = fully transparent only)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--write", action="store_true", help="write the trimmed sheets and trim_map.json")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="output folder for --write (default: assets/vfx/trimmed)")
+    parser.add_argument("--json", metavar="PATH", help="also write the full report as JSON")
+    args = parser.parse_args()
+
+    sheets, seen = [], set()
+    for sheet in load_sheet_configs():
+        if sheet.res_path in seen or not os.path.exists(sheet.path):
+            continue
+        seen.add(sheet.res_path)
+        sheets.append(sheet)
+    if args.only:
+        wanted = {s.strip() for s in args.only.split(",") if s.strip()}
+        sheets = [s for s in sheets if s.id in wanted]
+        if not sheets:
+            sys.exit(f"No configured sheet matches {args.only}")
+
+    def out_path(sheet):
+        if not args.write:
+            return None
+        rel = os.path.relpath(sheet.path, VFX_ROOT)
+        return os.path.join(args.out, os.path.splitext(rel)[0] + "_trimmed.png")
+
+    t0 = time.perf_counter()
+    jobs = [(s, args.alpha_threshold, args.margin, out_path(s)) for s in sheets]
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        reports = list(pool.map(trim_sheet, jobs))
+
+    print(f"  {'category':<10} {'id':<20} {'frames':>9} {'empty':>5} {'dup':>4} {'frame':>9} -> {'trimmed':<9} "
+          f"{'VRAM':>9} -> {'trimmed':>9} {'saved':>6}")
+    total = total_trimmed = 0
+    for r in sorted(reports, key=lambda r: r["trimmed_vram"] - r["vram"]):
+        total += r["vram"]
+        total_trimmed += r["trimmed_vram"]
+        kept = r["frames"] - r["empty"] - r["duplicates"]
+        saved = 1 - r["trimmed_vram"] / r["vram"] if r["vram"] else 0.0
+        print(f"  {r['category']:<10} {r['id']:<20} {kept:>3} of {r['frames']:<3} {r['empty']:>5} {r['duplicates']:>4} "
+              f"{'%dx%d' % tuple(r['source_frame_size']):>9} -> {'%dx%d' % tuple(r['frame_size']):<9} "
+              f"{_kb(r['vram']):>9} -> {_kb(r['trimmed_vram']):>9} {saved:>6.0%}")
+    saved = total - total_trimmed
+    print(f"\n{len(reports)} sheet(s): {_kb(total)} -> {_kb(total_trimmed)} of uncompressed VRAM, "
+          f"{_kb(saved)} saved ({saved / total:.0%})" if total else "\nNo sheets")
+
+    if args.write:
+        trim_map = {}
+        for r, (sheet, _a, _m, path) in zip(reports, jobs):
+            if r["written"]:
+                rel = os.path.relpath(path, project_root()).replace(os.sep, "/")
+                trim_map[r["res_path"]] = dict(sheet="res://" + rel, **r["entry"])
+        os.makedirs(args.out, exist_ok=True)
+        with open(os.path.join(args.out, TRIM_MAP), 'w', encoding='utf-8') as f:
+            json.dump(dict(sorted(trim_map.items())), f, indent=1)
+            f.write("\n")
+        print(f"Wrote {len(trim_map)} trimmed sheet(s) and {TRIM_MAP} to {args.out}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(reports, f, indent=1)
+    print(f"Done in {time.perf_counter() - t0:.1f}s")
+
+if __name__ == "__main__":
+    main()
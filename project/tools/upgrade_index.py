@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+Inverted index and query CLI over UpgradeAuditor output (upgrade_audit.jsonl).
+
+Every check of every upgrade_audit / weapon_audit / global_weapon_upgrade_audit
+event becomes one row (events without checks get one row of their own). Rows
+are posted under:
+
+    event, type, id, name (lower-case word tokens), category, verdict,
+    stat, status, check, run (bundle folder)
+
+and keep before / after / delta / tier / pickup_num for numeric filters plus
+the byte offset of their line, so --show can seek to the full event.
+
+The index lives in <runs_dir>/.upgrade_index.pickle as a handful of arrays
+(columns with string fields stored as vocab codes, postings per term) plus
+one row range per upgrade_audit.jsonl keyed by (size, mtime_ns): only new or
+changed files are re-read, and a query over the whole archive never touches
+the logs.
+
+Query terms are ANDed:
+    field=value   field!=value   field~substring
+    before|after|delta|tier|pickup_num  <, <=, >, >=, =, !=  number
+
+Usage:
+    python tools/upgrade_index.py --runs [RUNS_DIR] stat=armor "status!=OK"
+    python tools/upgrade_index.py --runs "after<0" --group stat
+    python tools/upgrade_index.py --file upgrade_audit.jsonl "verdict!=OK" --show
+"""
+
+import argparse
+import json
+import math
+import os
+import pickle
+import re
+import sys
+import time
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from run_bundle import (bundle_file_exists, bundle_file_signature, default_runs_dir, event_prefilter,
+                        find_bundles, iter_bundle_lines, json_loads, open_bundle_file)
+
+INDEX_FILE = ".upgrade_index.pickle"
+INDEX_VERSION = 1
+UPGRADE_EVENTS = ("upgrade_audit", "weapon_audit", "global_weapon_upgrade_audit")
+
+# row layout (tuple positions)
+ROW_FIELDS = ("offset", "length", "check_idx", "event", "type", "id", "name", "category",
+              "verdict", "check", "stat", "status", "before", "after", "delta", "tier", "pickup_num")
+_COL = {name: i for i, name in enumerate(ROW_FIELDS)}
+POSITION_FIELDS = ("offset", "length", "check_idx")
+CHECK_FIELDS = ("check", "stat", "status", "before", "after", "delta")
+TERM_FIELDS = ("event", "type", "id", "name", "category", "verdict", "check", "stat", "status")
+NUMERIC_FIELDS = ("before", "after", "delta", "tier", "pickup_num")
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_TERM_RE = re.compile(r"^(\w+)\s*(!=|<=|>=|=|<|>|~)\s*(.*)$")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BUILD
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _number(value):
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+def index_file(path):
+    """Read one upgrade_audit.jsonl into local columns: {"n", "vocab", "cols"}.
+
+    String fields are stored as codes into the returned vocab, numbers as
+    doubles with NaN for missing values.
+    """
+    vocab = {}
+    cols = _empty_columns()
+    patterns = event_prefilter(UPGRADE_EVENTS)
+    n = 0
+    offset = 0
+    for raw in iter_bundle_lines(path):
+        length = len(raw)
+        line_offset = offset
+        offset += length
+        if not any(p in raw for p in patterns):
+            continue
+        try:
+            e = json_loads(raw)
+        except ValueError:
+            continue
+        if not isinstance(e, dict) or e.get('event') not in UPGRADE_EVENTS:
+            continue
+        checks = [c for c in e.get('checks', []) if isinstance(c, dict)] or [{}]
+        for check_idx, c in enumerate(checks):
+            cols["offset"].append(line_offset)
+            cols["length"].append(length)
+            cols["check_idx"].append(check_idx if c else -1)
+            for field in TERM_FIELDS:
+                value = (c if field in CHECK_FIELDS else e).get(field)
+                text = "" if value is None else str(value)
+                cols[field].append(vocab.setdefault(text, len(vocab)))
+            for field in NUMERIC_FIELDS:
+                value = (c if field in CHECK_FIELDS else e).get(field)
+                ok = isinstance(value, (int, float)) and not isinstance(value, bool)
+                cols[field].append(float(value) if ok else math.nan)
+            n += 1
+    return {"n": n, "vocab": list(vocab), "cols": cols}
+
+def _empty_columns():
+    cols = {field: array('q') for field in POSITION_FIELDS}
+    cols.update({field: array('I') for field in TERM_FIELDS})
+    cols.update({field: array('d') for field in NUMERIC_FIELDS})
+    return cols
+
+def _signature(path):
+    return tuple(bundle_file_signature(path))
+
+def _build_segment(args):
+    label, path = args
+    return label, path, _signature(path), index_file(path)
+
+def empty_index():
+    return {"version": INDEX_VERSION, "n": 0, "vocab": [], "cols": _empty_columns(),
+            "postings": {field: {} for field in TERM_FIELDS}, "segments": {}}
+
+def load_index(index_path):
+    try:
+        with open(index_path, 'rb') as f:
+            index = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return empty_index()
+    return index if isinstance(index, dict) and index.get("version") == INDEX_VERSION else empty_index()
+
+def save_index(index_path, index):
+    tmp_path = index_path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, index_path)
+
+def _build_postings(index):
+    """term -> array of row numbers, for every TERM_FIELDS column (name: per word token)."""
+    vocab = index["vocab"]
+    postings = {}
+    for field in TERM_FIELDS:
+        by_code = {}
+        for doc, code in enumerate(index["cols"][field]):
+            docs = by_code.get(code)
+            if docs is None:
+                docs = by_code[code] = array('I')
+            docs.append(doc)
+        field_postings = {}
+        for code, docs in by_code.items():
+            keys = set(_TOKEN_RE.findall(vocab[code].lower())) if field == "name" else (vocab[code],)
+            for key in keys:
+                if key in field_postings:
+                    field_postings[key] = array('I', sorted(field_postings[key] + docs))
+                else:
+                    field_postings[key] = docs
+        postings[field] = field_postings
+    return postings
+
+def update_index(sources, index, workers=None):
+    """Bring the index up to date with sources ({label: path}). Returns (index, re-read count).
+
+    Unchanged files keep their rows (copied as array slices); new or changed
+    files are re-read in a process pool; files that disappeared are dropped.
+    """
+    old_segments = index["segments"]
+    todo = []
+    kept = {}
+    for label, path in sources.items():
+        segment = old_segments.get(label)
+        try:
+            sig = _signature(path)
+        except OSError:
+            continue
+        if segment and segment["path"] == path and tuple(segment["sig"]) == sig:
+            kept[label] = segment
+        else:
+            todo.append((label, path))
+    if not todo and len(kept) == len(old_segments):
+        return index, 0
+
+    if len(todo) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_build_segment, todo, chunksize=max(1, len(todo) // 64)))
+    else:
+        results = [_build_segment(item) for item in todo]
+    fresh = {label: (path, sig, local) for label, path, sig, local in results}
+
+    vocab = list(index["vocab"])
+    codes = {text: code for code, text in enumerate(vocab)}
+    cols = _empty_columns()
+    segments = {}
+    n = 0
+    for label in sorted(set(kept) | set(fresh)):
+        if label in kept:
+            segment = kept[label]
+            start, stop = segment["start"], segment["stop"]
+            for field, col in cols.items():
+                col.extend(index["cols"][field][start:stop])
+            count = stop - start
+            path, sig = segment["path"], segment["sig"]
+        else:
+            path, sig, local = fresh[label]
+            for text in local["vocab"]:
+                if text not in codes:
+                    codes[text] = len(vocab)
+                    vocab.append(text)
+            remap = [codes[text] for text in local["vocab"]]
+            for field, col in cols.items():
+                if field in TERM_FIELDS:
+                    col.extend(remap[code] for code in local["cols"][field])
+                else:
+                    col.extend(local["cols"][field])
+            count = local["n"]
+        segments[label] = {"path": path, "sig": tuple(sig), "start": n, "stop": n + count}
+        n += count
+
+    index = {"version": INDEX_VERSION, "n": n, "vocab": vocab, "cols": cols, "segments": segments}
+    index["postings"] = _build_postings(index)
+    return index, len(todo)
+
+def row_at(index, doc):
+    """Materialize one row as a tuple in ROW_FIELDS order."""
+    cols, vocab = index["cols"], index["vocab"]
+    row = []
+    for field in ROW_FIELDS:
+        value = cols[field][doc]
+        if field in TERM_FIELDS:
+            value = vocab[value]
+        elif field in NUMERIC_FIELDS:
+            value = None if math.isnan(value) else (int(value) if value.is_integer() else value)
+        row.append(value)
+    return tuple(row)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# QUERY
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def parse_query(terms):
+    """["stat=armor", "status!=OK"] -> [(field, op, value)]; raises ValueError."""
+    parsed = []
+    for term in terms:
+        match = _TERM_RE.match(term.strip())
+        if not match:
+            raise ValueError(f"cannot parse query term {term!r}")
+        field, op, value = match.groups()
+        if field in NUMERIC_FIELDS:
+            if op == "~":
+                raise ValueError(f"{field} is numeric; use <, <=, >, >=, = or !=")
+            value = float(value)
+        elif field in TERM_FIELDS or field == "run":
+            if op not in ("=", "!=", "~"):
+                raise ValueError(f"{field} only supports =, != and ~")
+            if field == "name":
+                value = value.lower()
+        else:
+            raise ValueError(f"unknown field {field!r} (fields: run, {', '.join(TERM_FIELDS + NUMERIC_FIELDS)})")
+        parsed.append((field, op, value))
+    return parsed
+
+_NUMERIC_OPS = {
+    "<": lambda a, b: a < b, "<=": lambda a, b: a <= b, ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b, "=": lambda a, b: a == b, "!=": lambda a, b: a != b,
+}
+
+def _term_docs(index, field, op, value):
+    """Row numbers matching one categorical term."""
+    postings = index["postings"][field]
+    if op == "~":
+        docs = set()
+        if field == "name":
+            # substring over whole names, not tokens
+            codes = {code for code, text in enumerate(index["vocab"]) if value in text.lower()}
+            return {doc for doc, code in enumerate(index["cols"]["name"]) if code in codes}
+        for key, key_docs in postings.items():
+            if value.lower() in key.lower():
+                docs.update(key_docs)
+        return docs
+    if field == "name":
+        docs = None
+        for token in _TOKEN_RE.findall(value):
+            token_docs = set(postings.get(token, ()))
+            docs = token_docs if docs is None else docs & token_docs
+        docs = docs or set()
+    else:
+        docs = set(postings.get(value, ()))
+    if op == "!=":
+        return set(range(index["n"])) - docs
+    return docs
+
+def _run_matches(label, op, value):
+    if op == "~":
+        hit = value.lower() in label.lower()
+    else:
+        hit = value in (label, label[4:] if label.startswith("run_") else label)
+    return hit != (op == "!=")
+
+def run_query(index, query):
+    """[(label, row number)] for every match, in label / file order (see row_at)."""
+    docs = None
+    numeric = []
+    run_terms = []
+    for field, op, value in query:
+        if field == "run":
+            run_terms.append((op, value))
+        elif field in NUMERIC_FIELDS:
+            numeric.append((index["cols"][field], _NUMERIC_OPS[op], value))
+        else:
+            term_docs = _term_docs(index, field, op, value)
+            docs = term_docs if docs is None else docs & term_docs
+            if not docs:
+                return []
+
+    ordered = sorted(index["segments"].items(), key=lambda item: item[1]["start"])
+    starts = [segment["start"] for _label, segment in ordered]
+    allowed = [all(_run_matches(label, op, value) for op, value in run_terms) for label, _segment in ordered]
+    if docs is None:
+        candidates = (doc for (label, segment), ok in zip(ordered, allowed) if ok
+                      for doc in range(segment["start"], segment["stop"]))
+    else:
+        candidates = sorted(docs)
+    matches = []
+    for doc in candidates:
+        # NaN (missing number) never matches a numeric term
+        if not all(col[doc] == col[doc] and compare(col[doc], value) for col, compare, value in numeric):
+            continue
+        pos = bisect_right(starts, doc) - 1
+        if allowed[pos]:
+            matches.append((ordered[pos][0], doc))
+    return matches
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _fmt_row(label, row):
+    r = dict(zip(ROW_FIELDS, row))
+    text = f"  {label}: {r['name']} [{r['id']}] verdict={r['verdict']}"
+    if r["check_idx"] >= 0:
+        text += (f"  {r['check']}: {r['stat']} {r['before']} -> {r['after']} "
+                 f"(delta={r['delta']}) status={r['status']}")
+    return text
+
+def show_events(index, matches):
+    """Print the full JSON of each matching event, read by seeking to its offset."""
+    seen = set()
+    offsets, lengths = index["cols"]["offset"], index["cols"]["length"]
+    for label, doc in matches:
+        key = (label, offsets[doc])
+        if key in seen:
+            continue
+        seen.add(key)
+        with open_bundle_file(index["segments"][label]["path"]) as f:
+            f.seek(offsets[doc])
+            event = json_loads(f.read(lengths[doc]))
+        print(f"--- {label}")
+        print(json.dumps(event, indent=2, ensure_ascii=False))
+
+def main():
+    parser = argparse.ArgumentParser(description="Query UpgradeAuditor logs through an inverted index.")
+    parser.add_argument("query", nargs="*", help='terms like stat=armor "status!=OK" "after<0" name~muerte')
+    parser.add_argument("--runs", nargs="?", const=default_runs_dir(), metavar="RUNS_DIR",
+                        help="index every bundle's upgrade_audit.jsonl under RUNS_DIR (default: user://runs)")
+    parser.add_argument("--file", action="append", default=[], metavar="JSONL",
+                        help="also index this upgrade_audit.jsonl (repeatable)")
+    parser.add_argument("--index", metavar="PATH",
+                        help=f"index file (default: <RUNS_DIR>/{INDEX_FILE}; in memory for --file only)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes for (re)indexing")
+    parser.add_argument("--count", action="store_true", help="only print the number of matching rows")
+    parser.add_argument("--group", metavar="FIELD", help="count matches per field value (e.g. stat, id, run)")
+    parser.add_argument("--show", action="store_true", help="print the full matching events")
+    parser.add_argument("--limit", type=int, default=200, help="max rows to list (default 200, 0 = all)")
+    args = parser.parse_args()
+
+    if not args.runs and not args.file:
+        args.runs = default_runs_dir()
+    try:
+        query = parse_query(args.query)
+    except ValueError as ex:
+        parser.error(str(ex))
+
+    sources = {}
+    if args.runs:
+        for path, _meta in find_bundles(args.runs):
+            log = os.path.join(path, "upgrade_audit.jsonl")
+            if bundle_file_exists(log):
+                sources[os.path.basename(path)] = log
+    for path in args.file:
+        sources[os.path.abspath(path)] = os.path.abspath(path)
+
+    index_path = args.index or (os.path.join(args.runs, INDEX_FILE) if args.runs else None)
+    t0 = time.perf_counter()
+    index = load_index(index_path) if index_path else empty_index()
+    index, rebuilt = update_index(sources, index, args.workers)
+    if index_path and rebuilt:
+        save_index(index_path, index)
+    t1 = time.perf_counter()
+    matches = run_query(index, query)
+    t2 = time.perf_counter()
+    if args.group:
+        if args.group not in ROW_FIELDS and args.group != "run":
+            parser.error(f"cannot group by {args.group!r}")
+        column = _COL.get(args.group)
+        counts = Counter(label if args.group == "run" else row_at(index, doc)[column] for label, doc in matches)
+        for value, n in counts.most_common():
+            print(f"  {value}: {n}")
+    elif args.show:
+        show_events(index, matches)
+    elif not args.count:
+        limit = args.limit or len(matches)
+        for label, doc in matches[:limit]:
+            print(_fmt_row(label, row_at(index, doc)))
+        if len(matches) > limit:
+            print(f"  ... {len(matches) - limit} more (use --limit 0)")
+    print(f"{len(matches)} match(es) among {index['n']} rows in {len(index['segments'])} log(s) "
+          f"[index {1000 * (t1 - t0):.1f}ms, {rebuilt} re-indexed; query {1000 * (t2 - t1):.1f}ms]",
+          file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
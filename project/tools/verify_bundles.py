@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Integrity check for a whole runs/ archive.
+
+RunBundleManager._generate_integrity() only checks the current bundle, in
+game, and only the first line of each JSONL. This tool re-checks every
+run_* bundle offline, in parallel:
+
+  - file set: required files present, finalized bundles complete
+  - run_id: folder name, meta.json, JSON documents and every JSONL line agree
+  - JSONL well-formedness: every line decodes to an object with an "event",
+    and the file ends on a newline (no half-written tail)
+  - integrity.json: recorded sizes still match (a smaller file = truncated)
+  - sha256 of every file; identical logs shared by different bundles are
+    reported as copies
+
+Files are read through mmap; logs compressed by archive_bundles.py are
+decompressed and checked as the original bytes. Results are cached per file
+by (size, mtime_ns) in <runs_dir>/.verify_cache.json, so re-checking an
+unchanged archive only costs one stat() per file.
+
+Usage:
+    python tools/verify_bundles.py [RUNS_DIR] [--workers N] [--no-cache] [--json report.json]
+"""
+
+import argparse
+import hashlib
+import json
+import lzma
+import mmap
+import os
+import sys
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+from run_bundle import (archive_manifest, archived_log, bundle_file_signature, default_runs_dir, iter_bundle_lines,
+                        json_loads)
+
+CACHE_FILE = ".verify_cache.json"
+CACHE_VERSION = 1
+
+REQUIRED_FILES = ("meta.json", "audit.jsonl", "balance.jsonl")
+# written by RunBundleManager.finalize_bundle(); only expected once meta has end_timestamp
+FINALIZED_FILES = ("summary.json", "integrity.json", "perf.jsonl", "upgrade_audit.jsonl",
+                   "audit_report.md", "upgrade_audit_report.md", "event_index.json")
+JSON_FILES = ("meta.json", "summary.json", "integrity.json", "event_index.json")
+JSONL_FILES = ("audit.jsonl", "balance.jsonl", "perf.jsonl", "upgrade_audit.jsonl")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PER-FILE CHECKS (cacheable: depend only on the file's bytes and the run_id)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _map_file(path):
+    """Return (mmap or bytes, open file or None) for a read-only view of the file.
+
+    An archived log is decompressed into memory instead.
+    """
+    if not os.path.exists(path) and archived_log(path)[0] is not None:
+        return b"".join(iter_bundle_lines(path)), None
+    f = open(path, 'rb')
+    if os.fstat(f.fileno()).st_size == 0:
+        return b"", f
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), f
+
+def check_jsonl(path, run_id):
+    """Scan a JSONL file line by line; returns counters plus the file's sha256."""
+    buf, f = _map_file(path)
+    try:
+        result = {"sha256": hashlib.sha256(buf).hexdigest(), "lines": 0, "parse_errors": 0,
+                  "no_event": 0, "run_id_mismatch": 0, "no_run_id": 0, "truncated_tail": False,
+                  "first_error_line": None}
+        size = len(buf)
+        pos = 0
+        line_num = 0
+        while pos < size:
+            end = buf.find(b"\n", pos)
+            if end < 0:
+                end = size
+                result["truncated_tail"] = True
+            line = buf[pos:end].strip()
+            pos = end + 1
+            line_num += 1
+            if not line:
+                continue
+            result["lines"] += 1
+            try:
+                event = json_loads(line)
+            except ValueError:
+                event = None
+            if not isinstance(event, dict):
+                result["parse_errors"] += 1
+                result["first_error_line"] = result["first_error_line"] or line_num
+                continue
+            if "event" not in event:
+                result["no_event"] += 1
+            line_run_id = event.get("run_id")
+            if line_run_id in (None, ""):
+                result["no_run_id"] += 1
+            elif run_id and str(line_run_id) != run_id:
+                result["run_id_mismatch"] += 1
+        return result
+    finally:
+        if isinstance(buf, mmap.mmap):
+            buf.close()
+        if f is not None:
+            f.close()
+
+def check_json(path, run_id):
+    """Parse a JSON document and compare its run_id (if it has one)."""
+    buf, f = _map_file(path)
+    try:
+        result = {"sha256": hashlib.sha256(buf).hexdigest(), "status": "ok", "data": None}
+        try:
+            data = json_loads(bytes(buf))
+        except ValueError:
+            result["status"] = "parse_error"
+            return result
+        if not isinstance(data, dict):
+            result["status"] = "invalid_format"
+            return result
+        file_run_id = str(data.get("run_id", ""))
+        if not file_run_id:
+            result["status"] = "no_run_id"
+        elif run_id and file_run_id != run_id:
+            result["status"] = "run_id_mismatch"
+        # keep only what the bundle-level checks need
+        if os.path.basename(path) == "meta.json":
+            result["data"] = {k: data.get(k) for k in ("run_id", "end_timestamp")}
+        elif os.path.basename(path) == "integrity.json":
+            result["data"] = {name: info.get("size_bytes") for name, info in data.get("artifacts", {}).items()
+                              if isinstance(info, dict) and info.get("exists")}
+        return result
+    finally:
+        if isinstance(buf, mmap.mmap):
+            buf.close()
+        if f is not None:
+            f.close()
+
+def check_file(path, run_id):
+    name = os.path.basename(path)
+    if name.endswith(".jsonl"):
+        return check_jsonl(path, run_id)
+    if name.endswith(".json"):
+        return check_json(path, run_id)
+    buf, f = _map_file(path)
+    try:
+        return {"sha256": hashlib.sha256(buf).hexdigest()}
+    finally:
+        if isinstance(buf, mmap.mmap):
+            buf.close()
+        if f is not None:
+            f.close()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BUNDLE CHECK
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _signature(path):
+    """[size, mtime_ns] of the file; archived logs add the archive's own size and mtime."""
+    if os.path.exists(path):
+        st = os.stat(path)
+        return [st.st_size, st.st_mtime_ns]
+    archive, _entry = archived_log(path)
+    if archive is None:
+        raise FileNotFoundError(path)
+    st = os.stat(archive)
+    return [*bundle_file_signature(path), st.st_size, st.st_mtime_ns]
+
+def _bundle_files(bundle_dir):
+    """Names of the files in a bundle, counting archived logs under their original name."""
+    names = set(os.listdir(bundle_dir))
+    for fname, entry in archive_manifest(bundle_dir).get("files", {}).items():
+        if entry.get("archive") in names:
+            names.add(fname)
+    return names
+
+def verify_bundle(args):
+    """Check one bundle. args = (bundle_dir, cached_files) -> (bundle name, report).
+
+    cached_files maps file name -> {"sig": [size, mtime_ns], "run_id": ..., "result": ...};
+    entries whose signature and run_id still match are reused as-is.
+    """
+    bundle_dir, cached_files = args
+    name = os.path.basename(os.path.normpath(bundle_dir))
+    folder_run_id = name[4:] if name.startswith("run_") else name
+    errors, warnings = [], []
+    files = {}
+
+    def file_result(fname, run_id):
+        path = os.path.join(bundle_dir, fname)
+        sig = _signature(path)
+        cached = cached_files.get(fname)
+        if cached and cached.get("sig") == sig and cached.get("run_id") == run_id:
+            result = cached["result"]
+        else:
+            try:
+                result = check_file(path, run_id)
+            except (EOFError, lzma.LZMAError, zlib.error) as ex:
+                errors.append(f"{fname}: compressed archive is corrupt ({ex})")
+                return None
+        files[fname] = {"sig": sig, "run_id": run_id, "result": result}
+        return result
+
+    present = _bundle_files(bundle_dir)
+    if "meta.json" not in present:
+        return name, {"status": "error", "errors": ["meta.json is missing"], "warnings": [], "files": {}}
+
+    meta = file_result("meta.json", folder_run_id)
+    run_id = str((meta.get("data") or {}).get("run_id") or folder_run_id)
+    if meta["status"] == "run_id_mismatch":
+        errors.append(f"meta.json run_id {run_id!r} does not match folder {name!r}")
+    elif meta["status"] != "ok":
+        errors.append(f"meta.json: {meta['status']}")
+    finalized = (meta.get("data") or {}).get("end_timestamp") is not None
+
+    for fname in REQUIRED_FILES + FINALIZED_FILES:
+        if fname in present:
+            continue
+        if fname in REQUIRED_FILES:
+            errors.append(f"{fname} is missing")
+        elif finalized:
+            warnings.append(f"{fname} is missing")
+    if not finalized:
+        warnings.append("bundle not finalized (meta.json has no end_timestamp)")
+
+    for fname in sorted(present):
+        path = os.path.join(bundle_dir, fname)
+        if fname == "meta.json" or fname.endswith(".tmp"):
+            continue
+        if fname not in JSONL_FILES + JSON_FILES + FINALIZED_FILES:
+            continue
+        if os.path.exists(path) and not os.path.isfile(path):
+            continue
+        result = file_result(fname, run_id)
+        if result is None:
+            continue
+        if fname in JSONL_FILES:
+            if result["parse_errors"]:
+                errors.append(f"{fname}: {result['parse_errors']} unparseable line(s), "
+                              f"first at line {result['first_error_line']}")
+            if result["truncated_tail"]:
+                errors.append(f"{fname}: last line has no newline (truncated write)")
+            if result["run_id_mismatch"]:
+                errors.append(f"{fname}: {result['run_id_mismatch']} line(s) from another run_id")
+            if result["no_event"]:
+                warnings.append(f"{fname}: {result['no_event']} line(s) without an event key")
+            if result["lines"] and result["no_run_id"] == result["lines"] - result["parse_errors"]:
+                # the game stamps run_id on session_start only in perf.jsonl, so a few lines without one are fine
+                warnings.append(f"{fname}: no line has a run_id, the file cannot be tied to this run")
+            if result["lines"] == 0:
+                warnings.append(f"{fname} is empty")
+        elif fname in JSON_FILES:
+            if result["status"] == "run_id_mismatch":
+                errors.append(f"{fname} has a different run_id")
+            elif result["status"] in ("parse_error", "invalid_format"):
+                errors.append(f"{fname}: {result['status']}")
+
+    # sizes recorded at finalize: a file that shrank since was truncated or replaced
+    recorded = (files.get("integrity.json", {}).get("result") or {}).get("data") or {}
+    for fname, size in recorded.items():
+        if fname in files and isinstance(size, (int, float)) and files[fname]["sig"][0] < size:
+            errors.append(f"{fname} is smaller than recorded in integrity.json ({files[fname]['sig'][0]} < {int(size)})")
+
+    status = "error" if errors else ("warning" if warnings else "ok")
+    return name, {"status": status, "run_id": run_id, "errors": errors, "warnings": warnings, "files": files}
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CACHE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def load_cache(runs_dir):
+    try:
+        with open(os.path.join(runs_dir, CACHE_FILE), 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache.get("bundles", {}) if cache.get("version") == CACHE_VERSION else {}
+
+def save_cache(runs_dir, bundles):
+    path = os.path.join(runs_dir, CACHE_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"version": CACHE_VERSION, "bundles": bundles}, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+def _cache_hit(bundle_dir, cached):
+    """True if every file the cached report looked at is unchanged and no file was added/removed."""
+    if not cached:
+        return False
+    try:
+        names = {n for n in _bundle_files(bundle_dir)
+                 if n in REQUIRED_FILES + FINALIZED_FILES + JSONL_FILES + JSON_FILES}
+        if names != set(cached.get("files", {})):
+            return False
+        return all(_signature(os.path.join(bundle_dir, n)) == cached["files"][n]["sig"] for n in names)
+    except OSError:
+        return False
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def find_bundle_dirs(runs_dir):
+    """Every run_* folder (unlike find_bundles(), including those with a broken meta.json)."""
+    try:
+        return sorted(e.path for e in os.scandir(runs_dir) if e.is_dir() and e.name.startswith("run_"))
+    except OSError:
+        return []
+
+def find_copies(reports):
+    """JSONL files whose bytes appear in more than one bundle."""
+    by_hash = {}
+    for name, report in reports.items():
+        for fname, info in report.get("files", {}).items():
+            result = info.get("result") or {}
+            if fname in JSONL_FILES and result.get("lines"):
+                by_hash.setdefault(result["sha256"], []).append(f"{name}/{fname}")
+    return [paths for paths in by_hash.values() if len(paths) > 1]
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify every run bundle under a runs/ directory.")
+    parser.add_argument("runs_dir", nargs="?", default=default_runs_dir(),
+                        help="folder holding run_* bundles (default: the game's user://runs)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--no-cache", action="store_true", help="ignore and do not update the result cache")
+    parser.add_argument("--json", metavar="PATH", help="write the full report as JSON")
+    parser.add_argument("--verbose", action="store_true", help="also list warnings")
+    args = parser.parse_args()
+
+    bundle_dirs = find_bundle_dirs(args.runs_dir)
+    if not bundle_dirs:
+        print(f"No run_* bundles under {args.runs_dir}", file=sys.stderr)
+        sys.exit(2)
+
+    cache = {} if args.no_cache else load_cache(args.runs_dir)
+    reports = {}
+    todo = []
+    for bundle_dir in bundle_dirs:
+        name = os.path.basename(bundle_dir)
+        if _cache_hit(bundle_dir, cache.get(name)):
+            reports[name] = cache[name]
+        else:
+            todo.append((bundle_dir, cache.get(name, {}).get("files", {})))
+
+    if todo:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            for name, report in pool.map(verify_bundle, todo, chunksize=max(1, len(todo) // 64)):
+                reports[name] = report
+    if not args.no_cache:
+        save_cache(args.runs_dir, reports)
+
+    counts = {"ok": 0, "warning": 0, "error": 0}
+    for name in sorted(reports):
+        report = reports[name]
+        counts[report["status"]] += 1
+        if report["status"] == "error" or (args.verbose and report["warnings"]):
+            print(f"  {name}: {report['status'].upper()}")
+            for message in report["errors"]:
+                print(f"    ✗ {message}")
+            if args.verbose:
+                for message in report["warnings"]:
+                    print(f"    ⚠ {message}")
+    copies = find_copies(reports)
+    for paths in copies:
+        print(f"  identical logs: {', '.join(paths)}")
+
+    print(f"\n{len(reports)} bundles ({len(reports) - len(todo)} from cache): "
+          f"{counts['ok']} ok, {counts['warning']} with warnings, {counts['error']} with errors, "
+          f"{len(copies)} duplicated log(s)")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({"bundles": reports, "copies": copies}, f, indent=2)
+    sys.exit(1 if counts["error"] else 0)
+
+if __name__ == "__main__":
+    main()
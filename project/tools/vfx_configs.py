@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Spritesheet configs of VFXManager.gd
+
+VFXManager keeps one `var <CATEGORY>_CONFIG = { id: { path, hframes, vframes,
+frame_size, duration } }` table per effect family (AOE, PROJECTILE, AURA,
+PLAYER_VFX, BEAM, TELEGRAPH, BOSS). This module reads them with gd_const so
+asset tools slice, pack and budget the sheets exactly as the game does.
+
+Usage:
+    python tools/vfx_configs.py            # table of every configured sheet
+"""
+
+import os
+import sys
+from collections import namedtuple
+
+from gd_const import Call, load_consts, project_root
+
+VFX_MANAGER = os.path.join(project_root(), "scripts", "core", "VFXManager.gd")
+
+SheetConfig = namedtuple("SheetConfig", "category id res_path path hframes vframes frame_w frame_h duration")
+
+
+def res_to_path(res_path, root=None):
+    """res://a/b.png -> <project>/a/b.png"""
+    return os.path.join(root or project_root(), *res_path[len("res://"):].split("/"))
+
+def load_sheet_configs(gd_path=VFX_MANAGER):
+    """Every configured spritesheet, in file order; category is the table name without _CONFIG, lowercased"""
+    tables = load_consts(gd_path, variables=True)
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(gd_path))))
+    sheets = []
+    for table, entries in tables.items():
+        if not table.endswith("_CONFIG") or not isinstance(entries, dict):
+            continue
+        category = table[:-len("_CONFIG")].lower()
+        for vfx_id, config in entries.items():
+            if not isinstance(config, dict) or not isinstance(config.get("path"), str):
+                continue
+            size = config.get("frame_size")
+            frame_w, frame_h = size.args if isinstance(size, Call) and len(size.args) == 2 else (0, 0)
+            sheets.append(SheetConfig(category, vfx_id, config["path"], res_to_path(config["path"], root),
+                                      int(config.get("hframes", 1)), int(config.get("vframes", 1)),
+                                      int(frame_w), int(frame_h), float(config.get("duration", 0.5))))
+    return sheets
+
+def main():
+    sheets = load_sheet_configs(sys.argv[1] if len(sys.argv) > 1 else VFX_MANAGER)
+    for s in sheets:
+        missing = "" if os.path.exists(s.path) else "  (missing)"
+        print(f"  {s.category:<11} {s.id:<20} {s.hframes}x{s.vframes} of {s.frame_w}x{s.frame_h}  {s.res_path}{missing}")
+    print(f"\n{len(sheets)} sheet config(s)")
+
+if __name__ == "__main__":
+    main()
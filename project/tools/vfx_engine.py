@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+Data-driven VFX spritesheet engine
+
+Effects are described in JSON (or YAML, when PyYAML is installed) under
+tools/vfx_effects/ and drawn with vfx_raster. A spec file holds one effect,
+a list of effects, or {"effects": [...]}:
+
+    {
+      "name": "frost_nova",
+      "size": 128, "frames": 8, "cols": 4, "blur": 1.0,
+      "output": "engine/player/buffs/vfx_player_frost_nova_spritesheet.png",
+      "params": {"tint": [140, 210, 255]},
+      "curves": {"expand": [[0, 0], [0.6, 1], [1, 1]]},
+      "vars":   {"radius": "size * 0.45 * expand"},
+      "layers": [
+        {"type": "ring", "when": "radius > 5 * s", "r": "radius", "width": "3 * s",
+         "color": ["tint[0]", "tint[1]", "tint[2]", "180 * alpha"], "fade": 0.75},
+        {"type": "emitter", "count": 16, "seed": 42,
+         "vars": {"angle": "rand(0, tau)", "x": "cx + cos(angle) * radius", "y": "cy + sin(angle) * radius"},
+         "draw": [{"shape": "diamond", "r": "3 * s", "aspect": 1.5, "color": [200, 240, 255, 220]}]}
+      ],
+      "variants": [{"name": "frost_nova_elite", "output": "...", "params": {"tint": [255, 120, 90]}}]
+    }
+
+Values are numbers or expressions. Every frame defines t (0..1 over the
+animation), frame, frames, size (frame px), s (size / base size, for pixel
+constants), cx, cy, pi and tau, then params, curves (piecewise-linear in t)
+and vars, in that order. Layers: disc, ring, glow, rect, line, emitter; any
+layer may have "repeat" (index k), "vars", "when" and "blend" (over/add).
+An emitter evaluates its vars over count particles at once (index i, n),
+with rand(lo, hi[, count]) / randint(lo, hi) drawing from a stream seeded
+by its "seed" expression ("100 + frame" for per-frame sparkles), drops the
+particles failing "keep", and draws each "draw" entry (disc, diamond,
+square, cross or line) as one batch. Use & | ~ and where() on arrays.
+
+Variants inherit everything from their effect and override params, vars,
+curves or any top-level key, so hundreds of enemy / boss / elite tints of
+one description build in the same pass; all sheets render across one
+process pool. Builds go through build_cache: a sheet whose description,
+engine code and encoder are unchanged is skipped (--force renders it anyway)
+and <out>/_build_manifest.json (tracked) records what produced each file. An output
+that another generator's manifest already records (e.g. the PIL player
+sheets in abilities/player/) is refused rather than overwritten; the player
+specs build their own copies under abilities/engine/player/.
+
+Usage:
+    python tools/vfx_engine.py [SPEC_OR_DIR ...] [--out DIR] [--only NAME,...] [--scale 2] [--frames 16]
+                               [--workers N] [--force] [--list]
+"""
+
+import argparse
+import ast
+import copy
+import io
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import PIL
+
+import vfx_raster
+from build_cache import MANIFEST_FILE, BuildCache, cache_key, find_owner
+from vfx_raster import Sheet
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+SPECS_DIR = os.path.join(TOOLS_DIR, "vfx_effects")
+OUTPUT_ROOT = os.path.join(os.path.dirname(TOOLS_DIR), "assets", "vfx", "abilities")
+SPEC_SUFFIXES = (".json", ".yaml", ".yml")
+LAYER_TYPES = ("disc", "ring", "glow", "rect", "line", "emitter")
+PNG_OPTIONS = {"compress_type": 3}  # zlib Z_RLE
+
+
+class SpecError(ValueError):
+    pass
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# EXPRESSIONS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _toint(x):
+    return np.floor(x).astype(np.int64) if isinstance(x, np.ndarray) else int(math.floor(x))
+
+def _reduce(fn):
+    def apply(*args):
+        result = args[0]
+        for arg in args[1:]:
+            result = fn(result, arg)
+        return result
+    return apply
+
+FUNCS = {
+    "sin": np.sin, "cos": np.cos, "tan": np.tan, "atan2": np.arctan2, "sqrt": np.sqrt, "exp": np.exp,
+    "abs": np.abs, "floor": np.floor, "ceil": np.ceil, "hypot": np.hypot, "clip": np.clip, "where": np.where,
+    "min": _reduce(np.minimum), "max": _reduce(np.maximum), "int": _toint, "float": float,
+    "lerp": lambda a, b, x: a + (b - a) * x,
+    "smoothstep": lambda e0, e1, x: (lambda u: u * u * (3 - 2 * u))(np.clip((x - e0) / (e1 - e0), 0.0, 1.0)),
+    "interp": lambda x, xs, ys: np.interp(x, xs, ys),
+    "take": lambda values, index: np.asarray(values)[index],
+}
+RANDOM_FUNCS = ("rand", "randint")
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare, ast.IfExp, ast.Call, ast.Name, ast.Load,
+    ast.Constant, ast.Subscript, ast.List, ast.Tuple, ast.Slice,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow, ast.USub, ast.UAdd, ast.Not, ast.Invert,
+    ast.BitAnd, ast.BitOr, ast.BitXor, ast.And, ast.Or,
+    ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
+)
+_compiled = {}
+
+def compile_expr(text):
+    """Compile a spec expression once (arithmetic, comparisons, indexing and FUNCS calls only)"""
+    code = _compiled.get(text)
+    if code is None:
+        try:
+            tree = ast.parse(text, mode="eval")
+        except SyntaxError as ex:
+            raise SpecError(f"bad expression {text!r}: {ex.msg}") from None
+        for node in ast.walk(tree):
+            if not isinstance(node, _ALLOWED_NODES):
+                raise SpecError(f"expression {text!r}: {type(node).__name__} is not allowed")
+            if isinstance(node, ast.Call) and not (isinstance(node.func, ast.Name)
+                                                   and (node.func.id in FUNCS or node.func.id in RANDOM_FUNCS)):
+                raise SpecError(f"expression {text!r}: only {', '.join(sorted(FUNCS))}, rand, randint can be called")
+        code = _compiled[text] = compile(tree, "<vfx>", "eval")
+    return code
+
+def value(v, env):
+    """Evaluate a spec value: number, expression string, or list of those"""
+    if isinstance(v, str):
+        try:
+            return eval(compile_expr(v), {"__builtins__": {}}, env)
+        except SpecError:
+            raise
+        except Exception as ex:
+            raise SpecError(f"evaluating {v!r}: {type(ex).__name__}: {ex}") from None
+    if isinstance(v, (list, tuple)):
+        return [value(item, env) for item in v]
+    return v
+
+def _eval_vars(spec_vars, env):
+    for name, expr in (spec_vars or {}).items():
+        env[name] = value(expr, env)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SPECS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def load_spec_file(path):
+    """Effects (dicts) of one spec file, each tagged with its source path"""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith((".yaml", ".yml")):
+            if yaml is None:
+                raise SpecError(f"{path}: PyYAML is not installed (pip install pyyaml), use JSON instead")
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+    effects = data.get("effects", [data]) if isinstance(data, dict) else data
+    for effect in effects:
+        if not isinstance(effect, dict) or "name" not in effect:
+            raise SpecError(f"{path}: every effect needs a name")
+        effect["_source"] = path
+    return effects
+
+def load_specs(paths):
+    """Effects from spec files and directories, variants expanded. Names must be unique."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, n) for n in sorted(os.listdir(path)) if n.endswith(SPEC_SUFFIXES))
+        else:
+            files.append(path)
+    effects = {}
+    for path in files:
+        for effect in load_spec_file(path):
+            for resolved in expand_variants(effect):
+                if resolved["name"] in effects:
+                    raise SpecError(f"{path}: duplicate effect name {resolved['name']!r}")
+                effects[resolved["name"]] = resolved
+    return effects
+
+def expand_variants(effect):
+    """The effect itself plus one effect per variant (overrides merged into a copy)"""
+    base = {k: v for k, v in effect.items() if k != "variants"}
+    yield base
+    for variant in effect.get("variants", []):
+        if "name" not in variant:
+            raise SpecError(f"{effect['name']}: every variant needs a name")
+        resolved = copy.deepcopy(base)
+        for key, override in variant.items():
+            if key in ("params", "vars", "curves") and isinstance(override, dict):
+                resolved[key] = dict(resolved.get(key, {}), **override)
+            else:
+                resolved[key] = override
+        yield resolved
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RENDER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _color(c, n=None):
+    """[r, g, b(, a)] of scalars/arrays -> (4,) or (n, 4) on the 0..255 scale"""
+    if len(c) == 3:
+        c = list(c) + [255]
+    if n is None and not any(isinstance(x, np.ndarray) and x.ndim for x in c):
+        return [float(x) for x in c]
+    return np.stack([np.broadcast_to(np.asarray(x, dtype=np.float32), (n,)) for x in c], axis=1)
+
+def _layer(f, layer, env):
+    kind = layer.get("type")
+    if kind not in LAYER_TYPES:
+        raise SpecError(f"unknown layer type {kind!r} (known: {', '.join(LAYER_TYPES)})")
+    repeat = int(value(layer.get("repeat", 1), env))
+    for k in range(repeat):
+        scope = dict(env, k=k)
+        if kind != "emitter":  # emitter vars are per particle, see _emitter()
+            _eval_vars(layer.get("vars"), scope)
+        if "when" in layer and not value(layer["when"], scope):
+            continue
+        get = lambda key, default=None: value(layer.get(key, default), scope)
+        blend = layer.get("blend", "over")
+        if kind == "disc":
+            f.disc(get("x", "cx"), get("y", "cy"), get("r"), _color(get("color")), blend)
+        elif kind == "ring":
+            f.ring(get("x", "cx"), get("y", "cy"), get("r"), get("width", "s"), _color(get("color")),
+                   get("fade", 0.0), blend)
+        elif kind == "glow":
+            f.glow(get("x", "cx"), get("y", "cy"), get("r"), _color(get("color")), get("falloff", 2.0), blend)
+        elif kind == "rect":
+            x, y, w, h = get("x", "cx"), get("y", "cy"), get("w"), get("h")
+            f.rect(x - w / 2, y - h / 2, x + w / 2, y + h / 2, _color(get("color")), blend)
+        elif kind == "line":
+            f.line(get("x0"), get("y0"), get("x1"), get("y1"), get("width", "s"), _color(get("color")), blend)
+        else:
+            _emitter(f, layer, scope)
+
+def _emitter(f, layer, env):
+    n = int(value(layer.get("count", 1), env))
+    if n <= 0:
+        return
+    rng = np.random.default_rng(int(value(layer.get("seed", 0), env)))
+    scope = dict(env, n=n, i=np.arange(n))
+    scope["rand"] = lambda lo, hi, count=None: rng.uniform(lo, hi, n if count is None else count)
+    scope["randint"] = lambda lo, hi, count=None: rng.integers(lo, hi + 1, n if count is None else count)
+    _eval_vars(layer.get("vars"), scope)
+    if "keep" in layer:
+        keep = np.broadcast_to(np.asarray(value(layer["keep"], scope), dtype=bool), (n,))
+        for name, v in list(scope.items()):
+            if isinstance(v, np.ndarray) and v.shape[:1] == (n,) and name not in env:
+                scope[name] = v[keep]
+        n = scope["n"] = int(keep.sum())
+        if n == 0:
+            return
+    for draw in layer.get("draw", []):
+        get = lambda key, default=None: value(draw.get(key, default), scope)
+        shape = draw.get("shape", "disc")
+        blend = draw.get("blend", layer.get("blend", "over"))
+        color = _color(get("color"), n)
+        if shape == "line":
+            f.lines(*(np.broadcast_to(np.asarray(get(k), dtype=np.float32), (n,)) for k in ("x0", "y0", "x1", "y1")),
+                    get("width", "s"), color, blend=blend)
+        else:
+            xs = np.broadcast_to(np.asarray(get("x", "x"), dtype=np.float32), (n,))
+            ys = np.broadcast_to(np.asarray(get("y", "y"), dtype=np.float32), (n,))
+            f.particles(xs, ys, get("r"), color, shape=shape, aspect=get("aspect", 1.0),
+                        thickness=get("thickness", "s"), blend=blend)
+
+def render(effect, scale=1.0, frames=None, ss=4):
+    """Render one effect description to a PIL image (all frames in one sheet buffer)"""
+    base = float(effect.get("size", 128))
+    size = int(round(base * scale))
+    num_frames = int(frames or effect.get("frames", 8))
+    cols = int(effect.get("cols", 4))
+    sigma = float(effect.get("blur", 0.0)) * size / base
+    ss = int(effect.get("ss", ss))
+    if sigma > 1.0:
+        # a blur of sigma px smooths away anything finer than 1 / sigma px: no need to sample finer
+        ss = max(1, math.ceil(ss / sigma))
+    sheet = Sheet(size, cols=cols, rows=max(1, math.ceil(num_frames / cols)), ss=ss)
+    curves = {name: np.asarray(points, dtype=np.float64).T for name, points in effect.get("curves", {}).items()}
+    for frame in range(num_frames):
+        t = frame / (num_frames - 1) if num_frames > 1 else 1.0
+        env = dict(FUNCS, t=t, frame=frame, frames=num_frames, size=size, s=size / base,
+                   cx=size / 2.0, cy=size / 2.0, pi=math.pi, tau=2 * math.pi)
+        env.update({k: value(v, env) for k, v in effect.get("params", {}).items()})
+        env.update({k: float(np.interp(t, xs, ys)) for k, (xs, ys) in curves.items()})
+        _eval_vars(effect.get("vars"), env)
+        canvas = sheet.frame(frame)
+        for layer in effect.get("layers", []):
+            _layer(canvas, layer, env)
+    sheet.blur(sigma)
+    return sheet.to_image()
+
+def encode_png(image):
+    """PNG bytes of a rendered sheet. Run-length matching deflates the smooth gradients in under half the
+    time of zlib's default search, for files about 40% larger; optimize_pngs.py recompresses for shipping."""
+    png = io.BytesIO()
+    image.save(png, "PNG", **PNG_OPTIONS)
+    return png.getvalue()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BUILD
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def effect_key(effect, scale=1.0, frames=None):
+    """Build-cache key: the description itself, the engine / rasterizer source and the PNG encoder"""
+    params = {"spec": {k: v for k, v in effect.items() if k != "_source"}, "scale": scale, "frames": frames}
+    fmt = {"format": "png", "pil": PIL.__version__, "numpy": np.__version__, "png": PNG_OPTIONS}
+    return cache_key(params, [__file__, vfx_raster.__file__], fmt)
+
+def build_one(job):
+    """Worker entry point: job = (effect, scale, frames) -> (name, png bytes, size, seconds, error)"""
+    effect, scale, frames = job
+    t0 = time.perf_counter()
+    try:
+        image = render(effect, scale, frames)
+        return effect["name"], encode_png(image), image.size, time.perf_counter() - t0, None
+    except SpecError as ex:
+        return effect["name"], None, None, time.perf_counter() - t0, f"{effect.get('_source', '?')}: {ex}"
+
+def build(effects, out_root=OUTPUT_ROOT, scale=1.0, frames=None, workers=None, force=False):
+    """Render every stale effect across one process pool and store it through the build cache
+    (<out_root>/_build_manifest.json). Yields (name, path, size or None if up to date, seconds, error)."""
+    cache = BuildCache(out_root, force=force)
+    manifests = {}
+    todo = []
+    for effect in effects:
+        if "output" not in effect:
+            raise SpecError(f"{effect['name']}: no output path")
+        owner = find_owner(os.path.join(out_root, effect["output"]), exclude=out_root, manifests=manifests)
+        if owner:
+            folder, entry = owner
+            raise SpecError(f"{effect['name']}: {effect['output']} is already built by {entry.get('generator', '?')} "
+                            f"(see {os.path.join(folder, MANIFEST_FILE)}); give it another output path")
+        key = effect_key(effect, scale, frames)
+        if cache.is_fresh(effect["output"], key):
+            yield effect["name"], os.path.join(out_root, effect["output"]), None, 0.0, None
+        else:
+            todo.append((effect, key))
+    if not todo:
+        cache.save()
+        return
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(build_one, [(effect, scale, frames) for effect, _key in todo])
+            for (effect, key), (name, png, size, seconds, error) in zip(todo, results):
+                path = os.path.join(out_root, effect["output"])
+                if png is not None:
+                    source = effect.get("_source")
+                    # relative, so the tracked manifest reads the same in every checkout
+                    spec = os.path.relpath(source, TOOLS_DIR).replace(os.sep, "/") if source else None
+                    info = {"generator": "vfx_engine.py", "effect": name, "spec": spec,
+                            "scale": scale, "frames": frames}
+                    try:
+                        cache.write(effect["output"], key, png, info)
+                    except OSError as ex:
+                        size, error = None, str(ex)
+                yield name, path, size, seconds, error
+    finally:
+        cache.save()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def main():
+    parser = argparse.ArgumentParser(description="Render VFX spritesheets from effect descriptions.")
+    parser.add_argument("specs", nargs="*", default=[SPECS_DIR], help="spec files or folders (default: tools/vfx_effects)")
+    parser.add_argument("--out", default=OUTPUT_ROOT, help="root for the effects' output paths (default: assets/vfx/abilities)")
+    parser.add_argument("--only", metavar="NAMES", help="comma-separated effect names to build")
+    parser.add_argument("--scale", type=float, default=1.0, help="frame size multiplier")
+    parser.add_argument("--frames", type=int, default=None, help="override every effect's frame count")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--force", action="store_true", help="ignore the build cache and render every sheet")
+    parser.add_argument("--list", action="store_true", help="list the effects and exit")
+    args = parser.parse_args()
+
+    try:
+        effects = load_specs(args.specs)
+    except (OSError, ValueError) as ex:
+        sys.exit(f"Cannot load specs: {ex}")
+    if args.only:
+        wanted = [n.strip() for n in args.only.split(",") if n.strip()]
+        missing = [n for n in wanted if n not in effects]
+        if missing:
+            sys.exit(f"Unknown effect(s): {', '.join(missing)}")
+        effects = {n: effects[n] for n in wanted}
+    if args.list:
+        for name, effect in effects.items():
+            print(f"  {name:<32} {effect.get('size', 128)}px x{effect.get('frames', 8)}  -> {effect.get('output')}")
+        return
+
+    t0 = time.perf_counter()
+    failed = fresh = 0
+    try:
+        for name, path, size, seconds, error in build(effects.values(), args.out, args.scale, args.frames,
+                                                      args.workers, args.force):
+            if error:
+                failed += 1
+                print(f"  ✗ {name}: {error}", file=sys.stderr)
+            elif size is None:
+                fresh += 1
+            else:
+                print(f"  ✓ {name}: {size[0]}x{size[1]} in {seconds:.2f}s -> {path}")
+    except SpecError as ex:
+        sys.exit(str(ex))
+    built = len(effects) - failed - fresh
+    print(f"\n{built} sheet(s) built, {fresh} up to date, {failed} failed in {time.perf_counter() - t0:.1f}s")
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,390 @@
+"""
+NumPy rasterizer for procedural VFX spritesheets
+
+Shapes are signed distance functions evaluated on whole pixel windows instead
+of one ImageDraw call per outline pixel. Anti-aliasing is supersampled: pixel
+centres decide the inside/outside of every pixel, and only the pixels within
+half a diagonal of an edge are resampled on an ss x ss grid. Particle and line
+batches are rasterized as one (N, window) array and merged into the frame with
+bincount, so a hundred sparks cost about as much as one.
+
+Everything draws into one preallocated float32 sheet (premultiplied RGBA,
+0..1); frames are views into it, so there is no per-frame image to paste.
+blur() runs a separable Gaussian (three running-sum box passes per axis)
+frame by frame over the painted part of each frame, so it never bleeds
+across frame borders and its cost follows the drawn area, not the sheet.
+
+Colors are (r, g, b, a) on the 0..255 scale ImageDraw uses; alpha may be a
+float. blend="over" composites normally, blend="add" accumulates light.
+
+Usage:
+    from vfx_raster import Sheet
+    sheet = Sheet(256, 256, cols=4, rows=4, ss=4)
+    f = sheet.frame(0)
+    f.ring(128, 128, 100, 8, (140, 210, 255, 180), fade=0.7)
+    f.glow(128, 128, 60, (180, 230, 255, 80))
+    f.particles(xs, ys, 3.0, (220, 245, 255, 200), shape="diamond")
+    sheet.blur(1.0)
+    sheet.to_image().save("out.png")
+"""
+
+import math
+
+import numpy as np
+from PIL import Image
+
+HALF_DIAGONAL = 0.7072  # pixels farther than this from an edge are fully in or out
+LONG_LINE = 48.0        # px; longer segments in lines() are drawn one by one
+
+
+def _rgba(color):
+    c = np.asarray(color, dtype=np.float32) / 255.0
+    return np.clip(c, 0.0, 1.0)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CANVAS — one frame (a view into the sheet buffer)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class Canvas:
+    """Drawing surface over an (h, w, 4) premultiplied float32 buffer"""
+
+    def __init__(self, buf, ss=4):
+        self.buf = buf
+        self.h, self.w = buf.shape[:2]
+        self.ss = max(1, int(ss))
+        sub = (np.arange(self.ss, dtype=np.float32) + 0.5) / self.ss
+        self._sub_x = np.tile(sub, self.ss)
+        self._sub_y = np.repeat(sub, self.ss)
+
+    # --- internals -------------------------------------------------------------
+
+    def _window(self, x0, y0, x1, y1):
+        ix0 = max(0, int(math.floor(x0)))
+        iy0 = max(0, int(math.floor(y0)))
+        ix1 = min(self.w, int(math.ceil(x1)))
+        iy1 = min(self.h, int(math.ceil(y1)))
+        if ix0 >= ix1 or iy0 >= iy1:
+            return None
+        return ix0, iy0, ix1, iy1
+
+    def _composite(self, iy0, ix0, alpha, rgb, blend):
+        """Blend a layer (alpha (h, w), rgb (3,) or (h, w, 3), straight) at (ix0, iy0)"""
+        h, w = alpha.shape
+        dst = self.buf[iy0:iy0 + h, ix0:ix0 + w]
+        a = alpha[..., None]
+        if blend == "add":
+            dst[..., :3] += a * rgb
+            np.minimum(dst[..., 3] + alpha, 1.0, out=dst[..., 3])
+        else:
+            inv = 1.0 - a
+            dst *= inv
+            dst[..., :3] += a * rgb
+            dst[..., 3] += alpha
+
+    def _composite_at(self, ys, xs, alpha, rgb, blend):
+        """Same as _composite for scattered pixels: alpha (m,), rgb (3,) or (m, 3)"""
+        dst = self.buf[ys, xs]
+        a = alpha[:, None]
+        if blend == "add":
+            dst[:, :3] += a * rgb
+            dst[:, 3] = np.minimum(dst[:, 3] + alpha, 1.0)
+        else:
+            dst *= 1.0 - a
+            dst[:, :3] += a * rgb
+            dst[:, 3] += alpha
+        self.buf[ys, xs] = dst
+
+    def _shape(self, bbox, sdf, color, alpha_fn=None, blend="over"):
+        """Rasterize one shape given its SDF (vectorized over x, y) and bounding box"""
+        c = _rgba(color)
+        if c[3] <= 0:
+            return
+        win = self._window(*bbox)
+        if win is None:
+            return
+        ix0, iy0, ix1, iy1 = win
+        px = np.arange(ix0, ix1, dtype=np.float32)[None, :] + 0.5
+        py = np.arange(iy0, iy1, dtype=np.float32)[:, None] + 0.5
+        d = np.broadcast_to(sdf(px, py), (iy1 - iy0, ix1 - ix0))
+        cov = (d <= 0).astype(np.float32)
+        if self.ss > 1:
+            ey, ex = np.nonzero(np.abs(d) < HALF_DIAGONAL)
+            if len(ey):
+                sx = (ex + ix0).astype(np.float32)[:, None] + self._sub_x
+                sy = (ey + iy0).astype(np.float32)[:, None] + self._sub_y
+                cov[ey, ex] = (sdf(sx, sy) <= 0).mean(axis=1)
+        if alpha_fn is not None:
+            cov *= alpha_fn(px, py)
+        alpha = np.clip(cov * c[3], 0.0, 1.0)
+        ey, ex = np.nonzero(alpha)
+        if len(ey) < alpha.size // 3:
+            # thin shapes (rings, lines) cover a fraction of their box: blend only those pixels
+            self._composite_at(ey + iy0, ex + ix0, alpha[ey, ex], c[:3], blend)
+        else:
+            self._composite(iy0, ix0, alpha, c[:3], blend)
+
+    def _batch(self, cx, cy, half_w, half_h, inside, colors, blend):
+        """Rasterize N small shapes at once. inside(rx, ry) gets sample offsets from each centre, shaped (N, H, W)."""
+        n = len(cx)
+        if n == 0:
+            return
+        ss = self.ss
+        kw = int(math.ceil(2 * float(np.max(half_w)))) + 2
+        kh = int(math.ceil(2 * float(np.max(half_h)))) + 2
+        ox = np.floor(cx - kw / 2.0).astype(np.int64)
+        oy = np.floor(cy - kh / 2.0).astype(np.int64)
+        sub_x = (np.arange(kw * ss, dtype=np.float32) + 0.5) / ss
+        sub_y = (np.arange(kh * ss, dtype=np.float32) + 0.5) / ss
+        rx = (ox - cx)[:, None, None] + sub_x[None, None, :]
+        ry = (oy - cy)[:, None, None] + sub_y[None, :, None]
+        cov = inside(rx, ry).reshape(n, kh, ss, kw, ss).mean(axis=(2, 4), dtype=np.float32)
+
+        alpha = cov * colors[:, 3][:, None, None]
+        gx = ox[:, None, None] + np.arange(kw)[None, None, :]
+        gy = oy[:, None, None] + np.arange(kh)[None, :, None]
+        keep = (alpha > 0) & (gx >= 0) & (gx < self.w) & (gy >= 0) & (gy < self.h)
+        if not keep.any():
+            return
+        flat = (gy * self.w + gx)[keep]
+        a = alpha[keep]
+        owner = np.broadcast_to(np.arange(n)[:, None, None], keep.shape)[keep]
+        pixels, slot = np.unique(flat, return_inverse=True)
+        weight = np.bincount(slot, weights=a)
+        rgb = np.stack([np.bincount(slot, weights=a * colors[owner, ch]) for ch in range(3)], axis=-1)
+        rgb /= weight[:, None]
+        if blend == "add":
+            layer = np.minimum(weight, 1.0)
+        else:
+            # union of overlapping shapes, independent of draw order
+            layer = 1.0 - np.exp(np.bincount(slot, weights=np.log1p(-np.minimum(a, 0.999999))))
+        ys, xs = np.divmod(pixels, self.w)
+        self._composite_at(ys, xs, layer.astype(np.float32), rgb.astype(np.float32), blend)
+
+    @staticmethod
+    def _colors(color, n, alpha=None):
+        c = np.broadcast_to(_rgba(color), (n, 4)).copy() if np.ndim(color) < 2 else _rgba(color)
+        if alpha is not None:
+            c[:, 3] *= np.broadcast_to(np.asarray(alpha, dtype=np.float32), (n,))
+        return np.clip(c, 0.0, 1.0)
+
+    # --- single shapes ---------------------------------------------------------
+
+    def disc(self, cx, cy, r, color, blend="over"):
+        """Filled circle"""
+        self._shape((cx - r - 1, cy - r - 1, cx + r + 1, cy + r + 1),
+                    lambda x, y: np.hypot(x - cx, y - cy) - r, color, blend=blend)
+
+    def ring(self, cx, cy, r, width, color, fade=0.0, blend="over"):
+        """Circle outline whose outer edge is at r; fade > 0 dims the alpha towards the inner edge
+        (1 = transparent there), fade < 0 brightens it (-3 = 4x the outer alpha)"""
+        mid, half = r - width / 2.0, width / 2.0
+        alpha_fn = None
+        if fade:
+            alpha_fn = lambda x, y: 1.0 - fade * np.clip((r - np.hypot(x - cx, y - cy)) / width, 0.0, 1.0)
+        self._shape((cx - r - 1, cy - r - 1, cx + r + 1, cy + r + 1),
+                    lambda x, y: np.abs(np.hypot(x - cx, y - cy) - mid) - half, color, alpha_fn, blend)
+
+    def glow(self, cx, cy, r, color, falloff=2.0, blend="over"):
+        """Soft radial gradient: full alpha at the centre, zero at r"""
+        c = _rgba(color)
+        win = self._window(cx - r, cy - r, cx + r, cy + r)
+        if win is None or c[3] <= 0 or r <= 0:
+            return
+        ix0, iy0, ix1, iy1 = win
+        px = np.arange(ix0, ix1, dtype=np.float32)[None, :] + 0.5
+        py = np.arange(iy0, iy1, dtype=np.float32)[:, None] + 0.5
+        a = np.clip(1.0 - np.hypot(px - cx, py - cy) / r, 0.0, 1.0) ** falloff
+        self._composite(iy0, ix0, a * c[3], c[:3], blend)
+
+    def rect(self, x0, y0, x1, y1, color, blend="over"):
+        """Axis-aligned filled rectangle"""
+        cx, cy, hw, hh = (x0 + x1) / 2.0, (y0 + y1) / 2.0, abs(x1 - x0) / 2.0, abs(y1 - y0) / 2.0
+
+        def sdf(x, y):
+            qx, qy = np.abs(x - cx) - hw, np.abs(y - cy) - hh
+            return np.hypot(np.maximum(qx, 0), np.maximum(qy, 0)) + np.minimum(np.maximum(qx, qy), 0)
+        self._shape((x0 - 1, y0 - 1, x1 + 1, y1 + 1), sdf, color, blend=blend)
+
+    def line(self, x0, y0, x1, y1, width, color, blend="over"):
+        """Thick segment with round caps"""
+        bx, by = x1 - x0, y1 - y0
+        bb = bx * bx + by * by or 1.0
+        half = width / 2.0
+
+        def sdf(x, y):
+            px, py = x - x0, y - y0
+            h = np.clip((px * bx + py * by) / bb, 0.0, 1.0)
+            return np.hypot(px - h * bx, py - h * by) - half
+        self._shape((min(x0, x1) - half - 1, min(y0, y1) - half - 1, max(x0, x1) + half + 1, max(y0, y1) + half + 1),
+                    sdf, color, blend=blend)
+
+    # --- batches ---------------------------------------------------------------
+
+    def particles(self, xs, ys, radius, color, alpha=None, shape="disc", aspect=1.0, thickness=1.0, blend="over"):
+        """N shapes at (xs, ys). radius, alpha (0..1 multiplier) and thickness may be scalars or arrays;
+        color may be one color or an (N, 4) array. shape: disc, diamond (height = radius * aspect),
+        square or cross (4-point sparkle, arms of the given thickness)."""
+        xs = np.asarray(xs, dtype=np.float32).ravel()
+        ys = np.asarray(ys, dtype=np.float32).ravel()
+        n = len(xs)
+        if n == 0:
+            return
+        r = np.broadcast_to(np.asarray(radius, dtype=np.float32), (n,))
+        half = np.broadcast_to(np.asarray(thickness, dtype=np.float32), (n,)) / 2.0
+        colors = self._colors(color, n, alpha)
+        keep = (r > 0) & (colors[:, 3] > 0)
+        xs, ys, r, half, colors = xs[keep], ys[keep], r[keep], half[keep], colors[keep]
+        rr = r[:, None, None]
+        if shape == "disc":
+            inside = lambda rx, ry: rx * rx + ry * ry <= rr * rr
+            hw = hh = r
+        elif shape == "diamond":
+            inside = lambda rx, ry: np.abs(rx) / rr + np.abs(ry) / (rr * aspect) <= 1.0
+            hw, hh = r, r * aspect
+        elif shape == "square":
+            inside = lambda rx, ry: (np.abs(rx) <= rr) & (np.abs(ry) <= rr)
+            hw = hh = r
+        elif shape == "cross":
+            th = half[:, None, None]
+            inside = lambda rx, ry: (((np.abs(rx) <= rr) & (np.abs(ry) <= th))
+                                     | ((np.abs(ry) <= rr) & (np.abs(rx) <= th)))
+            hw = hh = r
+        else:
+            raise ValueError(f"unknown particle shape: {shape}")
+        self._batch(xs, ys, hw, hh, inside, colors, blend)
+
+    def lines(self, x0, y0, x1, y1, width, color, alpha=None, blend="over"):
+        """N thick segments; width and alpha may be scalars or arrays, color one color or (N, 4)"""
+        x0, y0, x1, y1 = (np.asarray(v, dtype=np.float32).ravel() for v in (x0, y0, x1, y1))
+        n = len(x0)
+        if n == 0:
+            return
+        half = np.broadcast_to(np.asarray(width, dtype=np.float32), (n,)) / 2.0
+        colors = self._colors(color, n, alpha)
+        keep = (half > 0) & (colors[:, 3] > 0)
+        x0, y0, x1, y1, half, colors = x0[keep], y0[keep], x1[keep], y1[keep], half[keep], colors[keep]
+        if len(x0) and float(np.max(np.hypot(x1 - x0, y1 - y0) + 2 * half)) > LONG_LINE:
+            # long segments: the edge-band path of line() samples far fewer points than a full window
+            for i in range(len(x0)):
+                self.line(x0[i], y0[i], x1[i], y1[i], 2 * half[i], colors[i] * 255.0, blend)
+            return
+        cx, cy = (x0 + x1) / 2.0, (y0 + y1) / 2.0
+        bx, by = (x1 - x0)[:, None, None], (y1 - y0)[:, None, None]
+        bb = np.maximum(bx * bx + by * by, 1e-6)
+        hr = half[:, None, None]
+
+        def inside(rx, ry):
+            px, py = rx + bx / 2.0, ry + by / 2.0
+            h = np.clip((px * bx + py * by) / bb, 0.0, 1.0)
+            qx, qy = px - h * bx, py - h * by
+            return qx * qx + qy * qy <= hr * hr
+        self._batch(cx, cy, np.abs(x1 - x0) / 2.0 + half, np.abs(y1 - y0) / 2.0 + half, inside, colors, blend)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SHEET — preallocated cols x rows buffer
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class Sheet:
+    """Spritesheet buffer; frame(i) returns a Canvas drawing straight into it (row-major order)"""
+
+    def __init__(self, frame_w, frame_h=None, cols=4, rows=2, ss=4):
+        self.fw = int(frame_w)
+        self.fh = int(frame_h or frame_w)
+        self.cols, self.rows, self.ss = cols, rows, ss
+        self.buf = np.zeros((rows * self.fh, cols * self.fw, 4), dtype=np.float32)
+
+    @property
+    def num_frames(self):
+        return self.cols * self.rows
+
+    def frame(self, i):
+        row, col = divmod(i, self.cols)
+        return Canvas(self.buf[row * self.fh:(row + 1) * self.fh, col * self.fw:(col + 1) * self.fw], self.ss)
+
+    def blur(self, sigma):
+        """Gaussian blur of every frame (premultiplied, so colors do not darken at the edges).
+        Three box passes per axis, like PIL's GaussianBlur, run frame by frame on the drawn part of
+        the frame only: the work stays in cache and follows the painted area, not the sheet size."""
+        if sigma <= 0:
+            return
+        radii = _box_radii(sigma)
+        reach = sum(radii)
+        for i in range(self.num_frames):
+            row, col = divmod(i, self.cols)
+            frame = self.buf[row * self.fh:(row + 1) * self.fh, col * self.fw:(col + 1) * self.fw]
+            painted = frame[..., 3] > 0
+            ys = np.flatnonzero(painted.any(axis=1))
+            if not len(ys):
+                continue
+            xs = np.flatnonzero(painted.any(axis=0))
+            y0, y1 = max(0, ys[0] - reach), min(self.fh, ys[-1] + 1 + reach)
+            x0, x1 = max(0, xs[0] - reach), min(self.fw, xs[-1] + 1 + reach)
+            frame[y0:y1, x0:x1] = _gaussian(frame[y0:y1, x0:x1], radii)
+
+    def to_array(self, chunk=64):
+        """uint8 (H, W, 4) with straight alpha (converted a few rows at a time)"""
+        out = np.empty(self.buf.shape, dtype=np.uint8)
+        scratch = np.empty((chunk,) + self.buf.shape[1:], dtype=np.float32)
+        inv = np.empty((chunk,) + self.buf.shape[1:2], dtype=np.float32)
+        for y in range(0, self.buf.shape[0], chunk):
+            src = self.buf[y:y + chunk]
+            if not src[..., 3].any():
+                out[y:y + chunk] = 0
+                continue
+            tmp, scale = scratch[:len(src)], inv[:len(src)]
+            np.clip(src[..., 3], 0.0, 1.0, out=tmp[..., 3])
+            # 1 / alpha, or 0 where alpha rounds to 0 so that fully transparent pixels come out black
+            np.maximum(tmp[..., 3], 1e-6, out=scale)
+            np.divide(1.0, scale, out=scale)
+            scale[tmp[..., 3] < 0.5 / 255.0] = 0.0
+            np.multiply(src[..., :3], scale[..., None], out=tmp[..., :3])
+            tmp *= 255.0
+            tmp += 0.5
+            np.clip(tmp, 0.0, 255.0, out=tmp)
+            out[y:y + chunk] = tmp
+        return out
+
+    def to_image(self):
+        return Image.fromarray(self.to_array(), "RGBA")
+
+
+def _box_radii(sigma, passes=3):
+    """Radii of the box filters whose repeated application approximates a Gaussian of sigma"""
+    ideal = math.sqrt(12.0 * sigma * sigma / passes + 1.0)
+    lo = int(ideal)
+    if lo % 2 == 0:
+        lo -= 1
+    hi = lo + 2
+    m = round((12.0 * sigma * sigma - passes * lo * lo - 4 * passes * lo - 3 * passes) / (-4.0 * lo - 4.0))
+    return [(lo if i < m else hi) // 2 for i in range(passes)]
+
+def _box_rows(a, radius, acc, out):
+    """out = zero-padded moving average of width 2 * radius + 1 down the rows of a; acc is scratch"""
+    n = len(a)
+    if radius <= 0:
+        out[...] = a
+        return
+    # running sum one row at a time: each step is a vectorized add over a whole row
+    acc[0] = a[0]
+    for i in range(1, n):
+        np.add(acc[i - 1], a[i], out=acc[i])
+    # out[i] = acc[min(i + r, n - 1)] - acc[i - r - 1], with acc[< 0] = 0
+    r = min(radius, n - 1)
+    out[:n - r] = acc[r:]
+    out[n - r:] = acc[n - 1]
+    out[radius + 1:] -= acc[:max(0, n - radius - 1)]
+    out *= 1.0 / (2 * radius + 1)
+
+def _boxes(a, radii):
+    acc, out = np.empty_like(a), np.empty_like(a)
+    for radius in radii:
+        _box_rows(a, radius, acc, out)
+        a, out = out, a
+    return a
+
+def _gaussian(region, radii):
+    """Blur of an (h, w, 4) block: box passes down the columns, then down the columns of its transpose"""
+    columns = _boxes(np.array(region, dtype=np.float32), radii)
+    return _boxes(np.ascontiguousarray(columns.transpose(1, 0, 2)), radii).transpose(1, 0, 2)
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+VRAM budget of the project's textures, from image headers and .import files
+
+For every image with a `.import` sidecar (importer="texture") the size and
+alpha come from the file header (image_meta.py, no pixels decoded) and the
+import settings from [params]: compress/mode, mipmaps/generate,
+process/size_limit (and Godot 3 style flags/filter when present; otherwise
+the project's default canvas texture filter). The estimated GPU size is:
+
+    Lossless / Lossy / VRAM Uncompressed   4 bytes per pixel (RGBA8; RGB8 is padded by drivers)
+    VRAM Compressed                        1 byte (BPTC / DXT5 / ETC2 with alpha), 0.5 without alpha
+    Basis Universal                        1 byte per pixel once transcoded
+    mipmaps                                x 4/3
+
+Only the runtime texture folders are scanned (--dirs, default assets/):
+docs/ holds store screenshots and working files the game never loads, and
+counting them would swamp the budget and let --fix rewrite their presets.
+Folders with a .gdignore file are skipped, as Godot does.
+
+Totals are reported per texture, per directory and per VFXManager.gd category
+(vfx_configs.py). Expensive cases are flagged:
+    large-lossless   lossless / lossy import of --large-mp megapixels or more, e.g. a 1080p
+                     background (VRAM Compressed is 4-8x smaller)
+    mipmapped-ui     mipmaps on 2D UI / icon textures, which are never minified in 3D
+    oversized        larger than 4096 px on a side (exceeds many GPUs' limits)
+    not-imported     image without a .import file
+
+--fix rewrites the flagged presets in place (large-lossless -> compress/mode=2,
+mipmapped-ui -> mipmaps/generate=false); Godot re-imports them on the next
+editor scan. Add --dry-run to only print what would change.
+
+Usage:
+    python tools/vram_budget.py [ROOT] [--dirs assets,scenes] [--top 15] [--large-mp 2.0] [--json REPORT.json] [--fix [--dry-run]]
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+from collections import defaultdict
+
+from gd_const import project_root
+from image_meta import read_meta
+from vfx_configs import load_sheet_configs
+
+TEXTURE_EXTS = (".png", ".jpg", ".jpeg", ".webp")
+SKIP_DIRS = {".godot", ".git", ".import", "addons"}
+DEFAULT_DIRS = ("assets",)
+COMPRESS_MODES = {0: "lossless", 1: "lossy", 2: "vram", 3: "vram-uncompressed", 4: "basis"}
+FILTERS = {0: "nearest", 1: "linear", 2: "nearest-mipmap", 3: "linear-mipmap"}
+UI_DIRS = ("assets/ui/", "assets/icons/")
+MAX_SIDE = 4096
+
+_PARAM_RE = re.compile(r'^([\w/]+)=(.*)$', re.M)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# HEADERS / IMPORT FILES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def read_import(path):
+    """{"importer": str, "params": {key: raw value}} of a .import file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    importer = re.search(r'^importer="([^"]*)"', text, re.M)
+    params_at = text.find("[params]")
+    params = dict(_PARAM_RE.findall(text[params_at:])) if params_at >= 0 else {}
+    return {"importer": importer.group(1) if importer else "", "params": params}
+
+def project_filter(root):
+    """Default canvas texture filter from project.godot (Godot's default is linear)"""
+    try:
+        with open(os.path.join(root, "project.godot"), 'r', encoding='utf-8') as f:
+            m = re.search(r'^textures/canvas_textures/default_texture_filter=(\d+)', f.read(), re.M)
+    except OSError:
+        m = None
+    return FILTERS.get(int(m.group(1)), "linear") if m else "linear"
+
+def _int(value, default=0):
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return default
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ESTIMATE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def vram_bytes(width, height, mode, has_alpha, mipmaps, size_limit=0):
+    if size_limit and max(width, height) > size_limit:
+        scale = size_limit / max(width, height)
+        width, height = max(1, int(width * scale)), max(1, int(height * scale))
+    if mode == "vram":
+        per_pixel = 1.0 if has_alpha else 0.5
+    elif mode == "basis":
+        per_pixel = 1.0
+    else:
+        per_pixel = 4.0
+    size = width * height * per_pixel
+    return int(size * 4 / 3) if mipmaps else int(size)
+
+def _walk(root, dirs):
+    """os.walk over root/dir for each of dirs, minus SKIP_DIRS, hidden and .gdignore'd subfolders"""
+    for top in dirs:
+        for dirpath, dirnames, filenames in os.walk(os.path.join(root, top)):
+            dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS and not d.startswith(".")
+                                 and not os.path.exists(os.path.join(dirpath, d, ".gdignore")))
+            yield dirpath, dirnames, filenames
+
+def scan(root, large_mp=2.0, dirs=DEFAULT_DIRS):
+    """One record per texture under the given folders of root (paths stay relative to root)"""
+    categories = {sheet.res_path: sheet.category for sheet in load_sheet_configs()}
+    default_filter = project_filter(root)
+    records = []
+    for dirpath, dirnames, filenames in _walk(root, dirs):
+        names = set(filenames)
+        for name in sorted(filenames):
+            if not name.lower().endswith(TEXTURE_EXTS):
+                continue
+            path = os.path.join(dirpath, name)
+            rel = os.path.relpath(path, root).replace(os.sep, "/")
+            meta = read_meta(path)
+            if meta is None:
+                continue
+            width, height, has_alpha = meta.width, meta.height, meta.alpha
+            record = {"path": rel, "width": width, "height": height, "alpha": has_alpha,
+                      "category": categories.get("res://" + rel), "flags": []}
+            if name + ".import" not in names:
+                record.update(mode=None, mipmaps=False, filter=default_filter, vram=0)
+                record["flags"].append("not-imported")
+                records.append(record)
+                continue
+            imp = read_import(path + ".import")
+            if imp["importer"] != "texture":
+                continue
+            params = imp["params"]
+            mode = COMPRESS_MODES.get(_int(params.get("compress/mode")), "lossless")
+            mipmaps = params.get("mipmaps/generate", "false") == "true"
+            size_limit = _int(params.get("process/size_limit"))
+            filt = FILTERS.get(_int(params.get("flags/filter"), -1), default_filter) \
+                if "flags/filter" in params else default_filter
+            record.update(mode=mode, mipmaps=mipmaps, filter=filt, size_limit=size_limit,
+                          vram=vram_bytes(width, height, mode, has_alpha, mipmaps, size_limit))
+            if mode in ("lossless", "lossy") and width * height >= large_mp * 1e6:
+                record["flags"].append("large-lossless")
+            if mipmaps and rel.startswith(UI_DIRS):
+                record["flags"].append("mipmapped-ui")
+            if max(width, height) > MAX_SIDE and not (size_limit and size_limit <= MAX_SIDE):
+                record["flags"].append("oversized")
+            records.append(record)
+    return records
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# FIX
+# ═══════════════════════════════════════════════════════════════════════════════
+
+FIXES = {
+    "large-lossless": ("compress/mode", "2"),
+    "mipmapped-ui": ("mipmaps/generate", "false"),
+}
+
+def fix_import(path, changes, dry_run=False):
+    """Set [params] keys of a .import file; returns the (key, old, new) that changed"""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    done = []
+    for key, value in changes:
+        pattern = re.compile(r'^(' + re.escape(key) + r')=(.*)$', re.M)
+        m = pattern.search(text)
+        if m and m.group(2) != value:
+            done.append((key, m.group(2), value))
+            text = text[:m.start(2)] + value + text[m.end(2):]
+    if done and not dry_run:
+        with open(path + ".tmp", 'w', encoding='utf-8', newline="\n") as f:
+            f.write(text)
+        os.replace(path + ".tmp", path)
+    return done
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _mb(n):
+    return f"{n / (1024 * 1024):,.1f} MB"
+
+def main():
+    parser = argparse.ArgumentParser(description="Estimate texture VRAM from headers and .import settings.")
+    parser.add_argument("root", nargs="?", default=project_root(), help="Godot project folder (default: this project)")
+    parser.add_argument("--dirs", default=",".join(DEFAULT_DIRS), metavar="DIR,...",
+                        help="folders of ROOT holding runtime textures (default: assets; '.' for the whole project)")
+    parser.add_argument("--top", type=int, default=15, help="rows per table (default 15)")
+    parser.add_argument("--large-mp", type=float, default=2.0,
+                        help="megapixels at which a lossless import is flagged (default 2.0, i.e. 1920x1080)")
+    parser.add_argument("--json", metavar="PATH", help="also write every texture record as JSON")
+    parser.add_argument("--fix", action="store_true", help="rewrite the import presets of flagged textures")
+    parser.add_argument("--dry-run", action="store_true", help="with --fix: only show what would change")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    dirs = [d.strip() for d in args.dirs.split(",") if d.strip()]
+    records = scan(args.root, args.large_mp, dirs)
+    total = sum(r["vram"] for r in records)
+    per_dir, per_category = defaultdict(lambda: [0, 0]), defaultdict(lambda: [0, 0])
+    for r in records:
+        per_dir[os.path.dirname(r["path"]) or "."][0] += 1
+        per_dir[os.path.dirname(r["path"]) or "."][1] += r["vram"]
+        if r["category"]:
+            per_category[r["category"]][0] += 1
+            per_category[r["category"]][1] += r["vram"]
+    modes = defaultdict(int)
+    for r in records:
+        modes[r["mode"] or "not imported"] += 1
+
+    print(f"{len(records)} texture(s), estimated VRAM {_mb(total)} "
+          f"({', '.join(f'{n} {m}' for m, n in sorted(modes.items(), key=lambda kv: -kv[1]))})")
+    print(f"\nLargest textures:")
+    for r in sorted(records, key=lambda r: -r["vram"])[:args.top]:
+        mip = " +mips" if r["mipmaps"] else ""
+        print(f"  {_mb(r['vram']):>9}  {r['width']:>5}x{r['height']:<5} {(r['mode'] or '-') + mip:<18} {r['path']}")
+    print(f"\nBy directory:")
+    for d, (n, vram) in sorted(per_dir.items(), key=lambda kv: -kv[1][1])[:args.top]:
+        print(f"  {_mb(vram):>9}  {n:>4} texture(s)  {d}")
+    if per_category:
+        print(f"\nBy VFXManager category:")
+        for c, (n, vram) in sorted(per_category.items(), key=lambda kv: -kv[1][1]):
+            print(f"  {_mb(vram):>9}  {n:>4} sheet(s)  {c}")
+
+    flagged = [r for r in records if r["flags"]]
+    if flagged:
+        print(f"\nFlagged ({len(flagged)}):")
+        for r in sorted(flagged, key=lambda r: -r["vram"])[:args.top]:
+            print(f"  {', '.join(r['flags']):<28} {_mb(r['vram']):>9}  {r['width']}x{r['height']}  {r['path']}")
+        if len(flagged) > args.top:
+            print(f"  ... {len(flagged) - args.top} more")
+
+    if args.fix:
+        changed = 0
+        for r in flagged:
+            changes = [FIXES[flag] for flag in r["flags"] if flag in FIXES]
+            if not changes:
+                continue
+            done = fix_import(os.path.join(args.root, r["path"]) + ".import", changes, args.dry_run)
+            for key, old, new in done:
+                print(f"  {'would set' if args.dry_run else 'set'} {key}: {old} -> {new}  {r['path']}.import")
+            changed += bool(done)
+        print(f"\n{changed} import file(s) {'would be ' if args.dry_run else ''}rewritten")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(records, f, indent=1)
+    print(f"\nScanned in {time.perf_counter() - t0:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
 import os
-try:
-    from PIL import Image
-except:
-    import sys; sys.exit(1)
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "tools"))
+from image_meta import DimsIndex
+
+index = DimsIndex()
 
 directory = r'c:\git\loopialike\project\docs\steam\assets'
 candidates = {
@@ -15,12 +17,13 @@ print("--- VERIFYING ---")
 for f, (tw, th) in candidates.items():
     path = os.path.join(directory, f)
     if os.path.exists(path):
-        try:
-            with Image.open(path) as img:
-                match = "MATCH" if (img.width == tw and img.height == th) else "MISMATCH"
-                print(f"{f}: {img.width}x{img.height} -> {match}")
-        except Exception as e:
-            print(f"{f}: Error {e}")
+        meta = index.get(path)
+        if meta:
+            match = "MATCH" if (meta.width == tw and meta.height == th) else "MISMATCH"
+            print(f"{f}: {meta.width}x{meta.height} -> {match}")
+        else:
+            print(f"{f}: Error unknown image format")
     else:
         print(f"{f}: Missing")
 print("--- END ---")
+index.save()